@@ -119,6 +119,8 @@ from draftgeoutils.intersections import (findIntersection,
                                          angleBisection)
 
 from draftgeoutils.wires import (findWires,
+                                 chain_edges,
+                                 find_wires_indexed,
                                  findWiresOld,
                                  findWiresOld2,
                                  flattenWire,
@@ -49,6 +49,151 @@ def findWires(edgeslist):
     return [Part.Wire(e) for e in Part.sortEdges(edgeslist)]
 
 
+def _endpoint_nodes(points, tol):
+    """Merge coincident points through a quantized spatial hash.
+
+    Each point is snapped to a cell of size `4 * tol`. Only the cells
+    the point lies within `tol` of are searched for an existing node,
+    so merging is linear in the number of points.
+    Return a list with the node index of every point.
+    """
+    size = 4 * tol
+    cells = {}
+    nodes = []
+    ids = []
+    for p in points:
+        key = (math.floor(p[0] / size),
+               math.floor(p[1] / size),
+               math.floor(p[2] / size))
+        ranges = []
+        for i in range(3):
+            low = p[i] - key[i] * size
+            steps = [0]
+            if low <= tol:
+                steps.append(-1)
+            if size - low <= tol:
+                steps.append(1)
+            ranges.append(steps)
+        found = None
+        for dx in ranges[0]:
+            for dy in ranges[1]:
+                for dz in ranges[2]:
+                    cell = (key[0] + dx, key[1] + dy, key[2] + dz)
+                    for n in cells.get(cell, ()):
+                        q = nodes[n]
+                        if (abs(q[0] - p[0]) <= tol
+                                and abs(q[1] - p[1]) <= tol
+                                and abs(q[2] - p[2]) <= tol):
+                            found = n
+                            break
+                    if found is not None:
+                        break
+                if found is not None:
+                    break
+        if found is None:
+            found = len(nodes)
+            nodes.append(p)
+            cells.setdefault(key, []).append(found)
+        ids.append(found)
+    return ids
+
+
+def chain_edges(edgeslist, tol=None):
+    """Chain edges that share end points into ordered groups.
+
+    This does the same as `Part.sortEdges` but works in linear time,
+    so it scales to the large edge counts of imported drawings.
+    The end points are merged with a spatial hash, then every chain is
+    grown at both ends from the first unused edge, like `sortEdges` does.
+
+    Parameters
+    ----------
+    edgeslist : list of Part.Edge
+        The edges to chain, in any order and orientation.
+
+    tol : float, optional
+        It defaults to `None`, in which case the Draft precision is used.
+        Two end points closer than this are considered the same.
+
+    Returns
+    -------
+    list of lists of Part.Edge
+        Each list holds connected edges, ordered so that two
+        consecutive edges share an end point.
+        Closed edges, like full circles, form a list of their own.
+    """
+    if tol is None:
+        tol = 10 ** (-precision())
+    points = []
+    for e in edgeslist:
+        points.append(tuple(e.Vertexes[0].Point))
+        points.append(tuple(e.Vertexes[-1].Point))
+    ids = _endpoint_nodes(points, tol)
+
+    starts = ids[0::2]
+    ends = ids[1::2]
+    closed = [len(e.Vertexes) < 2 or s == f
+              for e, s, f in zip(edgeslist, starts, ends)]
+    adjacent = {}
+    for i in range(len(edgeslist)):
+        if not closed[i]:
+            adjacent.setdefault(starts[i], []).append(i)
+            adjacent.setdefault(ends[i], []).append(i)
+    # position of the first edge at each node that may still be unused
+    cursor = dict.fromkeys(adjacent, 0)
+    used = [False] * len(edgeslist)
+
+    def next_edge(node):
+        edges = adjacent[node]
+        k = cursor[node]
+        while k < len(edges) and used[edges[k]]:
+            k += 1
+        cursor[node] = k
+        if k < len(edges):
+            return edges[k]
+        return None
+
+    def grow(node):
+        chain = []
+        i = next_edge(node)
+        while i is not None:
+            used[i] = True
+            chain.append(i)
+            node = ends[i] if starts[i] == node else starts[i]
+            i = next_edge(node)
+        return chain
+
+    chains = []
+    for i in range(len(edgeslist)):
+        if used[i]:
+            continue
+        used[i] = True
+        if closed[i]:
+            chains.append([edgeslist[i]])
+            continue
+        tail = grow(ends[i])
+        head = grow(starts[i])
+        order = head[::-1] + [i] + tail
+        chains.append([edgeslist[k] for k in order])
+    return chains
+
+
+def find_wires_indexed(edgeslist, tol=None):
+    """Find wires in a list of edges, in linear time.
+
+    The edges are grouped with `chain_edges` and a `Part.Wire` is only
+    built once per chain. A chain whose end points are too far apart
+    for OpenCASCADE to connect them is split with `Part.sortEdges`.
+    """
+    wires = []
+    for chain in chain_edges(edgeslist, tol):
+        try:
+            wires.append(Part.Wire(chain))
+        except Part.OCCError:
+            wires.extend(Part.Wire(e) for e in Part.sortEdges(chain))
+    return wires
+
+
 def findWiresOld2(edgeslist):
     """Find connected wires in the given list of edges."""
 
@@ -28,11 +28,17 @@
 
 ## \addtogroup drafttests
 # @{
+import importlib.util
 import os
+import random
+import sys
+import tempfile
 import unittest
 
 import FreeCAD as App
+import Part
 import Draft
+import DraftGeomUtils
 import drafttests.auxiliary as aux
 
 from draftutils.messages import _msg
@@ -87,6 +93,147 @@ class DraftDXF(unittest.TestCase):
         obj = Draft.export_dxf(out_file)
         self.assertTrue(obj, "'{}' failed".format(operation))
 
+    def assert_chains(self, chains, edges):
+        """Check the chains hold every edge once and are connected."""
+        hashes = sorted(e.hashCode() for chain in chains for e in chain)
+        self.assertEqual(hashes, sorted(e.hashCode() for e in edges))
+        for chain in chains:
+            for e1, e2 in zip(chain, chain[1:]):
+                ends1 = [v.Point for v in (e1.Vertexes[0], e1.Vertexes[-1])]
+                ends2 = [v.Point for v in (e2.Vertexes[0], e2.Vertexes[-1])]
+                self.assertTrue(any(p1.distanceToPoint(p2) < 1e-3
+                                    for p1 in ends1 for p2 in ends2),
+                                "edges of a chain are not connected")
+
+    def test_chain_edges_shuffled(self):
+        """Chain the shuffled and partly reversed edges of polylines."""
+        operation = "DraftGeomUtils.chain_edges"
+        _msg("  Test '{}'".format(operation))
+        edges = []
+        for y in (0, 10):
+            points = [App.Vector(x, y + (x % 2), 0) for x in range(20)]
+            for i in range(len(points) - 1):
+                if i % 3:
+                    edges.append(Part.makeLine(points[i], points[i + 1]))
+                else:
+                    edges.append(Part.makeLine(points[i + 1], points[i]))
+        random.seed(3)
+        random.shuffle(edges)
+
+        chains = DraftGeomUtils.chain_edges(edges)
+        self.assertEqual(len(chains), 2, "'{}' failed".format(operation))
+        self.assert_chains(chains, edges)
+
+        wires = DraftGeomUtils.find_wires_indexed(edges)
+        self.assertEqual(len(wires), 2)
+        for w in wires:
+            self.assertEqual(len(w.Edges), 19)
+            self.assertFalse(w.isClosed())
+
+    def test_chain_edges_closed(self):
+        """Chain a closed loop and keep a full circle on its own."""
+        operation = "DraftGeomUtils.find_wires_indexed"
+        _msg("  Test '{}'".format(operation))
+        points = [App.Vector(0, 0, 0), App.Vector(10, 0, 0),
+                  App.Vector(10, 10, 0), App.Vector(0, 10, 0)]
+        edges = [Part.makeLine(points[i], points[i - 1]) for i in range(4)]
+        circle = Part.makeCircle(5, App.Vector(30, 0, 0))
+        edges.insert(2, circle)
+
+        chains = DraftGeomUtils.chain_edges(edges)
+        self.assertEqual(len(chains), 2, "'{}' failed".format(operation))
+        self.assert_chains(chains, edges)
+        self.assertIn([circle.hashCode()],
+                      [[e.hashCode() for e in chain] for chain in chains])
+
+        wires = DraftGeomUtils.find_wires_indexed(edges)
+        self.assertEqual(sorted(len(w.Edges) for w in wires), [1, 4])
+        self.assertTrue(all(w.isClosed() for w in wires))
+
+    def test_chain_edges_junction(self):
+        """Chain edges meeting in a T-junction."""
+        operation = "DraftGeomUtils.chain_edges"
+        _msg("  Test '{}'".format(operation))
+        center = App.Vector(10, 0, 0)
+        edges = [Part.makeLine(App.Vector(0, 0, 0), center),
+                 Part.makeLine(center, App.Vector(10, 10, 0)),
+                 Part.makeLine(App.Vector(20, 0, 0), center)]
+
+        chains = DraftGeomUtils.chain_edges(edges)
+        self.assertEqual(sorted(len(c) for c in chains), [1, 2],
+                         "'{}' failed".format(operation))
+        self.assert_chains(chains, edges)
+        self.assertEqual(len(DraftGeomUtils.find_wires_indexed(edges)), 2)
+
+    def test_chain_edges_cell_boundary(self):
+        """Join end points within the tolerance across hash cell bounds."""
+        operation = "DraftGeomUtils.chain_edges"
+        _msg("  Test '{}'".format(operation))
+        tol = 1e-3
+        # the end points are hashed into cells of 4 * tol
+        for bound in (0.0, 4 * tol, -4 * tol, 400 * tol):
+            for delta in (App.Vector(1, 0, 0), App.Vector(0, 1, 0),
+                          App.Vector(1, 1, 1)):
+                p1 = App.Vector(bound, bound, bound) - delta * (0.4 * tol)
+                p2 = App.Vector(bound, bound, bound) + delta * (0.4 * tol)
+                edges = [Part.makeLine(p1 - delta * 10, p1),
+                         Part.makeLine(p2 + delta * 10, p2)]
+                chains = DraftGeomUtils.chain_edges(edges, tol)
+                self.assertEqual(len(chains), 1,
+                                 "'{}' failed at {}".format(operation, p1))
+
+                far = p2 + delta * (2 * tol)
+                edges = [Part.makeLine(p1 - delta * 10, p1),
+                         Part.makeLine(far + delta * 10, far)]
+                chains = DraftGeomUtils.chain_edges(edges, tol)
+                self.assertEqual(len(chains), 2,
+                                 "'{}' failed at {}".format(operation, p1))
+
+    def test_join_dxf_layers(self):
+        """Join the lines of a DXF file per layer with the legacy importer."""
+        operation = "importDXF.processdxf"
+        _msg("  Test '{}'".format(operation))
+        # the legacy importer needs the dxf libraries of the addon
+        sys.path.append(App.ConfigGet("UserAppData"))
+        if importlib.util.find_spec("dxfReader") is None:
+            self.skipTest("DXF libraries are not installed")
+        import importDXF
+        importDXF.getDXFlibs()
+        importDXF.readPreferences()
+
+        lines = [("A", (0, 0), (10, 0)),
+                 ("B", (10, 0), (10, 10)),
+                 ("A", (10, 10), (10, 0)),
+                 ("B", (0, 10), (10, 10))]
+        content = ["0", "SECTION", "2", "ENTITIES"]
+        for layer, p1, p2 in lines:
+            content += ["0", "LINE", "8", layer,
+                        "10", str(p1[0]), "20", str(p1[1]), "30", "0.0",
+                        "11", str(p2[0]), "21", str(p2[1]), "31", "0.0"]
+        content += ["0", "ENDSEC", "0", "EOF"]
+        in_file = os.path.join(tempfile.mkdtemp(), "join.dxf")
+        with open(in_file, "w") as f:
+            f.write("\n".join(content) + "\n")
+
+        importDXF.dxfJoin = True
+        importDXF.dxfCreateSketch = False
+        importDXF.dxfMakeBlocks = False
+        importDXF.dxfUseDraftVisGroups = False
+        try:
+            importDXF.processdxf(self.doc, in_file)
+        finally:
+            importDXF.readPreferences()
+            os.remove(in_file)
+            os.rmdir(os.path.dirname(in_file))
+
+        for layer in ("A", "B"):
+            groups = self.doc.getObjectsByLabel(layer)
+            self.assertEqual(len(groups), 1, "'{}' failed".format(operation))
+            shapes = [o.Shape for o in groups[0].Group]
+            self.assertEqual(len(shapes), 1,
+                             "'{}' failed".format(operation))
+            self.assertEqual(len(shapes[0].Edges), 2)
+
     def tearDown(self):
         """Finish the test.
 
@@ -2173,9 +2173,8 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
     Returns
     -------
     list of `Part.Shapes`
-        It returns `None` if the edges (lines, polylines, arcs)
-        are above 100, and the user decides to interrupt (graphically)
-        the process of joining them.
+        When `dxfJoin` is set, the lines, polylines and arcs
+        of each layer are joined into wires.
 
     To do
     -----
@@ -2203,6 +2202,8 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
     layerBlocks = {}
     sketch = None
     shapes = []
+    # layer of each shape collected for joining
+    shapeLayers = []
 
     # Create layers
     if hasattr(drawing, "tables"):
@@ -2249,6 +2250,7 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
                         shapes.append(shape)
                     else:
                         shapes.append(shape.Shape)
+                    shapeLayers.append(line.layer)
                 elif dxfMakeBlocks:
                     addToBlock(shape, line.layer)
                 else:
@@ -2300,6 +2302,7 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
                         shapes.append(shape)
                     else:
                         shapes.append(shape.Shape)
+                    shapeLayers.append(polyline.layer)
                 elif dxfMakeBlocks:
                     addToBlock(shape, polyline.layer)
                 else:
@@ -2335,6 +2338,7 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
                         shapes.append(shape)
                     else:
                         shapes.append(shape.Shape)
+                    shapeLayers.append(arc.layer)
                 elif dxfMakeBlocks:
                     addToBlock(shape, arc.layer)
                 else:
@@ -2345,29 +2349,19 @@ def processdxf(document, filename, getShapes=False, reComputeFlag=True):
     # Join lines, polylines and arcs if needed
     if dxfJoin and shapes:
         FCC.PrintMessage("Joining geometry...\n")
-        edges = []
-        for s in shapes:
-            edges.extend(s.Edges)
-        if len(edges) > (100):
-            FCC.PrintMessage(str(len(edges)) + " edges to join\n")
-            if FreeCAD.GuiUp:
-                d = QtGui.QMessageBox()
-                d.setText("Warning: High number of entities to join (>100)")
-                d.setInformativeText("This might take a long time "
-                                     "or even freeze your computer. "
-                                     "Are you sure? You can also disable "
-                                     "the 'join geometry' setting in DXF "
-                                     "import preferences")
-                d.setStandardButtons(QtGui.QMessageBox.Ok
-                                     | QtGui.QMessageBox.Cancel)
-                d.setDefaultButton(QtGui.QMessageBox.Cancel)
-                res = d.exec_()
-                if res == QtGui.QMessageBox.Cancel:
-                    FCC.PrintMessage("Aborted\n")
-                    return
-        shapes = DraftGeomUtils.findWires(edges)
-        for s in shapes:
-            newob = addObject(s)
+        # joined shapes stay on their layer, so join each layer on its own
+        layerEdges = {}
+        for s, layer in zip(shapes, shapeLayers):
+            layerEdges.setdefault(layer, []).extend(s.Edges)
+        shapes = []
+        for layer, edges in layerEdges.items():
+            wires = DraftGeomUtils.find_wires_indexed(edges)
+            FCC.PrintMessage(str(len(edges)) + " edges joined into "
+                             + str(len(wires)) + " wires"
+                             + " on layer " + str(layer) + "\n")
+            for s in wires:
+                newob = addObject(s, "Shape", layer)
+            shapes.extend(wires)
 
     # Draw circles
     circles = drawing.entities.get_type("circle")
@@ -2860,9 +2854,8 @@ def getShapes(filename):
     Returns
     -------
     list of `Part.Shapes`
-        It returns `None` if the edges (lines, polylines, arcs)
-        are above 100, and the user decides to interrupt (graphically)
-        the process of joining them.
+        When `dxfJoin` is set, the lines, polylines and arcs
+        of each layer are joined into wires.
 
     See also
     --------
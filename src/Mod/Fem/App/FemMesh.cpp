@@ -24,8 +24,11 @@
 #include "PreCompiled.h"
 
 #ifndef _PreComp_
+# include <cstdint>
 # include <cstdlib>
+# include <iomanip>
 # include <memory>
+# include <sstream>
 # include <Python.h>
 # include <Bnd_Box.hxx>
 # include <BRep_Tool.hxx>
@@ -2523,6 +2526,46 @@ struct Fem::FemMesh::FemMeshInfo FemMesh::getInfo(void) const{
 //            );
 //        }
 
+std::string FemMesh::getFingerprint(void)const
+{
+    // 64 bit FNV-1a hash over the raw bytes of the node ids and absolute
+    // coordinates and of the element ids, node counts and node ids
+    uint64_t hash = 14695981039346656037ULL;
+    auto update = [&hash](const void* data, std::size_t size) {
+        const unsigned char* bytes = static_cast<const unsigned char*>(data);
+        for (std::size_t i = 0; i < size; i++) {
+            hash ^= bytes[i];
+            hash *= 1099511628211ULL;
+        }
+    };
+
+    Base::Matrix4D Mtrx = getTransform();
+    SMDS_NodeIteratorPtr aNodeIter = myMesh->GetMeshDS()->nodesIterator();
+    while (aNodeIter->more()) {
+        const SMDS_MeshNode* aNode = aNodeIter->next();
+        Base::Vector3d vec = Mtrx * Base::Vector3d(aNode->X(), aNode->Y(), aNode->Z());
+        int id = aNode->GetID();
+        double xyz[3] = {vec.x, vec.y, vec.z};
+        update(&id, sizeof(id));
+        update(xyz, sizeof(xyz));
+    }
+
+    SMDS_ElemIteratorPtr aElemIter = myMesh->GetMeshDS()->elementsIterator();
+    while (aElemIter->more()) {
+        const SMDS_MeshElement* aElem = aElemIter->next();
+        int ele[2] = {aElem->GetID(), aElem->NbNodes()};
+        update(ele, sizeof(ele));
+        for (int i = 0; i < aElem->NbNodes(); i++) {
+            int node = aElem->GetNode(i)->GetID();
+            update(&node, sizeof(node));
+        }
+    }
+
+    std::stringstream str;
+    str << std::hex << std::setw(16) << std::setfill('0') << hash;
+    return str.str();
+}
+
 Base::Quantity FemMesh::getVolume(void)const
 {
     SMDS_VolumeIteratorPtr aVolIter = myMesh->GetMeshDS()->volumesIterator();
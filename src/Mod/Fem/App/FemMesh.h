@@ -124,6 +124,8 @@ public:
     Base::BoundBox3d getBoundBox(void)const;
     /// get the volume (when there are volume elements)
     Base::Quantity getVolume(void)const;
+    /// hash of the node coordinates and the element connectivity, stable between sessions
+    std::string getFingerprint(void)const;
     //@}
 
     /** @name Modification */
@@ -30,6 +30,7 @@
 # include <SMESH_Gen.hxx>
 # include <SMESH_Group.hxx>
 # include <SMESH_Mesh.hxx>
+# include <SMESH_MeshEditor.hxx>
 # include <SMESHDS_Group.hxx>
 # include <SMDSAbs_ElementType.hxx>
 # include <SMDS_MeshElement.hxx>
@@ -231,6 +232,90 @@ PyObject* FemMeshPy::addNode(PyObject *args)
     return 0;
 }
 
+PyObject* FemMeshPy::addNodes(PyObject *args)
+{
+    Py_buffer ids, coords;
+    if (!PyArg_ParseTuple(args, "y*y*", &ids, &coords))
+        return 0;
+
+    PyObject* result = 0;
+    try {
+        if (ids.len % sizeof(int) != 0)
+            throw std::runtime_error("Node ids have to be a buffer of 32 bit integers");
+        std::size_t count = ids.len / sizeof(int);
+        if (coords.len != static_cast<Py_ssize_t>(3 * count * sizeof(double)))
+            throw std::runtime_error("Node coordinates have to be a buffer of three doubles per node id");
+
+        const int* nodeIds = static_cast<const int*>(ids.buf);
+        const double* xyz = static_cast<const double*>(coords.buf);
+        SMESHDS_Mesh* meshDS = getFemMeshPtr()->getSMesh()->GetMeshDS();
+        for (std::size_t i = 0; i < count; i++) {
+            SMDS_MeshNode* node = meshDS->AddNodeWithID(xyz[3*i], xyz[3*i+1], xyz[3*i+2], nodeIds[i]);
+            if (!node)
+                throw std::runtime_error("Failed to add node");
+        }
+        result = Py::new_reference_to(Py::Long(static_cast<long>(count)));
+    }
+    catch (const std::exception& e) {
+        PyErr_SetString(Base::BaseExceptionFreeCADError, e.what());
+    }
+    PyBuffer_Release(&ids);
+    PyBuffer_Release(&coords);
+    return result;
+}
+
+PyObject* FemMeshPy::addElements(PyObject *args)
+{
+    char* typeName;
+    Py_buffer ids, nodes;
+    if (!PyArg_ParseTuple(args, "sy*y*", &typeName, &ids, &nodes))
+        return 0;
+
+    PyObject* result = 0;
+    try {
+        SMDSAbs_ElementType type;
+        if (strcmp(typeName, "Edge") == 0)
+            type = SMDSAbs_Edge;
+        else if (strcmp(typeName, "Face") == 0)
+            type = SMDSAbs_Face;
+        else if (strcmp(typeName, "Volume") == 0)
+            type = SMDSAbs_Volume;
+        else
+            throw std::runtime_error("Element type has to be Edge, Face or Volume");
+        if (ids.len % sizeof(int) != 0 || nodes.len % sizeof(int) != 0)
+            throw std::runtime_error("Element ids and nodes have to be buffers of 32 bit integers");
+        std::size_t count = ids.len / sizeof(int);
+        std::size_t nodeTotal = nodes.len / sizeof(int);
+        if (count == 0 ? nodeTotal != 0 : nodeTotal % count != 0)
+            throw std::runtime_error("Element nodes do not fit to the element ids");
+
+        // every element has the same number of nodes
+        std::size_t nodeCount = count == 0 ? 0 : nodeTotal / count;
+        const int* elementIds = static_cast<const int*>(ids.buf);
+        const int* nodeIds = static_cast<const int*>(nodes.buf);
+        SMESHDS_Mesh* meshDS = getFemMeshPtr()->getSMesh()->GetMeshDS();
+        SMESH_MeshEditor editor(getFemMeshPtr()->getSMesh());
+        SMESH_MeshEditor::ElemFeatures features(type);
+        std::vector<const SMDS_MeshNode*> elementNodes(nodeCount);
+        for (std::size_t i = 0; i < count; i++) {
+            for (std::size_t j = 0; j < nodeCount; j++) {
+                elementNodes[j] = meshDS->FindNode(nodeIds[i * nodeCount + j]);
+                if (!elementNodes[j])
+                    throw std::runtime_error("Failed to get node of the given indices");
+            }
+            if (!editor.AddElement(elementNodes, features.SetID(elementIds[i])))
+                throw std::runtime_error("Failed to add element");
+        }
+        result = Py::new_reference_to(Py::Long(static_cast<long>(count)));
+    }
+    catch (const std::exception& e) {
+        PyErr_SetString(Base::BaseExceptionFreeCADError, e.what());
+    }
+    PyBuffer_Release(&ids);
+    PyBuffer_Release(&nodes);
+    return result;
+}
+
 PyObject* FemMeshPy::addEdge(PyObject *args)
 {
     SMESH_Mesh* mesh = getFemMeshPtr()->getSMesh();
@@ -1160,6 +1245,14 @@ PyObject* FemMeshPy::getIdByElementType(PyObject *args)
     return Py::new_reference_to(tuple);
 }
 
+PyObject* FemMeshPy::getFingerprint(PyObject *args)
+{
+    if (!PyArg_ParseTuple(args, ""))
+        return 0;
+
+    return PyUnicode_FromString(getFemMeshPtr()->getFingerprint().c_str());
+}
+
 // ===== Attributes ============================================================
 
 Py::Dict FemMeshPy::getNodes(void) const
@@ -58,7 +58,9 @@
 #include <vector>
 #include <set>
 #include <bitset>
+#include <cstdint>
 #include <cstdlib>
+#include <iomanip>
 #include <memory>
 #include <cmath>
 
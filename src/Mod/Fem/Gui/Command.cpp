@@ -1683,6 +1683,10 @@ void CmdFemPostPipelineFromResult::activated(int)
     if (results.size() == 1) {
         std::string FeatName = getUniqueObjectName("ResultPipeline");
         openCommand(QT_TRANSLATE_NOOP("Command", "Create pipeline from result"));
+        // derived result fields registered as lazy are needed by the pipeline
+        doCommand(Doc,"from femresult import resulttools");
+        doCommand(Doc,"resulttools.fill_lazy_results(App.activeDocument().getObject(\"%s\"))",
+                  results[0]->getNameInDocument());
         doCommand(Doc,"App.activeDocument().addObject('Fem::FemPostPipeline','%s')",FeatName.c_str());
         doCommand(Doc,"App.activeDocument().ActiveObject.load("
                       "App.activeDocument().getObject(\"%s\"))", results[0]->getNameInDocument());
@@ -686,6 +686,8 @@ def makePostVtkResult(
 ):
     """makePostVtkResult(document, base_result, [name]):
     creates a FEM post processing result object (vtk based) to hold FEM results"""
+    from femresult import resulttools
+    resulttools.fill_lazy_results(base_result)
     obj = doc.addObject("Fem::FemPostPipeline", name)
     obj.load(base_result)
     return obj
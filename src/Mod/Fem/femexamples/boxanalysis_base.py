@@ -24,7 +24,6 @@
 
 import FreeCAD
 
-import Fem
 import ObjectsFem
 
 from .manager import get_meshname
@@ -62,14 +61,9 @@ def setup_boxanalysisbase(doc=None, solvertype="ccxtools"):
     analysis.addObject(material_obj)
 
     # mesh
-    from .meshes.mesh_boxanalysis_tetra10 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from femmesh.meshcache import read_mesh_module
+    from .meshes import mesh_boxanalysis_tetra10
+    fem_mesh = read_mesh_module(mesh_boxanalysis_tetra10)
     femmesh_obj = analysis.addObject(ObjectsFem.makeMeshGmsh(doc, get_meshname()))[0]
     femmesh_obj.FemMesh = fem_mesh
     femmesh_obj.Part = geom_obj
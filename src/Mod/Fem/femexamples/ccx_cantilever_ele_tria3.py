@@ -21,10 +21,6 @@
 # *                                                                         *
 # ***************************************************************************
 
-import FreeCAD
-
-import Fem
-
 from . import manager
 from .ccx_cantilever_base_face import setup_cantilever_base_face
 from .manager import get_meshname
@@ -75,14 +71,9 @@ def setup(doc=None, solvertype="ccxtools"):
     geom_obj = doc.getObject("CanileverPlate")
 
     # load the tria3 mesh
-    from .meshes.mesh_canticcx_tria3 import create_nodes, create_elements
-    new_fem_mesh = Fem.FemMesh()
-    control = create_nodes(new_fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(new_fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from femmesh.meshcache import read_mesh_module
+    from .meshes import mesh_canticcx_tria3
+    new_fem_mesh = read_mesh_module(mesh_canticcx_tria3)
 
     # overwrite mesh with the tria3 mesh
     femmesh_obj.FemMesh = new_fem_mesh
@@ -26,7 +26,6 @@ import FreeCAD
 from FreeCAD import Rotation
 from FreeCAD import Vector
 
-import Fem
 import ObjectsFem
 
 from . import manager
@@ -159,14 +158,9 @@ def setup(doc=None, solvertype="elmer"):
     analysis.addObject(const_vacperm)
 
     # mesh
-    from .meshes.mesh_capacitance_two_balls_tetra10 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from femmesh.meshcache import read_mesh_module
+    from .meshes import mesh_capacitance_two_balls_tetra10
+    fem_mesh = read_mesh_module(mesh_capacitance_two_balls_tetra10)
     femmesh_obj = analysis.addObject(ObjectsFem.makeMeshGmsh(doc, get_meshname()))[0]
     femmesh_obj.FemMesh = fem_mesh
     femmesh_obj.Part = geom_obj
@@ -35,7 +35,6 @@ from FreeCAD import Vector
 
 from BOPTools import SplitFeatures
 
-import Fem
 import ObjectsFem
 
 from . import manager
@@ -211,14 +210,9 @@ def setup(doc=None, solvertype="ccxtools"):
     analysis.addObject(con_temp)
 
     # mesh
-    from .meshes.mesh_thermomech_bimetall_tetra10 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from femmesh.meshcache import read_mesh_module
+    from .meshes import mesh_thermomech_bimetall_tetra10
+    fem_mesh = read_mesh_module(mesh_thermomech_bimetall_tetra10)
     femmesh_obj = analysis.addObject(ObjectsFem.makeMeshGmsh(doc, get_meshname()))[0]
     femmesh_obj.FemMesh = fem_mesh
     femmesh_obj.Part = geom_obj
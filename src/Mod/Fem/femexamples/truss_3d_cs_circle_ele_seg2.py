@@ -21,10 +21,6 @@
 # *                                                                         *
 # ***************************************************************************
 
-import FreeCAD
-
-import Fem
-
 from .truss_3d_cs_circle_ele_seg3 import setup as setup_truss_seg3
 from .manager import get_meshname
 from .manager import init_doc
@@ -57,14 +53,9 @@ def setup(doc=None, solvertype="z88"):
     femmesh_obj = doc.getObject(get_meshname())
 
     # mesh
-    from .meshes.mesh_truss_crane_seg2 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from femmesh.meshcache import read_mesh_module
+    from .meshes import mesh_truss_crane_seg2
+    fem_mesh = read_mesh_module(mesh_truss_crane_seg2)
 
     # overwrite mesh with the hexa20 mesh
     femmesh_obj.FemMesh = fem_mesh
@@ -31,6 +31,7 @@ __url__ = "https://www.freecadweb.org"
 #  \ingroup FEM
 #  \brief FreeCAD Calculix FRD Reader for FEM workbench
 
+import itertools
 import os
 
 import FreeCAD
@@ -70,22 +71,50 @@ def importFrd(
     filename,
     analysis=None,
     result_name_prefix="",
-    result_analysis_type=""
+    result_analysis_type="",
+    lazy_results=None,
+    result_series=None
 ):
+    """ imports the results of a CalculiX frd file into result objects
+
+        lazy_results ... if True the derived result fields (DisplacementLengths,
+        vonMises, principal stresses) and the Stats are not calculated on import,
+        they are calculated on first use, see resulttools.fill_lazy_results()
+        default None uses the FEM general preference "LazyResultFields"
+        result_series ... if True all increments are written into a result series
+        next to the frd file and only one result object is created, it is filled
+        with the last increment, see femresult/resultseries.py
+        default None uses the FEM CalculiX preference "ResultSeries"
+    """
     import ObjectsFem
     from . import importToolsFem
 
+    if lazy_results is None:
+        lazy_results = FreeCAD.ParamGet(
+            "User parameter:BaseApp/Preferences/Mod/Fem/General"
+        ).GetBool("LazyResultFields", False)
+    if result_series is None:
+        result_series = FreeCAD.ParamGet(
+            "User parameter:BaseApp/Preferences/Mod/Fem/Ccx"
+        ).GetBool("ResultSeries", False)
+
     if analysis:
         doc = analysis.Document
     else:
         doc = FreeCAD.ActiveDocument
 
-    m = read_frd_result(filename)
+    Console.PrintMessage(
+        "Read ccx results from frd file: {}\n"
+        .format(filename)
+    )
+    inout_nodes = read_inout_nodes(filename)
+    mesh_arrays = read_frd_mesh_arrays(filename, inout_nodes)
     result_mesh_object = None
     res_obj = None
 
-    if len(m["Nodes"]) > 0:
-        mesh = importToolsFem.make_femmesh(m)
+    if len(mesh_arrays["NodeIds"]) > 0:
+        mesh = importToolsFem.make_femmesh_from_arrays(mesh_arrays)
+        del mesh_arrays
         result_mesh_object = ObjectsFem.makeMeshResult(
             doc,
             "ResultMesh"
@@ -94,12 +123,30 @@ def importFrd(
         res_mesh_is_compacted = False
         nodenumbers_for_compacted_mesh = []
 
-        number_of_increments = len(m["Results"])
-        Console.PrintLog(
-            "Increments: " + str(number_of_increments) + "\n"
-        )
-        if len(m["Results"]) > 0:
-            for result_set in m["Results"]:
+        # the result sets are read one by one
+        # the first two are read in advance to know if there are multiple increments
+        result_sets = iter_frd_result_arrays(filename, inout_nodes)
+        first_result_sets = list(itertools.islice(result_sets, 2))
+        number_of_increments = len(first_result_sets)
+        if not inout_nodes and first_result_sets:
+            if "mflow" in first_result_sets[0] or "npressure" in first_result_sets[0]:
+                Console.PrintError(
+                    "We have mflow or npressure, but no inout_nodes file.\n"
+                )
+        if len(first_result_sets) > 0 and result_series:
+            res_obj = import_frd_result_series(
+                filename,
+                itertools.chain(first_result_sets, result_sets),
+                result_mesh_object,
+                analysis,
+                result_name_prefix,
+                lazy_results
+            )
+
+        elif len(first_result_sets) > 0:
+            increment_count = 0
+            for result_set in itertools.chain(first_result_sets, result_sets):
+                increment_count += 1
                 if "number" in result_set:
                     eigenmode_number = result_set["number"]
                 else:
@@ -141,7 +188,6 @@ def importFrd(
 
                 # more result object calculations
                 from femresult import resulttools
-                from femtools import femutils
                 if not res_obj.MassFlowRate:
                     # information 1:
                     # only compact result if not Flow 1D results
@@ -163,40 +209,16 @@ def importFrd(
                         # all other result sets, do not compact FemMesh, only set NodeNumbers
                         res_obj.NodeNumbers = nodenumbers_for_compacted_mesh
 
-                # fill DisplacementLengths
-                res_obj = resulttools.add_disp_apps(res_obj)
-                # fill vonMises
-                res_obj = resulttools.add_von_mises(res_obj)
-                # fill principal stress
-                # if material reinforced object use add additional values to the res_obj
-                if res_obj.getParentGroup():
-                    has_reinforced_mat = False
-                    for obj in res_obj.getParentGroup().Group:
-                        if femutils.is_of_type(obj, "Fem::MaterialReinforced"):
-                            has_reinforced_mat = True
-                            Console.PrintLog(
-                                "Reinforced material object detected, "
-                                "reinforced principal stresses and standard principal "
-                                "stresses will be added.\n"
-                            )
-                            resulttools.add_principal_stress_reinforced(res_obj)
-                            break
-                    if has_reinforced_mat is False:
-                        Console.PrintLog(
-                            "No reinforced material object detected, "
-                            "standard principal stresses will be added.\n"
-                        )
-                        # fill PrincipalMax, PrincipalMed, PrincipalMin, MaxShear
-                        res_obj = resulttools.add_principal_stress_std(res_obj)
+                if lazy_results:
+                    # derived fields and stats are calculated when asked for
+                    res_obj = resulttools.add_lazy_results(res_obj)
                 else:
-                    Console.PrintLog(
-                        "No Analysis detected, standard principal stresses will be added.\n"
-                    )
-                    # if a pure frd file was opened no analysis and thus no parent group
-                    # fill PrincipalMax, PrincipalMed, PrincipalMin, MaxShear
-                    res_obj = resulttools.add_principal_stress_std(res_obj)
-                # fill Stats
-                res_obj = resulttools.fill_femresult_stats(res_obj)
+                    # fill DisplacementLengths, vonMises, principal stress and Stats
+                    res_obj = resulttools.add_derived_results(res_obj)
+
+            Console.PrintLog(
+                "Increments: " + str(increment_count) + "\n"
+            )
 
         else:
             error_message = (
@@ -240,15 +262,179 @@ def importFrd(
     return res_obj
 
 
+def import_frd_result_series(
+    filename,
+    result_sets,
+    result_mesh_object,
+    analysis=None,
+    result_name_prefix="",
+    lazy_results=False
+):
+    """ writes all result sets into a result series and creates one result object
+        filled with the last increment, all increments share the result mesh
+    """
+    import ObjectsFem
+    from femresult import resultseries
+    from femresult import resulttools
+
+    series_directory = resultseries.get_series_directory(filename)
+    resultseries.close_result_series(series_directory)
+    writer = resultseries.ResultSeriesWriter(series_directory)
+    for result_set in result_sets:
+        writer.add_result_set(result_set)
+    writer.close()
+    Console.PrintLog(
+        "Increments: " + str(len(writer.increments)) + "\n"
+    )
+
+    res_obj = ObjectsFem.makeResultMechanical(
+        result_mesh_object.Document,
+        "{}Results".format(result_name_prefix)
+    )
+    res_obj.Mesh = result_mesh_object
+    res_obj.SeriesDirectory = series_directory
+    res_obj = resultseries.fill_result_series_increment(res_obj, -1)
+    if analysis:
+        analysis.addObject(res_obj)
+    if not res_obj.MassFlowRate:
+        # compact result object, workaround for bug 2873, see importFrd
+        # the compacted NodeNumbers are kept on filling other increments
+        res_obj = resulttools.compact_result(res_obj)
+    if not lazy_results:
+        res_obj = resulttools.add_derived_results(res_obj)
+    return res_obj
+
+
 # read a calculix result file and extract the nodes
 # displacement vectors and stress values.
 def read_frd_result(
     frd_input
 ):
+    """ reads a CalculiX frd file into dictionaries
+        compatibility adapter around read_frd_mesh_arrays() and
+        iter_frd_result_arrays(), the mesh and every result set are
+        converted into the dict of dict structure used by make_femmesh()
+    """
     Console.PrintMessage(
         "Read ccx results from frd file: {}\n"
         .format(frd_input)
     )
+    inout_nodes = read_inout_nodes(frd_input)
+    mesh_data = frd_mesh_arrays_to_dict(read_frd_mesh_arrays(frd_input, inout_nodes))
+    results = []
+    for result_set in iter_frd_result_arrays(frd_input, inout_nodes):
+        results.append(frd_result_set_to_dict(result_set))
+
+    if not inout_nodes:
+        if results:
+            if "mflow" in results[0] or "npressure" in results[0]:
+                Console.PrintError(
+                    "We have mflow or npressure, but no inout_nodes file.\n"
+                )
+    if not mesh_data["Nodes"]:
+        Console.PrintError("FEM: No nodes found in Frd file.\n")
+
+    mesh_data["Results"] = results
+    return mesh_data
+
+
+# ********* array based frd reader *********
+# the data lines of a frd block have fixed column widths, a whole block
+# is collected and converted at once into NumPy arrays
+# ids are in columns [4:13], the values follow in 12 character columns
+FRD_ID_COLUMNS = (4, 13)
+FRD_VALUE_START = 13
+FRD_VALUE_WIDTH = 12
+
+# frd element type --> (FreeCAD element key, count of "-2" lines,
+#                       FreeCAD node order as indices into the frd nodes)
+# node order fits with node order in writeAbaqus() in FemMesh.cpp
+# CalculiX uses a different node order in input file *.inp and
+# result file *.frd for hexa20, penta15 and seg3
+# ccx (and thus the *.inp) follows the ABAQUS convention
+# cgx (and thus the *.frd) follows the FAM2 convention
+FRD_ELEMENT_TYPES = {
+    # C3D8 --> hexa8: N6, N7, N8, N5, N2, N3, N4, N1
+    1: ("Hexa8Elem", 1, (5, 6, 7, 4, 1, 2, 3, 0)),
+    # C3D6 --> penta6: N5, N6, N4, N2, N3, N1
+    2: ("Penta6Elem", 1, (4, 5, 3, 1, 2, 0)),
+    # C3D4 --> tetra4: N2, N1, N3, N4
+    3: ("Tetra4Elem", 1, (1, 0, 2, 3)),
+    # C3D20 --> hexa20: N8, N5, N6, N7, N4, N1, N2, N3, N20, N17,
+    #                   N18, N19, N12, N9, N10, N11, N16, N13, N14, N15
+    4: ("Hexa20Elem", 2, (
+        7, 4, 5, 6, 3, 0, 1, 2, 19, 16,
+        17, 18, 11, 8, 9, 10, 15, 12, 13, 14
+    )),
+    # C3D15 --> penta15: N5, N6, N4, N2, N3, N1, N14, N15, N13, N8,
+    #                    N9, N7, N11, N12, N10
+    5: ("Penta15Elem", 2, (4, 5, 3, 1, 2, 0, 13, 14, 12, 7, 8, 6, 10, 11, 9)),
+    # C3D10 --> tetra10: N2, N1, N3, N4, N5, N7, N6, N9, N8, N10
+    6: ("Tetra10Elem", 1, (1, 0, 2, 3, 4, 6, 5, 8, 7, 9)),
+    # S3 --> tria3
+    7: ("Tria3Elem", 1, (0, 1, 2)),
+    # S6 --> tria6
+    8: ("Tria6Elem", 1, (0, 1, 2, 3, 4, 5)),
+    # S4 --> quad4
+    9: ("Quad4Elem", 1, (0, 1, 2, 3)),
+    # S8 --> quad8
+    10: ("Quad8Elem", 1, (0, 1, 2, 3, 4, 5, 6, 7)),
+    # B31 --> seg2
+    11: ("Seg2Elem", 1, (0, 1)),
+    # B32 and D elements --> seg3, see read_frd_mesh_arrays() for inout nodes
+    12: ("Seg3Elem", 1, (0, 1, 2)),
+}
+
+# result block name in frd, columns of the name, result set key, value count
+# CalculiX frd stress and strain: (xx, yy, zz, xy, yz, zx)
+# FreeCAD:                        (xx, yy, zz, xy, xz, yz)
+# thus the last two entries are exchanged on reading
+FRD_RESULT_BLOCKS = (
+    (b"DISP", (5, 9), "disp", 3),
+    (b"STRESS", (5, 11), "stress", 6),
+    (b"TOSTRAIN", (5, 13), "strain", 6),
+    (b"PE", (5, 7), "peeq", 1),
+    (b"NDTEMP", (5, 11), "temp", 1),
+    (b"MAFLOW", (5, 11), "mflow", 1),
+    (b"STPRES", (5, 11), "npressure", 1),
+)
+
+
+class FrdResultBlock(object):
+    """ node numbers and values of one result block of a frd file
+
+        node_ids ... int array of length n
+        values ... float array of shape (n,) for scalar results
+        or (n, k) for vector and tensor results
+    """
+
+    __slots__ = ("node_ids", "values")
+
+    def __init__(self, node_ids, values):
+        self.node_ids = node_ids
+        self.values = values
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def to_dict(self, as_vector=False):
+        """ returns the block as {node_id: value} as read_frd_result() does
+        """
+        node_ids = self.node_ids.tolist()
+        if self.values.ndim == 1:
+            values = self.values.tolist()
+        elif as_vector:
+            values = [FreeCAD.Vector(*v) for v in self.values.tolist()]
+        else:
+            values = [tuple(v) for v in self.values.tolist()]
+        return dict(zip(node_ids, values))
+
+
+def read_inout_nodes(
+    frd_input
+):
+    """ reads the special 1DFlow nodes data file written by the ccx writer
+    """
     inout_nodes = []
     inout_nodes_file = frd_input.rsplit(".", 1)[0] + "_inout_nodes.txt"
     if os.path.exists(inout_nodes_file):
@@ -262,529 +448,346 @@ def read_frd_result(
             inout_nodes.append(a)
         f.close()
         Console.PrintMessage("{}\n".format(inout_nodes))
-    frd_file = pyopen(frd_input, "r")
-    nodes = {}
-    elements_hexa8 = {}
-    elements_penta6 = {}
-    elements_tetra4 = {}
-    elements_tetra10 = {}
-    elements_penta15 = {}
-    elements_hexa20 = {}
-    elements_tria3 = {}
-    elements_tria6 = {}
-    elements_quad4 = {}
-    elements_quad8 = {}
-    elements_seg2 = {}
-    elements_seg3 = {}
-    results = []
-    mode_results = {}
-    mode_results["number"] = float("NaN")
-    mode_results["time"] = float("NaN")
-    mode_disp = {}
-    mode_stress = {}
-    mode_strain = {}
-    mode_peeq = {}
-    mode_temp = {}
-    mode_massflow = {}
-    mode_networkpressure = {}
-
-    nodes_found = False
-    elements_found = False
+    return inout_nodes
+
+
+def read_frd_mesh_arrays(
+    frd_input,
+    inout_nodes=None
+):
+    """ reads the nodes and elements of a CalculiX frd file into NumPy arrays
+
+        returns a dict with
+        "NodeIds" ... int array (n,)
+        "NodeCoords" ... float array (n, 3)
+        and for every element key of make_femmesh() ("Tetra10Elem", ...)
+        a tuple (element ids (m,), node ids in FreeCAD order (m, k))
+        reading stops at the first result step, results are not parsed
+    """
+    import numpy as np
+
+    if inout_nodes is None:
+        inout_nodes = read_inout_nodes(frd_input)
+
+    mesh_data = {
+        "NodeIds": np.zeros(0, dtype=np.int64),
+        "NodeCoords": np.zeros((0, 3)),
+    }
+    for ele_key, row_count, node_order in FRD_ELEMENT_TYPES.values():
+        mesh_data[ele_key] = (
+            np.zeros(0, dtype=np.int64),
+            np.zeros((0, len(node_order)), dtype=np.int64)
+        )
+
+    with pyopen(frd_input, "rb") as frd_file:
+        for line in frd_file:
+            if line[4:6] == b"2C":
+                node_lines = _read_frd_block_lines(frd_file, (b" -1",))
+                node_ids, coords = _parse_frd_value_lines(node_lines, 3)
+                mesh_data["NodeIds"] = node_ids
+                mesh_data["NodeCoords"] = coords
+            elif line[4:6] == b"3C":
+                element_lines = _read_frd_block_lines(frd_file, (b" -1", b" -2"))
+                mesh_data.update(_parse_frd_element_lines(element_lines, inout_nodes))
+            elif line[4:10] == b"1PSTEP" or line[1:5] == b"9999":
+                # mesh sections are always in front of the results
+                break
+    return mesh_data
+
+
+def iter_frd_result_arrays(
+    frd_input,
+    inout_nodes=None
+):
+    """ generator, yields the result sets of a CalculiX frd file one by one
+
+        a result set is a dict with the keys "number" and "time" and
+        a FrdResultBlock for every result block found for this increment or
+        eigenmode ("disp", "stress", "strain", "peeq", "temp", "mflow",
+        "npressure"), see fill_femresult_mechanical() in importToolsFem
+        only one result set is held in memory at a time
+    """
+    if inout_nodes is None:
+        inout_nodes = read_inout_nodes(frd_input)
+
+    mode_results = {"number": float("NaN"), "time": float("NaN")}
     mode_time_found = False
-    mode_disp_found = False
-    mode_stress_found = False
-    mode_strain_found = False
-    mode_peeq_found = False
-    mode_temp_found = False
-    mode_massflow_found = False
-    mode_networkpressure_found = False
-    end_of_section_found = False
-    end_of_frd_data_found = False
-    input_continues = False
     mode_eigen_changed = False
     mode_time_changed = False
-
+    end_of_section_found = False
+    end_of_frd_data_found = False
+    node_element_section = True
     eigenmode = 0
-    eigentemp = 0
-    elem = -1
-    elemType = 0
     timestep = 0
-    timetemp = 0
-
-    for line in frd_file:
 
-        # Check if we found nodes section
-        if line[4:6] == "2C":
-            nodes_found = True
-        if nodes_found and (line[1:3] == "-1"):
-            # we found a nodes line, lets extract the node and coordinate data
-            elem = int(line[4:13])
-            nodes_x = float(line[13:25])
-            nodes_y = float(line[25:37])
-            nodes_z = float(line[37:49])
-            nodes[elem] = FreeCAD.Vector(nodes_x, nodes_y, nodes_z)
-
-        # Check if we found elements section
-        if line[4:6] == "3C":
-            elements_found = True
-        if elements_found and (line[1:3] == "-1"):
-            # we found a first element line, lets extract element number
-            elem = int(line[4:13])
-            elemType = int(line[14:18])
-        if elements_found and (line[1:3] == "-2"):
-            # we found a second element line, lets extract the elements
-            # node order fits with node order in writeAbaqus() in FemMesh.cpp
-            if elemType == 1:
-                # C3D8 CalculiX --> hexa8 FreeCAD
-                # N6, N7, N8, N5, N2, N3, N4, N1
-                nd1 = int(line[3:13])
-                nd2 = int(line[13:23])
-                nd3 = int(line[23:33])
-                nd4 = int(line[33:43])
-                nd5 = int(line[43:53])
-                nd6 = int(line[53:63])
-                nd7 = int(line[63:73])
-                nd8 = int(line[73:83])
-                elements_hexa8[elem] = (nd6, nd7, nd8, nd5, nd2, nd3, nd4, nd1)
-            elif elemType == 2:
-                # C3D6 Calculix --> penta6 FreeCAD
-                # N5, N6, N4, N2, N3, N1
-                nd1 = int(line[3:13])
-                nd2 = int(line[13:23])
-                nd3 = int(line[23:33])
-                nd4 = int(line[33:43])
-                nd5 = int(line[43:53])
-                nd6 = int(line[53:63])
-                elements_penta6[elem] = (nd5, nd6, nd4, nd2, nd3, nd1)
-            elif elemType == 3:
-                # C3D4 Calculix --> tetra4 FreeCAD
-                # N2, N1, N3, N4
-                nd1 = int(line[3:13])
-                nd2 = int(line[13:23])
-                nd3 = int(line[23:33])
-                nd4 = int(line[33:43])
-                elements_tetra4[elem] = (nd2, nd1, nd3, nd4)
-            elif elemType == 4 and input_continues is False:
-                # first line
-                # C3D20 Calculix --> hexa20 FreeCAD
-                # N6, N7, N8, N5, N2, N3, N4, N1, N14, N15
-                # N16, N13, N10, N11, N12, N9, N18, N19, N20, N17
-                nd1 = int(line[3:13])
-                nd2 = int(line[13:23])
-                nd3 = int(line[23:33])
-                nd4 = int(line[33:43])
-                nd5 = int(line[43:53])
-                nd6 = int(line[53:63])
-                nd7 = int(line[63:73])
-                nd8 = int(line[73:83])
-                nd9 = int(line[83:93])
-                nd10 = int(line[93:103])
-                input_continues = True
-            elif elemType == 4 and input_continues is True:
-                # second line
-                nd11 = int(line[3:13])
-                nd12 = int(line[13:23])
-                nd13 = int(line[23:33])
-                nd14 = int(line[33:43])
-                nd15 = int(line[43:53])
-                nd16 = int(line[53:63])
-                nd17 = int(line[63:73])
-                nd18 = int(line[73:83])
-                nd19 = int(line[83:93])
-                nd20 = int(line[93:103])
-                input_continues = False
-                """
-                CalculiX uses a different node order in
-                input file *.inp and result file *.frd for hexa20 (C3D20)
-                according to Guido (the developer of ccx):
-                see note in the first line of cgx manual part element types
-                ccx (and thus the *.inp) follows the ABAQUS convention
-                documented in the ccx-documentation
-                cgx (and thus the *.frd) follows the FAM2 convention
-                documented in the cgx-documentation
-                FAM32 is from the company FEGS limited
-                maybe this company does not exist any more
-                elements_hexa20[elem] = (
-                    nd6, nd7, nd8, nd5, nd2, nd3, nd4, nd1, nd14, nd15,
-                    nd16, nd13, nd10, nd11, nd12, nd9, nd18, nd19, nd20, nd17
-                )
-                elements_hexa20[elem] = (
-                    nd6, nd7, nd8, nd5, nd2, nd3, nd4, nd1, nd14, nd15,
-                    nd16, nd13, nd18, nd19, nd20, nd17, nd10, nd11, nd12, nd9
-                )
-                hexa20 import works with the following frd file node assignment
-                """
-                elements_hexa20[elem] = (
-                    nd8, nd5, nd6, nd7, nd4, nd1, nd2, nd3, nd20, nd17,
-                    nd18, nd19, nd12, nd9, nd10, nd11, nd16, nd13, nd14, nd15
-                )
-            elif elemType == 5 and input_continues is False:
-                # first line
-                # C3D15 Calculix --> penta15 FreeCAD
-                # N5, N6, N4, N2, N3, N1, N11, N12, N10, N8, N9, N7, N14, N15, N13
-                nd1 = int(line[3:13])
-                nd2 = int(line[13:23])
-                nd3 = int(line[23:33])
-                nd4 = int(line[33:43])
-                nd5 = int(line[43:53])
-                nd6 = int(line[53:63])
-                nd7 = int(line[63:73])
-                nd8 = int(line[73:83])
-                nd9 = int(line[83:93])
-                nd10 = int(line[93:103])
-                input_continues = True
-            elif elemType == 5 and input_continues is True:
-                # second line
-                nd11 = int(line[3:13])
-                nd12 = int(line[13:23])
-                nd13 = int(line[23:33])
-                nd14 = int(line[33:43])
-                nd15 = int(line[43:53])
-                input_continues = False
-                """
-                CalculiX uses a different node order in
-                input file *.inp and result file *.frd for penta15 (C3D15)
-                see notes at hexa20
-                elements_penta15[elem] = (
-                    nd5, nd6, nd4, nd2, nd3, nd1, nd11, nd12, nd10, nd8,
-                    nd9, nd7, nd14, nd15, nd13
-                )  # order of the *.inp file
-                """
-                elements_penta15[elem] = (
-                    nd5, nd6, nd4, nd2, nd3, nd1, nd14, nd15, nd13, nd8,
-                    nd9, nd7, nd11, nd12, nd10
-                )
-            elif elemType == 6:
-                # C3D10 Calculix --> tetra10 FreeCAD
-                # N2, N1, N3, N4, N5, N7, N6, N9, N8, N10
-                nd1 = int(line[3:13])
-                nd2 = int(line[13:23])
-                nd3 = int(line[23:33])
-                nd4 = int(line[33:43])
-                nd5 = int(line[43:53])
-                nd6 = int(line[53:63])
-                nd7 = int(line[63:73])
-                nd8 = int(line[73:83])
-                nd9 = int(line[83:93])
-                nd10 = int(line[93:103])
-                elements_tetra10[elem] = (nd2, nd1, nd3, nd4, nd5, nd7, nd6, nd9, nd8, nd10)
-            elif elemType == 7:
-                # S3 Calculix --> tria3 FreeCAD
-                # N1, N2, N3
-                nd1 = int(line[3:13])
-                nd2 = int(line[13:23])
-                nd3 = int(line[23:33])
-                elements_tria3[elem] = (nd1, nd2, nd3)
-            elif elemType == 8:
-                # S6 CalculiX --> tria6 FreeCAD
-                # N1, N2, N3, N4, N5, N6
-                nd1 = int(line[3:13])
-                nd2 = int(line[13:23])
-                nd3 = int(line[23:33])
-                nd4 = int(line[33:43])
-                nd5 = int(line[43:53])
-                nd6 = int(line[53:63])
-                elements_tria6[elem] = (nd1, nd2, nd3, nd4, nd5, nd6)
-            elif elemType == 9:
-                # S4 CalculiX --> quad4 FreeCAD
-                # N1, N2, N3, N4
-                nd1 = int(line[3:13])
-                nd2 = int(line[13:23])
-                nd3 = int(line[23:33])
-                nd4 = int(line[33:43])
-                elements_quad4[elem] = (nd1, nd2, nd3, nd4)
-            elif elemType == 10:
-                # S8 CalculiX --> quad8 FreeCAD
-                # N1, N2, N3, N4, N5, N6, N7, N8
-                nd1 = int(line[3:13])
-                nd2 = int(line[13:23])
-                nd3 = int(line[23:33])
-                nd4 = int(line[33:43])
-                nd5 = int(line[43:53])
-                nd6 = int(line[53:63])
-                nd7 = int(line[63:73])
-                nd8 = int(line[73:83])
-                elements_quad8[elem] = (nd1, nd2, nd3, nd4, nd5, nd6, nd7, nd8)
-            elif elemType == 11:
-                # B31 CalculiX --> seg2 FreeCAD
-                # N1, N2
-                nd1 = int(line[3:13])
-                nd2 = int(line[13:23])
-                elements_seg2[elem] = (nd1, nd2)
-            elif elemType == 12:
-                # B32 CalculiX --> seg3 FreeCAD
-                # Also D element element number
-                # CalculiX uses a different node order in
-                # input file *.inp and result file *.frd for seg3 (B32)
-                # see notes at hexa20
-                # N1, N2 ,N3
-                nd1 = int(line[3:13])
-                nd2 = int(line[13:23])
-                nd3 = int(line[23:33])
-                if inout_nodes:
-                    for i in range(len(inout_nodes)):
-                        if nd1 == int(inout_nodes[i][1]):
-                            # fluid inlet node numbering
-                            elements_seg3[elem] = (int(inout_nodes[i][2]), nd3, nd1)
-                        elif nd3 == int(inout_nodes[i][1]):
-                            # fluid outlet node numbering
-                            elements_seg3[elem] = (nd1, int(inout_nodes[i][2]), nd3)
-                else:
-                    # normal node numbering for D, B32 elements
-                    elements_seg3[elem] = (nd1, nd2, nd3)
-
-        # Check if we found new eigenmode line
-        if line[5:10] == "PMODE":
-            eigentemp = int(line[30:36])
-            if eigentemp > eigenmode:
-                eigenmode = eigentemp
-                mode_eigen_changed = True
-
-        # Check if we found new time step
-        if line[4:10] == "1PSTEP":
-            mode_time_found = True
-        if mode_time_found and (line[2:7] == "100CL"):
-            # we found the new time step line
-            # !!! be careful here, there is timetemp and timestep!
-            # TODO: use more differ names
-            timetemp = float(line[13:25])
-            if timetemp > timestep:
-                timestep = timetemp
-                mode_time_changed = True
-
-        # Check if we found displacement section
-        if line[5:9] == "DISP":
-            mode_disp_found = True
-        if mode_disp_found and (line[1:3] == "-1"):
-            # we found a displacement line
-            elem = int(line[4:13])
-            mode_disp_x = float(line[13:25])
-            mode_disp_y = float(line[25:37])
-            mode_disp_z = float(line[37:49])
-            mode_disp[elem] = FreeCAD.Vector(mode_disp_x, mode_disp_y, mode_disp_z)
-
-        # Check if we found stress section
-        if line[5:11] == "STRESS":
-            mode_stress_found = True
-        if mode_stress_found and (line[1:3] == "-1"):
-            # we found a stress line
-            elem = int(line[4:13])
-            stress_1 = float(line[13:25])
-            stress_2 = float(line[25:37])
-            stress_3 = float(line[37:49])
-            stress_4 = float(line[49:61])
-            stress_5 = float(line[61:73])
-            stress_6 = float(line[73:85])
-            # CalculiX frd files: (Sxx, Syy, Szz, Sxy, Syz, Szx)
-            # FreeCAD:            (Sxx, Syy, Szz, Sxy, Sxz, Syz)
-            # thus exchange the last two entries
-            mode_stress[elem] = (stress_1, stress_2, stress_3, stress_4, stress_6, stress_5)
-
-        # Check if we found strain section
-        if line[5:13] == "TOSTRAIN":
-            mode_strain_found = True
-        if mode_strain_found and (line[1:3] == "-1"):
-            # we found a strain line in the frd file
-            elem = int(line[4:13])
-            strain_1 = float(line[13:25])
-            strain_2 = float(line[25:37])
-            strain_3 = float(line[37:49])
-            strain_4 = float(line[49:61])
-            strain_5 = float(line[61:73])
-            strain_6 = float(line[73:85])
-            # CalculiX frd files: (Exx, Eyy, Ezz, Exy, Eyz, Ezx)
-            # FreeCAD:            (Exx, Eyy, Ezz, Exy, Exz, Eyz)
-            # thus exchange the last two entries
-            mode_strain[elem] = (strain_1, strain_2, strain_3, strain_4, strain_6, strain_5)
-
-        # Check if we found an equivalent plastic strain section
-        if line[5:7] == "PE":
-            mode_peeq_found = True
-        if mode_peeq_found and (line[1:3] == "-1"):
-            # we found an equivalent plastic strain line
-            elem = int(line[4:13])
-            peeq = float(line[13:25])
-            mode_peeq[elem] = (peeq)
-
-        # Check if we found a temperature section
-        if line[5:11] == "NDTEMP":
-            mode_temp_found = True
-        if mode_temp_found and (line[1:3] == "-1"):
-            # we found a temperature line
-            elem = int(line[4:13])
-            temperature = float(line[13:25])
-            mode_temp[elem] = (temperature)
-
-        # Check if we found a mass flow section
-        if line[5:11] == "MAFLOW":
-            mode_massflow_found = True
-        if mode_massflow_found and (line[1:3] == "-1"):
-            # we found a mass flow line
-            elem = int(line[4:13])
-            massflow = float(line[13:25])
-            mode_massflow[elem] = (massflow * 1000)  # convert units to kg/s from t/s
-            if inout_nodes:
-                for i in range(len(inout_nodes)):
-                    if elem == int(inout_nodes[i][1]):
-                        node = int(inout_nodes[i][2])
-                        # convert units to kg/s from t/s
-                        mode_massflow[node] = (massflow * 1000)
-
-        # Check if we found a network pressure section
-        if line[5:11] == "STPRES":
-            mode_networkpressure_found = True
-        if mode_networkpressure_found and (line[1:3] == "-1"):
-            # we found a network pressure line
-            elem = int(line[4:13])
-            networkpressure = float(line[13:25])
-            mode_networkpressure[elem] = (networkpressure)
-            if inout_nodes:
-                for i in range(len(inout_nodes)):
-                    if elem == int(inout_nodes[i][1]):
-                        node = int(inout_nodes[i][2])
-                        mode_networkpressure[node] = (networkpressure)
-
-        # Check if we found the end of a section
-        if line[1:3] == "-3":
-            end_of_section_found = True
-
-            if nodes_found:
-                nodes_found = False
-                node_element_section = True
+    with pyopen(frd_input, "rb") as frd_file:
+        for line in frd_file:
 
-            if elements_found:
-                elements_found = False
+            # nodes and elements are read by read_frd_mesh_arrays()
+            if line[4:6] == b"2C" or line[4:6] == b"3C":
+                _read_frd_block_lines(frd_file, ())
+                end_of_section_found = True
                 node_element_section = True
+                continue
+
+            for block_name, (start, end), result_key, value_count in FRD_RESULT_BLOCKS:
+                if line[start:end] == block_name:
+                    block_lines = _read_frd_block_lines(frd_file, (b" -1",))
+                    node_ids, values = _parse_frd_value_lines(block_lines, value_count)
+                    if value_count == 6:
+                        values = values[:, (0, 1, 2, 3, 5, 4)]
+                    elif value_count == 1:
+                        values = values[:, 0]
+                    if result_key == "mflow":
+                        # convert units to kg/s from t/s
+                        values = values * 1000
+                    if inout_nodes and result_key in ("mflow", "npressure"):
+                        node_ids, values = _add_frd_inout_node_values(
+                            node_ids,
+                            values,
+                            inout_nodes
+                        )
+                    mode_results[result_key] = FrdResultBlock(node_ids, values)
+                    end_of_section_found = True
+                    node_element_section = False
+                    break
+            else:
+                # Check if we found the end of a section we do not read
+                if line[1:3] == b"-3":
+                    end_of_section_found = True
+
+                # Check if we found new eigenmode line
+                if line[5:10] == b"PMODE":
+                    eigentemp = int(line[30:36])
+                    if eigentemp > eigenmode:
+                        eigenmode = eigentemp
+                        mode_eigen_changed = True
+
+                # Check if we found new time step
+                if line[4:10] == b"1PSTEP":
+                    mode_time_found = True
+                if mode_time_found and (line[2:7] == b"100CL"):
+                    timetemp = float(line[13:25])
+                    if timetemp > timestep:
+                        timestep = timetemp
+                        mode_time_changed = True
+
+                # Check if we found the end of frd data
+                if line[1:5] == b"9999":
+                    end_of_frd_data_found = True
+
+            if (mode_eigen_changed or mode_time_changed or end_of_frd_data_found) \
+                    and end_of_section_found \
+                    and not node_element_section:
+                # hand over mode_results and start a new one
+                # https://forum.freecadweb.org/viewtopic.php?f=18&t=32649&start=10#p274686
+                yield mode_results
+                mode_results = {"number": float("NaN"), "time": float("NaN")}
+                end_of_section_found = False
+
+            # on changed --> write changed values in mode_result
+            # will be the first to do on an empty mode_result
+            if mode_eigen_changed:
+                mode_results["number"] = eigenmode
+                mode_eigen_changed = False
+
+            if mode_time_changed:
+                mode_results["time"] = timestep
+                mode_time_found = False
+                mode_time_changed = False
+
+
+def frd_mesh_arrays_to_dict(
+    mesh_arrays
+):
+    """ converts the output of read_frd_mesh_arrays() into
+        the FEM mesh data dict used by make_femmesh()
+    """
+    mesh_data = {
+        "Nodes": {
+            node_id: FreeCAD.Vector(*coords)
+            for node_id, coords in zip(
+                mesh_arrays["NodeIds"].tolist(),
+                mesh_arrays["NodeCoords"].tolist()
+            )
+        }
+    }
+    for ele_key, row_count, node_order in FRD_ELEMENT_TYPES.values():
+        ele_ids, ele_nodes = mesh_arrays[ele_key]
+        mesh_data[ele_key] = dict(zip(
+            ele_ids.tolist(),
+            [tuple(nodes) for nodes in ele_nodes.tolist()]
+        ))
+    return mesh_data
 
-            if mode_disp_found:
-                mode_results["disp"] = mode_disp
-                mode_disp = {}
-                mode_disp_found = False
-                node_element_section = False
-
-            if mode_stress_found:
-                mode_results["stress"] = mode_stress
-                mode_stress = {}
-                mode_stress_found = False
-                node_element_section = False
-
-            if mode_strain_found:
-                mode_results["strain"] = mode_strain
-
-                mode_strain = {}
-                mode_strain_found = False
-                node_element_section = False
-
-            if mode_peeq_found:
-                mode_results["peeq"] = mode_peeq
-                mode_peeq = {}
-                mode_peeq_found = False
-                node_element_section = False
-
-            if mode_temp_found:
-                mode_results["temp"] = mode_temp
-                mode_temp = {}
-                mode_temp_found = False
-                node_element_section = False
-
-            if mode_massflow_found:
-                mode_results["mflow"] = mode_massflow
-                mode_massflow = {}
-                mode_massflow_found = False
-                node_element_section = False
-
-            if mode_networkpressure_found:
-                mode_results["npressure"] = mode_networkpressure
-                mode_networkpressure_found = False
-                mode_networkpressure = {}
-                node_element_section = False
-
-            """
-            print("---- End of Section --> Mode_Results may be changed ----")
-            for key in sorted(mode_results.keys()):
-                if key is "number" or key is "time":
-                    print(key + " --> " + str(mode_results[key]))
-                else:
-                    print(key + " --> " + str(len(mode_results[key])))
-            print("----Mode_Results----\n")
-            """
-
-        # Check if we found the end of frd data
-        if line[1:5] == "9999":
-            end_of_frd_data_found = True
-
-        if (mode_eigen_changed or mode_time_changed or end_of_frd_data_found) \
-                and end_of_section_found \
-                and not node_element_section:
-
-            """
-            print("\n\n----Append mode_results to results")
-            print(line)
-            for key in sorted(mode_results.keys()):
-                if key is "number" or key is "time":
-                    print(key + " --> " + str(mode_results[key]))
-                else:
-                    print(key + " --> " + str(len(mode_results[key])))
-            print("----Append Mode_Results----\n")
-            """
-
-            # append mode_results to results and reset mode_result
-            results.append(mode_results)
-            mode_results = {}
-            # https://forum.freecadweb.org/viewtopic.php?f=18&t=32649&start=10#p274686
-            mode_results["number"] = float("NaN")
-            mode_results["time"] = float("NaN")
-            end_of_section_found = False
-
-        # on changed --> write changed values in mode_result
-        # will be the first to do on an empty mode_result
-        if mode_eigen_changed:
-            mode_results["number"] = eigenmode
-            mode_eigen_changed = False
-
-        if mode_time_changed:
-            mode_results["time"] = timestep
-            # mode_results["time"] = 0  # Don't return time if static  # Why?
-            mode_time_found = False
-            mode_time_changed = False
-
-        # here we are in the indent of loop for every line in frd file
-        # do not add a print here :-)
-
-    # close frd file if loop over all lines is finished
-    frd_file.close()
 
+def frd_result_set_to_dict(
+    result_set
+):
+    """ converts a result set of iter_frd_result_arrays() into
+        the dict of dict result set read_frd_result() returns
     """
-    # debug prints and checks with the read data
-    print("\n\n----RESULTS values begin----")
-    print(len(results))
-    # print("\n")
-    # print(results)
-    print("----RESULTS values end----\n\n")
-    """
+    result_dict = {}
+    for key, value in result_set.items():
+        if isinstance(value, FrdResultBlock):
+            result_dict[key] = value.to_dict(as_vector=(key == "disp"))
+        else:
+            result_dict[key] = value
+    return result_dict
 
-    if not inout_nodes:
-        if results:
-            if "mflow" in results[0] or "npressure" in results[0]:
-                Console.PrintError(
-                    "We have mflow or npressure, but no inout_nodes file.\n"
-                )
-    if not nodes:
-        Console.PrintError("FEM: No nodes found in Frd file.\n")
 
-    return {
-        "Nodes": nodes,
-        "Seg2Elem": elements_seg2,
-        "Seg3Elem": elements_seg3,
-        "Tria3Elem": elements_tria3,
-        "Tria6Elem": elements_tria6,
-        "Quad4Elem": elements_quad4,
-        "Quad8Elem": elements_quad8,
-        "Tetra4Elem": elements_tetra4,
-        "Tetra10Elem": elements_tetra10,
-        "Hexa8Elem": elements_hexa8,
-        "Hexa20Elem": elements_hexa20,
-        "Penta6Elem": elements_penta6,
-        "Penta15Elem": elements_penta15,
-        "Results": results
-    }
+def _read_frd_block_lines(
+    frd_file,
+    prefixes
+):
+    # returns all lines of a block starting with one of the prefixes
+    # the block is consumed up to and including its end line " -3"
+    block_lines = []
+    for line in frd_file:
+        if line[1:3] == b"-3":
+            break
+        if line[:3] in prefixes:
+            block_lines.append(line)
+    return block_lines
+
+
+def _frd_lines_to_chars(
+    lines,
+    width
+):
+    # all lines as a (len(lines), width) character array, short lines are padded
+    import numpy as np
+    buffer = b"".join(line.rstrip(b"\r\n")[:width].ljust(width) for line in lines)
+    return np.frombuffer(buffer, dtype="S1").reshape(len(lines), width)
+
+
+def _parse_frd_ints(
+    chars
+):
+    # right aligned non negative integers from a fixed width character array
+    # every non digit character (blanks) counts as 0
+    import numpy as np
+    digits = np.ascontiguousarray(chars).view(np.uint8).astype(np.int64) - 48
+    digits[(digits < 0) | (digits > 9)] = 0
+    return digits.dot(10 ** np.arange(chars.shape[-1] - 1, -1, -1, dtype=np.int64))
+
+
+def _parse_frd_value_lines(
+    lines,
+    value_count
+):
+    # node ids and float values of the " -1" lines of a node or result block
+    import numpy as np
+    if not lines:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, value_count))
+    width = FRD_VALUE_START + FRD_VALUE_WIDTH * value_count
+    chars = _frd_lines_to_chars(lines, width)
+    node_ids = _parse_frd_ints(chars[:, FRD_ID_COLUMNS[0]:FRD_ID_COLUMNS[1]])
+    values = np.ascontiguousarray(chars[:, FRD_VALUE_START:]).view(
+        "S{}".format(FRD_VALUE_WIDTH)
+    ).astype(np.float64)
+    return node_ids, values
+
+
+def _parse_frd_element_lines(
+    lines,
+    inout_nodes
+):
+    # every element has one " -1" line with element id and type
+    # followed by one or two " -2" lines with up to 10 node ids each
+    import numpy as np
+    head_lines = []
+    node_lines = []
+    node_line_owner = []
+    for line in lines:
+        if line[:3] == b" -1":
+            head_lines.append(line)
+        elif head_lines:
+            node_lines.append(line)
+            node_line_owner.append(len(head_lines) - 1)
+
+    elements = {}
+    if not head_lines or not node_lines:
+        return elements
+
+    head_chars = _frd_lines_to_chars(head_lines, 18)
+    ele_ids = _parse_frd_ints(head_chars[:, 4:13])
+    ele_types = _parse_frd_ints(head_chars[:, 14:18])
+
+    node_chars = _frd_lines_to_chars(node_lines, 103)
+    node_rows = _parse_frd_ints(node_chars[:, 3:103].reshape(len(node_lines), 10, 10))
+
+    node_line_owner = np.array(node_line_owner, dtype=np.int64)
+    ele_range = np.arange(len(head_lines))
+    first_row = np.searchsorted(node_line_owner, ele_range)
+    row_count = np.bincount(node_line_owner, minlength=len(head_lines))
+
+    for ele_type, (ele_key, needed_rows, node_order) in FRD_ELEMENT_TYPES.items():
+        selected = (ele_types == ele_type) & (row_count >= needed_rows)
+        if not selected.any():
+            continue
+        rows = first_row[selected]
+        frd_nodes = node_rows[rows]
+        if needed_rows == 2:
+            frd_nodes = np.hstack((frd_nodes, node_rows[rows + 1]))
+        ids = ele_ids[selected]
+        ele_nodes = frd_nodes[:, node_order]
+        if ele_type == 12 and inout_nodes:
+            ids, ele_nodes = _apply_frd_inout_nodes_seg3(ids, ele_nodes, inout_nodes)
+        elements[ele_key] = (ids, ele_nodes)
+    return elements
+
+
+def _apply_frd_inout_nodes_seg3(
+    ele_ids,
+    ele_nodes,
+    inout_nodes
+):
+    # fluid inlet and outlet node numbering of D elements
+    # seg3 elements without inlet or outlet node are not returned
+    import numpy as np
+    nd1 = ele_nodes[:, 0]
+    nd3 = ele_nodes[:, 2]
+    new_nodes = ele_nodes.copy()
+    keep = np.zeros(len(ele_ids), dtype=bool)
+    for inout in inout_nodes:
+        inout_node = int(inout[1])
+        extra_node = int(inout[2])
+        inlet = nd1 == inout_node
+        outlet = ~inlet & (nd3 == inout_node)
+        # fluid inlet node numbering
+        new_nodes[inlet, 0] = extra_node
+        new_nodes[inlet, 1] = nd3[inlet]
+        new_nodes[inlet, 2] = nd1[inlet]
+        # fluid outlet node numbering
+        new_nodes[outlet, 0] = nd1[outlet]
+        new_nodes[outlet, 1] = extra_node
+        new_nodes[outlet, 2] = nd3[outlet]
+        keep |= inlet | outlet
+    return ele_ids[keep], new_nodes[keep]
+
+
+def _add_frd_inout_node_values(
+    node_ids,
+    values,
+    inout_nodes
+):
+    # the extra inout node gets the value of its inout node
+    # the node order is the same as inserting the values one by one into a dict
+    import numpy as np
+    all_ids = [node_ids]
+    all_values = [values]
+    all_positions = [2 * np.arange(len(node_ids))]
+    for inout in inout_nodes:
+        rows = np.nonzero(node_ids == int(inout[1]))[0]
+        all_ids.append(np.full(len(rows), int(inout[2]), dtype=np.int64))
+        all_values.append(values[rows])
+        all_positions.append(2 * rows + 1)
+    order = np.argsort(np.concatenate(all_positions), kind="stable")
+    all_ids = np.concatenate(all_ids)[order]
+    all_values = np.concatenate(all_values)[order]
+    # first position of a node id, last value of a node id
+    unique_ids, first_index = np.unique(all_ids, return_index=True)
+    last_index = len(all_ids) - 1 - np.unique(all_ids[::-1], return_index=True)[1]
+    keep_order = np.argsort(first_index)
+    return unique_ids[keep_order], all_values[last_index[keep_order]]
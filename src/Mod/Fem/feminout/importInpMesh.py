@@ -67,6 +67,21 @@ def read(filename):
     """read a FemMesh from a inp mesh file and return the FemMesh
     """
     # no document object is created, just the FemMesh is returned
+    from femmesh import meshcache
+    if meshcache.is_mesh_cache_enabled():
+        # the file is read once for the cache key and the include check
+        file_hash = meshcache.new_file_hash(meshcache.get_reader_name(read_inp))
+        include = False
+        with pyopen(filename, "rb") as f:
+            for line in f:
+                file_hash.update(line)
+                if line[:8].upper() == b"*INCLUDE":
+                    include = True
+        # included files are not part of the cache key
+        if not include:
+            return meshcache.make_femmesh(
+                meshcache.read_cached(filename, read_inp, key=file_hash.hexdigest())
+            )
     mesh_data = read_inp(filename)
     from . import importToolsFem
     return importToolsFem.make_femmesh(mesh_data)
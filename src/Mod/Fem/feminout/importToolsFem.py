@@ -245,6 +245,153 @@ def make_femmesh(
     return mesh
 
 
+# element key of make_femmesh() --> (node count, FemMesh element dimension)
+# in the order make_femmesh() adds the elements to the mesh
+FEM_ELEMENT_TYPES = {
+    "Hexa8Elem": (8, "Volume"),
+    "Penta6Elem": (6, "Volume"),
+    "Tetra4Elem": (4, "Volume"),
+    "Tetra10Elem": (10, "Volume"),
+    "Penta15Elem": (15, "Volume"),
+    "Hexa20Elem": (20, "Volume"),
+    "Tria3Elem": (3, "Face"),
+    "Tria6Elem": (6, "Face"),
+    "Quad4Elem": (4, "Face"),
+    "Quad8Elem": (8, "Face"),
+    "Seg2Elem": (2, "Edge"),
+    "Seg3Elem": (3, "Edge"),
+}
+
+
+def make_femmesh_from_arrays(
+    mesh_arrays
+):
+    """ makes an FreeCAD FEM Mesh object from FEM mesh arrays
+
+        mesh_arrays is a dict with
+        "NodeIds" ... int array (n,)
+        "NodeCoords" ... float array (n, 3)
+        and for the element keys of make_femmesh() ("Tetra10Elem", ...)
+        a tuple (element ids (m,), element node ids (m, k)),
+        element keys which are not in the dict have no elements
+
+        the arrays are checked as a whole before the mesh is filled
+        by the bulk FemMesh methods addNodes() and addElements(),
+        a ValueError is raised for invalid mesh arrays
+    """
+    import Fem
+    mesh = Fem.FemMesh()
+    node_ids, node_coords, elements = check_mesh_arrays(mesh_arrays)
+    if len(node_ids) == 0:
+        Console.PrintError("No Nodes found!\n")
+        return mesh
+    if not elements:
+        Console.PrintError("No Elements found!\n")
+        return mesh
+
+    # the nodes and the elements of every element type are added in one call each,
+    # the FemMesh reads the arrays as contiguous int32 and float64 buffers
+    import numpy as np
+    mesh.addNodes(
+        np.ascontiguousarray(node_ids, dtype=np.int32),
+        np.ascontiguousarray(node_coords, dtype=np.float64)
+    )
+    for ele_key, (ele_ids, ele_nodes) in elements.items():
+        mesh.addElements(
+            FEM_ELEMENT_TYPES[ele_key][1],
+            np.ascontiguousarray(ele_ids, dtype=np.int32),
+            np.ascontiguousarray(ele_nodes, dtype=np.int32)
+        )
+    Console.PrintLog(
+        "imported mesh: {} nodes, {}\n"
+        .format(
+            len(node_ids),
+            ", ".join(
+                "{} {}".format(len(ele_ids), ele_key[:-4].upper())
+                for ele_key, (ele_ids, ele_nodes) in elements.items()
+            )
+        )
+    )
+    return mesh
+
+
+def check_mesh_arrays(
+    mesh_arrays
+):
+    """ checks FEM mesh arrays for make_femmesh_from_arrays()
+
+        returns the node ids, the node coordinates and a dict
+        {element key: (element ids, element node ids)} of the element keys
+        with elements in the order of FEM_ELEMENT_TYPES
+        raises a ValueError for unknown element keys, wrong array shapes,
+        not finite coordinates, duplicate ids, ids which do not fit into
+        32 bit integers or element nodes which are not in the node ids
+    """
+    import numpy as np
+
+    unknown_keys = set(
+        k for k in mesh_arrays if k.endswith("Elem") and k not in FEM_ELEMENT_TYPES
+    )
+    if unknown_keys:
+        raise ValueError("Unknown element types: {}".format(sorted(unknown_keys)))
+
+    node_ids = np.asarray(mesh_arrays.get("NodeIds", ()), dtype=np.int64).ravel()
+    node_coords = np.asarray(mesh_arrays.get("NodeCoords", ()), dtype=np.float64)
+    if node_coords.size == 0:
+        node_coords = node_coords.reshape(0, 3)
+    if node_coords.shape != (len(node_ids), 3):
+        raise ValueError(
+            "Node coordinates of shape {} do not fit to {} node ids."
+            .format(node_coords.shape, len(node_ids))
+        )
+    if not np.isfinite(node_coords).all():
+        raise ValueError("Node coordinates are not finite.")
+    sorted_node_ids = np.sort(node_ids)
+    if len(sorted_node_ids) > 1 and (np.diff(sorted_node_ids) == 0).any():
+        raise ValueError("Node ids are not unique.")
+    if len(sorted_node_ids) > 0 and sorted_node_ids[0] < 1:
+        raise ValueError("Node ids have to be positive.")
+    if len(sorted_node_ids) > 0 and sorted_node_ids[-1] > np.iinfo(np.int32).max:
+        raise ValueError("Node ids have to fit into 32 bit integers.")
+
+    elements = {}
+    for ele_key, (node_count, dimension) in FEM_ELEMENT_TYPES.items():
+        if ele_key not in mesh_arrays:
+            continue
+        ele_ids, ele_nodes = mesh_arrays[ele_key]
+        ele_ids = np.asarray(ele_ids, dtype=np.int64).ravel()
+        if len(ele_ids) == 0:
+            continue
+        ele_nodes = np.asarray(ele_nodes, dtype=np.int64)
+        if ele_nodes.shape != (len(ele_ids), node_count):
+            raise ValueError(
+                "{} connectivity of shape {} does not fit to {} elements with {} nodes."
+                .format(ele_key, ele_nodes.shape, len(ele_ids), node_count)
+            )
+        if len(sorted_node_ids) == 0:
+            raise ValueError("{} elements, but no nodes.".format(ele_key))
+        # every element node has to be one of the node ids
+        positions = np.searchsorted(sorted_node_ids, ele_nodes.ravel())
+        positions[positions == len(sorted_node_ids)] = 0
+        missing = sorted_node_ids[positions] != ele_nodes.ravel()
+        if missing.any():
+            raise ValueError(
+                "{} elements use nodes which are not in the node ids: {}"
+                .format(ele_key, np.unique(ele_nodes.ravel()[missing])[:10].tolist())
+            )
+        elements[ele_key] = (ele_ids, ele_nodes)
+
+    if elements:
+        all_ele_ids = np.sort(np.concatenate([e[0] for e in elements.values()]))
+        if len(all_ele_ids) > 1 and (np.diff(all_ele_ids) == 0).any():
+            raise ValueError("Element ids are not unique.")
+        if all_ele_ids[0] < 1:
+            raise ValueError("Element ids have to be positive.")
+        if all_ele_ids[-1] > np.iinfo(np.int32).max:
+            raise ValueError("Element ids have to fit into 32 bit integers.")
+    return node_ids, node_coords, elements
+
+
 def make_dict_from_femmesh(
     femmesh
 ):
@@ -340,6 +487,9 @@ def fill_femresult_mechanical(
     result_set
 ):
     """ fills a FreeCAD FEM mechanical result object with result data
+        the result data of a result set is either a dict {node: value}
+        or an array block with node_ids and values, see FrdResultBlock in
+        importCcxFrdResults, the arrays are set without intermediate dicts
     """
     if "number" in result_set:
         eigenmode_number = result_set["number"]
@@ -355,29 +505,16 @@ def fill_femresult_mechanical(
     # furthermore the eigenmode number
     if "disp" in result_set:
         disp = result_set["disp"]
-        res_obj.DisplacementVectors = list(map((lambda x: x), disp.values()))
-        res_obj.NodeNumbers = list(disp.keys())
+        res_obj.DisplacementVectors = get_result_values(disp)
+        res_obj.NodeNumbers = get_result_node_ids(disp)
 
         # fill res_obj.NodeStressXX etc if they exist in result_set
         # list values are just added
         # Should we check if the key in stress and strain dict
         # is the same as the number in NodeNumbers?
         if "stress" in result_set:
-            stress = result_set["stress"]
-            Sxx = []
-            Syy = []
-            Szz = []
-            Sxy = []
-            Sxz = []
-            Syz = []
-            # values_S .. stress_tensor .. (Sxx, Syy, Szz, Sxy, Sxz, Syz)
-            for i, values_S in enumerate(stress.values()):
-                Sxx.append(values_S[0])
-                Syy.append(values_S[1])
-                Szz.append(values_S[2])
-                Sxy.append(values_S[3])
-                Sxz.append(values_S[4])
-                Syz.append(values_S[5])
+            # stress_tensor .. (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+            Sxx, Syy, Szz, Sxy, Sxz, Syz = get_result_columns(result_set["stress"], 6)
             res_obj.NodeStressXX = Sxx
             res_obj.NodeStressYY = Syy
             res_obj.NodeStressZZ = Szz
@@ -387,21 +524,8 @@ def fill_femresult_mechanical(
 
         # fill res_obj.NodeStrainXX etc if they exist in result_set
         if "strain" in result_set:
-            strain = result_set["strain"]
-            Exx = []
-            Eyy = []
-            Ezz = []
-            Exy = []
-            Exz = []
-            Eyz = []
-            # values_E .. straintuple .. (Exx, Eyy, Ezz, Exy, Exz, Eyz)
-            for i, values_E in enumerate(strain.values()):
-                Exx.append(values_E[0])
-                Eyy.append(values_E[1])
-                Ezz.append(values_E[2])
-                Exy.append(values_E[3])
-                Exz.append(values_E[4])
-                Eyz.append(values_E[5])
+            # straintuple .. (Exx, Eyy, Ezz, Exy, Exz, Eyz)
+            Exx, Eyy, Ezz, Exy, Exz, Eyz = get_result_columns(result_set["strain"], 6)
             res_obj.NodeStrainXX = Exx
             res_obj.NodeStrainYY = Eyy
             res_obj.NodeStrainZZ = Ezz
@@ -413,18 +537,12 @@ def fill_femresult_mechanical(
         if "peeq" in result_set:
             Peeq = result_set["peeq"]
             if len(Peeq) > 0:
-                if len(Peeq.values()) != len(disp.values()):
+                if len(Peeq) != len(disp):
                     # how is this possible? An example is needed!
                     Console.PrintError("PEEQ seams to have exptra nodes.\n")
-                    Pe = []
-                    Pe_extra_nodes = list(Peeq.values())
-                    nodes = len(disp.values())
-                    for i in range(nodes):
-                        Pe_value = Pe_extra_nodes[i]
-                        Pe.append(Pe_value)
-                    res_obj.Peeq = Pe
+                    res_obj.Peeq = get_result_values(Peeq)[:len(disp)]
                 else:
-                    res_obj.Peeq = list(Peeq.values())
+                    res_obj.Peeq = get_result_values(Peeq)
 
         # fill eigenmode number if they exist
         if eigenmode_number > 0:
@@ -437,34 +555,65 @@ def fill_femresult_mechanical(
         if "temp" in result_set:
             Temperature = result_set["temp"]
             if len(Temperature) > 0:
-                if len(Temperature.values()) != len(disp.values()):
-                    Temp = []
-                    Temp_extra_nodes = list(Temperature.values())
-                    nodes = len(disp.values())
-                    for i in range(nodes):
-                        # how is this possible? An example is needed!
-                        Console.PrintError("Temperature seams to have exptra nodes.\n")
-                        Temp_value = Temp_extra_nodes[i]
-                        Temp.append(Temp_value)
-                    res_obj.Temperature = list(map((lambda x: x), Temp))
+                if len(Temperature) != len(disp):
+                    # how is this possible? An example is needed!
+                    Console.PrintError("Temperature seams to have exptra nodes.\n")
+                    res_obj.Temperature = get_result_values(Temperature)[:len(disp)]
                 else:
-                    res_obj.Temperature = list(map((lambda x: x), Temperature.values()))
+                    res_obj.Temperature = get_result_values(Temperature)
                 res_obj.Time = step_time
 
     # fill res_obj.MassFlow
     if "mflow" in result_set:
         MassFlow = result_set["mflow"]
         if len(MassFlow) > 0:
-            res_obj.MassFlowRate = list(map((lambda x: x), MassFlow.values()))
+            res_obj.MassFlowRate = get_result_values(MassFlow)
             res_obj.Time = step_time
             # disp does not exist, res_obj.NodeNumbers needs to be set
-            res_obj.NodeNumbers = list(MassFlow.keys())
+            res_obj.NodeNumbers = get_result_node_ids(MassFlow)
 
     # fill res_obj.NetworkPressure, disp does not exist, see MassFlow
     if "npressure" in result_set:
         NetworkPressure = result_set["npressure"]
         if len(NetworkPressure) > 0:
-            res_obj.NetworkPressure = list(map((lambda x: x), NetworkPressure.values()))
+            res_obj.NetworkPressure = get_result_values(NetworkPressure)
             res_obj.Time = step_time
 
     return res_obj
+
+
+def get_result_node_ids(
+    result_data
+):
+    """ node numbers of result data, a dict {node: value} or an array block
+    """
+    if isinstance(result_data, dict):
+        return list(result_data.keys())
+    return result_data.node_ids.tolist()
+
+
+def get_result_values(
+    result_data
+):
+    """ values of result data, a dict {node: value} or an array block
+        vector values of an array block are returned as tuples
+    """
+    if isinstance(result_data, dict):
+        return list(result_data.values())
+    if result_data.values.ndim == 1:
+        return result_data.values.tolist()
+    return [tuple(v) for v in result_data.values.tolist()]
+
+
+def get_result_columns(
+    result_data,
+    column_count
+):
+    """ values of tensor result data as one list per tensor component
+    """
+    if isinstance(result_data, dict):
+        columns = [list(c) for c in zip(*result_data.values())]
+        if not columns:
+            columns = [[] for i in range(column_count)]
+        return columns
+    return [result_data.values[:, i].tolist() for i in range(column_count)]
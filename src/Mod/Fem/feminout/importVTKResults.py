@@ -91,6 +91,8 @@ def export(
         )
         return
     elif obj.isDerivedFrom("Fem::FemResultObject"):
+        from femresult import resulttools
+        resulttools.fill_lazy_results(obj)
         Fem.writeResult(filename, obj)
     else:
         Console.PrintError(
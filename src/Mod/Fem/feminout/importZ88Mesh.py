@@ -143,6 +143,10 @@ def read(
     """
     # no document object is created, just the FemMesh is returned
 
+    from femmesh import meshcache
+    if meshcache.is_mesh_cache_enabled():
+        return meshcache.make_femmesh(meshcache.read_cached(filename, read_z88_mesh))
+
     mesh_data = read_z88_mesh(filename)
     from . import importToolsFem
 
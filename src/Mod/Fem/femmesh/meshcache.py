@@ -0,0 +1,405 @@
+# ***************************************************************************
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "Binary cache for finite element meshes"
+__author__ = "FreeCAD developers"
+__url__ = "https://www.freecadweb.org"
+
+## \addtogroup FEM
+#  @{
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+import FreeCAD
+
+from feminout import importToolsFem
+
+
+# a cached mesh is a directory named by the hash of the mesh source file
+# mesh.json ... header with version, element keys and group names and types
+# NodeIds.npy, NodeCoords.npy ... node ids (n,) and node coordinates (n, 3)
+# <ElementKey>_ids.npy, <ElementKey>_nodes.npy ... element ids (m,) and
+#     element node ids (m, k) for every element key of make_femmesh()
+# group_elements.npy, group_offsets.npy ... element ids of all groups and
+#     the start of every group in there
+# the arrays are memory mapped on reading
+#
+# the mesh arrays dict has the same layout as the one returned by
+# importCcxFrdResults.read_frd_mesh_arrays() plus a "Groups" list of
+# tuples (group name, group element type, element ids)
+MESH_CACHE_VERSION = 1
+MESH_CACHE_HEADER = "mesh.json"
+
+# element key of make_femmesh() --> (node count, FemMesh element dimension)
+ELEMENT_TYPES = importToolsFem.FEM_ELEMENT_TYPES
+
+
+# ************************************************************************************************
+def is_mesh_cache_enabled():
+    return FreeCAD.ParamGet(
+        "User parameter:BaseApp/Preferences/Mod/Fem/General"
+    ).GetBool("MeshCache", True) and get_cache_size() > 0
+
+
+def get_cache_size():
+    """returns the size in bytes the cache directory is limited to,
+    the least recently used meshes are removed if the cache gets bigger
+    """
+    return FreeCAD.ParamGet(
+        "User parameter:BaseApp/Preferences/Mod/Fem/General"
+    ).GetInt("MeshCacheSize", 500) * 1024 * 1024
+
+
+def get_cache_dir():
+    cache_dir = FreeCAD.ParamGet(
+        "User parameter:BaseApp/Preferences/Mod/Fem/General"
+    ).GetString("MeshCacheDirectory", "")
+    if not cache_dir:
+        cache_dir = os.path.join(FreeCAD.getUserAppDataDir(), "FemMeshCache")
+    return cache_dir
+
+
+def get_file_hash(filename, reader=""):
+    """returns the cache key of a mesh source file,
+    the reader name is part of the key, because different readers
+    may create different meshes out of the same file
+    """
+    file_hash = new_file_hash(reader)
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def new_file_hash(reader=""):
+    """returns the hash object of get_file_hash() before the file content is added,
+    for readers which hash the content while they read the file anyway
+    """
+    file_hash = hashlib.sha1()
+    file_hash.update("{} {}\n".format(MESH_CACHE_VERSION, reader).encode("utf-8"))
+    return file_hash
+
+
+def get_reader_name(read_function):
+    return "{}.{}".format(read_function.__module__, read_function.__name__)
+
+
+# ************************************************************************************************
+def read_cached(filename, read_function, cache_dir=None, key=None):
+    """returns the mesh arrays of a mesh file,
+    read_function(filename) returns the FEM mesh data dict of the file,
+    it is only called if the file is not in the cache
+    key is the get_file_hash() of the file with the reader name of read_function,
+    it is computed if not given
+    """
+    if cache_dir is None:
+        cache_dir = get_cache_dir()
+    if key is None:
+        key = get_file_hash(filename, get_reader_name(read_function))
+    entry_dir = os.path.join(cache_dir, key)
+    mesh_arrays = read_mesh_arrays(entry_dir)
+    if mesh_arrays is not None:
+        FreeCAD.Console.PrintLog("Mesh of {} read from cache {}.\n".format(filename, entry_dir))
+        return mesh_arrays
+    mesh_arrays = mesh_arrays_from_dict(read_function(filename))
+    write_mesh_arrays(entry_dir, mesh_arrays)
+    return mesh_arrays
+
+
+def read_mesh_module(mesh_module, cache_dir=None):
+    """returns a FemMesh created by a mesh module of femexamples/meshes,
+    the mesh is created by the create_nodes() and create_elements() of the module
+    only if the module file is not in the cache
+    """
+    import Fem
+    if is_mesh_cache_enabled():
+        if cache_dir is None:
+            cache_dir = get_cache_dir()
+        source_file = os.path.splitext(mesh_module.__file__)[0] + ".py"
+        if os.path.isfile(source_file):
+            entry_dir = os.path.join(cache_dir, get_file_hash(source_file, mesh_module.__name__))
+            mesh_arrays = read_mesh_arrays(entry_dir)
+            if mesh_arrays is not None:
+                return make_femmesh(mesh_arrays)
+        else:
+            entry_dir = None
+    else:
+        entry_dir = None
+    femmesh = Fem.FemMesh()
+    control = mesh_module.create_nodes(femmesh)
+    if not control:
+        FreeCAD.Console.PrintError("Error on creating nodes.\n")
+    control = mesh_module.create_elements(femmesh)
+    if not control:
+        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    if entry_dir is not None:
+        mesh_arrays = mesh_arrays_from_femmesh(femmesh)
+        if mesh_arrays is not None:
+            write_mesh_arrays(entry_dir, mesh_arrays)
+    return femmesh
+
+
+# ************************************************************************************************
+def write_mesh_arrays(directory, mesh_arrays):
+    """writes the mesh arrays into a cache directory
+    the files are written into a temporary directory which is renamed afterwards,
+    thus a cache directory is complete if it exists
+    returns False if the cache could not be written
+    """
+    header = {
+        "version": MESH_CACHE_VERSION,
+        "elements": [],
+        "groups": [],
+    }
+    parent_dir = os.path.dirname(directory)
+    try:
+        if not os.path.isdir(parent_dir):
+            os.makedirs(parent_dir)
+        tmp_dir = tempfile.mkdtemp(prefix=".tmp_", dir=parent_dir)
+    except OSError as e:
+        FreeCAD.Console.PrintLog("Mesh cache not written: {}\n".format(e))
+        return False
+    try:
+        np.save(
+            os.path.join(tmp_dir, "NodeIds.npy"),
+            np.asarray(mesh_arrays["NodeIds"], dtype=np.int64)
+        )
+        np.save(
+            os.path.join(tmp_dir, "NodeCoords.npy"),
+            np.asarray(mesh_arrays["NodeCoords"], dtype=np.float64).reshape(-1, 3)
+        )
+        for ele_key, (node_count, dimension) in ELEMENT_TYPES.items():
+            ele_ids, ele_nodes = mesh_arrays[ele_key]
+            if len(ele_ids) == 0:
+                continue
+            header["elements"].append(ele_key)
+            np.save(
+                os.path.join(tmp_dir, ele_key + "_ids.npy"),
+                np.asarray(ele_ids, dtype=np.int64)
+            )
+            np.save(
+                os.path.join(tmp_dir, ele_key + "_nodes.npy"),
+                np.asarray(ele_nodes, dtype=np.int64).reshape(-1, node_count)
+            )
+        groups = mesh_arrays.get("Groups", [])
+        group_offsets = [0]
+        for name, group_type, ele_ids in groups:
+            header["groups"].append([name, group_type])
+            group_offsets.append(group_offsets[-1] + len(ele_ids))
+        group_elements = [np.asarray(ele_ids, dtype=np.int64) for n, t, ele_ids in groups]
+        np.save(
+            os.path.join(tmp_dir, "group_elements.npy"),
+            np.concatenate(group_elements) if group_elements else np.zeros(0, dtype=np.int64)
+        )
+        np.save(
+            os.path.join(tmp_dir, "group_offsets.npy"),
+            np.asarray(group_offsets, dtype=np.int64)
+        )
+        with open(os.path.join(tmp_dir, MESH_CACHE_HEADER), "w") as f:
+            json.dump(header, f)
+        if os.path.isdir(directory):
+            # an other process was faster
+            shutil.rmtree(tmp_dir)
+        else:
+            os.rename(tmp_dir, directory)
+    except (OSError, IOError) as e:
+        FreeCAD.Console.PrintLog("Mesh cache not written: {}\n".format(e))
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return False
+    evict(parent_dir, get_cache_size())
+    return True
+
+
+def read_mesh_arrays(directory):
+    """returns the mesh arrays of a cache directory with memory mapped arrays,
+    None if there is no valid cache in the directory
+    """
+    header_file = os.path.join(directory, MESH_CACHE_HEADER)
+    if not os.path.isfile(header_file):
+        return None
+    try:
+        with open(header_file, "r") as f:
+            header = json.load(f)
+        if header.get("version") != MESH_CACHE_VERSION:
+            return None
+
+        def load(name):
+            return np.load(os.path.join(directory, name + ".npy"), mmap_mode="r")
+
+        mesh_arrays = {
+            "NodeIds": load("NodeIds"),
+            "NodeCoords": load("NodeCoords"),
+        }
+        for ele_key, (node_count, dimension) in ELEMENT_TYPES.items():
+            if ele_key in header["elements"]:
+                mesh_arrays[ele_key] = (load(ele_key + "_ids"), load(ele_key + "_nodes"))
+            else:
+                mesh_arrays[ele_key] = (
+                    np.zeros(0, dtype=np.int64),
+                    np.zeros((0, node_count), dtype=np.int64)
+                )
+        group_elements = load("group_elements")
+        group_offsets = load("group_offsets")
+        mesh_arrays["Groups"] = [
+            (name, group_type, group_elements[group_offsets[i]:group_offsets[i + 1]])
+            for i, (name, group_type) in enumerate(header["groups"])
+        ]
+    except (OSError, IOError, ValueError, KeyError) as e:
+        FreeCAD.Console.PrintLog("Mesh cache {} not read: {}\n".format(directory, e))
+        return None
+    # the modification time of the header tracks the last use for the eviction
+    try:
+        os.utime(header_file, None)
+    except OSError:
+        pass
+    return mesh_arrays
+
+
+def get_entries(cache_dir):
+    """returns (last use, size, directory) of all meshes in the cache directory,
+    least recently used first
+    """
+    entries = []
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return entries
+    for name in names:
+        directory = os.path.join(cache_dir, name)
+        header_file = os.path.join(directory, MESH_CACHE_HEADER)
+        # directories of writes in progress have no header
+        if name.startswith(".tmp_") or not os.path.isfile(header_file):
+            continue
+        try:
+            last_use = os.path.getmtime(header_file)
+            size = sum(
+                os.path.getsize(os.path.join(directory, f))
+                for f in os.listdir(directory)
+            )
+        except OSError:
+            continue
+        entries.append((last_use, size, directory))
+    return sorted(entries)
+
+
+def evict(cache_dir, max_size):
+    """removes the least recently used meshes until the cache fits into max_size bytes
+    """
+    entries = get_entries(cache_dir)
+    size = sum(e[1] for e in entries)
+    for last_use, entry_size, directory in entries:
+        if size <= max_size:
+            break
+        FreeCAD.Console.PrintLog("Mesh cache {} removed.\n".format(directory))
+        shutil.rmtree(directory, ignore_errors=True)
+        size -= entry_size
+
+
+# ************************************************************************************************
+def mesh_arrays_from_dict(mesh_data):
+    """converts a FEM mesh data dict of make_femmesh() into mesh arrays
+    """
+    nodes = mesh_data.get("Nodes", {})
+    mesh_arrays = {
+        "NodeIds": np.fromiter(nodes.keys(), dtype=np.int64, count=len(nodes)),
+        "NodeCoords": np.array(
+            [(v[0], v[1], v[2]) for v in nodes.values()],
+            dtype=np.float64
+        ).reshape(-1, 3),
+        "Groups": [],
+    }
+    for ele_key, (node_count, dimension) in ELEMENT_TYPES.items():
+        elements = mesh_data.get(ele_key, {})
+        mesh_arrays[ele_key] = (
+            np.fromiter(elements.keys(), dtype=np.int64, count=len(elements)),
+            np.array(list(elements.values()), dtype=np.int64).reshape(-1, node_count)
+        )
+    return mesh_arrays
+
+
+def mesh_arrays_from_femmesh(femmesh):
+    """returns the mesh arrays of a FemMesh including its groups
+    returns None if the FemMesh has elements which are not supported by the mesh cache,
+    the mesh would be incomplete
+    """
+    elements = {ele_key: ([], []) for ele_key in ELEMENT_TYPES}
+    ele_keys = {}
+    for ele_key, (node_count, dimension) in ELEMENT_TYPES.items():
+        ele_keys.setdefault(dimension, {})[node_count] = ele_key
+    for dimension, ele_ids in (
+        ("Edge", femmesh.Edges),
+        ("Face", femmesh.Faces),
+        ("Volume", femmesh.Volumes),
+    ):
+        for ele_id in ele_ids:
+            ele_nodes = femmesh.getElementNodes(ele_id)
+            ele_key = ele_keys[dimension].get(len(ele_nodes))
+            if ele_key is None:
+                FreeCAD.Console.PrintLog(
+                    "{} element {} with {} nodes is not supported by the mesh cache, "
+                    "the mesh is not cached.\n"
+                    .format(dimension, ele_id, len(ele_nodes))
+                )
+                return None
+            elements[ele_key][0].append(ele_id)
+            elements[ele_key][1].append(ele_nodes)
+    nodes = femmesh.Nodes
+    mesh_arrays = {
+        "NodeIds": np.fromiter(nodes.keys(), dtype=np.int64, count=len(nodes)),
+        "NodeCoords": np.array(
+            [(v.x, v.y, v.z) for v in nodes.values()],
+            dtype=np.float64
+        ).reshape(-1, 3),
+        "Groups": [
+            (
+                femmesh.getGroupName(group_id),
+                femmesh.getGroupElementType(group_id),
+                np.array(femmesh.getGroupElements(group_id), dtype=np.int64)
+            )
+            for group_id in femmesh.Groups
+        ],
+    }
+    for ele_key, (node_count, dimension) in ELEMENT_TYPES.items():
+        ele_ids, ele_nodes = elements[ele_key]
+        mesh_arrays[ele_key] = (
+            np.array(ele_ids, dtype=np.int64),
+            np.array(ele_nodes, dtype=np.int64).reshape(-1, node_count)
+        )
+    return mesh_arrays
+
+
+def make_femmesh(mesh_arrays):
+    """returns a FemMesh of mesh arrays including the groups
+    """
+    femmesh = importToolsFem.make_femmesh_from_arrays(mesh_arrays)
+    for name, group_type, ele_ids in mesh_arrays.get("Groups", []):
+        group_id = femmesh.addGroup(name, group_type)
+        if len(ele_ids) > 0:
+            femmesh.addGroupElements(group_id, ele_ids.tolist())
+    return femmesh
+
+##  @}
@@ -28,11 +28,16 @@ __url__ = "https://www.freecadweb.org"
 ## \addtogroup FEM
 #  @{
 
+import multiprocessing
+import sys
 import time
 
+import numpy as np
+
 import FreeCAD
 
 from femmesh import meshtools
+from femtools import geomtools
 from femtools.femutils import type_of_obj
 
 
@@ -43,6 +48,8 @@ class MeshSetsGetter():
         solver_obj,
         mesh_obj,
         member,
+        parallel=None,
+        max_workers=None,
     ):
         # class attributes from parameter values
         self.analysis = analysis_obj
@@ -50,6 +57,16 @@ class MeshSetsGetter():
         self.mesh_object = mesh_obj  # TODO without _object
         self.member = member
 
+        # node set lookups in a process pool, see get_constraints_nodes_parallel
+        # default None uses the FEM general preferences
+        fem_prefs = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Fem/General")
+        if parallel is None:
+            parallel = fem_prefs.GetBool("MeshSetsParallel", False)
+        if max_workers is None:
+            max_workers = fem_prefs.GetInt("MeshSetsMaxWorkers", 0)
+        self.parallel = parallel
+        self.max_workers = max_workers
+
         # more attributes
         self.analysis_type = self.solver_obj.AnalysisType
         self.document = self.analysis.Document
@@ -105,6 +122,13 @@ class MeshSetsGetter():
         self.femelement_edges_table = {}
         self.femelement_count_test = True
         self.mat_geo_sets = []
+        # {constraint name: (nodes, seconds)} of the node sets found by the process pool
+        self.femnodes_parallel = {}
+        # {force constraint name: ({(object name, element name): nodes}, seconds)}
+        # of the vertex and edge nodes of the force references found by the process pool
+        self.refshape_nodes_parallel = {}
+        # [(constraint name, seconds), ...] of the lookups in the order of the getters
+        self.constraint_timings = []
 
     # ********************************************************************************************
     # ********************************************************************************************
@@ -128,7 +152,8 @@ class MeshSetsGetter():
             "node sets (groups), surface sets (groups) and element sets (groups)\n"
         )
 
-        time_start = time.process_time()
+        time_start = time.perf_counter()
+        self.constraint_timings = []
 
         # materials and element geometry element sets getter
         self.get_element_sets_material_and_femelement_geometry()
@@ -137,6 +162,8 @@ class MeshSetsGetter():
         self.get_constraints_centrif_elements()
 
         # constraints node sets getter
+        if self.parallel:
+            self.get_constraints_nodes_parallel()
         self.get_constraints_fixed_nodes()
         self.get_constraints_displacement_nodes()
         self.get_constraints_planerotation_nodes()
@@ -153,11 +180,107 @@ class MeshSetsGetter():
         self.get_constraints_pressure_faces()
         self.get_constraints_heatflux_faces()
 
-        setstime = round((time.process_time() - time_start), 3)
+        setstime = round((time.perf_counter() - time_start), 3)
         FreeCAD.Console.PrintMessage(
             "Getting mesh data time: {} seconds.\n".format(setstime)
         )
 
+    # ********************************************************************************************
+    # ********************************************************************************************
+    # per constraint timings
+    def time_constraint(self, getter, femobj):
+        time_start = time.perf_counter()
+        getter(femobj)
+        self.add_constraint_timing(femobj, time.perf_counter() - time_start)
+
+    def add_constraint_timing(self, femobj, seconds):
+        self.constraint_timings.append((femobj["Object"].Name, seconds))
+        FreeCAD.Console.PrintLog(
+            "    {}: {} seconds\n".format(femobj["Object"].Name, round(seconds, 3))
+        )
+
+    # ********************************************************************************************
+    # ********************************************************************************************
+    # parallel node sets
+    # the geometric node searches of the node set constraints are independent of each
+    # other and only need the mesh nodes, thus they run in worker processes on a
+    # read-only snapshot of the nodes, the reference shapes are sent as BREP strings
+    # the found nodes are taken by get_constraint_nodes, thus the sets and the
+    # constraint conflict nodes are added in the order of the sequential getters
+    # the vertex and edge nodes of force constraints are searched the same way,
+    # they are taken by get_constraint_force_nodeload
+    # the element face searches need the whole mesh, they stay sequential
+    def get_constraints_nodes_parallel(self):
+        tasks = []
+        for femobj in (
+            self.member.cons_fixed
+            + self.member.cons_displacement
+            + self.member.cons_planerotation
+            + self.member.cons_transform
+            + self.member.cons_temperature
+        ):
+            # node sets of mesh group data are not searched
+            if self.femmesh.GroupCount and meshtools.get_femmesh_groupdata_sets_by_name(
+                self.femmesh,
+                femobj,
+                "Node"
+            ):
+                continue
+            tasks.append(
+                (femobj["Object"].Name, get_brep_strings(femobj["Object"].References))
+            )
+        refshape_tasks = []
+        for femobj in self.member.cons_force:
+            if femobj["RefShapeType"] not in ("Vertex", "Edge"):
+                continue
+            for ref_obj, ref_elements in femobj["Object"].References:
+                for ref_element in ref_elements:
+                    refshape_tasks.append((
+                        femobj["Object"].Name,
+                        (ref_obj.Name, ref_element),
+                        ref_obj.Shape.getElement(ref_element).exportBrepToString()
+                    ))
+        if not tasks and not refshape_tasks:
+            return
+        if not can_use_process_pool():
+            FreeCAD.Console.PrintLog(
+                "Processes are only forked on Linux without GUI, "
+                "the node sets are searched sequentially.\n"
+            )
+            return
+        if not self.femnodes_mesh:
+            self.femnodes_mesh = self.femmesh.Nodes
+        node_ids, node_coords = get_node_snapshot(self.femnodes_mesh)
+        task_count = len(tasks) + len(refshape_tasks)
+        workers = self.max_workers if self.max_workers > 0 else multiprocessing.cpu_count()
+        workers = min(workers, task_count)
+        FreeCAD.Console.PrintMessage(
+            "Get {} node sets of constraints in {} processes.\n"
+            .format(task_count, workers)
+        )
+        # the workers are forked, because they need the loaded FreeCAD modules
+        # spawned processes would start the FreeCAD executable
+        context = multiprocessing.get_context("fork")
+        with context.Pool(
+            processes=workers,
+            initializer=init_node_snapshot,
+            initargs=(node_ids, node_coords)
+        ) as pool:
+            # map keeps the order of the tasks and raises the exception of a failed lookup
+            results = pool.map(get_femnodes_by_brep_strings, [breps for name, breps in tasks])
+            refshape_results = pool.map(
+                get_refshape_femnodes_by_brep_string,
+                [brep for name, ref, brep in refshape_tasks]
+            )
+        self.femnodes_parallel = {}
+        for (name, breps), result in zip(tasks, results):
+            self.femnodes_parallel[name] = result
+        self.refshape_nodes_parallel = {}
+        for (name, ref, brep), (nodes, seconds) in zip(refshape_tasks, refshape_results):
+            ref_nodes, ref_seconds = self.refshape_nodes_parallel.get(name, ({}, 0.0))
+            ref_nodes[ref] = nodes
+            self.refshape_nodes_parallel[name] = (ref_nodes, ref_seconds + seconds)
+
     # ********************************************************************************************
     # ********************************************************************************************
     # node sets
@@ -166,19 +289,17 @@ class MeshSetsGetter():
             return
         # get nodes
         for femobj in self.member.cons_fixed:
-            # femobj --> dict, FreeCAD document object is femobj["Object"]
-            print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(
-                self.femmesh,
-                femobj
-            )
-            # add nodes to constraint_conflict_nodes, needed by constraint plane rotation
-            for node in femobj["Nodes"]:
-                self.constraint_conflict_nodes.append(node)
+            self.get_constraint_nodes(femobj)
+        # add nodes to constraint_conflict_nodes, needed by constraint plane rotation
+        self.add_constraint_conflict_nodes(self.member.cons_fixed)
+        self.get_constraints_fixed_nodes_solid_faceedge()
+
+    def get_constraints_fixed_nodes_solid_faceedge(self):
         # if mixed mesh with solids the node set needs to be split
         # because solid nodes do not have rotational degree of freedom
         if (
-            self.femmesh.Volumes
+            self.member.cons_fixed
+            and self.femmesh.Volumes
             and (
                 len(self.member.geos_shellthickness) > 0
                 or len(self.member.geos_beamsection) > 0
@@ -210,67 +331,84 @@ class MeshSetsGetter():
             return
         # get nodes
         for femobj in self.member.cons_displacement:
-            # femobj --> dict, FreeCAD document object is femobj["Object"]
-            print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(
-                self.femmesh,
-                femobj
-            )
-            # add nodes to constraint_conflict_nodes, needed by constraint plane rotation
-            for node in femobj["Nodes"]:
-                self.constraint_conflict_nodes.append(node)
+            self.get_constraint_nodes(femobj)
+        # add nodes to constraint_conflict_nodes, needed by constraint plane rotation
+        self.add_constraint_conflict_nodes(self.member.cons_displacement)
 
     def get_constraints_planerotation_nodes(self):
         if not self.member.cons_planerotation:
             return
         # get nodes
         for femobj in self.member.cons_planerotation:
-            # femobj --> dict, FreeCAD document object is femobj["Object"]
-            print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(
-                self.femmesh,
-                femobj
-            )
+            self.get_constraint_nodes(femobj)
 
     def get_constraints_transform_nodes(self):
         if not self.member.cons_transform:
             return
         # get nodes
         for femobj in self.member.cons_transform:
-            # femobj --> dict, FreeCAD document object is femobj["Object"]
-            print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(
-                self.femmesh,
-                femobj
-            )
+            self.get_constraint_nodes(femobj)
 
     def get_constraints_temperature_nodes(self):
         if not self.member.cons_temperature:
             return
         # get nodes
         for femobj in self.member.cons_temperature:
-            # femobj --> dict, FreeCAD document object is femobj["Object"]
-            print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(
-                self.femmesh,
-                femobj
-            )
+            self.get_constraint_nodes(femobj)
 
     def get_constraints_fluidsection_nodes(self):
         if not self.member.geos_fluidsection:
             return
         # get nodes
         for femobj in self.member.geos_fluidsection:
-            # femobj --> dict, FreeCAD document object is femobj["Object"]
-            print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(
-                self.femmesh,
-                femobj
-            )
+            self.get_constraint_nodes(femobj)
+
+    def get_constraint_nodes(self, femobj):
+        # femobj --> dict, FreeCAD document object is femobj["Object"]
+        print_obj_info(femobj["Object"])
+        if femobj["Object"].Name in self.femnodes_parallel:
+            # found by get_constraints_nodes_parallel, seconds of the worker process
+            femobj["Nodes"], seconds = self.femnodes_parallel[femobj["Object"].Name]
+            self.add_constraint_timing(femobj, seconds)
+            return
+        self.time_constraint(self.get_constraint_nodes_by_references, femobj)
+
+    def get_constraint_nodes_by_references(self, femobj):
+        femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(
+            self.femmesh,
+            femobj
+        )
+
+    def add_constraint_conflict_nodes(self, femobjs):
+        for femobj in femobjs:
+            for node in femobj["Nodes"]:
+                self.constraint_conflict_nodes.append(node)
 
     def get_constraints_force_nodeloads(self):
         if not self.member.cons_force:
             return
+        self.get_constraints_force_mesh_data()
+        # get node loads
+        FreeCAD.Console.PrintLog(
+            "    Finite element mesh nodes will be retrieved by searching "
+            "the appropriate nodes in the finite element mesh.\n"
+        )
+        FreeCAD.Console.PrintLog(
+            "    The appropriate finite element mesh node load values will "
+            "be calculated according to the finite element definition.\n"
+        )
+        for femobj in self.member.cons_force:
+            # vertex and edge nodes found by get_constraints_nodes_parallel
+            # the seconds of the worker processes are added to the timing
+            ref_nodes, seconds = self.refshape_nodes_parallel.get(
+                femobj["Object"].Name,
+                (None, 0.0)
+            )
+            time_start = time.perf_counter()
+            self.get_constraint_force_nodeload(femobj, ref_nodes)
+            self.add_constraint_timing(femobj, time.perf_counter() - time_start + seconds)
+
+    def get_constraints_force_mesh_data(self):
         # check shape type of reference shape
         for femobj in self.member.cons_force:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
@@ -300,42 +438,49 @@ class MeshSetsGetter():
                     self.femelement_table = meshtools.get_femelement_table(
                         self.femmesh
                     )
-        # get node loads
-        FreeCAD.Console.PrintLog(
-            "    Finite element mesh nodes will be retrieved by searching "
-            "the appropriate nodes in the finite element mesh.\n"
-        )
-        FreeCAD.Console.PrintLog(
-            "    The appropriate finite element mesh node load values will "
-            "be calculated according to the finite element definition.\n"
-        )
-        for femobj in self.member.cons_force:
-            # femobj --> dict, FreeCAD document object is femobj["Object"]
-            frc_obj = femobj["Object"]
-            print_obj_info(frc_obj)
-            if frc_obj.Force == 0:
-                FreeCAD.Console.PrintMessage("  Warning --> Force = 0\n")
-            if femobj["RefShapeType"] == "Vertex":  # point load on vertices
-                femobj["NodeLoadTable"] = meshtools.get_force_obj_vertex_nodeload_table(
-                    self.femmesh,
-                    frc_obj
-                )
-            elif femobj["RefShapeType"] == "Edge":  # line load on edges
-                femobj["NodeLoadTable"] = meshtools.get_force_obj_edge_nodeload_table(
-                    self.femmesh,
-                    self.femelement_table,
-                    self.femnodes_mesh, frc_obj
-                )
-            elif femobj["RefShapeType"] == "Face":  # area load on faces
-                femobj["NodeLoadTable"] = meshtools.get_force_obj_face_nodeload_table(
-                    self.femmesh,
-                    self.femelement_table,
-                    self.femnodes_mesh, frc_obj
-                )
+
+    def get_constraint_force_nodeload(self, femobj, ref_nodes=None):
+        # femobj --> dict, FreeCAD document object is femobj["Object"]
+        frc_obj = femobj["Object"]
+        print_obj_info(frc_obj)
+        if frc_obj.Force == 0:
+            FreeCAD.Console.PrintMessage("  Warning --> Force = 0\n")
+        if femobj["RefShapeType"] == "Vertex":  # point load on vertices
+            femobj["NodeLoadTable"] = meshtools.get_force_obj_vertex_nodeload_table(
+                self.femmesh,
+                frc_obj,
+                ref_nodes
+            )
+        elif femobj["RefShapeType"] == "Edge":  # line load on edges
+            femobj["NodeLoadTable"] = meshtools.get_force_obj_edge_nodeload_table(
+                self.femmesh,
+                self.femelement_table,
+                self.femnodes_mesh, frc_obj,
+                ref_nodes
+            )
+        elif femobj["RefShapeType"] == "Face":  # area load on faces
+            femobj["NodeLoadTable"] = meshtools.get_force_obj_face_nodeload_table(
+                self.femmesh,
+                self.femelement_table,
+                self.femnodes_mesh, frc_obj
+            )
 
     # ********************************************************************************************
     # ********************************************************************************************
     # faces sets
+    def get_femnodes_ele_data(self):
+        # mesh data needed for the element face searches
+        if not self.femnodes_mesh:
+            self.femnodes_mesh = self.femmesh.Nodes
+        if not self.femelement_table:
+            self.femelement_table = meshtools.get_femelement_table(self.femmesh)
+        if not self.femnodes_ele_table:
+            self.femnodes_ele_table = meshtools.get_femnodes_ele_index(
+                self.femmesh,
+                self.femelement_table,
+                self.mesh_object
+            )
+
     def get_constraints_pressure_faces(self):
         if not self.member.cons_pressure:
             return
@@ -354,59 +499,47 @@ class MeshSetsGetter():
             # print(femobj["PressureFaces"])
         """
 
-        if not self.femnodes_mesh:
-            self.femnodes_mesh = self.femmesh.Nodes
-        if not self.femelement_table:
-            self.femelement_table = meshtools.get_femelement_table(self.femmesh)
-        if not self.femnodes_ele_table:
-            self.femnodes_ele_table = meshtools.get_femnodes_ele_table(
-                self.femnodes_mesh,
-                self.femelement_table
-            )
-
+        self.get_femnodes_ele_data()
         for femobj in self.member.cons_pressure:
-            # femobj --> dict, FreeCAD document object is femobj["Object"]
-            print_obj_info(femobj["Object"])
-            pressure_faces = meshtools.get_pressure_obj_faces(
-                self.femmesh,
-                self.femelement_table,
-                self.femnodes_ele_table, femobj
-            )
-            # the data model is for compatibility reason with deprecated version
-            # get_pressure_obj_faces_depreciated returns the face ids in a tuple per ref_shape
-            # some_string was the reference_shape_element_string in deprecated method
-            # [(some_string, [ele_id, ele_face_id], [ele_id, ele_face_id], ...])]
-            some_string = "{}: face load".format(femobj["Object"].Name)
-            femobj["PressureFaces"] = [(some_string, pressure_faces)]
-            FreeCAD.Console.PrintLog("{}\n".format(femobj["PressureFaces"]))
+            self.time_constraint(self.get_constraint_pressure_faces, femobj)
+
+    def get_constraint_pressure_faces(self, femobj):
+        # femobj --> dict, FreeCAD document object is femobj["Object"]
+        print_obj_info(femobj["Object"])
+        pressure_faces = meshtools.get_pressure_obj_faces(
+            self.femmesh,
+            self.femelement_table,
+            self.femnodes_ele_table, femobj
+        )
+        # the data model is for compatibility reason with deprecated version
+        # get_pressure_obj_faces_depreciated returns the face ids in a tuple per ref_shape
+        # some_string was the reference_shape_element_string in deprecated method
+        # [(some_string, [ele_id, ele_face_id], [ele_id, ele_face_id], ...])]
+        some_string = "{}: face load".format(femobj["Object"].Name)
+        femobj["PressureFaces"] = [(some_string, pressure_faces)]
+        FreeCAD.Console.PrintLog("{}\n".format(femobj["PressureFaces"]))
 
     def get_constraints_contact_faces(self):
         if not self.member.cons_contact:
             return
-        if not self.femnodes_mesh:
-            self.femnodes_mesh = self.femmesh.Nodes
-        if not self.femelement_table:
-            self.femelement_table = meshtools.get_femelement_table(self.femmesh)
-        if not self.femnodes_ele_table:
-            self.femnodes_ele_table = meshtools.get_femnodes_ele_table(
-                self.femnodes_mesh,
-                self.femelement_table
-            )
-
+        self.get_femnodes_ele_data()
         for femobj in self.member.cons_contact:
-            # femobj --> dict, FreeCAD document object is femobj["Object"]
-            print_obj_info(femobj["Object"])
-            contact_slave_faces, contact_master_faces = meshtools.get_contact_obj_faces(
-                self.femmesh,
-                self.femelement_table,
-                self.femnodes_ele_table, femobj
-            )
-            # [ele_id, ele_face_id], [ele_id, ele_face_id], ...]
-            # whereas the ele_face_id might be ccx specific
-            femobj["ContactSlaveFaces"] = contact_slave_faces
-            femobj["ContactMasterFaces"] = contact_master_faces
-            # FreeCAD.Console.PrintLog("{}\n".format(femobj["ContactSlaveFaces"]))
-            # FreeCAD.Console.PrintLog("{}\n".format(femobj["ContactMasterFaces"]))
+            self.time_constraint(self.get_constraint_contact_faces, femobj)
+
+    def get_constraint_contact_faces(self, femobj):
+        # femobj --> dict, FreeCAD document object is femobj["Object"]
+        print_obj_info(femobj["Object"])
+        contact_slave_faces, contact_master_faces = meshtools.get_contact_obj_faces(
+            self.femmesh,
+            self.femelement_table,
+            self.femnodes_ele_table, femobj
+        )
+        # [ele_id, ele_face_id], [ele_id, ele_face_id], ...]
+        # whereas the ele_face_id might be ccx specific
+        femobj["ContactSlaveFaces"] = contact_slave_faces
+        femobj["ContactMasterFaces"] = contact_master_faces
+        # FreeCAD.Console.PrintLog("{}\n".format(femobj["ContactSlaveFaces"]))
+        # FreeCAD.Console.PrintLog("{}\n".format(femobj["ContactMasterFaces"]))
 
     # information in the regard of element faces constraints
     # forum post: https://forum.freecadweb.org/viewtopic.php?f=18&t=42783&p=370286#p366723
@@ -418,30 +551,24 @@ class MeshSetsGetter():
     def get_constraints_tie_faces(self):
         if not self.member.cons_tie:
             return
-        if not self.femnodes_mesh:
-            self.femnodes_mesh = self.femmesh.Nodes
-        if not self.femelement_table:
-            self.femelement_table = meshtools.get_femelement_table(self.femmesh)
-        if not self.femnodes_ele_table:
-            self.femnodes_ele_table = meshtools.get_femnodes_ele_table(
-                self.femnodes_mesh,
-                self.femelement_table
-            )
-
+        self.get_femnodes_ele_data()
         for femobj in self.member.cons_tie:
-            # femobj --> dict, FreeCAD document object is femobj["Object"]
-            print_obj_info(femobj["Object"])
-            slave_faces, master_faces = meshtools.get_tie_obj_faces(
-                self.femmesh,
-                self.femelement_table,
-                self.femnodes_ele_table, femobj
-            )
-            # [ele_id, ele_face_id], [ele_id, ele_face_id], ...]
-            # whereas the ele_face_id might be ccx specific
-            femobj["TieSlaveFaces"] = slave_faces
-            femobj["TieMasterFaces"] = master_faces
-            # FreeCAD.Console.PrintLog("{}\n".format(femobj["ContactSlaveFaces"]))
-            # FreeCAD.Console.PrintLog("{}\n".format(femobj["ContactMasterFaces"]))
+            self.time_constraint(self.get_constraint_tie_faces, femobj)
+
+    def get_constraint_tie_faces(self, femobj):
+        # femobj --> dict, FreeCAD document object is femobj["Object"]
+        print_obj_info(femobj["Object"])
+        slave_faces, master_faces = meshtools.get_tie_obj_faces(
+            self.femmesh,
+            self.femelement_table,
+            self.femnodes_ele_table, femobj
+        )
+        # [ele_id, ele_face_id], [ele_id, ele_face_id], ...]
+        # whereas the ele_face_id might be ccx specific
+        femobj["TieSlaveFaces"] = slave_faces
+        femobj["TieMasterFaces"] = master_faces
+        # FreeCAD.Console.PrintLog("{}\n".format(femobj["ContactSlaveFaces"]))
+        # FreeCAD.Console.PrintLog("{}\n".format(femobj["ContactMasterFaces"]))
 
     def get_constraints_sectionprint_faces(self):
         if not self.member.cons_sectionprint:
@@ -449,42 +576,45 @@ class MeshSetsGetter():
         # TODO: use meshtools to get the surfaces
         # see constraint contact or constraint tie
         for femobj in self.member.cons_sectionprint:
-            # femobj --> dict, FreeCAD document object is femobj["Object"]
-            sectionprint_obj = femobj["Object"]
-            if len(sectionprint_obj.References) > 1:
-                FreeCAD.Console.PrintError(
-                    "Only one reference shape allowed for a section print "
-                    "but {} found: {}\n"
-                    .format(len(sectionprint_obj.References), sectionprint_obj.References)
-                )
-            for o, elem_tup in sectionprint_obj.References:
-                for elem in elem_tup:
-                    # there should only be one reference for each section print object
-                    # in the gui this is checked
-                    ref_shape = o.Shape.getElement(elem)
-                    if ref_shape.ShapeType == "Face":
-                        v = self.mesh_object.FemMesh.getccxVolumesByFace(ref_shape)
-                        if len(v) > 0:
-                            femobj["SectionPrintFaces"] = v
-                            # volume elements found
-                            FreeCAD.Console.PrintLog(
-                                "{}, surface {}, {} touching volume elements found\n"
-                                .format(sectionprint_obj.Label, sectionprint_obj.Name, len(v))
-                            )
-                        else:
-                            # no volume elements found, shell elements not allowed
-                            FreeCAD.Console.PrintError(
-                                "{}, surface {}, Error: "
-                                "No volume elements found!\n"
-                                .format(sectionprint_obj.Label, sectionprint_obj.Name)
-                            )
+            self.time_constraint(self.get_constraint_sectionprint_faces, femobj)
+
+    def get_constraint_sectionprint_faces(self, femobj):
+        # femobj --> dict, FreeCAD document object is femobj["Object"]
+        sectionprint_obj = femobj["Object"]
+        if len(sectionprint_obj.References) > 1:
+            FreeCAD.Console.PrintError(
+                "Only one reference shape allowed for a section print "
+                "but {} found: {}\n"
+                .format(len(sectionprint_obj.References), sectionprint_obj.References)
+            )
+        for o, elem_tup in sectionprint_obj.References:
+            for elem in elem_tup:
+                # there should only be one reference for each section print object
+                # in the gui this is checked
+                ref_shape = o.Shape.getElement(elem)
+                if ref_shape.ShapeType == "Face":
+                    v = self.mesh_object.FemMesh.getccxVolumesByFace(ref_shape)
+                    if len(v) > 0:
+                        femobj["SectionPrintFaces"] = v
+                        # volume elements found
+                        FreeCAD.Console.PrintLog(
+                            "{}, surface {}, {} touching volume elements found\n"
+                            .format(sectionprint_obj.Label, sectionprint_obj.Name, len(v))
+                        )
                     else:
-                        # in Gui only Faces can be added
+                        # no volume elements found, shell elements not allowed
                         FreeCAD.Console.PrintError(
-                            "Wrong reference shape type for {} "
-                            "Only Faces are allowed, but a {} was found.\n"
-                            .format(sectionprint_obj.Name, ref_shape.ShapeType)
+                            "{}, surface {}, Error: "
+                            "No volume elements found!\n"
+                            .format(sectionprint_obj.Label, sectionprint_obj.Name)
                         )
+                else:
+                    # in Gui only Faces can be added
+                    FreeCAD.Console.PrintError(
+                        "Wrong reference shape type for {} "
+                        "Only Faces are allowed, but a {} was found.\n"
+                        .format(sectionprint_obj.Name, ref_shape.ShapeType)
+                    )
 
     def get_constraints_heatflux_faces(self):
         if not self.member.cons_heatflux:
@@ -498,16 +628,19 @@ class MeshSetsGetter():
         #         ("refshape_name:elemname", face_table)
         #     ]
         for femobj in self.member.cons_heatflux:
-            # femobj --> dict, FreeCAD document object is femobj["Object"]
-            heatflux_obj = femobj["Object"]
-            femobj["HeatFluxFaceTable"] = []
-            for o, elem_tup in heatflux_obj.References:
-                for elem in elem_tup:
-                    ho = o.Shape.getElement(elem)
-                    if ho.ShapeType == "Face":
-                        elem_info = "{}:{}".format(o.Name, elem)
-                        face_table = self.mesh_object.FemMesh.getccxVolumesByFace(ho)
-                        femobj["HeatFluxFaceTable"].append((elem_info, face_table))
+            self.time_constraint(self.get_constraint_heatflux_faces, femobj)
+
+    def get_constraint_heatflux_faces(self, femobj):
+        # femobj --> dict, FreeCAD document object is femobj["Object"]
+        heatflux_obj = femobj["Object"]
+        femobj["HeatFluxFaceTable"] = []
+        for o, elem_tup in heatflux_obj.References:
+            for elem in elem_tup:
+                ho = o.Shape.getElement(elem)
+                if ho.ShapeType == "Face":
+                    elem_info = "{}:{}".format(o.Name, elem)
+                    face_table = self.mesh_object.FemMesh.getccxVolumesByFace(ho)
+                    femobj["HeatFluxFaceTable"].append((elem_info, face_table))
 
     # ********************************************************************************************
     # ********************************************************************************************
@@ -545,8 +678,8 @@ class MeshSetsGetter():
             if not self.femnodes_mesh:
                 self.femnodes_mesh = self.femmesh.Nodes
             if not self.femnodes_ele_table:
-                self.femnodes_ele_table = meshtools.get_femnodes_ele_table(
-                    self.femnodes_mesh,
+                self.femnodes_ele_table = meshtools.get_femnodes_ele_index(
+                    self.femmesh,
                     self.femelement_table
                 )
             control = meshtools.get_femelement_sets(
@@ -1066,6 +1199,84 @@ def get_elset_name_short(names):
         raise Exception(error)
 
 
+# ************************************************************************************************
+# worker processes of MeshSetsGetter.get_constraints_nodes_parallel
+# the FemMesh of a worker only has the nodes, which is all the node search needs
+_node_snapshot = {}
+
+
+def can_use_process_pool():
+    # forked processes are only safe on Linux without GUI
+    # on macOS the system frameworks are not fork safe, thus spawn is the default there
+    # the GUI process runs Qt threads, which are not copied into a forked process
+    return sys.platform.startswith("linux") and not FreeCAD.GuiUp
+
+
+def get_node_snapshot(femnodes_mesh):
+    # femnodes_mesh --> femmesh.Nodes, the node coordinates are placed already
+    node_ids = np.fromiter(femnodes_mesh.keys(), dtype=np.int32, count=len(femnodes_mesh))
+    node_coords = np.array(
+        [(vec.x, vec.y, vec.z) for vec in femnodes_mesh.values()],
+        dtype=np.float64
+    )
+    return node_ids, node_coords
+
+
+def init_node_snapshot(node_ids, node_coords):
+    import Fem
+    femmesh = Fem.FemMesh()
+    femmesh.addNodes(node_ids, node_coords)
+    _node_snapshot["femmesh"] = femmesh
+
+
+def get_brep_strings(references):
+    # the reference shapes of a constraint, the placement is kept in the BREP string
+    brep_strings = []
+    for ref_obj, ref_elements in references:
+        for ref_element in ref_elements:
+            brep_strings.append(
+                geomtools.get_element(ref_obj, ref_element).exportBrepToString()
+            )
+    return brep_strings
+
+
+def get_femnodes_by_brep_strings(brep_strings):
+    # returns the sorted nodes and the seconds of the search like
+    # meshtools.get_femnodes_by_femobj_with_references does without group data
+    import Part
+    time_start = time.perf_counter()
+    femmesh = _node_snapshot["femmesh"]
+    nodes = []
+    for brep in brep_strings:
+        shape = Part.Shape()
+        shape.importBrepFromString(brep, False)
+        if shape.ShapeType == "Vertex":
+            nodes += femmesh.getNodesByVertex(shape.Vertexes[0])
+        elif shape.ShapeType == "Edge":
+            nodes += femmesh.getNodesByEdge(shape.Edges[0])
+        elif shape.ShapeType == "Face":
+            nodes += femmesh.getNodesByFace(shape.Faces[0])
+        elif shape.ShapeType == "Solid":
+            nodes += femmesh.getNodesBySolid(shape.Solids[0])
+    return sorted(set(nodes)), time.perf_counter() - time_start
+
+
+def get_refshape_femnodes_by_brep_string(brep_string):
+    # returns the nodes of one vertex or edge in the order of the FemMesh search
+    # and the seconds of the search, see meshtools.get_force_obj_vertex_nodeload_table
+    # and meshtools.get_ref_edgenodes_table
+    import Part
+    time_start = time.perf_counter()
+    femmesh = _node_snapshot["femmesh"]
+    shape = Part.Shape()
+    shape.importBrepFromString(brep_string, False)
+    if shape.ShapeType == "Vertex":
+        nodes = femmesh.getNodesByVertex(shape.Vertexes[0])
+    else:
+        nodes = femmesh.getNodesByEdge(shape.Edges[0])
+    return nodes, time.perf_counter() - time_start
+
+
 def print_obj_info(obj, log=False):
     if log is False:
         FreeCAD.Console.PrintMessage("{}:\n".format(obj.Label))
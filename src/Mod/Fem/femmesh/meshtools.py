@@ -27,6 +27,10 @@ __url__ = "https://www.freecadweb.org"
 # \addtogroup FEM
 #  @{
 
+import itertools
+
+import numpy as np
+
 import FreeCAD
 
 from femtools import geomtools
@@ -241,6 +245,244 @@ def get_femnodes_ele_table(
     return femnodes_ele_table
 
 
+# ************************************************************************************************
+# CalculiX volume element faces coded as bit array of the element node positions
+# {number of element nodes : {face bit mask : ccx face number}}
+# see get_ccxelement_faces_from_binary_search for more information
+CCX_VOLUME_FACE_MASKS = {
+    4: {  # tetra4
+        7: 1,
+        11: 2,
+        13: 3,
+        14: 4},
+    6: {  # penta6
+        56: 1,
+        7: 2,
+        54: 3,
+        45: 4,
+        27: 5},
+    8: {  # hexa8
+        240: 1,
+        15: 2,
+        102: 3,
+        204: 4,
+        153: 5,
+        51: 6},
+    10: {  # tetra10
+        119: 1,
+        411: 2,
+        717: 3,
+        814: 4},
+    15: {  # penta15
+        3640: 1,
+        455: 2,
+        25782: 3,
+        22829: 4,
+        12891: 5},
+    20: {  # hexa20
+        61680: 1,
+        3855: 2,
+        402022: 3,
+        804044: 4,
+        624793: 5,
+        201011: 6},
+}
+
+
+class FemNodesEleIndex(object):
+    """array based version of the femnodes_ele_table
+    the node to element adjacency is stored in compressed sparse row form
+    node_ids ... sorted node ids of all nodes used by the elements
+    offsets ... the entries of node_ids[i] are offsets[i]:offsets[i + 1]
+    ele_index ... per entry the index of the element in element_ids
+    node_bits ... per entry the position of the node in the element
+    coded as a set bit, as in get_femnodes_ele_table()
+    element_ids ... element ids in order of the femelement_table
+    element_node_counts ... number of nodes per element
+    the bit pattern of the elements for a node set is evaluated with
+    bitwise NumPy operations on the elements touched by the node set only
+    """
+
+    def __init__(
+        self,
+        femelement_table
+    ):
+        self.element_ids = np.fromiter(femelement_table, dtype=np.int64)
+        self.element_node_counts = np.fromiter(
+            (len(nodes) for nodes in femelement_table.values()),
+            dtype=np.int64,
+            count=len(femelement_table)
+        )
+        ele_nodes = np.fromiter(
+            itertools.chain.from_iterable(femelement_table.values()),
+            dtype=np.int64,
+            count=int(self.element_node_counts.sum())
+        )
+        ele_starts = np.cumsum(self.element_node_counts) - self.element_node_counts
+        ele_index = np.repeat(
+            np.arange(len(self.element_ids), dtype=np.int64),
+            self.element_node_counts
+        )
+        node_pos = np.arange(len(ele_nodes), dtype=np.int64) - ele_starts[ele_index]
+        # sort the entries by node, stable keeps the element order per node
+        order = np.argsort(ele_nodes, kind="stable")
+        self.ele_index = ele_index[order]
+        self.node_bits = np.left_shift(1, node_pos[order])
+        self.node_ids, node_counts = np.unique(ele_nodes[order], return_counts=True)
+        self.offsets = np.zeros(len(self.node_ids) + 1, dtype=np.int64)
+        np.cumsum(node_counts, out=self.offsets[1:])
+        FreeCAD.Console.PrintLog(
+            "FemNodesEleIndex: {} nodes, {} elements\n"
+            .format(len(self.node_ids), len(self.element_ids))
+        )
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def get_bit_patterns(
+        self,
+        node_set
+    ):
+        """the array version of get_bit_pattern_dict()
+        returns the indices of the elements which have at least one node in node_set
+        (in order of the femelement_table) and the bit array of each of these elements
+        """
+        nodes = np.unique(np.asarray(list(node_set), dtype=np.int64))
+        rows = np.searchsorted(self.node_ids, nodes)
+        # nodes without elements are not in the index
+        rows = rows[rows < len(self.node_ids)]
+        rows = rows[self.node_ids[rows] == nodes[:len(rows)]]
+        # gather the entries of all rows
+        starts = self.offsets[rows]
+        lengths = self.offsets[rows + 1] - starts
+        entry_starts = np.cumsum(lengths) - lengths
+        entries = (
+            np.arange(int(lengths.sum()), dtype=np.int64)
+            + np.repeat(starts - entry_starts, lengths)
+        )
+        touched, inverse = np.unique(self.ele_index[entries], return_inverse=True)
+        patterns = np.zeros(len(touched), dtype=np.int64)
+        np.bitwise_or.at(patterns, inverse, self.node_bits[entries])
+        return touched, patterns
+
+    def get_ccxelement_faces(
+        self,
+        node_set
+    ):
+        """the array version of get_ccxelement_faces_from_binary_search()
+        returns [[eleID, ccx face number], ...] for volume element faces
+        with all face nodes in node_set
+        """
+        touched, patterns = self.get_bit_patterns(node_set)
+        masks, face_numbers = _get_ccx_volume_face_mask_arrays()
+        node_counts = self.element_node_counts[touched]
+        node_counts = np.where(node_counts < len(masks), node_counts, 0)
+        ele_masks = masks[node_counts]
+        found = (ele_masks & patterns[:, None]) == ele_masks
+        rows, cols = np.nonzero(found)
+        faces = np.column_stack((
+            self.element_ids[touched[rows]],
+            face_numbers[node_counts[rows], cols]
+        ))
+        FreeCAD.Console.PrintLog("found Faces: {}\n".format(len(faces)))
+        return faces.tolist()
+
+    def get_femelements_by_femnodes(
+        self,
+        node_list
+    ):
+        """the array version of get_femelements_by_femnodes_bin()
+        returns the elements with all nodes in node_list
+        """
+        touched, patterns = self.get_bit_patterns(node_list)
+        all_nodes = np.left_shift(1, self.element_node_counts[touched]) - 1
+        return self.element_ids[touched[patterns == all_nodes]].tolist()
+
+
+_ccx_volume_face_mask_arrays = None
+
+
+def _get_ccx_volume_face_mask_arrays():
+    # CCX_VOLUME_FACE_MASKS as arrays indexed by the number of element nodes
+    # not used masks never match, face number 0
+    global _ccx_volume_face_mask_arrays
+    if _ccx_volume_face_mask_arrays is None:
+        size = max(CCX_VOLUME_FACE_MASKS) + 1
+        width = max(len(mask_dict) for mask_dict in CCX_VOLUME_FACE_MASKS.values())
+        masks = np.full((size, width), 1 << 62, dtype=np.int64)
+        face_numbers = np.zeros((size, width), dtype=np.int64)
+        for node_count, mask_dict in CCX_VOLUME_FACE_MASKS.items():
+            for col, (mask, face_number) in enumerate(mask_dict.items()):
+                masks[node_count, col] = mask
+                face_numbers[node_count, col] = face_number
+        _ccx_volume_face_mask_arrays = (masks, face_numbers)
+    return _ccx_volume_face_mask_arrays
+
+
+# the index is built once per mesh object, FemMesh has no attribute storage
+# and every access of the FemMesh property returns a new FemMesh wrapper
+# thus the indices are stored here keyed by (document name, mesh object name)
+# together with the fingerprint of the mesh they are made for
+_femnodes_ele_index_cache = {}
+
+
+def _prune_femnodes_ele_index_cache():
+    # drop the indices of closed documents and deleted mesh objects
+    documents = FreeCAD.listDocuments()
+    for doc_name, obj_name in list(_femnodes_ele_index_cache):
+        doc = documents.get(doc_name)
+        if doc is None or doc.getObject(obj_name) is None:
+            del _femnodes_ele_index_cache[(doc_name, obj_name)]
+
+
+def get_femnodes_ele_index(
+    femmesh,
+    femelement_table=None,
+    mesh_obj=None
+):
+    """returns the FemNodesEleIndex of a femmesh
+    femelement_table ... see get_femelement_table(), it is only used on building
+    mesh_obj ... the mesh document object of femmesh, if given the index is
+    built once and reused as long as the fingerprint of its mesh does not change
+    """
+    if mesh_obj is None:
+        if femelement_table is None:
+            femelement_table = get_femelement_table(femmesh)
+        return FemNodesEleIndex(femelement_table)
+    _prune_femnodes_ele_index_cache()
+    key = (mesh_obj.Document.Name, mesh_obj.Name)
+    fingerprint = femmesh.getFingerprint()
+    cached = _femnodes_ele_index_cache.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    # the index of the former mesh is released before the new one is built
+    _femnodes_ele_index_cache.pop(key, None)
+    if femelement_table is None:
+        femelement_table = get_femelement_table(femmesh)
+    index = FemNodesEleIndex(femelement_table)
+    _femnodes_ele_index_cache[key] = (fingerprint, index)
+    return index
+
+
+def get_ccxelement_faces_by_femnodes(
+    femelement_table,
+    femnodes_ele_table,
+    node_set
+):
+    """get the CalculiX element faces with all face nodes in node_set
+    femnodes_ele_table ... the dict of get_femnodes_ele_table()
+    or the FemNodesEleIndex of get_femnodes_ele_index()
+    """
+    if isinstance(femnodes_ele_table, FemNodesEleIndex):
+        return femnodes_ele_table.get_ccxelement_faces(node_set)
+    bit_pattern_dict = get_bit_pattern_dict(
+        femelement_table,
+        femnodes_ele_table,
+        node_set
+    )
+    return get_ccxelement_faces_from_binary_search(bit_pattern_dict)
+
+
 # ************************************************************************************************
 def get_copy_of_empty_femelement_table(
     femelement_table
@@ -299,52 +541,9 @@ def get_ccxelement_faces_from_binary_search(
     # https://forum.freecadweb.org/viewtopic.php?f=18&t=17318&start=60#p141484
     # https://forum.freecadweb.org/viewtopic.php?f=18&t=17318&start=50#p141108
     # https://forum.freecadweb.org/viewtopic.php?f=18&t=17318&start=40#p140371
-    tet10_mask = {
-        119: 1,
-        411: 2,
-        717: 3,
-        814: 4}
-    tet4_mask = {
-        7: 1,
-        11: 2,
-        13: 3,
-        14: 4}
-    hex8_mask = {
-        240: 1,
-        15: 2,
-        102: 3,
-        204: 4,
-        153: 5,
-        51: 6}
-    hex20_mask = {
-        61680: 1,
-        3855: 2,
-        402022: 3,
-        804044: 4,
-        624793: 5,
-        201011: 6}
-    pent6_mask = {
-        56: 1,
-        7: 2,
-        54: 3,
-        45: 4,
-        27: 5}
-    pent15_mask = {
-        3640: 1,
-        455: 2,
-        25782: 3,
-        22829: 4,
-        12891: 5}
-    vol_dict = {
-        4: tet4_mask,
-        6: pent6_mask,
-        8: hex8_mask,
-        10: tet10_mask,
-        15: pent15_mask,
-        20: hex20_mask}
     faces = []
     for ele in bit_pattern_dict:
-        mask_dict = vol_dict[bit_pattern_dict[ele][0]]
+        mask_dict = CCX_VOLUME_FACE_MASKS[bit_pattern_dict[ele][0]]
         for key in mask_dict:
             if (key & bit_pattern_dict[ele][1]) == key:
                 faces.append([ele, mask_dict[key]])
@@ -366,6 +565,11 @@ def get_femelements_by_femnodes_bin(
     """
     FreeCAD.Console.PrintMessage(
         "binary search: get_femelements_by_femnodes_bin\n")
+    if isinstance(femnodes_ele_table, FemNodesEleIndex):
+        ele_list = femnodes_ele_table.get_femelements_by_femnodes(node_list)
+        FreeCAD.Console.PrintMessage("found Volumes: {}\n".format(len(ele_list)))
+        return ele_list
+    # all bits of the element nodes set
     vol_masks = {
         4: 15,
         6: 63,
@@ -809,8 +1013,11 @@ def get_elset_short_name(
 # ***** Vertex loads *****************************************************************************
 def get_force_obj_vertex_nodeload_table(
     femmesh,
-    frc_obj
+    frc_obj,
+    ref_nodes=None
 ):
+    # ref_nodes: {(object name, element name): nodes} of the vertices
+    # already searched, the nodes of other vertices are searched in the femmesh
     # force_obj_node_load_table:
     #     [
     #         ("refshape_name.elemname", node_load_table),
@@ -831,7 +1038,10 @@ def get_force_obj_vertex_nodeload_table(
                 "Element name: {3}\n"
                 .format(ref_node.ShapeType, o.Name, o.Label, elem)
             )
-            node = femmesh.getNodesByVertex(ref_node)
+            if ref_nodes and (o.Name, elem) in ref_nodes:
+                node = ref_nodes[(o.Name, elem)]
+            else:
+                node = femmesh.getNodesByVertex(ref_node)
             elem_info_string = "node load on shape: " + o.Name + ":" + elem
             if len(node) == 1:
                 force_obj_node_load_table.append(
@@ -853,8 +1063,11 @@ def get_force_obj_edge_nodeload_table(
     femmesh,
     femelement_table,
     femnodes_mesh,
-    frc_obj
+    frc_obj,
+    ref_nodes=None
 ):
+    # ref_nodes: {(object name, element name): nodes} of the edges
+    # already searched, see get_ref_edgenodes_table
     # force_obj_node_load_table:
     #     [
     #         ("refshape_name.elemname", node_load_table),
@@ -886,7 +1099,8 @@ def get_force_obj_edge_nodeload_table(
             # edge_table:
             #     { meshedgeID : ( nodeID, ... , nodeID ) }
             edge_table = get_ref_edgenodes_table(
-                femmesh, femelement_table, ref_edge)
+                femmesh, femelement_table, ref_edge,
+                ref_nodes.get((o.Name, elem)) if ref_nodes else None)
 
             # node_length_table:
             #     [ (nodeID, length), ... , (nodeID, length) ]
@@ -1014,10 +1228,12 @@ def get_force_obj_edge_nodeload_table(
 def get_ref_edgenodes_table(
     femmesh,
     femelement_table,
-    refedge
+    refedge,
+    refedge_nodes=None
 ):
     edge_table = {}  # { meshedgeID : ( nodeID, ... , nodeID ) }
-    refedge_nodes = femmesh.getNodesByEdge(refedge)
+    if refedge_nodes is None:
+        refedge_nodes = femmesh.getNodesByEdge(refedge)
     if is_solid_femmesh(femmesh):
         refedge_fem_volumeelements = []
         # if at least two nodes of a femvolumeelement are in
@@ -1675,13 +1891,11 @@ def get_pressure_obj_faces(
             femmesh, femobj)
         # FreeCAD.Console.PrintMessage("prs_face_node_set: {}\n".format(prs_face_node_set))
         # fill the bit_pattern_dict and search for the faces
-        bit_pattern_dict = get_bit_pattern_dict(
+        pressure_faces = get_ccxelement_faces_by_femnodes(
             femelement_table,
             femnodes_ele_table,
             prs_face_node_set
         )
-        pressure_faces = get_ccxelement_faces_from_binary_search(
-            bit_pattern_dict)
     elif is_face_femmesh(femmesh):
         pressure_faces = []
         # normally we should call get_femelements_by_references and
@@ -1803,23 +2017,17 @@ def get_contact_obj_faces(
 
         FreeCAD.Console.PrintLog(
             "    Fill the bit_pattern_dict and search for the faces.\n")
-        slave_bit_pattern_dict = get_bit_pattern_dict(
+        slave_faces = get_ccxelement_faces_by_femnodes(
             femelement_table,
             femnodes_ele_table,
             slaveface_nds
         )
-        master_bit_pattern_dict = get_bit_pattern_dict(
+        master_faces = get_ccxelement_faces_by_femnodes(
             femelement_table,
             femnodes_ele_table,
             masterface_nds
         )
 
-        FreeCAD.Console.PrintLog("    Get the FaceIDs.\n")
-        slave_faces = get_ccxelement_faces_from_binary_search(
-            slave_bit_pattern_dict)
-        master_faces = get_ccxelement_faces_from_binary_search(
-            master_bit_pattern_dict)
-
     elif is_face_femmesh(femmesh):
         slave_ref_shape = slave_ref[0].Shape.getElement(slave_ref[1][0])
         master_ref_shape = master_ref[0].Shape.getElement(master_ref[1][0])
@@ -1902,23 +2110,17 @@ def get_tie_obj_faces(
         # FreeCAD.Console.PrintLog("masterface_nds: {}\n".format(slaveface_nds))
 
         # fill the bit_pattern_dict and search for the faces
-        slave_bit_pattern_dict = get_bit_pattern_dict(
+        slave_faces = get_ccxelement_faces_by_femnodes(
             femelement_table,
             femnodes_ele_table,
             slaveface_nds
         )
-        master_bit_pattern_dict = get_bit_pattern_dict(
+        master_faces = get_ccxelement_faces_by_femnodes(
             femelement_table,
             femnodes_ele_table,
             masterface_nds
         )
 
-        # get the faces ids
-        slave_faces = get_ccxelement_faces_from_binary_search(
-            slave_bit_pattern_dict)
-        master_faces = get_ccxelement_faces_from_binary_search(
-            master_bit_pattern_dict)
-
     elif is_face_femmesh(femmesh):
         FreeCAD.Console.PrintError(
             "Shell mesh is not allowed for constraint tie.\n"
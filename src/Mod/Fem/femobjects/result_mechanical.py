@@ -30,6 +30,8 @@ __url__ = "https://www.freecadweb.org"
 #  \ingroup FEM
 #  \brief mechanical result object
 
+import FreeCAD
+
 from . import base_fempythonobject
 
 
@@ -52,6 +54,32 @@ class ResultMechanical(base_fempythonobject.BaseFemPythonObject):
         )
         obj.ResultType = str(self.Type)
 
+        # derived result fields which are calculated on first use
+        # see add_lazy_results in femresult/resulttools.py
+        obj.addProperty(
+            "App::PropertyStringList",
+            "LazyResults",
+            "Base",
+            "Derived result fields which are not yet calculated",
+            True
+        )
+
+        # multi step results stored in a result series, see femresult/resultseries.py
+        obj.addProperty(
+            "App::PropertyString",
+            "SeriesDirectory",
+            "Base",
+            "Directory of the result series with all increments",
+            True
+        )
+        obj.addProperty(
+            "App::PropertyInteger",
+            "SeriesIndex",
+            "Base",
+            "Increment of the result series the result fields are filled with",
+            True
+        )
+
         # for frequency analysis
         obj.addProperty(
             "App::PropertyInteger",
@@ -298,6 +326,25 @@ class ResultMechanical(base_fempythonobject.BaseFemPythonObject):
         zero_list = 26 * [0]
         obj.Stats = zero_list
 
+    def onChanged(self, obj, prop):
+        # fill the result fields with the increment of the result series set in SeriesIndex
+        # on restore the fields of the saved increment are restored with the document
+        if (
+            prop == "SeriesIndex"
+            and getattr(obj, "SeriesDirectory", "")
+            and "Restore" not in obj.State
+        ):
+            from femresult import resultseries
+            if resultseries.is_filling(obj):
+                return
+            try:
+                resultseries.fill_result_series_increment(obj, obj.SeriesIndex)
+            except (IndexError, OSError, ValueError) as e:
+                FreeCAD.Console.PrintError(
+                    "Increment {} of the result series {} could not be filled: {}\n"
+                    .format(obj.SeriesIndex, obj.SeriesDirectory, e)
+                )
+
     def onDocumentRestored(self, obj):
         # migrate old result objects, because property "StressValues"
         # was renamed to "vonMises" in commit 8b68ab7
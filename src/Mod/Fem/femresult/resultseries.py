@@ -0,0 +1,307 @@
+# ***************************************************************************
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "Fem result series"
+__author__ = "FreeCAD developers"
+__url__ = "https://www.freecadweb.org"
+
+## \addtogroup FEM
+#  @{
+
+# all increments of a multi step result share one mesh and one node map per field
+# the per increment result fields are stored in a sidecar directory
+# series.json ... fields and increments (time, eigenmode number)
+# <field>_nodes.bin ... int64 node numbers of the field, taken from its first increment
+# <field>.bin ... float64 values, shape (increments, nodes, components)
+# the field files are memory mapped, thus only the increment used is read
+
+import json
+import os
+
+import numpy as np
+
+import FreeCAD
+
+
+SERIES_FILE = "series.json"
+SERIES_VERSION = 1
+
+# result set key --> number of components
+SERIES_FIELDS = {
+    "disp": 3,
+    "stress": 6,
+    "strain": 6,
+    "peeq": 1,
+    "temp": 1,
+    "mflow": 1,
+    "npressure": 1,
+}
+
+# result set key --> result object properties
+SERIES_FIELD_PROPERTIES = {
+    "disp": ("DisplacementVectors",),
+    "stress": (
+        "NodeStressXX", "NodeStressYY", "NodeStressZZ",
+        "NodeStressXY", "NodeStressXZ", "NodeStressYZ"
+    ),
+    "strain": (
+        "NodeStrainXX", "NodeStrainYY", "NodeStrainZZ",
+        "NodeStrainXY", "NodeStrainXZ", "NodeStrainYZ"
+    ),
+    "peeq": ("Peeq",),
+    "temp": ("Temperature",),
+    "mflow": ("MassFlowRate",),
+    "npressure": ("NetworkPressure",),
+}
+
+
+def get_series_directory(result_file):
+    """Returns the sidecar directory of the result series of a result file"""
+    return os.path.splitext(result_file)[0] + "_series"
+
+
+class ResultSeriesWriter(object):
+    """Writes the result sets of a multi step result into a result series
+
+    The node map of a field is taken from the first increment the field is
+    found in. The values of all further increments are mapped onto it,
+    nodes without a value get NaN. Increments without the field get NaN rows.
+
+    Parameters
+    ----------
+    directory : str
+        sidecar directory, existing series files are overwritten
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.increments = []
+        self.node_ids = {}
+        self.node_sorters = {}
+        self.field_files = {}
+
+    def add_result_set(self, result_set):
+        """Appends one result set of iter_frd_result_arrays to the series"""
+        # item() gives Python numbers for json, NaN is kept
+        increment = {
+            "number": np.asarray(result_set.get("number", 0)).item(),
+            "time": np.asarray(result_set.get("time", 0.0)).item(),
+            "fields": []
+        }
+        for key in SERIES_FIELDS:
+            if key in result_set:
+                values = self._map_values(key, result_set[key])
+                increment["fields"].append(key)
+            elif key in self.field_files:
+                values = self._empty_values(key)
+            else:
+                continue
+            self.field_files[key].write(values.astype("<f8").tobytes())
+        self.increments.append(increment)
+
+    def close(self):
+        """Writes the series header, the series can be opened afterwards"""
+        for key, field_file in self.field_files.items():
+            field_file.close()
+            self.node_ids[key].astype("<i8").tofile(
+                os.path.join(self.directory, key + "_nodes.bin")
+            )
+        header = {
+            "version": SERIES_VERSION,
+            "fields": {
+                key: [len(self.node_ids[key]), SERIES_FIELDS[key]]
+                for key in self.field_files
+            },
+            "increments": self.increments,
+        }
+        with open(os.path.join(self.directory, SERIES_FILE), "w") as f:
+            json.dump(header, f)
+        FreeCAD.Console.PrintLog(
+            "Result series with {} increments written to: {}\n"
+            .format(len(self.increments), self.directory)
+        )
+
+    def _empty_values(self, key):
+        return np.full((len(self.node_ids[key]), SERIES_FIELDS[key]), np.nan)
+
+    def _map_values(self, key, block):
+        node_ids = np.asarray(block.node_ids, dtype=np.int64)
+        values = np.asarray(block.values, dtype=float).reshape(
+            len(node_ids), SERIES_FIELDS[key]
+        )
+        if key not in self.field_files:
+            # first increment with this field, its nodes are the node map
+            # a field found later gets NaN rows for the increments before
+            self.node_ids[key] = node_ids
+            self.node_sorters[key] = np.argsort(node_ids)
+            field_file = open(os.path.join(self.directory, key + ".bin"), "wb")
+            empty = self._empty_values(key).astype("<f8").tobytes()
+            for increment in self.increments:
+                field_file.write(empty)
+            self.field_files[key] = field_file
+            return values
+        field_node_ids = self.node_ids[key]
+        if np.array_equal(node_ids, field_node_ids):
+            return values
+        mapped = self._empty_values(key)
+        if len(field_node_ids) == 0:
+            return mapped
+        sorter = self.node_sorters[key]
+        pos = np.searchsorted(field_node_ids, node_ids, sorter=sorter)
+        rows = sorter[np.clip(pos, 0, len(field_node_ids) - 1)]
+        known = field_node_ids[rows] == node_ids
+        mapped[rows[known]] = values[known]
+        return mapped
+
+
+class ResultSeries(object):
+    """Read access to a result series written by ResultSeriesWriter
+
+    Parameters
+    ----------
+    directory : str
+        sidecar directory of the result series
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, SERIES_FILE), "r") as f:
+            header = json.load(f)
+        if header.get("version") != SERIES_VERSION:
+            raise ValueError("Unknown result series version in: {}".format(directory))
+        self.increments = header["increments"]
+        self.node_ids = {}
+        self.fields = {}
+        for key, (node_count, components) in header["fields"].items():
+            self.node_ids[key] = np.fromfile(
+                os.path.join(directory, key + "_nodes.bin"),
+                dtype="<i8"
+            )
+            if node_count == 0:
+                self.fields[key] = np.zeros((len(self.increments), 0, components))
+                continue
+            self.fields[key] = np.memmap(
+                os.path.join(directory, key + ".bin"),
+                dtype="<f8",
+                mode="r",
+                shape=(len(self.increments), node_count, components)
+            )
+
+    def __len__(self):
+        return len(self.increments)
+
+    def get_times(self):
+        return [increment["time"] for increment in self.increments]
+
+    def get_field(self, key, index):
+        """Returns the values of one field of one increment, shape (nodes, components)"""
+        return np.array(self.fields[key][index])
+
+    def get_result_set(self, index):
+        """Returns one increment as result set for fill_femresult_mechanical"""
+        from feminout.importCcxFrdResults import FrdResultBlock
+        increment = self.increments[index]
+        result_set = {"number": increment["number"], "time": increment["time"]}
+        for key in increment["fields"]:
+            values = self.get_field(key, index)
+            if values.shape[1] == 1:
+                values = values[:, 0]
+            result_set[key] = FrdResultBlock(self.node_ids[key], values)
+        return result_set
+
+
+# opened result series, the memory maps are shared by all result objects
+_open_series = {}
+
+
+def open_result_series(directory):
+    """Returns the ResultSeries of a sidecar directory, it is opened only once"""
+    directory = os.path.normpath(directory)
+    if directory not in _open_series:
+        _open_series[directory] = ResultSeries(directory)
+    return _open_series[directory]
+
+
+def close_result_series(directory):
+    """Releases the memory maps of a result series"""
+    _open_series.pop(os.path.normpath(directory), None)
+
+
+# result objects which are being filled, their SeriesIndex changes are not filled again
+_filling = set()
+
+
+def is_filling(res_obj):
+    return (res_obj.Document.Name, res_obj.Name) in _filling
+
+
+def fill_result_series_increment(res_obj, index):
+    """Fills a result object with one increment of its result series
+
+    The node numbers and the mesh of the result object are kept, the derived
+    result fields are registered as lazy, see resulttools.add_lazy_results.
+
+    Parameters
+    ----------
+    resultobj : Fem::ResultMechanical
+        FreeCAD FEM mechanical result object with SeriesDirectory set
+    index : int
+        increment index, negative values count from the last increment
+    """
+
+    series = open_result_series(res_obj.SeriesDirectory)
+    if index < 0:
+        index += len(series)
+    if not 0 <= index < len(series):
+        raise IndexError(
+            "Increment {} is out of the {} increments of the result series"
+            .format(index, len(series))
+        )
+    key = (res_obj.Document.Name, res_obj.Name)
+    _filling.add(key)
+    try:
+        return _fill_result_series_increment(res_obj, series, index)
+    finally:
+        _filling.discard(key)
+
+
+def _fill_result_series_increment(res_obj, series, index):
+    from feminout import importToolsFem
+    from femresult import resulttools
+
+    result_set = series.get_result_set(index)
+
+    # NodeNumbers are the compacted node numbers of the result mesh
+    node_numbers = res_obj.NodeNumbers
+    for key in series.fields:
+        if key not in result_set:
+            for prop in SERIES_FIELD_PROPERTIES[key]:
+                setattr(res_obj, prop, [])
+    res_obj = importToolsFem.fill_femresult_mechanical(res_obj, result_set)
+    if node_numbers:
+        res_obj.NodeNumbers = node_numbers
+    res_obj.SeriesIndex = index
+    res_obj = resulttools.add_lazy_results(res_obj)
+    return res_obj
+
+##  @}
@@ -27,7 +27,6 @@ __url__ = "https://www.freecadweb.org"
 #  @{
 
 import numpy as np
-from math import isnan
 
 import FreeCAD
 
@@ -133,6 +132,8 @@ def show_result(resultobj, result_type="Sabs", limit=None):
         reset_mesh_color(resultobj.Mesh)
         return
     if resultobj:
+        if result_type in RESULT_TYPE_LAZY_FIELDS:
+            fill_lazy_results(resultobj, [RESULT_TYPE_LAZY_FIELDS[result_type]])
         if result_type == "Sabs":
             values = resultobj.vonMises
         elif result_type == "Uabs":
@@ -194,6 +195,11 @@ def get_stats(res_obj, result_type):
 
     """
 
+    lazy_fields = ["Stats"]
+    if result_type in RESULT_TYPE_LAZY_FIELDS:
+        lazy_fields.append(RESULT_TYPE_LAZY_FIELDS[result_type])
+    fill_lazy_results(res_obj, lazy_fields)
+
     match_table = get_all_stats(res_obj)
     match_table["None"] = (0.0, 0.0)
     stats = ()
@@ -367,18 +373,8 @@ def add_disp_apps(res_obj):
 
 
 def add_von_mises(res_obj):
-    mstress = []
-    iterator = zip(
-        res_obj.NodeStressXX,
-        res_obj.NodeStressYY,
-        res_obj.NodeStressZZ,
-        res_obj.NodeStressXY,
-        res_obj.NodeStressXZ,
-        res_obj.NodeStressYZ
-    )
-    for Sxx, Syy, Szz, Sxy, Sxz, Syz in iterator:
-        mstress.append(calculate_von_mises((Sxx, Syy, Szz, Sxy, Sxz, Syz)))
-    res_obj.vonMises = mstress
+    stress = get_stress_array(res_obj)
+    res_obj.vonMises = calculate_von_mises_array(stress).tolist()
     FreeCAD.Console.PrintLog("Added von Mises stress.\n")
     return res_obj
 
@@ -388,32 +384,170 @@ def add_principal_stress_std(res_obj):
     # TODO may be use only one container for principal stresses in result object
     # https://forum.freecadweb.org/viewtopic.php?f=18&t=33106&p=416006#p416006
     # but which one is better
-    prinstress1 = []
-    prinstress2 = []
-    prinstress3 = []
-    shearstress = []
-    iterator = zip(
-        res_obj.NodeStressXX,
-        res_obj.NodeStressYY,
-        res_obj.NodeStressZZ,
-        res_obj.NodeStressXY,
-        res_obj.NodeStressXZ,
-        res_obj.NodeStressYZ
-    )
-    for Sxx, Syy, Szz, Sxy, Sxz, Syz in iterator:
-        prin1, prin2, prin3, shear = calculate_principal_stress_std((Sxx, Syy, Szz, Sxy, Sxz, Syz))
-        prinstress1.append(prin1)
-        prinstress2.append(prin2)
-        prinstress3.append(prin3)
-        shearstress.append(shear)
-    res_obj.PrincipalMax = prinstress1
-    res_obj.PrincipalMed = prinstress2
-    res_obj.PrincipalMin = prinstress3
-    res_obj.MaxShear = shearstress
+    stress = get_stress_array(res_obj)
+    prinstress = calculate_principal_stress_std_array(stress)
+    res_obj.PrincipalMax = prinstress[:, 0].tolist()
+    res_obj.PrincipalMed = prinstress[:, 1].tolist()
+    res_obj.PrincipalMin = prinstress[:, 2].tolist()
+    res_obj.MaxShear = prinstress[:, 3].tolist()
     FreeCAD.Console.PrintLog("Added standard principal stresses and max shear values.\n")
     return res_obj
 
 
+def add_principal_stress(res_obj):
+    # if material reinforced object use add additional values to the res_obj
+    if res_obj.getParentGroup():
+        for obj in res_obj.getParentGroup().Group:
+            if is_of_type(obj, "Fem::MaterialReinforced"):
+                FreeCAD.Console.PrintLog(
+                    "Reinforced material object detected, "
+                    "reinforced principal stresses and standard principal "
+                    "stresses will be added.\n"
+                )
+                return add_principal_stress_reinforced(res_obj)
+        FreeCAD.Console.PrintLog(
+            "No reinforced material object detected, "
+            "standard principal stresses will be added.\n"
+        )
+    else:
+        # if a pure frd file was opened no analysis and thus no parent group
+        FreeCAD.Console.PrintLog(
+            "No Analysis detected, standard principal stresses will be added.\n"
+        )
+    # fill PrincipalMax, PrincipalMed, PrincipalMin, MaxShear
+    return add_principal_stress_std(res_obj)
+
+
+def add_derived_results(res_obj):
+    """Calculates all derived result fields and the stats of a result object
+
+    Parameters
+    ----------
+    resultobj : Fem::ResultMechanical
+        FreeCAD FEM mechanical result object
+    """
+
+    for field in LAZY_RESULT_FIELDS:
+        res_obj = _add_lazy_field(res_obj, field)
+    res_obj = fill_femresult_stats(res_obj)
+    if getattr(res_obj, "LazyResults", None):
+        res_obj.LazyResults = []
+    return res_obj
+
+
+# derived result fields, they are calculated from the result data read
+# on demand if they are registered as lazy, see add_lazy_results
+# Stats is not in the list, but can be registered as lazy too
+LAZY_RESULT_FIELDS = (
+    "DisplacementLengths",
+    "vonMises",
+    "PrincipalStress",
+)
+
+# result type, see get_all_stats --> derived result field needed
+RESULT_TYPE_LAZY_FIELDS = {
+    "Uabs": "DisplacementLengths",
+    "Sabs": "vonMises",
+    "MaxPrin": "PrincipalStress",
+    "MidPrin": "PrincipalStress",
+    "MinPrin": "PrincipalStress",
+    "MaxShear": "PrincipalStress",
+}
+
+
+def add_lazy_results(res_obj):
+    """Registers the derived result fields and the stats of a result object as lazy
+
+    They are calculated, cached and stored in the result object the first time
+    they are asked for by show_result, get_stats, fill_lazy_results.
+
+    Parameters
+    ----------
+    resultobj : Fem::ResultMechanical
+        FreeCAD FEM mechanical result object
+    """
+
+    res_obj.LazyResults = list(LAZY_RESULT_FIELDS) + ["Stats"]
+    FreeCAD.Console.PrintLog(
+        "Registered lazy results for result obj: " + res_obj.Name + "\n"
+    )
+    return res_obj
+
+
+def fill_lazy_results(res_obj, fields=None):
+    """Calculates derived result fields which are registered as lazy
+
+    Parameters
+    ----------
+    resultobj : Fem::ResultMechanical
+        FreeCAD FEM mechanical result object
+    fields : list of str, optional
+        derived result fields to calculate, see LAZY_RESULT_FIELDS, and "Stats"
+        fields not registered as lazy are ignored, they are up to date
+        default is None, all lazy fields are calculated
+    """
+
+    lazy_fields = list(getattr(res_obj, "LazyResults", []))
+    if not lazy_fields:
+        return res_obj
+    if fields is None:
+        fields = lazy_fields
+
+    added_field = False
+    for field in LAZY_RESULT_FIELDS:
+        if field in fields and field in lazy_fields:
+            res_obj = _add_lazy_field(res_obj, field)
+            lazy_fields.remove(field)
+            added_field = True
+
+    # the stats include the derived fields, thus they are updated on every new field
+    if added_field or ("Stats" in fields and "Stats" in lazy_fields):
+        res_obj = fill_femresult_stats(res_obj)
+        if "Stats" in lazy_fields:
+            lazy_fields.remove("Stats")
+
+    res_obj.LazyResults = lazy_fields
+    return res_obj
+
+
+def _add_lazy_field(res_obj, field):
+    if field == "DisplacementLengths":
+        # fill DisplacementLengths
+        return add_disp_apps(res_obj)
+    elif field == "vonMises":
+        # fill vonMises
+        return add_von_mises(res_obj)
+    elif field == "PrincipalStress":
+        # fill principal stress
+        return add_principal_stress(res_obj)
+    return res_obj
+
+
+def get_stress_array(res_obj):
+    """Returns the stress tensors of a result object as one array
+
+    Parameters
+    ----------
+    resultobj : Fem::ResultMechanical
+        FreeCAD FEM mechanical result object
+
+    Returns
+    -------
+    numpy.ndarray
+        shape (number of nodes, 6), columns (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+    """
+
+    stress = np.column_stack((
+        np.asarray(res_obj.NodeStressXX, dtype=float),
+        np.asarray(res_obj.NodeStressYY, dtype=float),
+        np.asarray(res_obj.NodeStressZZ, dtype=float),
+        np.asarray(res_obj.NodeStressXY, dtype=float),
+        np.asarray(res_obj.NodeStressXZ, dtype=float),
+        np.asarray(res_obj.NodeStressYZ, dtype=float)
+    ))
+    return stress.reshape(-1, 6)
+
+
 def get_concrete_nodes(res_obj):
 
     #
@@ -473,21 +607,6 @@ def add_principal_stress_reinforced(res_obj):
     # TODO may be use only one container for principal stresses in result object
     # https://forum.freecadweb.org/viewtopic.php?f=18&t=33106&p=416006#p416006
     # but which one is better
-    prinstress1 = []
-    prinstress2 = []
-    prinstress3 = []
-    shearstress = []
-    ps1v = []
-    ps2v = []
-    ps3v = []
-    #
-    # HarryvL: additional arrays to hold reinforcement ratios
-    # and mohr coulomb stress
-    #
-    rhx = []
-    rhy = []
-    rhz = []
-    moc = []
 
     # material parameter
     for obj in res_obj.getParentGroup().Group:
@@ -505,70 +624,43 @@ def add_principal_stress_reinforced(res_obj):
     # print(matrix_cs)
     # print(reinforce_yield)
 
-    iterator = zip(
-        res_obj.NodeStressXX,
-        res_obj.NodeStressYY,
-        res_obj.NodeStressZZ,
-        res_obj.NodeStressXY,
-        res_obj.NodeStressXZ,
-        res_obj.NodeStressYZ
-    )
-    for isv, stress_tensor in enumerate(iterator):
-
-        rhox = 0.
-        rhoy = 0.
-        rhoz = 0.
-        mc = 0.
-
-        if ic[isv] == 1:
-            #
-            # HarryvL: for concrete scxx etc. are affected by
-            # reinforcement (see calculate_rho(stress_tensor)). for all other
-            # materials scxx etc. are the original stresses
-            #
-            rhox, rhoy, rhoz = calculate_rho(
-                stress_tensor,
-                reinforce_yield
-            )
+    stress = get_stress_array(res_obj)
+    prinstress, psv = calculate_principal_stress_reinforced_array(stress)
 
-        prin1, prin2, prin3, shear, psv = calculate_principal_stress_reinforced(
-            stress_tensor
+    #
+    # HarryvL: for concrete scxx etc. are affected by
+    # reinforcement (see calculate_rho(stress_tensor)). for all other
+    # materials scxx etc. are the original stresses
+    # additional arrays to hold reinforcement ratios and mohr coulomb stress
+    #
+    is_concrete = ic[:len(stress)] == 1
+    rho = np.zeros((len(stress), 3))
+    moc = np.zeros(len(stress))
+    if is_concrete.any():
+        rho[is_concrete] = calculate_rho_array(stress[is_concrete], reinforce_yield)
+        moc[is_concrete] = calculate_mohr_coulomb_array(
+            prinstress[is_concrete, 0],
+            prinstress[is_concrete, 2],
+            matrix_af,
+            matrix_cs
         )
 
-        prinstress1.append(prin1)
-        prinstress2.append(prin2)
-        prinstress3.append(prin3)
-        shearstress.append(shear)
-        ps1v.append(psv[0])
-        ps2v.append(psv[1])
-        ps3v.append(psv[2])
-
-        #
-        # reinforcement ratios and mohr coulomb criterion
-        #
-        rhx.append(rhox)
-        rhy.append(rhoy)
-        rhz.append(rhoz)
-        if ic[isv] == 1:
-            mc = calculate_mohr_coulomb(prin1, prin3, matrix_af, matrix_cs)
-        moc.append(mc)
-
-    res_obj.PrincipalMax = prinstress1
-    res_obj.PrincipalMed = prinstress2
-    res_obj.PrincipalMin = prinstress3
-    res_obj.MaxShear = shearstress
+    res_obj.PrincipalMax = prinstress[:, 0].tolist()
+    res_obj.PrincipalMed = prinstress[:, 1].tolist()
+    res_obj.PrincipalMin = prinstress[:, 2].tolist()
+    res_obj.MaxShear = prinstress[:, 3].tolist()
     #
     # HarryvL: additional concrete and principal stress plot
     # results for use in _ViewProviderFemResultMechanical
     #
-    res_obj.ReinforcementRatio_x = rhx
-    res_obj.ReinforcementRatio_y = rhy
-    res_obj.ReinforcementRatio_z = rhz
-    res_obj.MohrCoulomb = moc
+    res_obj.ReinforcementRatio_x = rho[:, 0].tolist()
+    res_obj.ReinforcementRatio_y = rho[:, 1].tolist()
+    res_obj.ReinforcementRatio_z = rho[:, 2].tolist()
+    res_obj.MohrCoulomb = moc.tolist()
 
-    res_obj.PS1Vector = ps1v
-    res_obj.PS2Vector = ps2v
-    res_obj.PS3Vector = ps3v
+    res_obj.PS1Vector = [tuple(v) for v in psv[:, 0].tolist()]
+    res_obj.PS2Vector = [tuple(v) for v in psv[:, 1].tolist()]
+    res_obj.PS3Vector = [tuple(v) for v in psv[:, 2].tolist()]
 
     FreeCAD.Console.PrintLog(
         "Added reinforcement principal stresses and max shear values as well as "
@@ -603,47 +695,75 @@ def compact_result(res_obj):
     return res_obj
 
 
+# the calculate_*_array methods work on all nodes at once
+# stress ... array of shape (number of nodes, 6), columns (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+# the calculate_* methods for one stress tensor are wrappers around them
+
+
 def calculate_von_mises(stress_tensor):
+    # stress_tensor ... (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+    return calculate_von_mises_array(np.array([stress_tensor], dtype=float))[0]
+
+
+def calculate_von_mises_array(stress):
     # Von mises stress: http://en.wikipedia.org/wiki/Von_Mises_yield_criterion
     # simplification: https://forum.freecadweb.org/viewtopic.php?f=18&t=33974&p=296542#p296542
-    # stress_tensor ... (Sxx, Syy, Szz, Sxy, Sxz, Syz)
-    normal = stress_tensor[:3]
-    shear = stress_tensor[3:]
-    pressure = np.average(normal)
-    return np.sqrt(1.5 * np.linalg.norm(normal - pressure)**2 + 3.0 * np.linalg.norm(shear)**2)
+    normal = stress[:, :3]
+    shear = stress[:, 3:]
+    pressure = np.average(normal, axis=1)
+    deviatoric = normal - pressure[:, np.newaxis]
+    return np.sqrt(
+        1.5 * np.einsum("ij,ij->i", deviatoric, deviatoric)
+        + 3.0 * np.einsum("ij,ij->i", shear, shear)
+    )
+
+
+def get_stress_tensor_matrices(stress):
+    # (Sxx, Syy, Szz, Sxy, Sxz, Syz) --> symmetric 3x3 matrices, shape (n, 3, 3)
+    # https://forum.freecadweb.org/viewtopic.php?f=18&t=24637&start=10#p240408
+    return stress[:, (
+        (0, 3, 4),
+        (3, 1, 5),
+        (4, 5, 2)
+    )]
 
 
 def calculate_principal_stress_std(
     stress_tensor
 ):
+    # stress_tensor ... (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+    prin = calculate_principal_stress_std_array(np.array([stress_tensor], dtype=float))[0]
+    return tuple(prin.tolist())
+
+
+def calculate_principal_stress_std_array(stress):
+    # returns array of shape (n, 4), columns (prin1, prin2, prin3, maxshear)
+    # prin1 >= prin2 >= prin3
 
-    # if NaN is inside the array, which can happen on Calculix frd result files return NaN
+    # if NaN is inside a stress tensor, which can happen on Calculix frd result files
+    # NaN is returned for this node
     # https://forum.freecadweb.org/viewtopic.php?f=22&t=33911&start=10#p284229
     # https://forum.freecadweb.org/viewtopic.php?f=18&t=32649#p274291
-    for s in stress_tensor:
-        if isnan(s) is True:
-            return (float("NaN"), float("NaN"), float("NaN"), float("NaN"))
-
-    s11 = stress_tensor[0]  # Sxx
-    s22 = stress_tensor[1]  # Syy
-    s33 = stress_tensor[2]  # Szz
-    s12 = stress_tensor[3]  # Sxy
-    s31 = stress_tensor[4]  # Sxz
-    s23 = stress_tensor[5]  # Syz
-    sigma = np.array([
-        [s11, s12, s31],
-        [s12, s22, s23],
-        [s31, s23, s33]
-    ])  # https://forum.freecadweb.org/viewtopic.php?f=18&t=24637&start=10#p240408
-
-    eigvals = list(np.linalg.eigvalsh(sigma))
-    eigvals.sort()
-    eigvals.reverse()
-    maxshear = (eigvals[0] - eigvals[2]) / 2.0
-    return (eigvals[0], eigvals[1], eigvals[2], maxshear)
+    prin = np.full((len(stress), 4), np.nan)
+    valid = ~np.isnan(stress).any(axis=1)
+    if valid.any():
+        # eigvalsh returns the eigenvalues in ascending order
+        eigvals = np.linalg.eigvalsh(get_stress_tensor_matrices(stress[valid]))[:, ::-1]
+        prin[valid, :3] = eigvals
+        prin[valid, 3] = (eigvals[:, 0] - eigvals[:, 2]) / 2.0
+    return prin
 
 
 def calculate_principal_stress_reinforced(stress_tensor):
+    # stress_tensor ... (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+    prin, psv = calculate_principal_stress_reinforced_array(
+        np.array([stress_tensor], dtype=float)
+    )
+    prin1, prin2, prin3, maxshear = prin[0].tolist()
+    return (prin1, prin2, prin3, maxshear, tuple([tuple(row) for row in psv[0].tolist()]))
+
+
+def calculate_principal_stress_reinforced_array(stress):
     #
     #   HarryvL - calculate principal stress vectors and values
     #           - for total stresses use stress_tensor[0], stress_tensor[1], stress_tensor[2]
@@ -652,20 +772,18 @@ def calculate_principal_stress_reinforced(stress_tensor):
     # difference to the original method:
     # https://forum.freecadweb.org/viewtopic.php?f=18&t=33106&start=90#p296539
     #
+    # returns
+    # array of shape (n, 4), columns (prin1, prin2, prin3, maxshear)
+    # array of shape (n, 3, 3), principal stress vectors of prin1, prin2, prin3
+    # nodes with NaN in the stress tensor get NaN values and vectors
+    #
+    prin = np.full((len(stress), 4), np.nan)
+    psv = np.full((len(stress), 3, 3), np.nan)
+    valid = ~np.isnan(stress).any(axis=1)
+    if not valid.any():
+        return prin, psv
 
-    s11 = stress_tensor[0]  # Sxx
-    s22 = stress_tensor[1]  # Syy
-    s33 = stress_tensor[2]  # Szz
-    s12 = stress_tensor[3]  # Sxy
-    s31 = stress_tensor[4]  # Sxz
-    s23 = stress_tensor[5]  # Syz
-    sigma = np.array([
-        [s11, s12, s31],
-        [s12, s22, s23],
-        [s31, s23, s33]
-    ])  # https://forum.freecadweb.org/viewtopic.php?f=18&t=24637&start=10#p240408
-
-    eigenvalues, eigenvectors = np.linalg.eig(sigma)
+    eigenvalues, eigenvectors = np.linalg.eig(get_stress_tensor_matrices(stress[valid]))
 
     #
     #   HarryvL: suppress complex eigenvalue and vectors that may occur for
@@ -675,21 +793,34 @@ def calculate_principal_stress_reinforced(stress_tensor):
     eigenvalues = eigenvalues.real
     eigenvectors = eigenvectors.real
 
-    eigenvectors[:, 0] = eigenvalues[0] * eigenvectors[:, 0]
-    eigenvectors[:, 1] = eigenvalues[1] * eigenvectors[:, 1]
-    eigenvectors[:, 2] = eigenvalues[2] * eigenvectors[:, 2]
-
-    idx = eigenvalues.argsort()[::-1]
-    eigenvalues = eigenvalues[idx]
-    eigenvectors = eigenvectors[:, idx]
+    # eigenvectors[:, :, i] belongs to eigenvalues[:, i]
+    # scale them and transpose, thus vectors[:, i] is the vector of eigenvalue i
+    vectors = np.swapaxes(eigenvectors * eigenvalues[:, np.newaxis, :], 1, 2)
 
-    maxshear = (eigenvalues[0] - eigenvalues[2]) / 2.0
+    idx = np.argsort(eigenvalues, axis=1)[:, ::-1]
+    eigenvalues = np.take_along_axis(eigenvalues, idx, axis=1)
+    vectors = np.take_along_axis(vectors, idx[:, :, np.newaxis], axis=1)
 
-    return (eigenvalues[0], eigenvalues[1], eigenvalues[2], maxshear,
-            tuple([tuple(row) for row in eigenvectors.T]))
+    prin[valid, :3] = eigenvalues
+    prin[valid, 3] = (eigenvalues[:, 0] - eigenvalues[:, 2]) / 2.0
+    psv[valid] = vectors
+    return prin, psv
 
 
 def calculate_rho(stress_tensor, fy):
+    # stress_tensor ... (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+    rho = calculate_rho_array(np.array([stress_tensor], dtype=float), fy)[0]
+    return tuple(rho.tolist())
+
+
+def _divide_where_nonzero(numerator, denominator):
+    # numerator / denominator, 0.0 where the denominator is 0.0
+    result = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator, denominator, out=result, where=(denominator != 0.))
+    return result
+
+
+def calculate_rho_array(stress, fy):
 
     #
     #   HarryvL - Calculation of Reinforcement Ratios and
@@ -698,20 +829,21 @@ def calculate_rho(stress_tensor, fy):
     #             https://forum.freecadweb.org/viewtopic.php?f=18&t=28821
     #                   fy: factored yield strength of reinforcement bars
     #
+    # returns array of shape (n, 3), columns (rhox, rhoy, rhoz)
+    # all 15 solutions are evaluated for all nodes at once,
+    # a solution not defined for a node (division by 0) is 0.0
+    #
 
-    rmin = 1.0e9
-    eqmin = 14
-
-    sxx = stress_tensor[0]
-    syy = stress_tensor[1]
-    szz = stress_tensor[2]
-    sxy = stress_tensor[3]
-    syz = stress_tensor[5]
-    sxz = stress_tensor[4]
+    sxx = stress[:, 0]
+    syy = stress[:, 1]
+    szz = stress[:, 2]
+    sxy = stress[:, 3]
+    syz = stress[:, 5]
+    sxz = stress[:, 4]
 
-    rhox = np.zeros(15)
-    rhoy = np.zeros(15)
-    rhoz = np.zeros(15)
+    rhox = np.zeros((len(stress), 15))
+    rhoy = np.zeros((len(stress), 15))
+    rhoz = np.zeros((len(stress), 15))
 
     #    i1=sxx+syy+szz NOT USED
     #    i2=sxx*syy+syy*szz+szz*sxx-sxy**2-sxz**2-syz**2 NOT USED
@@ -719,129 +851,115 @@ def calculate_rho(stress_tensor, fy):
           - syy * sxz**2 - szz * sxy**2)
 
     #    Solution (5)
-    d = (sxx * syy - sxy**2)
-    if d != 0.:
-        rhoz[0] = i3 / d / fy
+    rhoz[:, 0] = _divide_where_nonzero(i3, (sxx * syy - sxy**2)) / fy
 
     #    Solution (6)
-    d = (sxx * szz - sxz**2)
-    if d != 0.:
-        rhoy[1] = i3 / d / fy
+    rhoy[:, 1] = _divide_where_nonzero(i3, (sxx * szz - sxz**2)) / fy
 
     #    Solution (7)
-    d = (syy * szz - syz**2)
-    if d != 0.:
-        rhox[2] = i3 / d / fy
+    rhox[:, 2] = _divide_where_nonzero(i3, (syy * szz - syz**2)) / fy
 
     #    Solution (9)
-    if sxx != 0.:
-        fc = sxz * sxy / sxx - syz
-        fxy = sxy**2 / sxx
-        fxz = sxz**2 / sxx
-
-        #    Solution (9+)
-        rhoy[3] = syy - fxy + fc
-        rhoy[3] /= fy
-        rhoz[3] = szz - fxz + fc
-        rhoz[3] /= fy
-
-        #    Solution (9-)
-        rhoy[4] = syy - fxy - fc
-        rhoy[4] /= fy
-        rhoz[4] = szz - fxz - fc
-        rhoz[4] /= fy
+    has_sxx = sxx != 0.
+    fc = _divide_where_nonzero(sxz * sxy, sxx) - syz
+    fxy = _divide_where_nonzero(sxy**2, sxx)
+    fxz = _divide_where_nonzero(sxz**2, sxx)
 
-    #   Solution (10)
-    if syy != 0.:
-        fc = syz * sxy / syy - sxz
-        fxy = sxy**2 / syy
-        fyz = syz**2 / syy
+    #    Solution (9+)
+    rhoy[:, 3] = np.where(has_sxx, (syy - fxy + fc) / fy, 0.)
+    rhoz[:, 3] = np.where(has_sxx, (szz - fxz + fc) / fy, 0.)
 
-        # Solution (10+)
-        rhox[5] = sxx - fxy + fc
-        rhox[5] /= fy
-        rhoz[5] = szz - fyz + fc
-        rhoz[5] /= fy
+    #    Solution (9-)
+    rhoy[:, 4] = np.where(has_sxx, (syy - fxy - fc) / fy, 0.)
+    rhoz[:, 4] = np.where(has_sxx, (szz - fxz - fc) / fy, 0.)
 
-        # Solution (10-)vm
-        rhox[6] = sxx - fxy - fc
+    #   Solution (10)
+    has_syy = syy != 0.
+    fc = _divide_where_nonzero(syz * sxy, syy) - sxz
+    fxy = _divide_where_nonzero(sxy**2, syy)
+    fyz = _divide_where_nonzero(syz**2, syy)
 
-        rhox[6] /= fy
-        rhoz[6] = szz - fyz - fc
-        rhoz[6] /= fy
+    # Solution (10+)
+    rhox[:, 5] = np.where(has_syy, (sxx - fxy + fc) / fy, 0.)
+    rhoz[:, 5] = np.where(has_syy, (szz - fyz + fc) / fy, 0.)
+
+    # Solution (10-)
+    rhox[:, 6] = np.where(has_syy, (sxx - fxy - fc) / fy, 0.)
+    rhoz[:, 6] = np.where(has_syy, (szz - fyz - fc) / fy, 0.)
 
     # Solution (11)
-    if szz != 0.:
-        fc = sxz * syz / szz - sxy
-        fxz = sxz**2 / szz
-        fyz = syz**2 / szz
-
-        # Solution (11+)
-        rhox[7] = sxx - fxz + fc
-        rhox[7] /= fy
-        rhoy[7] = syy - fyz + fc
-        rhoy[7] /= fy
-
-        # Solution (11-)
-        rhox[8] = sxx - fxz - fc
-        rhox[8] /= fy
-        rhoy[8] = syy - fyz - fc
-        rhoy[8] /= fy
+    has_szz = szz != 0.
+    fc = _divide_where_nonzero(sxz * syz, szz) - sxy
+    fxz = _divide_where_nonzero(sxz**2, szz)
+    fyz = _divide_where_nonzero(syz**2, szz)
+
+    # Solution (11+)
+    rhox[:, 7] = np.where(has_szz, (sxx - fxz + fc) / fy, 0.)
+    rhoy[:, 7] = np.where(has_szz, (syy - fyz + fc) / fy, 0.)
+
+    # Solution (11-)
+    rhox[:, 8] = np.where(has_szz, (sxx - fxz - fc) / fy, 0.)
+    rhoy[:, 8] = np.where(has_szz, (syy - fyz - fc) / fy, 0.)
 
     # Solution (13)
-    rhox[9] = (sxx + sxy + sxz) / fy
-    rhoy[9] = (syy + sxy + syz) / fy
-    rhoz[9] = (szz + sxz + syz) / fy
+    rhox[:, 9] = (sxx + sxy + sxz) / fy
+    rhoy[:, 9] = (syy + sxy + syz) / fy
+    rhoz[:, 9] = (szz + sxz + syz) / fy
 
     # Solution (14)
-    rhox[10] = (sxx + sxy - sxz) / fy
-    rhoy[10] = (syy + sxy - syz) / fy
-    rhoz[10] = (szz - sxz - syz) / fy
+    rhox[:, 10] = (sxx + sxy - sxz) / fy
+    rhoy[:, 10] = (syy + sxy - syz) / fy
+    rhoz[:, 10] = (szz - sxz - syz) / fy
 
     # Solution (15)
-    rhox[11] = (sxx - sxy - sxz) / fy
-    rhoy[11] = (syy - sxy + syz) / fy
-    rhoz[11] = (szz - sxz + syz) / fy
+    rhox[:, 11] = (sxx - sxy - sxz) / fy
+    rhoy[:, 11] = (syy - sxy + syz) / fy
+    rhoz[:, 11] = (szz - sxz + syz) / fy
 
     # Solution (16)
-    rhox[12] = (sxx - sxy + sxz) / fy
-    rhoy[12] = (syy - sxy - syz) / fy
-    rhoz[12] = (szz + sxz - syz) / fy
+    rhox[:, 12] = (sxx - sxy + sxz) / fy
+    rhoy[:, 12] = (syy - sxy - syz) / fy
+    rhoz[:, 12] = (szz + sxz - syz) / fy
 
     # Solution (17)
-    if syz != 0.:
-        rhox[13] = (sxx - sxy * sxz / syz) / fy
-    if sxz != 0.:
-        rhoy[13] = (syy - sxy * syz / sxz) / fy
-    if sxy != 0.:
-        rhoz[13] = (szz - sxz * syz / sxy) / fy
-
-    for ir in range(0, rhox.size):
-
-        if rhox[ir] >= -1.e-10 and rhoy[ir] >= -1.e-10 and rhoz[ir] > -1.e-10:
-
-            # Concrete Stresses
-            scxx = sxx - rhox[ir] * fy
-            scyy = syy - rhoy[ir] * fy
-            sczz = szz - rhoz[ir] * fy
-            ic1 = (scxx + scyy + sczz)
-            ic2 = (scxx * scyy + scyy * sczz + sczz * scxx - sxy**2
-                   - sxz**2 - syz**2)
-            ic3 = (scxx * scyy * sczz + 2 * sxy * sxz * syz - scxx * syz**2
-                   - scyy * sxz**2 - sczz * sxy**2)
+    rhox[:, 13] = np.where(syz != 0., (sxx - _divide_where_nonzero(sxy * sxz, syz)) / fy, 0.)
+    rhoy[:, 13] = np.where(sxz != 0., (syy - _divide_where_nonzero(sxy * syz, sxz)) / fy, 0.)
+    rhoz[:, 13] = np.where(sxy != 0., (szz - _divide_where_nonzero(sxz * syz, sxy)) / fy, 0.)
+
+    # Concrete Stresses of all solutions
+    scxx = sxx[:, np.newaxis] - rhox * fy
+    scyy = syy[:, np.newaxis] - rhoy * fy
+    sczz = szz[:, np.newaxis] - rhoz * fy
+    sxy = sxy[:, np.newaxis]
+    sxz = sxz[:, np.newaxis]
+    syz = syz[:, np.newaxis]
+    ic1 = (scxx + scyy + sczz)
+    ic2 = (scxx * scyy + scyy * sczz + sczz * scxx - sxy**2
+           - sxz**2 - syz**2)
+    ic3 = (scxx * scyy * sczz + 2 * sxy * sxz * syz - scxx * syz**2
+           - scyy * sxz**2 - sczz * sxy**2)
+
+    rsum = rhox + rhoy + rhoz
+    admissible = (
+        (rhox >= -1.e-10) & (rhoy >= -1.e-10) & (rhoz > -1.e-10)
+        & (ic1 <= 1.e-6) & (ic2 >= -1.e-6) & (ic3 <= 1.0e-6)
+        & (rsum < 1.0e9) & (rsum > 0.)
+    )
 
-            if ic1 <= 1.e-6 and ic2 >= -1.e-6 and ic3 <= 1.0e-6:
+    # the admissible solution with the smallest sum of reinforcement ratios,
+    # if there is none solution 14 is used, which is always 0.0
+    rsum = np.where(admissible, rsum, np.inf)
+    eqmin = np.where(admissible.any(axis=1), np.argmin(rsum, axis=1), 14)
+    rows = np.arange(len(stress))
 
-                rsum = rhox[ir] + rhoy[ir] + rhoz[ir]
+    return np.column_stack((rhox[rows, eqmin], rhoy[rows, eqmin], rhoz[rows, eqmin]))
 
-                if rsum < rmin and rsum > 0.:
-                    rmin = rsum
-                    eqmin = ir
 
-    return rhox[eqmin], rhoy[eqmin], rhoz[eqmin]
+def calculate_mohr_coulomb(prin1, prin3, phi, fck):
+    return float(calculate_mohr_coulomb_array(prin1, prin3, phi, fck))
 
 
-def calculate_mohr_coulomb(prin1, prin3, phi, fck):
+def calculate_mohr_coulomb_array(prin1, prin3, phi, fck):
     #
     #   HarryvL - Calculation of Mohr Coulomb yield criterion to judge
     #             concrete curshing and shear failure
@@ -854,14 +972,17 @@ def calculate_mohr_coulomb(prin1, prin3, phi, fck):
     mc_stress = ((prin1 - prin3) + (prin1 + prin3) * np.sin(phi)
                  - 2. * coh * np.cos(phi))
 
-    if mc_stress < 0.:
-        mc_stress = 0.
-
-    return mc_stress
+    return np.maximum(mc_stress, 0.)
 
 
 def calculate_disp_abs(displacements):
     # see https://forum.freecadweb.org/viewtopic.php?f=18&t=33106&start=100#p296657
-    return [np.linalg.norm(nd) for nd in displacements]
+    return calculate_disp_abs_array(displacements).tolist()
+
+
+def calculate_disp_abs_array(displacements):
+    # displacements ... FreeCAD vectors or array of shape (n, 3)
+    displacements = np.asarray(displacements, dtype=float).reshape(-1, 3)
+    return np.sqrt(np.einsum("ij,ij->i", displacements, displacements))
 
 ##  @}
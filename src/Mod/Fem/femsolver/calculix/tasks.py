@@ -165,8 +165,13 @@ class Results(run.Results):
             self.directory, _inputFileName + ".frd")
         if os.path.isfile(frd_result_file):
             result_name_prefix = "CalculiX_" + self.solver.AnalysisType + "_"
+            # multi step results go into one result object if the preference is set
+            result_series = FreeCAD.ParamGet(
+                "User parameter:BaseApp/Preferences/Mod/Fem/Ccx"
+            ).GetBool("ResultSeries", False)
             importCcxFrdResults.importFrd(
-                frd_result_file, self.analysis, result_name_prefix)
+                frd_result_file, self.analysis, result_name_prefix,
+                result_series=result_series)
         else:
             # TODO: use solver framework status message system
             FreeCAD.Console.PrintError(
@@ -27,50 +27,92 @@ __url__ = "https://www.freecadweb.org"
 
 
 import codecs
+import os
 from os.path import join
 
 from femmesh import meshtools
+from femsolver import fragmentcache
 
 
 def write_mesh(ccxwriter):
 
     element_param = 1  # highest element order only
     group_param = False  # do not write mesh group data
+    # the mesh of the last run is reused if it has not changed
+    # not with fluid sections, their element definitions are changed in the mesh file
+    fragment_cache = ccxwriter.fragment_cache
+    if ccxwriter.member.geos_fluidsection:
+        fragment_cache = None
+    if fragment_cache is not None:
+        mesh_fingerprint = fragmentcache.get_femmesh_fingerprint(
+            ccxwriter.femmesh,
+            ccxwriter.mesh_name,
+            element_param,
+            group_param,
+            ccxwriter.split_inpfile
+        )
+
     if ccxwriter.split_inpfile is True:
         write_name = "femesh"
         file_name_split = ccxwriter.mesh_name + "_" + write_name + ".inp"
         ccxwriter.femmesh_file = join(ccxwriter.dir_name, file_name_split)
 
-        ccxwriter.femmesh.writeABAQUS(
-            ccxwriter.femmesh_file,
-            element_param,
-            group_param
-        )
-
-        # Check to see if fluid sections are in analysis and use D network element type
-        if ccxwriter.member.geos_fluidsection:
-            meshtools.write_D_network_element_to_inputfile(ccxwriter.femmesh_file)
+        if fragment_cache is not None and fragment_cache.is_current(
+            write_name,
+            mesh_fingerprint,
+            ccxwriter.femmesh_file
+        ):
+            # the mesh include file of the last run is kept
+            fragment_cache.reused.append(write_name)
+        else:
+            if fragment_cache is not None:
+                fragment_cache.invalidate(write_name)
+            write_femmesh_file(ccxwriter, ccxwriter.femmesh_file, element_param, group_param)
+            if fragment_cache is not None:
+                fragment_cache.set_fingerprint(write_name, mesh_fingerprint)
 
         inpfile = codecs.open(ccxwriter.file_name, "w", encoding="utf-8")
         inpfile.write("{}\n".format(59 * "*"))
         inpfile.write("** {}\n".format(write_name))
         inpfile.write("*INCLUDE,INPUT={}\n".format(file_name_split))
 
-    else:
+    elif fragment_cache is not None:
+        # the mesh is written into its fragment file and copied into the input file
+        write_name = "femesh"
         ccxwriter.femmesh_file = ccxwriter.file_name
-        ccxwriter.femmesh.writeABAQUS(
-            ccxwriter.femmesh_file,
-            element_param,
-            group_param
-        )
+        fragment_file = fragment_cache.get_fragment_file(write_name)
+        if fragment_cache.is_current(write_name, mesh_fingerprint, fragment_file):
+            fragment_cache.reused.append(write_name)
+        else:
+            fragment_cache.invalidate(write_name)
+            if not os.path.isdir(fragment_cache.fragment_dir):
+                os.makedirs(fragment_cache.fragment_dir)
+            write_femmesh_file(ccxwriter, fragment_file, element_param, group_param)
+            fragment_cache.set_fingerprint(write_name, mesh_fingerprint)
+        inpfile = codecs.open(ccxwriter.file_name, "w", encoding="utf-8")
+        fragment_cache.copy_fragment(write_name, inpfile)
+        inpfile.write("\n\n")
 
-        # Check to see if fluid sections are in analysis and use D network element type
-        if ccxwriter.member.geos_fluidsection:
-            # inpfile is closed
-            meshtools.write_D_network_element_to_inputfile(ccxwriter.femmesh_file)
+    else:
+        ccxwriter.femmesh_file = ccxwriter.file_name
+        write_femmesh_file(ccxwriter, ccxwriter.femmesh_file, element_param, group_param)
 
         # reopen file with "append" to add all the rest
         inpfile = codecs.open(ccxwriter.femmesh_file, "a", encoding="utf-8")
         inpfile.write("\n\n")
 
     return inpfile
+
+
+def write_femmesh_file(ccxwriter, file_name, element_param, group_param):
+
+    ccxwriter.femmesh.writeABAQUS(
+        file_name,
+        element_param,
+        group_param
+    )
+
+    # Check to see if fluid sections are in analysis and use D network element type
+    if ccxwriter.member.geos_fluidsection:
+        # inpfile is closed
+        meshtools.write_D_network_element_to_inputfile(file_name)
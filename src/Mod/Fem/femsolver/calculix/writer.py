@@ -57,6 +57,7 @@ from . import write_footer
 from . import write_mesh
 from . import write_step_equation
 from . import write_step_output
+from .. import fragmentcache
 from .. import writerbase
 from femtools import constants
 
@@ -111,7 +112,8 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
         mesh_obj,
         member,
         dir_name=None,
-        mat_geo_sets=None
+        mat_geo_sets=None,
+        incremental=None
     ):
         writerbase.FemInputWriter.__init__(
             self,
@@ -127,28 +129,22 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
         self.femmesh_file = ""  # the file the femmesh is in, no matter if one or split input file
         self.gravity = int(Units.Quantity(constants.gravity()).getValueAs("mm/s^2"))  # 9820 mm/s2
         self.units_information = units_information
+        # incremental writing, the mesh and the constraint sets are only written
+        # if they changed since the last run in the same working directory
+        # default None uses the CalculiX preference "IncrementalInputWriter"
+        if incremental is None:
+            incremental = FreeCAD.ParamGet(
+                "User parameter:BaseApp/Preferences/Mod/Fem/Ccx"
+            ).GetBool("IncrementalInputWriter", False)
+        if incremental:
+            self.fragment_cache = fragmentcache.FragmentCache(self.dir_name)
 
     # ********************************************************************************************
     # write calculix input
     def write_calculix_input_file(self):
-        timestart = time.process_time()
-        FreeCAD.Console.PrintMessage("Start writing CalculiX input file\n")
-        FreeCAD.Console.PrintMessage(
-            "Write ccx input file to: {}\n".format(self.file_name))
-        FreeCAD.Console.PrintLog(
-            "writerbaseCcx --> self.mesh_name  -->  {}\n".format(self.mesh_name)
-        )
-        FreeCAD.Console.PrintLog(
-            "writerbaseCcx --> self.dir_name  -->  {}\n".format(self.dir_name)
-        )
-        FreeCAD.Console.PrintLog(
-            "writerbaseCcx --> self.include  -->  {}\n".format(self.mesh_name)
-        )
-        FreeCAD.Console.PrintLog(
-            "writerbaseCcx --> self.file_name  -->  {}\n".format(self.file_name)
-        )
+        return self.write_solver_input()
 
-        self.write_file()
+    def write_solver_input(self):
 
         time_start = time.process_time()
         FreeCAD.Console.PrintMessage("\n")  # because of time print in separate line
@@ -220,8 +216,33 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
         write_step_equation.write_step_end(inpfile, self)
 
         # footer
-        self.write_footer(inpfile_main)
-        inpfile_main.close()
+        write_footer.write_footer(inpfile, self)
+
+        # close file
+        inpfile.close()
+
+        if self.fragment_cache is not None:
+            FreeCAD.Console.PrintMessage(
+                "Input file sections written: {}, unchanged sections reused: {}\n"
+                .format(len(self.fragment_cache.written), len(self.fragment_cache.reused))
+            )
+            FreeCAD.Console.PrintLog(
+                "Reused input file sections: {}\n".format(self.fragment_cache.reused)
+            )
+
+        writetime = round((time.process_time() - time_start), 3)
+        FreeCAD.Console.PrintMessage(
+            "Writing time CalculiX input file: {} seconds.\n".format(writetime)
+        )
+
+        # return
+        if self.femelement_count_test is True:
+            return self.file_name
+        else:
+            FreeCAD.Console.PrintError(
+                "Problems on writing input file, check report prints.\n\n"
+            )
+            return ""
 
     # ********************************************************************************************
     # mesh
@@ -0,0 +1,169 @@
+# ***************************************************************************
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "FreeCAD FEM solver input file fragment cache"
+__author__ = "FreeCAD developers"
+__url__ = "https://www.freecadweb.org"
+
+## \addtogroup FEM
+#  @{
+
+# the sections of the input file which are expensive to write
+# (mesh and constraint mesh sets) are fingerprinted on writing
+# a section with the same fingerprint as on the last run is not written again
+# split input file: the include file of the section is kept as it is
+# one input file: the section is copied from its fragment file of the last run
+# the fragment files and the fingerprints are kept in the working directory
+
+import codecs
+import hashlib
+import json
+import os
+import shutil
+from os.path import join
+
+import FreeCAD
+
+
+FRAGMENT_DIR = "inp_fragments"
+FRAGMENT_INDEX = "fragments.json"
+
+# properties which do not change the written input file
+IGNORED_PROPERTIES = ("ExpressionEngine", "Label2", "Proxy", "Shape", "Visibility")
+
+
+class FragmentCache(object):
+    """Fingerprints of the input file sections written on the last run
+
+    Parameters
+    ----------
+    dir_name : str
+        working directory of the solver input file
+    """
+
+    def __init__(self, dir_name):
+        self.fragment_dir = join(dir_name, FRAGMENT_DIR)
+        self.index_file = join(self.fragment_dir, FRAGMENT_INDEX)
+        self.fingerprints = {}
+        if os.path.isfile(self.index_file):
+            try:
+                with open(self.index_file, "r") as f:
+                    self.fingerprints = json.load(f)
+            except (OSError, ValueError):
+                FreeCAD.Console.PrintWarning(
+                    "Input file fragment index could not be read: {}\n"
+                    .format(self.index_file)
+                )
+        self.reused = []
+        self.written = []
+
+    def get_fragment_file(self, name):
+        return join(self.fragment_dir, name + ".inp")
+
+    def is_current(self, name, fingerprint, file_name):
+        """True if the section was written with this fingerprint into file_name"""
+        return self.fingerprints.get(name) == fingerprint and os.path.isfile(file_name)
+
+    def invalidate(self, name):
+        # the section file is written now, an interrupted writing must not be reused
+        if self.fingerprints.pop(name, None) is not None:
+            self.save()
+
+    def set_fingerprint(self, name, fingerprint):
+        self.fingerprints[name] = fingerprint
+        self.written.append(name)
+        self.save()
+
+    def save(self):
+        if not os.path.isdir(self.fragment_dir):
+            os.makedirs(self.fragment_dir)
+        with open(self.index_file, "w") as f:
+            json.dump(self.fingerprints, f, indent=1, sort_keys=True)
+
+    def copy_fragment(self, name, f):
+        """Copies the fragment file of a section into the open input file f"""
+        with codecs.open(self.get_fragment_file(name), "r", encoding="utf-8") as fragment:
+            shutil.copyfileobj(fragment, f)
+
+    def open_fragment(self, name):
+        self.invalidate(name)
+        if not os.path.isdir(self.fragment_dir):
+            os.makedirs(self.fragment_dir)
+        return codecs.open(self.get_fragment_file(name), "w", encoding="utf-8")
+
+
+def get_fingerprint(*data):
+    """Returns a hash of the repr of all data given"""
+    fingerprint = hashlib.sha1()
+    for item in data:
+        fingerprint.update(repr(item).encode("utf-8"))
+    return fingerprint.hexdigest()
+
+
+def get_obj_properties(obj):
+    """Returns the values of all properties which may change the written input file"""
+    return [
+        (prop, obj.getPropertyByName(prop))
+        for prop in obj.PropertiesList
+        if prop not in IGNORED_PROPERTIES
+    ]
+
+
+def get_femobjs_fingerprint(femobjs, *data):
+    """Fingerprint of the constraint dicts and their objects and the data given
+
+    All mesh set data of the femobj dicts (nodes, faces, node loads ...) and
+    all property values of the document objects are part of the fingerprint.
+    """
+    femobjs_data = []
+    for femobj in femobjs:
+        the_obj = femobj["Object"]
+        femobjs_data.append((
+            the_obj.Name,
+            sorted((key, value) for key, value in femobj.items() if key != "Object"),
+            get_obj_properties(the_obj)
+        ))
+    return get_fingerprint(femobjs_data, *data)
+
+
+def get_femmesh_fingerprint(femmesh, *data):
+    """Fingerprint of a FemMesh
+
+    The element counts and the hash of all node coordinates and element nodes
+    are used. The hash is computed by the FemMesh itself, thus the mesh is not
+    walked in Python.
+    """
+    counts = (
+        femmesh.NodeCount,
+        femmesh.EdgeCount,
+        femmesh.FaceCount,
+        femmesh.VolumeCount,
+        femmesh.TriangleCount,
+        femmesh.QuadrangleCount,
+        femmesh.TetraCount,
+        femmesh.HexaCount,
+        femmesh.PyramidCount,
+        femmesh.PrismCount,
+    )
+    return get_fingerprint(counts, femmesh.getFingerprint(), *data)
+
+
+##  @}
@@ -34,6 +34,7 @@ from os.path import join
 import FreeCAD
 
 from femmesh import meshsetsgetter
+from . import fragmentcache
 
 
 class FemInputWriter():
@@ -134,6 +135,9 @@ class FemInputWriter():
         self.femelement_faces_table = {}
         self.femelement_edges_table = {}
         self.femelement_count_test = True
+        # fingerprints of the sections written on the last run, see fragmentcache
+        # None writes all sections, set by the solver writer
+        self.fragment_cache = None
 
         # deprecated, leave for compatibility reasons
         # do not add new objects
@@ -185,16 +189,24 @@ class FemInputWriter():
         if analysis_types != "all" and self.analysis_type not in analysis_types:
             return
 
-        def constraint_sets_loop_writing(the_file, femobjs, write_before, write_after):
+        def constraint_sets_loop_writing(
+            main_file,
+            the_file,
+            femobjs,
+            write_before,
+            write_after,
+            write_meshdata=True
+        ):
             if write_before != "":
-                f.write(write_before)
+                main_file.write(write_before)
             for femobj in femobjs:
                 # femobj --> dict, FreeCAD document object is femobj["Object"]
                 the_obj = femobj["Object"]
-                f.write("** {}\n".format(the_obj.Label))
-                con_module.write_meshdata_constraint(the_file, femobj, the_obj, self)
+                main_file.write("** {}\n".format(the_obj.Label))
+                if write_meshdata:
+                    con_module.write_meshdata_constraint(the_file, femobj, the_obj, self)
             if write_after != "":
-                f.write(write_after)
+                main_file.write(write_after)
 
         write_before = con_module.get_before_write_meshdata_constraint()
         write_after = con_module.get_after_write_meshdata_constraint()
@@ -204,15 +216,49 @@ class FemInputWriter():
         f.write("\n{}\n".format(59 * "*"))
         f.write("** {}\n".format(write_name.replace("_", " ")))
 
+        # unchanged sets of the last run are not written again, see fragment_cache
+        fragment_cache = self.fragment_cache
+        if fragment_cache is not None:
+            fingerprint = fragmentcache.get_femobjs_fingerprint(
+                femobjs,
+                con_module.__name__,
+                self.analysis_type,
+                self.split_inpfile
+            )
+
         if self.split_inpfile is True:
             file_name_split = "{}_{}.inp".format(self.mesh_name, write_name)
             f.write("** {}\n".format(write_name.replace("_", " ")))
             f.write("*INCLUDE,INPUT={}\n".format(file_name_split))
-            inpfile_split = open(join(self.dir_name, file_name_split), "w")
-            constraint_sets_loop_writing(inpfile_split, femobjs, write_before, write_after)
+            split_file = join(self.dir_name, file_name_split)
+            if fragment_cache is not None:
+                if fragment_cache.is_current(write_name, fingerprint, split_file):
+                    # the include file of the last run is kept
+                    fragment_cache.reused.append(write_name)
+                    constraint_sets_loop_writing(
+                        f, None, femobjs, write_before, write_after, False
+                    )
+                    return
+                fragment_cache.invalidate(write_name)
+            inpfile_split = open(split_file, "w")
+            constraint_sets_loop_writing(f, inpfile_split, femobjs, write_before, write_after)
             inpfile_split.close()
+            if fragment_cache is not None:
+                fragment_cache.set_fingerprint(write_name, fingerprint)
+        elif fragment_cache is not None:
+            fragment_file = fragment_cache.get_fragment_file(write_name)
+            if fragment_cache.is_current(write_name, fingerprint, fragment_file):
+                fragment_cache.reused.append(write_name)
+            else:
+                inpfile_fragment = fragment_cache.open_fragment(write_name)
+                constraint_sets_loop_writing(
+                    inpfile_fragment, inpfile_fragment, femobjs, write_before, write_after
+                )
+                inpfile_fragment.close()
+                fragment_cache.set_fingerprint(write_name, fingerprint)
+            fragment_cache.copy_fragment(write_name, f)
         else:
-            constraint_sets_loop_writing(f, femobjs, write_before, write_after)
+            constraint_sets_loop_writing(f, f, femobjs, write_before, write_after)
 
     # write constraint property data
     def write_constraints_propdata(
@@ -290,9 +336,10 @@ class FemInputWriter():
             self.femelement_table = meshtools.get_femelement_table(
                 self.femmesh)
         if not self.femnodes_ele_table:
-            self.femnodes_ele_table = meshtools.get_femnodes_ele_table(
-                self.femnodes_mesh,
-                self.femelement_table
+            self.femnodes_ele_table = meshtools.get_femnodes_ele_index(
+                self.femmesh,
+                self.femelement_table,
+                self.mesh_object
             )
 
         for femobj in self.pressure_objects:
@@ -318,9 +365,10 @@ class FemInputWriter():
             self.femelement_table = meshtools.get_femelement_table(
                 self.femmesh)
         if not self.femnodes_ele_table:
-            self.femnodes_ele_table = meshtools.get_femnodes_ele_table(
-                self.femnodes_mesh,
-                self.femelement_table
+            self.femnodes_ele_table = meshtools.get_femnodes_ele_index(
+                self.femmesh,
+                self.femelement_table,
+                self.mesh_object
             )
 
         for femobj in self.contact_objects:
@@ -352,9 +400,10 @@ class FemInputWriter():
             self.femelement_table = meshtools.get_femelement_table(
                 self.femmesh)
         if not self.femnodes_ele_table:
-            self.femnodes_ele_table = meshtools.get_femnodes_ele_table(
-                self.femnodes_mesh,
-                self.femelement_table
+            self.femnodes_ele_table = meshtools.get_femnodes_ele_index(
+                self.femmesh,
+                self.femelement_table,
+                self.mesh_object
             )
 
         for femobj in self.tie_objects:
@@ -58,6 +58,8 @@ class _TaskPanel:
     def __init__(self, obj):
         self.result_obj = obj
         self.mesh_obj = self.result_obj.Mesh
+        # derived result fields registered as lazy are needed now
+        resulttools.fill_lazy_results(self.result_obj)
         # task panel should be started by use of setEdit of view provider
         # in view provider checks: Mesh, active analysis and
         # if Mesh and result are in active analysis
@@ -135,6 +135,57 @@ class TestCcxTools(unittest.TestCase):
             res_obj_name=res_obj_name,
         )
 
+    # ********************************************************************************************
+    def test_box_static_study(
+        self
+    ):
+        # set up
+        from femexamples.boxanalysis_static import setup
+        setup(self.document, "ccxtools")
+        from femtools import ccxstudy
+        study_dir = testtools.get_fem_test_tmp_dir(self.pre_dir_name + "box_static_study")
+        study = ccxstudy.FemStudyCcx(
+            self.document.Analysis,
+            self.document.CalculiXccxTools,
+            parameters=[
+                {"FemConstraintForce.Force": 40000.0},
+                {"FemConstraintForce.Force": 20000.0},
+            ],
+            study_dir=study_dir,
+            max_workers=2,
+            thread_budget=4,
+            test_mode=True,
+        )
+        self.assertEqual(
+            2,
+            study.get_omp_threads(),
+            "Thread budget is not split between the workers"
+        )
+
+        # test input file writing
+        cases = study.write_inp_files()
+        self.assertEqual(
+            2,
+            len(cases),
+            "Not all study input files were written"
+        )
+        self.assertEqual(
+            40000.0,
+            float(self.document.FemConstraintForce.Force),
+            "Study parameter was not restored"
+        )
+        inpfile_given = join(self.test_file_dir, "box_static.inp")
+        ret = testtools.compare_inp_files(inpfile_given, cases[0].inp_file_name)
+        self.assertFalse(
+            ret,
+            "Study input file with original parameters differs.\n{}".format(ret)
+        )
+        ret = testtools.compare_inp_files(inpfile_given, cases[1].inp_file_name)
+        self.assertTrue(
+            ret,
+            "Study input file with changed force does not differ."
+        )
+
     # ********************************************************************************************
     def test_thermomech_flow1D(
         self
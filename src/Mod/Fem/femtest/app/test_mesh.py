@@ -220,6 +220,310 @@ class TestMeshCommon(unittest.TestCase):
             )
         )
 
+    # ********************************************************************************************
+    def test_femnodes_ele_index(
+        self
+    ):
+        # the array based node element index gives the same elements and element faces
+        # as the dict based femnodes_ele_table
+        from femexamples.meshes.mesh_boxanalysis_tetra10 import create_nodes
+        from femexamples.meshes.mesh_boxanalysis_tetra10 import create_elements
+        from femmesh import meshtools
+        femmesh = Fem.FemMesh()
+        create_nodes(femmesh)
+        create_elements(femmesh)
+        femelement_table = meshtools.get_femelement_table(femmesh)
+        femnodes_ele_table = meshtools.get_femnodes_ele_table(femmesh.Nodes, femelement_table)
+        femnodes_ele_index = meshtools.get_femnodes_ele_index(femmesh, femelement_table)
+
+        # nodes of the box face x = 0 and nodes of the half box x <= 5
+        face_nodes = [n for n, v in femmesh.Nodes.items() if v.x == 0.0]
+        half_nodes = [n for n, v in femmesh.Nodes.items() if v.x <= 5.0]
+        for node_set in (face_nodes, half_nodes):
+            expected = meshtools.get_ccxelement_faces_from_binary_search(
+                meshtools.get_bit_pattern_dict(femelement_table, femnodes_ele_table, node_set)
+            )
+            self.assertEqual(
+                femnodes_ele_index.get_ccxelement_faces(node_set),
+                expected,
+                "Element faces of the node element index are unexpected."
+            )
+            expected = meshtools.get_femelements_by_femnodes_bin(
+                femelement_table,
+                femnodes_ele_table,
+                node_set
+            )
+            self.assertEqual(
+                femnodes_ele_index.get_femelements_by_femnodes(node_set),
+                expected,
+                "Elements of the node element index are unexpected."
+            )
+        self.assertEqual(
+            len(femnodes_ele_index.get_ccxelement_faces(face_nodes)),
+            16,
+            "Number of element faces on the box face is unexpected."
+        )
+
+    # ********************************************************************************************
+    def test_femnodes_ele_index_cache(
+        self
+    ):
+        # the node element index is cached per mesh object, every access of the
+        # FemMesh property returns a new FemMesh, the index is rebuilt on mesh changes
+        from femexamples.meshes.mesh_boxanalysis_tetra10 import create_nodes
+        from femexamples.meshes.mesh_boxanalysis_tetra10 import create_elements
+        from femmesh import meshtools
+        femmesh = Fem.FemMesh()
+        create_nodes(femmesh)
+        create_elements(femmesh)
+        mesh_obj = self.document.addObject("Fem::FemMeshObject", "Mesh")
+        mesh_obj.FemMesh = femmesh
+        key = (self.document.Name, mesh_obj.Name)
+
+        femnodes_ele_index = meshtools.get_femnodes_ele_index(mesh_obj.FemMesh, mesh_obj=mesh_obj)
+        self.assertIs(
+            meshtools.get_femnodes_ele_index(mesh_obj.FemMesh, mesh_obj=mesh_obj),
+            femnodes_ele_index,
+            "The node element index is not cached for the mesh object."
+        )
+        self.assertIsNot(
+            meshtools.get_femnodes_ele_index(mesh_obj.FemMesh),
+            femnodes_ele_index,
+            "The node element index is cached without a mesh object."
+        )
+
+        femmesh.addNode(100.0, 100.0, 100.0, max(femmesh.Nodes) + 1)
+        mesh_obj.FemMesh = femmesh
+        changed_index = meshtools.get_femnodes_ele_index(mesh_obj.FemMesh, mesh_obj=mesh_obj)
+        self.assertIsNot(
+            changed_index,
+            femnodes_ele_index,
+            "The node element index is not rebuilt for a changed mesh."
+        )
+        self.assertIs(
+            meshtools._femnodes_ele_index_cache[key][1],
+            changed_index,
+            "The node element index of the former mesh is still cached."
+        )
+
+        # the index of a deleted mesh object is released on the next lookup
+        other_obj = self.document.addObject("Fem::FemMeshObject", "OtherMesh")
+        other_obj.FemMesh = femmesh
+        self.document.removeObject(mesh_obj.Name)
+        meshtools.get_femnodes_ele_index(other_obj.FemMesh, mesh_obj=other_obj)
+        self.assertNotIn(
+            key,
+            meshtools._femnodes_ele_index_cache,
+            "The node element index of a deleted mesh object is still cached."
+        )
+
+    # ********************************************************************************************
+    def test_mesh_fingerprint(
+        self
+    ):
+        # equal meshes give equal fingerprints, a moved node or a changed element does not
+        from femexamples.meshes import mesh_canticcx_tetra10
+
+        def create_femmesh():
+            femmesh = Fem.FemMesh()
+            mesh_canticcx_tetra10.create_nodes(femmesh)
+            mesh_canticcx_tetra10.create_elements(femmesh)
+            return femmesh
+
+        fingerprint = create_femmesh().getFingerprint()
+        self.assertEqual(
+            fingerprint,
+            create_femmesh().getFingerprint(),
+            "Fingerprints of equal meshes differ."
+        )
+        moved = create_femmesh()
+        moved.setTransform(FreeCAD.Placement(
+            FreeCAD.Vector(0, 0, 1),
+            FreeCAD.Rotation()
+        ))
+        self.assertNotEqual(
+            fingerprint,
+            moved.getFingerprint(),
+            "Fingerprint of a moved mesh is unchanged."
+        )
+        extended = create_femmesh()
+        extended.addEdge([1, 2])
+        self.assertNotEqual(
+            fingerprint,
+            extended.getFingerprint(),
+            "Fingerprint of a mesh with an added element is unchanged."
+        )
+
+    # ********************************************************************************************
+    def test_mesh_cache(
+        self
+    ):
+        # a mesh read from the binary mesh cache equals the mesh created by the mesh module
+        from femexamples.meshes import mesh_canticcx_tetra10
+        from femmesh import meshcache
+        cache_dir = testtools.get_fem_test_tmp_dir("mesh_cache")
+        femmesh = Fem.FemMesh()
+        mesh_canticcx_tetra10.create_nodes(femmesh)
+        mesh_canticcx_tetra10.create_elements(femmesh)
+        group_id = femmesh.addGroup("MyNodeGroup", "Node")
+        femmesh.addGroupElements(group_id, [1, 2, 3])
+
+        entry_dir = join(cache_dir, "canticcx_tetra10")
+        self.assertTrue(
+            meshcache.write_mesh_arrays(entry_dir, meshcache.mesh_arrays_from_femmesh(femmesh)),
+            "Writing the mesh cache failed."
+        )
+        cached_femmesh = meshcache.make_femmesh(meshcache.read_mesh_arrays(entry_dir))
+        module_femmesh = meshcache.read_mesh_module(mesh_canticcx_tetra10, cache_dir)
+        module_cached_femmesh = meshcache.read_mesh_module(mesh_canticcx_tetra10, cache_dir)
+        for test_femmesh in (cached_femmesh, module_femmesh, module_cached_femmesh):
+            self.assertEqual(
+                (femmesh.NodeCount, femmesh.VolumeCount),
+                (test_femmesh.NodeCount, test_femmesh.VolumeCount),
+                "Node or volume count of the cached mesh is unexpected."
+            )
+            self.assertEqual(
+                [femmesh.getElementNodes(e) for e in femmesh.Volumes],
+                [test_femmesh.getElementNodes(e) for e in femmesh.Volumes],
+                "Element nodes of the cached mesh are unexpected."
+            )
+        self.assertEqual(
+            [("MyNodeGroup", "Node", (1, 2, 3))],
+            [(
+                cached_femmesh.getGroupName(g),
+                cached_femmesh.getGroupElementType(g),
+                tuple(sorted(cached_femmesh.getGroupElements(g)))
+            ) for g in cached_femmesh.Groups],
+            "Groups of the cached mesh are unexpected."
+        )
+
+    # ********************************************************************************************
+    def test_mesh_cache_unsupported_element(
+        self
+    ):
+        # a mesh with elements the cache does not support is not cached at all
+        import os
+        import types
+        from femmesh import meshcache
+        cache_dir = testtools.get_fem_test_tmp_dir("mesh_cache_unsupported")
+
+        def create_nodes(femmesh):
+            for node_id, (x, y, z) in enumerate(
+                ((0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (0.5, 0.5, 1), (0.5, 0.5, -1)),
+                1
+            ):
+                femmesh.addNode(x, y, z, node_id)
+            return True
+
+        def create_elements(femmesh):
+            # a 5 node pyramid next to a supported 4 node tetra
+            femmesh.addVolume([1, 2, 3, 4, 5], 1)
+            femmesh.addVolume([1, 2, 3, 6], 2)
+            return True
+
+        femmesh = Fem.FemMesh()
+        create_nodes(femmesh)
+        create_elements(femmesh)
+        self.assertIsNone(
+            meshcache.mesh_arrays_from_femmesh(femmesh),
+            "Mesh arrays of a mesh with a pyramid element are returned."
+        )
+
+        # read_mesh_module takes the module source file as cache key
+        mesh_module = types.ModuleType("mesh_pyramid_tetra")
+        mesh_module.__file__ = join(cache_dir, "mesh_pyramid_tetra.py")
+        with open(mesh_module.__file__, "w") as f:
+            f.write("# pyramid and tetra mesh\n")
+        mesh_module.create_nodes = create_nodes
+        mesh_module.create_elements = create_elements
+        for i in range(2):
+            module_femmesh = meshcache.read_mesh_module(mesh_module, cache_dir)
+            self.assertEqual(
+                (module_femmesh.VolumeCount, module_femmesh.PyramidCount),
+                (2, 1),
+                "The mesh of the mesh module is incomplete."
+            )
+        self.assertEqual(
+            meshcache.get_entries(cache_dir),
+            [],
+            "A mesh with a pyramid element is written to the mesh cache."
+        )
+        os.remove(mesh_module.__file__)
+
+    # ********************************************************************************************
+    def test_mesh_cache_eviction(
+        self
+    ):
+        # the least recently used meshes are removed if the cache gets too big
+        import os
+        import time
+        from femexamples.meshes import mesh_canticcx_tetra10
+        from femmesh import meshcache
+        cache_dir = testtools.get_fem_test_tmp_dir("mesh_cache_eviction")
+        femmesh = Fem.FemMesh()
+        mesh_canticcx_tetra10.create_nodes(femmesh)
+        mesh_canticcx_tetra10.create_elements(femmesh)
+        mesh_arrays = meshcache.mesh_arrays_from_femmesh(femmesh)
+
+        entry_dirs = [join(cache_dir, name) for name in ("first", "second", "third")]
+        for i, entry_dir in enumerate(entry_dirs):
+            meshcache.write_mesh_arrays(entry_dir, mesh_arrays)
+            last_use = time.time() - 100 + i
+            os.utime(join(entry_dir, meshcache.MESH_CACHE_HEADER), (last_use, last_use))
+        # reading the oldest mesh makes it the most recently used one
+        self.assertIsNotNone(
+            meshcache.read_mesh_arrays(entry_dirs[0]),
+            "Reading the cached mesh failed."
+        )
+        entries = meshcache.get_entries(cache_dir)
+        meshcache.evict(cache_dir, sum(e[1] for e in entries[1:]))
+        self.assertEqual(
+            [os.path.isdir(entry_dir) for entry_dir in entry_dirs],
+            [True, False, True],
+            "The least recently used mesh was not removed."
+        )
+
+    # ********************************************************************************************
+    def test_make_femmesh_from_arrays(
+        self
+    ):
+        # the bulk array path gives the same mesh as the dict path and checks the arrays
+        import numpy as np
+        from femexamples.meshes import mesh_canticcx_hexa20
+        from feminout import importToolsFem
+        from femmesh import meshcache
+        femmesh = Fem.FemMesh()
+        mesh_canticcx_hexa20.create_nodes(femmesh)
+        mesh_canticcx_hexa20.create_elements(femmesh)
+        mesh_data = importToolsFem.make_dict_from_femmesh(femmesh)
+        mesh_arrays = meshcache.mesh_arrays_from_dict(mesh_data)
+
+        dict_femmesh = importToolsFem.make_femmesh(mesh_data)
+        array_femmesh = importToolsFem.make_femmesh_from_arrays(mesh_arrays)
+        self.assertEqual(
+            (dict_femmesh.NodeCount, dict_femmesh.VolumeCount, dict_femmesh.FaceCount),
+            (array_femmesh.NodeCount, array_femmesh.VolumeCount, array_femmesh.FaceCount),
+            "Element counts of the array mesh are unexpected."
+        )
+        self.assertEqual(
+            [dict_femmesh.getElementNodes(e) for e in dict_femmesh.Volumes],
+            [array_femmesh.getElementNodes(e) for e in dict_femmesh.Volumes],
+            "Element nodes of the array mesh are unexpected."
+        )
+        self.assertEqual(
+            dict_femmesh.Nodes,
+            array_femmesh.Nodes,
+            "Nodes of the array mesh are unexpected."
+        )
+
+        ele_ids, ele_nodes = mesh_arrays["Hexa20Elem"]
+        ele_nodes = np.array(ele_nodes)
+        ele_nodes[0, 0] = max(mesh_arrays["NodeIds"]) + 1
+        with self.assertRaises(ValueError):
+            importToolsFem.make_femmesh_from_arrays(
+                dict(mesh_arrays, Hexa20Elem=(ele_ids, ele_nodes))
+            )
+
 
 # ************************************************************************************************
 # ************************************************************************************************
@@ -25,6 +25,7 @@ __title__ = "Results FEM unit tests"
 __author__ = "Bernd Hahnebach"
 __url__ = "https://www.freecadweb.org"
 
+import os
 import unittest
 from os.path import join
 
@@ -286,6 +287,224 @@ class TestResult(unittest.TestCase):
             "Values of read npressure result data are unexpected"
         )
 
+    # ********************************************************************************************
+    def test_read_frd_arrays(
+        self
+    ):
+        # read data from frd file as arrays and compare with values of the frd file
+        frd_file = join(
+            testtools.get_fem_test_home_dir(),
+            "calculix",
+            "box_static.frd"
+        )
+        from feminout.importCcxFrdResults import read_frd_mesh_arrays
+        from feminout.importCcxFrdResults import iter_frd_result_arrays
+        mesh_arrays = read_frd_mesh_arrays(frd_file)
+        result_sets = list(iter_frd_result_arrays(frd_file))
+
+        self.assertEqual(
+            mesh_arrays["NodeCoords"].shape,
+            (280, 3),
+            "Shape of read node coordinates array is unexpected"
+        )
+        node_ids = mesh_arrays["NodeIds"].tolist()
+        self.assertEqual(
+            mesh_arrays["NodeCoords"][node_ids.index(280)].tolist(),
+            [1.25, 7.5, 3.75],
+            "Values of read node coordinates are unexpected"
+        )
+        ele_ids, ele_nodes = mesh_arrays["Tetra10Elem"]
+        self.assertEqual(
+            ele_nodes.shape,
+            (129, 10),
+            "Shape of read Tetra10 array is unexpected"
+        )
+        # frd: 95, 98, 47, 196, 103, 197, 198, 200, 199, 201
+        self.assertEqual(
+            ele_nodes[ele_ids.tolist().index(1)].tolist(),
+            [98, 95, 47, 196, 103, 198, 197, 199, 200, 201],
+            "Values of read Tetra10 arrays are unexpected"
+        )
+        self.assertEqual(
+            len(result_sets),
+            1,
+            "Count of read result sets is unexpected"
+        )
+
+        disp = result_sets[0]["disp"]
+        self.assertEqual(
+            disp.values[disp.node_ids.tolist().index(280)].tolist(),
+            [-5.32384e-03, 1.88752e-03, -6.50264e-03],
+            "Values of read displacement arrays are unexpected"
+        )
+        stress = result_sets[0]["stress"]
+        self.assertEqual(
+            stress.values.shape,
+            (280, 6),
+            "Shape of read stress array is unexpected"
+        )
+        # frd: xx, yy, zz, xy, yz, zx, FreeCAD: xx, yy, zz, xy, xz, yz
+        stress_ids = stress.node_ids.tolist()
+        self.assertEqual(
+            stress.values[stress_ids.index(1)].tolist(),
+            [-2.62033e+03, -8.71861e+02, -8.00594e+02, -4.29349e+02, -5.42662e+02, -1.21884e+02],
+            "Values of read stress arrays are unexpected"
+        )
+        self.assertEqual(
+            stress.values[stress_ids.index(280)].tolist(),
+            [-1.06012e+03, -1.74273e+02, -2.84613e+02, 3.45887e+01, -3.83611e+02, -4.50833e+00],
+            "Values of read stress arrays are unexpected"
+        )
+
+    # ********************************************************************************************
+    def test_import_frd_lazy_results(
+        self
+    ):
+        # derived result fields are calculated on first use
+        frd_file = join(
+            testtools.get_fem_test_home_dir(),
+            "calculix",
+            "box_static.frd"
+        )
+        from feminout.importCcxFrdResults import importFrd
+        from femresult import resulttools
+        res_obj = importFrd(frd_file, lazy_results=True)
+        self.assertEqual(
+            len(res_obj.vonMises),
+            0,
+            "Lazy von Mises stress is calculated on import."
+        )
+        self.assertIn(
+            "vonMises",
+            res_obj.LazyResults,
+            "Von Mises stress is not registered as lazy."
+        )
+        stats = resulttools.get_stats(res_obj, "Sabs")
+        self.assertEqual(
+            len(res_obj.vonMises),
+            len(res_obj.NodeNumbers),
+            "Lazy von Mises stress is not calculated on first use."
+        )
+        self.assertEqual(
+            stats,
+            (min(res_obj.vonMises), max(res_obj.vonMises)),
+            "Stats of lazy von Mises stress are not the expected values."
+        )
+        self.assertNotIn(
+            "vonMises",
+            res_obj.LazyResults,
+            "Calculated von Mises stress is still registered as lazy."
+        )
+
+    # ********************************************************************************************
+    def test_result_series(
+        self
+    ):
+        # all increments of a multi step result are written into a result series
+        frd_file = join(
+            testtools.get_fem_test_home_dir(),
+            "calculix",
+            "thermomech_flow1D.frd"
+        )
+        series_dir = join(testtools.get_fem_test_tmp_dir(), "thermomech_flow1D_series")
+        from feminout import importCcxFrdResults
+        from femresult import resultseries
+        inout_nodes = importCcxFrdResults.read_inout_nodes(frd_file)
+        result_sets = list(importCcxFrdResults.iter_frd_result_arrays(frd_file, inout_nodes))
+        writer = resultseries.ResultSeriesWriter(series_dir)
+        for result_set in result_sets:
+            writer.add_result_set(result_set)
+        writer.close()
+
+        series = resultseries.ResultSeries(series_dir)
+        self.assertEqual(
+            len(series),
+            len(result_sets),
+            "Number of increments of the result series is not the expected one."
+        )
+        for index, result_set in enumerate(result_sets):
+            series_set = series.get_result_set(index)
+            for key in resultseries.SERIES_FIELDS:
+                self.assertEqual(
+                    key in series_set,
+                    key in result_set,
+                    "Field {} of increment {} is not the expected one.".format(key, index)
+                )
+                if key in result_set:
+                    self.assertEqual(
+                        series_set[key].node_ids.tolist(),
+                        result_set[key].node_ids.tolist(),
+                        "Nodes of {} of increment {} are not the expected ones."
+                        .format(key, index)
+                    )
+                    self.assertEqual(
+                        series_set[key].values.tolist(),
+                        result_set[key].values.tolist(),
+                        "Values of {} of increment {} are not the expected ones."
+                        .format(key, index)
+                    )
+
+    # ********************************************************************************************
+    def test_result_series_index(
+        self
+    ):
+        # a result series is imported into one result object
+        # changing its SeriesIndex fills the result fields with that increment
+        import shutil
+        from feminout import importCcxFrdResults
+        from femresult import resultseries
+        test_dir = testtools.get_fem_test_home_dir()
+        tmp_dir = join(testtools.get_fem_test_tmp_dir(), "result_series_index")
+        if not os.path.isdir(tmp_dir):
+            os.makedirs(tmp_dir)
+        for file_name in ("thermomech_flow1D.frd", "thermomech_flow1D_inout_nodes.txt"):
+            shutil.copy(join(test_dir, "calculix", file_name), tmp_dir)
+        frd_file = join(tmp_dir, "thermomech_flow1D.frd")
+        inout_nodes = importCcxFrdResults.read_inout_nodes(frd_file)
+        result_sets = list(importCcxFrdResults.iter_frd_result_arrays(frd_file, inout_nodes))
+
+        res_obj = importCcxFrdResults.importFrd(frd_file, result_series=True)
+        results = [o for o in self.document.Objects if o.isDerivedFrom("Fem::FemResultObject")]
+        self.assertEqual(
+            results,
+            [res_obj],
+            "A result series is not imported into one result object."
+        )
+        self.assertEqual(
+            res_obj.SeriesIndex,
+            len(result_sets) - 1,
+            "A result series is not filled with its last increment on import."
+        )
+        last_temperature = res_obj.Temperature
+
+        def expected_temperature(index):
+            values = result_sets[index]["temp"].values
+            return values[:len(res_obj.Temperature)].tolist()
+
+        res_obj.SeriesIndex = 0
+        self.assertEqual(
+            res_obj.Temperature,
+            expected_temperature(0),
+            "Result fields are not filled with the increment set in SeriesIndex."
+        )
+        self.assertNotEqual(
+            res_obj.Temperature,
+            last_temperature,
+            "First and last increment of the result series are not different."
+        )
+        res_obj.SeriesIndex = -1
+        self.assertEqual(
+            res_obj.SeriesIndex,
+            len(result_sets) - 1,
+            "A negative SeriesIndex does not count from the last increment."
+        )
+        self.assertEqual(
+            res_obj.Temperature,
+            last_temperature,
+            "Result fields are not filled with the last increment."
+        )
+        resultseries.close_result_series(res_obj.SeriesDirectory)
+
     # ********************************************************************************************
     def get_stress_values(
         self
@@ -368,6 +587,46 @@ class TestResult(unittest.TestCase):
             "Calculated principal reinforced stresses are not the expected values."
         )
 
+    # ********************************************************************************************
+    def test_stress_arrays(
+        self
+    ):
+        # the batched kernels calculate all nodes at once
+        # a node with NaN in the stress tensor gets NaN principal stresses
+        import numpy as np
+        from femresult import resulttools
+        stress = np.array([
+            self.get_stress_values(),
+            (2.000, -2.000, 5.000, 6.000, -4.000, 2.000),
+            (float("NaN"), 0.0, 0.0, 0.0, 0.0, 0.0)
+        ])
+        # node 5 of the cantilever, see test_stress_von_mises and test_stress_principal_std
+        # second tensor calculated by hand:
+        # von Mises sqrt(0.5 * (4^2 + 7^2 + 3^2) + 3 * (6^2 + 4^2 + 2^2)) = sqrt(205)
+        # principal stresses from the roots of s^3 - 5 s^2 - 60 s + 272 (I1 = 5, I2 = -60, I3 = -272)
+        expected_mises = (283.2082, 14.3178)
+        expected_principal = (
+            (-178.0076, -194.0749, -468.9075, 145.4499),
+            (8.2789, 4.3223, -7.6012, 7.9400)
+        )
+        mises = resulttools.calculate_von_mises_array(stress)
+        prin = resulttools.calculate_principal_stress_std_array(stress)
+        for i in range(2):
+            self.assertEqual(
+                round(mises[i], 4),
+                expected_mises[i],
+                "Batched von Mises stress is not the expected value."
+            )
+            self.assertEqual(
+                tuple(round(p, 4) for p in prin[i]),
+                expected_principal[i],
+                "Batched principal stresses are not the expected values."
+            )
+        self.assertTrue(
+            np.isnan(prin[2]).all(),
+            "Batched principal stresses of a NaN stress tensor are not NaN."
+        )
+
     # ********************************************************************************************
     def test_rho(
         self
@@ -95,6 +95,59 @@ class TestSolverCalculix(unittest.TestCase):
         setup(self.document, "calculix")
         self.input_file_writing_test(get_namefromdef("test_"))
 
+    # ********************************************************************************************
+    def test_box_static_incremental(
+        self
+    ):
+        # the second run in the same directory reuses the unchanged mesh and sets
+        # the input file has to be the same as the one written at once
+        from femexamples.boxanalysis_static import setup
+        from femmesh.meshsetsgetter import MeshSetsGetter
+        from femsolver.calculix.writer import FemInputWriterCcx
+        from femtools import membertools
+        setup(self.document, "calculix")
+        self.document.recompute()
+        base_name = "box_static"
+        working_dir = testtools.get_fem_test_tmp_dir(self.pre_dir_name + "box_static_incremental")
+        analysis = self.document.Analysis
+        mesh_obj = membertools.get_mesh_to_solve(analysis)[0]
+        for run in range(2):
+            meshdatagetter = MeshSetsGetter(
+                analysis,
+                self.document.SolverCalculiX,
+                mesh_obj,
+                membertools.AnalysisMember(analysis),
+            )
+            meshdatagetter.get_mesh_sets()
+            inp_writer = FemInputWriterCcx(
+                analysis,
+                self.document.SolverCalculiX,
+                mesh_obj,
+                meshdatagetter.member,
+                working_dir,
+                meshdatagetter.mat_geo_sets,
+                incremental=True
+            )
+            inpfile_totest = inp_writer.write_solver_input()
+            ret = testtools.compare_inp_files(
+                join(self.test_file_dir, base_name + self.ending),
+                inpfile_totest
+            )
+            self.assertFalse(
+                ret,
+                "CalculiX incremental input file run {} test failed.\n{}".format(run, ret)
+            )
+        self.assertIn(
+            "femesh",
+            inp_writer.fragment_cache.reused,
+            "Unchanged mesh is not reused on the second run."
+        )
+        self.assertEqual(
+            inp_writer.fragment_cache.written,
+            [],
+            "Sections are written again on the second run."
+        )
+
     # ********************************************************************************************
     def test_ccx_buckling_flexuralbuckling(
             self
@@ -261,6 +314,109 @@ class TestSolverCalculix(unittest.TestCase):
         setup(self.document, "calculix")
         self.input_file_writing_test(get_namefromdef("test_"))
 
+    # ********************************************************************************************
+    def test_constraint_tie_parallel_mesh_sets(
+        self
+    ):
+        # the node sets found by the process pool are the ones of the sequential lookups
+        from femexamples.constraint_tie import setup
+        from femmesh.meshsetsgetter import MeshSetsGetter
+        from femtools import membertools
+        setup(self.document, "calculix")
+        self.document.recompute()
+        analysis = self.document.Analysis
+        mesh_obj = membertools.get_mesh_to_solve(analysis)[0]
+        getters = []
+        for parallel in (False, True):
+            meshdatagetter = MeshSetsGetter(
+                analysis,
+                self.document.SolverCalculiX,
+                mesh_obj,
+                membertools.AnalysisMember(analysis),
+                parallel=parallel,
+                max_workers=2
+            )
+            meshdatagetter.get_mesh_sets()
+            getters.append(meshdatagetter)
+        sequential, parallel = getters
+        for femobj_seq, femobj_par in zip(
+            sequential.member.cons_fixed + sequential.member.cons_tie,
+            parallel.member.cons_fixed + parallel.member.cons_tie
+        ):
+            self.assertEqual(
+                femobj_seq,
+                femobj_par,
+                "Parallel mesh sets of {} differ from the sequential ones."
+                .format(femobj_seq["Object"].Name)
+            )
+        self.assertEqual(
+            sequential.constraint_conflict_nodes,
+            parallel.constraint_conflict_nodes,
+            "Parallel constraint conflict nodes differ from the sequential ones."
+        )
+        for meshdatagetter in getters:
+            self.assertEqual(
+                [name for name, seconds in meshdatagetter.constraint_timings],
+                [
+                    femobj["Object"].Name for femobj in (
+                        meshdatagetter.member.cons_fixed
+                        + meshdatagetter.member.cons_tie
+                        + meshdatagetter.member.cons_force
+                    )
+                ],
+                "Constraint timings are not in the order of the constraint lookups."
+            )
+
+    # ********************************************************************************************
+    def test_constraint_force_parallel_mesh_sets(
+        self
+    ):
+        # the vertex and edge node loads found with the process pool
+        # are the ones of the sequential lookups
+        from femmesh import meshsetsgetter
+        from femtools import membertools
+        from femexamples import ccx_cantilever_nodeload
+        from femexamples import square_pipe_end_twisted_edgeforces
+        for example in (ccx_cantilever_nodeload, square_pipe_end_twisted_edgeforces):
+            document = FreeCAD.newDocument(example.__name__.rsplit(".", 1)[-1])
+            try:
+                example.setup(document, "calculix")
+                document.recompute()
+                analysis = document.Analysis
+                mesh_obj = membertools.get_mesh_to_solve(analysis)[0]
+                getters = []
+                for parallel in (False, True):
+                    meshdatagetter = meshsetsgetter.MeshSetsGetter(
+                        analysis,
+                        document.SolverCalculiX,
+                        mesh_obj,
+                        membertools.AnalysisMember(analysis),
+                        parallel=parallel,
+                        max_workers=2
+                    )
+                    meshdatagetter.get_mesh_sets()
+                    getters.append(meshdatagetter)
+                sequential, parallel = getters
+                if meshsetsgetter.can_use_process_pool():
+                    self.assertEqual(
+                        sorted(parallel.refshape_nodes_parallel),
+                        sorted(femobj["Object"].Name for femobj in parallel.member.cons_force),
+                        "Force nodes of {} are not searched in the process pool."
+                        .format(example.__name__)
+                    )
+                for femobj_seq, femobj_par in zip(
+                    sequential.member.cons_force,
+                    parallel.member.cons_force
+                ):
+                    self.assertEqual(
+                        femobj_seq["NodeLoadTable"],
+                        femobj_par["NodeLoadTable"],
+                        "Parallel node loads of {} differ from the sequential ones."
+                        .format(femobj_seq["Object"].Name)
+                    )
+            finally:
+                FreeCAD.closeDocument(document.Name)
+
     # ********************************************************************************************
     def test_constraint_transform_beam_hinged(
         self
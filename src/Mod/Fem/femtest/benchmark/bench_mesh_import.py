@@ -0,0 +1,157 @@
+# ***************************************************************************
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "Benchmark of the FEM mesh import"
+__author__ = "FreeCAD developers"
+__url__ = "https://www.freecadweb.org"
+
+## @package bench_mesh_import
+#  \ingroup FEM
+#  \brief compares the dict and the bulk array path of the FEM mesh import
+
+# run from inside FreeCAD
+# from femtest.benchmark import bench_mesh_import
+# bench_mesh_import.run()
+
+import json
+import time
+from os.path import basename
+from os.path import join
+
+import Fem
+
+from femtest.app import support_utils as testtools
+from femtest.app.support_utils import fcc_print
+
+
+# the example meshes written into every mesh file format
+example_meshes = (
+    "mesh_boxanalysis_tetra10",
+    "mesh_canticcx_hexa20",
+    "mesh_contact_tube_tube_tria3",
+    "mesh_multibodybeam_tetra10",
+)
+
+# the frd result files of the FEM unit tests
+frd_files = (
+    "box_static.frd",
+    "thermomech_spine.frd",
+)
+
+
+def read_json_mesh(
+    mesh_file
+):
+    from feminout import importYamlJsonMesh
+    with open(mesh_file, "r") as f:
+        return importYamlJsonMesh.convert_raw_data_to_mesh_data(json.load(f))
+
+
+def get_mesh_files(
+    bench_dir
+):
+    """ writes the example meshes as inp, z88 and json mesh files
+        returns a list of tuples (importer name, mesh file, read function)
+        the read function returns the FEM mesh data dict of the file
+    """
+    import importlib
+    from feminout import importInpMesh
+    from feminout import importYamlJsonMesh
+    from feminout import importZ88Mesh
+
+    mesh_files = []
+    for mesh_name in example_meshes:
+        mesh_module = importlib.import_module("femexamples.meshes." + mesh_name)
+        femmesh = Fem.FemMesh()
+        mesh_module.create_nodes(femmesh)
+        mesh_module.create_elements(femmesh)
+        inp_file = join(bench_dir, mesh_name + ".inp")
+        femmesh.write(inp_file)
+        mesh_files.append(("inp", inp_file, importInpMesh.read_inp))
+        z88_file = join(bench_dir, mesh_name + ".z88")
+        importZ88Mesh.write(femmesh, z88_file)
+        mesh_files.append(("z88", z88_file, importZ88Mesh.read_z88_mesh))
+        json_file = join(bench_dir, mesh_name + ".json")
+        importYamlJsonMesh.write(json_file, femmesh)
+        mesh_files.append(("json", json_file, read_json_mesh))
+    return mesh_files
+
+
+def meshes_per_second(
+    make_mesh,
+    repeat
+):
+    start = time.time()
+    for i in range(repeat):
+        make_mesh()
+    return repeat / (time.time() - start)
+
+
+def run(
+    repeat=5
+):
+    """ prints the meshes per second of the dict path make_femmesh() and the
+        bulk array path make_femmesh_from_arrays() for every importer and file,
+        the file parsing is part of both paths
+    """
+    from feminout import importCcxFrdResults
+    from feminout import importToolsFem
+    from femmesh import meshcache
+
+    bench_dir = testtools.get_fem_test_tmp_dir("bench_mesh_import")
+    fcc_print("{:<8} {:<36} {:>10} {:>12} {:>12} {:>10}".format(
+        "importer", "mesh file", "nodes", "dict [1/s]", "arrays [1/s]", "speedup"
+    ))
+    results = {}
+
+    def print_result(importer, file_name, node_count, dict_path, array_path):
+        dict_rate = meshes_per_second(dict_path, repeat)
+        array_rate = meshes_per_second(array_path, repeat)
+        results[(importer, file_name)] = (dict_rate, array_rate)
+        fcc_print("{:<8} {:<36} {:>10} {:>12.2f} {:>12.2f} {:>10.2f}".format(
+            importer, file_name, node_count, dict_rate, array_rate, array_rate / dict_rate
+        ))
+
+    for importer, mesh_file, read_mesh in get_mesh_files(bench_dir):
+        print_result(
+            importer,
+            basename(mesh_file),
+            len(read_mesh(mesh_file)["Nodes"]),
+            lambda: importToolsFem.make_femmesh(read_mesh(mesh_file)),
+            lambda: importToolsFem.make_femmesh_from_arrays(
+                meshcache.mesh_arrays_from_dict(read_mesh(mesh_file))
+            ),
+        )
+
+    for frd_name in frd_files:
+        frd_file = join(testtools.get_fem_test_home_dir(), "calculix", frd_name)
+        print_result(
+            "frd",
+            frd_name,
+            len(importCcxFrdResults.read_frd_mesh_arrays(frd_file)["NodeIds"]),
+            lambda: importToolsFem.make_femmesh(importCcxFrdResults.frd_mesh_arrays_to_dict(
+                importCcxFrdResults.read_frd_mesh_arrays(frd_file)
+            )),
+            lambda: importToolsFem.make_femmesh_from_arrays(
+                importCcxFrdResults.read_frd_mesh_arrays(frd_file)
+            ),
+        )
+    return results
@@ -0,0 +1,95 @@
+# ***************************************************************************
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "Benchmark of the CalculiX frd result import"
+__author__ = "FreeCAD developers"
+__url__ = "https://www.freecadweb.org"
+
+## @package bench_result_import
+#  \ingroup FEM
+#  \brief compares eager and lazy import of frd result files
+
+# run from inside FreeCAD
+# from femtest.benchmark import bench_result_import
+# bench_result_import.run()
+
+import time
+from os.path import join
+
+import FreeCAD
+
+from femtest.app import support_utils as testtools
+from femtest.app.support_utils import fcc_print
+
+
+# the frd result files of the FEM unit tests and examples
+frd_files = (
+    "box_frequency.frd",
+    "box_static.frd",
+    "thermomech_flow1D.frd",
+    "thermomech_spine.frd",
+)
+
+
+def time_import(
+    frd_file,
+    lazy_results
+):
+    """ returns the time of the import and the time of the first get_stats
+        call on every result object, which calculates the lazy result fields
+    """
+    from feminout import importCcxFrdResults
+    from femresult import resulttools
+
+    doc = FreeCAD.newDocument("BenchResultImport")
+    start = time.time()
+    importCcxFrdResults.importFrd(frd_file, lazy_results=lazy_results)
+    import_time = time.time() - start
+
+    start = time.time()
+    for obj in doc.Objects:
+        if obj.isDerivedFrom("Fem::FemResultObject"):
+            resulttools.get_stats(obj, "Sabs")
+    first_use_time = time.time() - start
+    FreeCAD.closeDocument(doc.Name)
+    return import_time, first_use_time
+
+
+def run(
+    repeat=3
+):
+    """ prints the best eager and lazy import times of every frd file
+    """
+    fcc_print("{:<24} {:>12} {:>12} {:>12} {:>12}".format(
+        "frd file", "eager [s]", "lazy [s]", "1st use [s]", "speedup"
+    ))
+    results = {}
+    for frd_name in frd_files:
+        frd_file = join(testtools.get_fem_test_home_dir(), "calculix", frd_name)
+        eager = min(time_import(frd_file, False)[0] for i in range(repeat))
+        lazy_times = [time_import(frd_file, True) for i in range(repeat)]
+        lazy = min(t[0] for t in lazy_times)
+        first_use = min(t[1] for t in lazy_times)
+        results[frd_name] = (eager, lazy, first_use)
+        fcc_print("{:<24} {:>12.4f} {:>12.4f} {:>12.4f} {:>12.2f}".format(
+            frd_name, eager, lazy, first_use, eager / lazy if lazy else 0.0
+        ))
+    return results
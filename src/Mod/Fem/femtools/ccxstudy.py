@@ -0,0 +1,348 @@
+# ***************************************************************************
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "FemStudyCcx"
+__author__ = "FreeCAD developers"
+__url__ = "https://www.freecadweb.org"
+
+## \addtogroup FEM
+#  @{
+
+import os
+import subprocess
+import sys
+import time
+from concurrent import futures
+
+import FreeCAD
+
+from femtools import ccxtools
+from femtools import femutils
+
+
+# a study runs one CalculiX analysis for every row of a parameter table
+# the rows are dicts {"ObjectName.PropertyName": value}
+# the input files are written one after the other, because the document
+# is accessed, ccx processes run concurrently in their own working dirs
+# the results are loaded into the document in the calling thread
+# as soon as a ccx process has finished
+#
+# example:
+# from femtools import ccxstudy
+# study = ccxstudy.FemStudyCcx(
+#     FreeCAD.ActiveDocument.Analysis,
+#     parameters=[
+#         {"FemConstraintForce.Force": 10000.0},
+#         {"FemConstraintForce.Force": 20000.0},
+#     ],
+#     max_workers=2,
+#     thread_budget=4,
+# )
+# study.run()
+
+
+class StudyCase(object):
+    """One row of a parameter study
+
+    Attributes
+    ----------
+    index : int
+        position of the case in the parameter table
+    name : str
+        case name, used for the working dir and the result object prefix
+    parameters : dict
+        property overrides {"ObjectName.PropertyName": value}
+    fea : femtools/ccxtools/FemToolsCcx
+        tools instance which writes the input file and loads the results
+    ret_code : int
+        exit code of ccx, None as long as ccx has not been run
+    """
+
+    def __init__(self, index, parameters):
+        self.index = index
+        self.name = "Case{:03d}".format(index + 1)
+        self.parameters = parameters
+        self.fea = None
+        self.inp_file_name = ""
+        self.ret_code = None
+        self.ccx_stdout = ""
+        self.ccx_stderr = ""
+        self.solve_time = 0.0
+        self.results_present = False
+
+    @property
+    def result_name_prefix(self):
+        return self.name + "_"
+
+
+class FemStudyCcx(object):
+    """Run a CalculiX analysis for every row of a parameter table
+
+    Parameters
+    ----------
+    analysis : Fem::FemAnalysis
+        analysis to be solved
+    solver : Fem::FemSolverObjectPython, optional
+        ccx tools solver object, searched in the analysis if not given
+    parameters : list of dict
+        one dict {"ObjectName.PropertyName": value} for every case
+    study_dir : str, optional
+        a sub directory for every case is created in there,
+        default is a "study" dir in the solver working dir
+    max_workers : int, optional
+        number of ccx processes run at the same time,
+        default is the Ccx preference "StudyMaxWorkers",
+        which is the cpu count if it is not set
+    thread_budget : int, optional
+        number of OpenMP threads shared by all running ccx processes,
+        default is the Ccx preference "StudyThreadBudget",
+        which is the cpu count if it is not set
+    test_mode : bool, optional
+        input files are written, but ccx is not run
+    """
+
+    def __init__(
+        self,
+        analysis,
+        solver=None,
+        parameters=(),
+        study_dir=None,
+        max_workers=None,
+        thread_budget=None,
+        test_mode=False
+    ):
+        import multiprocessing
+        self.analysis = analysis
+        self.document = analysis.Document
+        self.test_mode = test_mode
+        # FemToolsCcx searches and checks the solver
+        self.solver = ccxtools.FemToolsCcx(analysis, solver, test_mode).solver
+        self.cases = [StudyCase(i, dict(row)) for i, row in enumerate(parameters)]
+
+        ccx_prefs = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Fem/Ccx")
+        cpu_count = multiprocessing.cpu_count()
+        if max_workers is None:
+            max_workers = ccx_prefs.GetInt("StudyMaxWorkers", 0)
+        if thread_budget is None:
+            thread_budget = ccx_prefs.GetInt("StudyThreadBudget", 0)
+        self.max_workers = max_workers if max_workers > 0 else cpu_count
+        self.thread_budget = thread_budget if thread_budget > 0 else cpu_count
+
+        if study_dir is None:
+            study_dir = os.path.join(femutils.get_pref_working_dir(self.solver), "study")
+        self.study_dir = study_dir
+        self.ccx_binary = ""
+
+    def get_workers(self):
+        return max(1, min(self.max_workers, len(self.cases)))
+
+    def get_omp_threads(self):
+        """Return the OpenMP thread count of every ccx process.
+        The thread budget is split evenly between the concurrently running processes.
+        """
+        return max(1, self.thread_budget // self.get_workers())
+
+    def write_inp_files(self):
+        """Write the input file of every case into its own working dir.
+
+        The parameter overrides are set, the document is recomputed,
+        the input file is written and the original values are restored.
+        The mesh is not regenerated, thus geometry parameters need
+        a mesh object which is recomputed with the document.
+        """
+        for case in self.cases:
+            self.write_case_inp_file(case)
+        return [case for case in self.cases if case.inp_file_name]
+
+    def write_case_inp_file(self, case):
+        working_dir = os.path.join(self.study_dir, case.name)
+        if not os.path.isdir(working_dir):
+            os.makedirs(working_dir)
+        case.fea = ccxtools.FemToolsCcx(self.analysis, self.solver, self.test_mode)
+        case.inp_file_name = ""
+        original_values = set_parameters(self.document, case.parameters)
+        try:
+            self.document.recompute()
+            case.fea.update_objects()
+            case.fea.setup_working_dir(working_dir)
+            message = case.fea.check_prerequisites()
+            if message:
+                FreeCAD.Console.PrintError(
+                    "{}: CalculiX can not be started due to missing prerequisites:\n{}\n"
+                    .format(case.name, message)
+                )
+                return
+            case.fea.write_inp_file()
+            case.inp_file_name = case.fea.inp_file_name
+        finally:
+            restore_parameters(self.document, original_values)
+            self.document.recompute()
+        FreeCAD.Console.PrintLog(
+            "{}: input file {} written.\n".format(case.name, case.inp_file_name)
+        )
+
+    def run(self, load_results=True, case_finished=None):
+        """Write all input files, run ccx and load the results.
+
+        Parameters
+        ----------
+        load_results : bool, optional
+            load the results of every successful case into the analysis,
+            the result object names start with the case name
+        case_finished : callable, optional
+            called with the StudyCase after its results have been loaded
+
+        Returns
+        -------
+        list of StudyCase
+        """
+        cases = self.write_inp_files()
+        if self.test_mode:
+            FreeCAD.Console.PrintError("CalculiX can not be run if test_mode is True.\n")
+            return self.cases
+        if not cases:
+            return self.cases
+        cases[0].fea.setup_ccx()
+        if cases[0].fea.ccx_binary_present is False:
+            FreeCAD.Console.PrintError(
+                "FEM: CalculiX binary ccx \'{}\' not found.\n"
+                .format(cases[0].fea.ccx_binary)
+            )
+            return self.cases
+        self.ccx_binary = cases[0].fea.ccx_binary
+
+        omp_threads = self.get_omp_threads()
+        FreeCAD.Console.PrintMessage(
+            "Run {} CalculiX cases with {} processes and {} threads each ...\n"
+            .format(len(cases), self.get_workers(), omp_threads)
+        )
+        with futures.ThreadPoolExecutor(max_workers=self.get_workers()) as executor:
+            running = {
+                executor.submit(
+                    run_ccx_process,
+                    self.ccx_binary,
+                    case.inp_file_name,
+                    omp_threads
+                ): case for case in cases
+            }
+            # futures finish in any order, the document is only touched in this thread
+            for future in futures.as_completed(running):
+                case = running[future]
+                try:
+                    case.ret_code, case.ccx_stdout, case.ccx_stderr, case.solve_time = (
+                        future.result()
+                    )
+                except OSError as e:
+                    FreeCAD.Console.PrintError("{}: {}\n".format(case.name, e))
+                    continue
+                self.case_solved(case, load_results)
+                if case_finished is not None:
+                    case_finished(case)
+        return self.cases
+
+    def case_solved(self, case, load_results=True):
+        if case.ret_code == 201 and self.solver.AnalysisType == "check":
+            # see FemToolsCcx.ccx_run, wrong exit code for *NOANALYSIS
+            case.ret_code = 0
+        if case.ret_code != 0:
+            FreeCAD.Console.PrintError(
+                "{}: CalculiX failed with exit code {}\n{}\n"
+                .format(case.name, case.ret_code, case.ccx_stderr)
+            )
+            return
+        FreeCAD.Console.PrintMessage(
+            "{}: CalculiX finished after {:.2f} seconds.\n"
+            .format(case.name, case.solve_time)
+        )
+        if load_results:
+            case.fea.load_results(case.result_name_prefix)
+            case.results_present = case.fea.results_present
+
+
+# ************************************************************************************************
+def get_parameter_target(doc, key):
+    """Return the object and the property name of a parameter key "ObjectName.PropertyName".
+    """
+    obj_name, sep, prop_name = key.partition(".")
+    obj = doc.getObject(obj_name)
+    if not sep or obj is None or prop_name not in obj.PropertiesList:
+        raise ValueError(
+            "FEM: Study parameter \'{}\' does not match an object property "
+            "in document {}.".format(key, doc.Name)
+        )
+    return obj, prop_name
+
+
+def set_parameters(doc, parameters):
+    """Set the parameter overrides and return the original values.
+    """
+    original_values = []
+    try:
+        for key, value in parameters.items():
+            obj, prop_name = get_parameter_target(doc, key)
+            original_values.append((obj, prop_name, getattr(obj, prop_name)))
+            setattr(obj, prop_name, value)
+    except Exception:
+        restore_parameters(doc, original_values)
+        raise
+    return original_values
+
+
+def restore_parameters(doc, original_values):
+    for obj, prop_name, value in reversed(original_values):
+        setattr(obj, prop_name, value)
+
+
+def run_ccx_process(ccx_binary, inp_file_name, omp_threads):
+    """Run ccx on one input file in the directory of the input file.
+
+    Thread safe, the environment and the current dir of FreeCAD are not changed.
+
+    Returns
+    -------
+    tuple
+        (exit code, stdout, stderr, solve time in seconds)
+    """
+    working_dir, inp_file = os.path.split(inp_file_name)
+    env = dict(os.environ)
+    env["OMP_NUM_THREADS"] = str(omp_threads)
+    startup_info = None
+    if sys.platform == "win32":
+        # Windows workaround to avoid blinking terminal window
+        startup_info = subprocess.STARTUPINFO()
+        startup_info.dwFlags = subprocess.STARTF_USESHOWWINDOW
+    start_time = time.time()
+    p = subprocess.Popen(
+        [ccx_binary, "-i", os.path.splitext(inp_file)[0]],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=working_dir,
+        env=env,
+        shell=False,
+        startupinfo=startup_info
+    )
+    ccx_stdout, ccx_stderr = p.communicate()
+    if sys.version_info.major >= 3:
+        ccx_stdout = ccx_stdout.decode()
+        ccx_stderr = ccx_stderr.decode()
+    return p.returncode, ccx_stdout, ccx_stderr, time.time() - start_time
+
+##  @}
@@ -807,24 +807,35 @@ class FemToolsCcx(QtCore.QRunnable, QtCore.QObject):
         else:
             return False
 
-    def load_results(self):
+    def load_results(self, result_name_prefix=None):
         FreeCAD.Console.PrintMessage("\n")  # because of time print in separate line
         FreeCAD.Console.PrintMessage("CalculiX read results...\n")
         self.results_present = False
-        self.load_results_ccxfrd()
-        self.load_results_ccxdat()
+        self.load_results_ccxfrd(result_name_prefix)
+        self.load_results_ccxdat(result_name_prefix)
 
-    def load_results_ccxfrd(self):
+    def load_results_ccxfrd(self, result_name_prefix=None):
         """Load results of ccx calculations from .frd file.
+
+        Parameters
+        ----------
+        result_name_prefix : str, optional
+            prefix of the result object names, used to distinguish
+            the results of several runs in one analysis, "CCX_" if not given
         """
         import feminout.importCcxFrdResults as importCcxFrdResults
         frd_result_file = os.path.splitext(self.inp_file_name)[0] + ".frd"
         if os.path.isfile(frd_result_file):
+            # multi step results go into one result object if the preference is set
+            result_series = FreeCAD.ParamGet(
+                "User parameter:BaseApp/Preferences/Mod/Fem/Ccx"
+            ).GetBool("ResultSeries", False)
             importCcxFrdResults.importFrd(
                 frd_result_file,
                 self.analysis,
-                "CCX_",
-                self.solver.AnalysisType
+                "CCX_" if result_name_prefix is None else result_name_prefix,
+                self.solver.AnalysisType,
+                result_series=result_series
             )
             for m in self.analysis.Group:
                 if m.isDerivedFrom("Fem::FemResultObject"):
@@ -845,8 +856,13 @@ class FemToolsCcx(QtCore.QRunnable, QtCore.QObject):
                 .format(frd_result_file)
             )
 
-    def load_results_ccxdat(self):
+    def load_results_ccxdat(self, result_name_prefix=None):
         """Load results of ccx calculations from .dat file.
+
+        Parameters
+        ----------
+        result_name_prefix : str, optional
+            if given, only result objects with this name prefix get the eigenmode frequencies
         """
         import feminout.importCcxDatResults as importCcxDatResults
         dat_result_file = os.path.splitext(self.inp_file_name)[0] + ".dat"
@@ -868,7 +884,11 @@ class FemToolsCcx(QtCore.QRunnable, QtCore.QObject):
         if mode_frequencies:
             # print(mode_frequencies)
             for m in self.analysis.Group:
-                if m.isDerivedFrom("Fem::FemResultObject") and m.Eigenmode > 0:
+                if (
+                    m.isDerivedFrom("Fem::FemResultObject")
+                    and m.Eigenmode > 0
+                    and (result_name_prefix is None or m.Name.startswith(result_name_prefix))
+                ):
                     for mf in mode_frequencies:
                         if m.Eigenmode == mf["eigenmode"]:
                             m.EigenmodeFrequency = mf["frequency"]
@@ -30,6 +30,7 @@
 #include "PathPy.cpp"
 
 #include "Base/BoundBoxPy.h"
+#include "Base/Exception.h"
 #include "Base/GeometryPyCXX.h"
 #include "CommandPy.h"
 
@@ -66,8 +67,21 @@ int PathPy::PyInit(PyObject* args, PyObject* /*kwd*/)
                 if (PyObject_TypeCheck((*it).ptr(), &(Path::CommandPy::Type))) {
                     Path::Command &cmd = *static_cast<Path::CommandPy*>((*it).ptr())->getCommandPtr();
                     getToolpathPtr()->addCommand(cmd);
+                } else if (PyUnicode_Check((*it).ptr())) {
+                    // a gcode string is one command, as Path.Command(string)
+                    Path::Command cmd;
+                    std::string gcode(PyUnicode_AsUTF8((*it).ptr()));
+                    try {
+                        if (!gcode.empty())
+                            cmd.setFromGCode(gcode);
+                    }
+                    catch (const Base::Exception& e) {
+                        PyErr_SetString(PyExc_ValueError, e.what());
+                        return -1;
+                    }
+                    getToolpathPtr()->addCommand(cmd);
                 } else {
-                    PyErr_SetString(PyExc_TypeError, "The list must contain only Path Commands");
+                    PyErr_SetString(PyExc_TypeError, "The list must contain only Path Commands or gcode strings");
                     return -1;
                 }
             }
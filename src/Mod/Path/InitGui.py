@@ -124,14 +124,14 @@ class PathWorkbench (Workbench):
         if PathPreferences.advancedOCLFeaturesEnabled():
             try:
                 import ocl  # pylint: disable=unused-variable
-                from PathScripts import PathSurfaceGui
-                from PathScripts import PathWaterlineGui
-                threedopcmdlist.extend(["Path_Surface", "Path_Waterline"])
-                threedcmdgroup = ['Path_3dTools']
-                FreeCADGui.addCommand('Path_3dTools', PathCommandGroup(threedopcmdlist, QtCore.QT_TRANSLATE_NOOP("Path", '3D Operations')))
             except ImportError:
                 if not PathPreferences.suppressOpenCamLibWarning():
-                    FreeCAD.Console.PrintError("OpenCamLib is not working!\n")
+                    FreeCAD.Console.PrintError("OpenCamLib is not working, 3D operations use the built-in drop cutter.\n")
+            from PathScripts import PathSurfaceGui
+            from PathScripts import PathWaterlineGui
+            threedopcmdlist.extend(["Path_Surface", "Path_Waterline"])
+            threedcmdgroup = ['Path_3dTools']
+            FreeCADGui.addCommand('Path_3dTools', PathCommandGroup(threedopcmdlist, QtCore.QT_TRANSLATE_NOOP("Path", '3D Operations')))
 
         self.appendToolbar(QtCore.QT_TRANSLATE_NOOP("Path", "Project Setup"), projcmdlist)
         self.appendToolbar(QtCore.QT_TRANSLATE_NOOP("Path", "Tool Commands"), toolcmdlist)
@@ -189,7 +189,7 @@ class PathWorkbench (Workbench):
             obj = FreeCADGui.Selection.getSelection()[0]
             if obj.isDerivedFrom("Path::Feature"):
                 self.appendContextMenu("", "Separator")
-                self.appendContextMenu("", ["Path_Inspect"])
+                self.appendContextMenu("", ["Path_Inspect", "Path_ForceRecompute"])
                 selectedName = obj.Name
                 if "Remote" in selectedName:
                     self.appendContextMenu("", ["Refresh_Path"])
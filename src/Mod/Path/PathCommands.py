@@ -162,6 +162,32 @@ if FreeCAD.GuiUp:
     FreeCADGui.addCommand('Path_OpActiveToggle', _ToggleOperation())
 
 
+class _ForceRecompute:
+    "command definition to recompute paths even if their inputs did not change"
+    def GetResources(self):
+        return {'Pixmap': 'view-refresh',
+                'MenuText': QtCore.QT_TRANSLATE_NOOP("Path_ForceRecompute", "Force Recompute"),
+                'ToolTip': QtCore.QT_TRANSLATE_NOOP("Path_ForceRecompute", "Recompute the selected paths and the paths depending on them, even if their inputs did not change"),
+                'CmdType': "ForEdit"}
+
+    def IsActive(self):
+        selection = FreeCADGui.Selection.getSelection()
+        if not selection:
+            return False
+        return all(hasattr(obj, 'Path') for obj in selection)
+
+    def Activated(self):
+        import PathScripts.PathFingerprint as PathFingerprint
+        for obj in FreeCADGui.Selection.getSelection():
+            PathFingerprint.forceRecompute(obj)
+
+        FreeCAD.ActiveDocument.recompute()
+
+
+if FreeCAD.GuiUp:
+    FreeCADGui.addCommand('Path_ForceRecompute', _ForceRecompute())
+
+
 class _CopyOperation:
     "the Path Copy Operation command definition"
     def GetResources(self):
@@ -43,6 +43,7 @@ FeatureExtensions = LazyLoader('PathScripts.PathFeatureExtensions',
                                globals(),
                                'PathScripts.PathFeatureExtensions')
 DraftGeomUtils = LazyLoader('DraftGeomUtils', globals(), 'DraftGeomUtils')
+PathAdaptiveCache = LazyLoader('PathScripts.PathAdaptiveCache', globals(), 'PathScripts.PathAdaptiveCache')
 
 if FreeCAD.GuiUp:
     from pivy import coin
@@ -432,75 +433,33 @@ def Execute(op, obj):
             obj.Tolerance = 0.001
 
         # Get list of working edges for adaptive algorithm
-        pathArray = op.pathArray
-        if not pathArray:
+        if not op.pathArray:
             PathLog.error("No wire data returned.")
             return
 
-        path2d = convertTo2d(pathArray)
+        (inputStateObject, stockPath2d, path2d) = _getAdaptiveInput(op, obj)
 
-        stockPaths = []
-        if hasattr(op.stock, "StockType") and op.stock.StockType == "CreateCylinder":
-            stockPaths.append([discretize(op.stock.Shape.Edges[0])])
-
-        else:
-            stockBB = op.stock.Shape.BoundBox
-            v = []
-            v.append(FreeCAD.Vector(stockBB.XMin, stockBB.YMin, 0))
-            v.append(FreeCAD.Vector(stockBB.XMax, stockBB.YMin, 0))
-            v.append(FreeCAD.Vector(stockBB.XMax, stockBB.YMax, 0))
-            v.append(FreeCAD.Vector(stockBB.XMin, stockBB.YMax, 0))
-            v.append(FreeCAD.Vector(stockBB.XMin, stockBB.YMin, 0))
-            stockPaths.append([v])
-
-        stockPath2d = convertTo2d(stockPaths)
-
-        opType = area.AdaptiveOperationType.ClearingInside
-        if obj.OperationType == "Clearing":
-            if obj.Side == "Outside":
-                opType = area.AdaptiveOperationType.ClearingOutside
-
-            else:
-                opType = area.AdaptiveOperationType.ClearingInside
-
-        else:  # profiling
-            if obj.Side == "Outside":
-                opType = area.AdaptiveOperationType.ProfilingOutside
-
-            else:
-                opType = area.AdaptiveOperationType.ProfilingInside
-
-        keepToolDownRatio = 3.0
-        if hasattr(obj, 'KeepToolDownRatio'):
-            keepToolDownRatio = float(obj.KeepToolDownRatio)
-
-        # put here all properties that influence calculation of adaptive base paths,
-
-        inputStateObject = {
-            "tool": float(op.tool.Diameter),
-            "tolerance": float(obj.Tolerance),
-            "geometry": path2d,
-            "stockGeometry": stockPath2d,
-            "stepover": float(obj.StepOver),
-            "effectiveHelixDiameter": float(helixDiameter),
-            "operationType": obj.OperationType,
-            "side": obj.Side,
-            "forceInsideOut": obj.ForceInsideOut,
-            "finishingProfile": obj.FinishingProfile,
-            "keepToolDownRatio": keepToolDownRatio,
-            "stockToLeave": float(obj.StockToLeave)
-        }
-
-        inputStateChanged = False
         adaptiveResults = None
 
         if obj.AdaptiveOutputState is not None and obj.AdaptiveOutputState != "":
             adaptiveResults = obj.AdaptiveOutputState
 
         if json.dumps(obj.AdaptiveInputState) != json.dumps(inputStateObject):
-            inputStateChanged = True
             adaptiveResults = None
 
+            # results computed in a worker by PathOpScheduler
+            precomputed = getattr(op, 'precomputed', None)
+            if precomputed and json.dumps(precomputed[0]) == json.dumps(inputStateObject):
+                adaptiveResults = precomputed[1]
+
+        # results of an identical input, computed by any op of any document
+        cache = PathAdaptiveCache.defaultCache()
+        cacheKey = PathAdaptiveCache.inputKey(inputStateObject)
+        cached = False
+        if adaptiveResults is None:
+            adaptiveResults = cache.get(cacheKey)
+            cached = adaptiveResults is not None
+
         # progress callback fn, if return true it will stop processing
         def progressFn(tpaths):
             if FreeCAD.GuiUp:
@@ -517,29 +476,8 @@ def Execute(op, obj):
 
         start = time.time()
 
-        if inputStateChanged or adaptiveResults is None:
-            a2d = area.Adaptive2d()
-            a2d.stepOverFactor = 0.01 * obj.StepOver
-            a2d.toolDiameter = float(op.tool.Diameter)
-            a2d.helixRampDiameter = helixDiameter
-            a2d.keepToolDownDistRatio = keepToolDownRatio
-            a2d.stockToLeave = float(obj.StockToLeave)
-            a2d.tolerance = float(obj.Tolerance)
-            a2d.forceInsideOut = obj.ForceInsideOut
-            a2d.finishingProfile = obj.FinishingProfile
-            a2d.opType = opType
-
-            # EXECUTE
-            results = a2d.Execute(stockPath2d, path2d, progressFn)
-
-            # need to convert results to python object to be JSON serializable
-            adaptiveResults = []
-            for result in results:
-                adaptiveResults.append({
-                    "HelixCenterPoint": result.HelixCenterPoint,
-                    "StartPoint": result.StartPoint,
-                    "AdaptivePaths": result.AdaptivePaths,
-                    "ReturnMotionType": result.ReturnMotionType})
+        if adaptiveResults is None:
+            adaptiveResults = computeAdaptive(inputStateObject, stockPath2d, path2d, progressFn)
 
         # GENERATE
         GenerateGCode(op, obj, adaptiveResults, helixDiameter)
@@ -548,6 +486,8 @@ def Execute(op, obj):
             PathLog.info("*** Done. Elapsed time: %f sec\n\n" % (time.time()-start))
             obj.AdaptiveOutputState = adaptiveResults
             obj.AdaptiveInputState = inputStateObject
+            if not cached and not cache.contains(cacheKey):
+                cache.put(cacheKey, adaptiveResults)
 
         else:
             PathLog.info("*** Processing cancelled (after: %f sec).\n\n" % (time.time()-start))
@@ -559,12 +499,102 @@ def Execute(op, obj):
             sceneClean()
 
 
+def _getAdaptiveInput(op, obj):
+    '''_getAdaptiveInput(op, obj) ... returns (inputStateObject, stockPath2d, path2d) for the working
+    edges in op.pathArray. inputStateObject holds all values influencing the adaptive base paths.'''
+    path2d = convertTo2d(op.pathArray)
+
+    stockPaths = []
+    if hasattr(op.stock, "StockType") and op.stock.StockType == "CreateCylinder":
+        stockPaths.append([discretize(op.stock.Shape.Edges[0])])
+
+    else:
+        stockBB = op.stock.Shape.BoundBox
+        v = []
+        v.append(FreeCAD.Vector(stockBB.XMin, stockBB.YMin, 0))
+        v.append(FreeCAD.Vector(stockBB.XMax, stockBB.YMin, 0))
+        v.append(FreeCAD.Vector(stockBB.XMax, stockBB.YMax, 0))
+        v.append(FreeCAD.Vector(stockBB.XMin, stockBB.YMax, 0))
+        v.append(FreeCAD.Vector(stockBB.XMin, stockBB.YMin, 0))
+        stockPaths.append([v])
+
+    stockPath2d = convertTo2d(stockPaths)
+
+    keepToolDownRatio = 3.0
+    if hasattr(obj, 'KeepToolDownRatio'):
+        keepToolDownRatio = float(obj.KeepToolDownRatio)
+
+    # put here all properties that influence calculation of adaptive base paths,
+
+    inputStateObject = {
+        "tool": float(op.tool.Diameter),
+        "tolerance": max(float(obj.Tolerance), 0.001),
+        "geometry": path2d,
+        "stockGeometry": stockPath2d,
+        "stepover": float(obj.StepOver),
+        "effectiveHelixDiameter": float(obj.HelixDiameterLimit.Value),
+        "operationType": obj.OperationType,
+        "side": obj.Side,
+        "forceInsideOut": obj.ForceInsideOut,
+        "finishingProfile": obj.FinishingProfile,
+        "keepToolDownRatio": keepToolDownRatio,
+        "stockToLeave": float(obj.StockToLeave)
+    }
+    return (inputStateObject, stockPath2d, path2d)
+
+
+def computeAdaptive(inputState, stockPath2d, path2d, progressFn):
+    '''computeAdaptive(inputState, stockPath2d, path2d, progressFn) ... runs the adaptive algorithm and
+    returns its results converted to JSON serializable python objects. Doesn't access the document.'''
+    opType = area.AdaptiveOperationType.ClearingInside
+    if inputState["operationType"] == "Clearing":
+        if inputState["side"] == "Outside":
+            opType = area.AdaptiveOperationType.ClearingOutside
+
+        else:
+            opType = area.AdaptiveOperationType.ClearingInside
+
+    else:  # profiling
+        if inputState["side"] == "Outside":
+            opType = area.AdaptiveOperationType.ProfilingOutside
+
+        else:
+            opType = area.AdaptiveOperationType.ProfilingInside
+
+    a2d = area.Adaptive2d()
+    a2d.stepOverFactor = 0.01 * inputState["stepover"]
+    a2d.toolDiameter = inputState["tool"]
+    a2d.helixRampDiameter = inputState["effectiveHelixDiameter"]
+    a2d.keepToolDownDistRatio = inputState["keepToolDownRatio"]
+    a2d.stockToLeave = inputState["stockToLeave"]
+    a2d.tolerance = inputState["tolerance"]
+    a2d.forceInsideOut = inputState["forceInsideOut"]
+    a2d.finishingProfile = inputState["finishingProfile"]
+    a2d.opType = opType
+
+    # EXECUTE
+    results = a2d.Execute(stockPath2d, path2d, progressFn)
+
+    # need to convert results to python object to be JSON serializable
+    adaptiveResults = []
+    for result in results:
+        adaptiveResults.append({
+            "HelixCenterPoint": result.HelixCenterPoint,
+            "StartPoint": result.StartPoint,
+            "AdaptivePaths": result.AdaptivePaths,
+            "ReturnMotionType": result.ReturnMotionType})
+    return adaptiveResults
+
+
 def _get_working_edges(op, obj):
     '''_get_working_edges(op, obj)...
     Compile all working edges from the Base Geometry selection (obj.Base)
     for the current operation.
     Additional modifications to selected region(face), such as extensions,
     should be placed within this function.
+    Returns the edges and the removal shape, which is None if there are no
+    horizontal faces. The document is not modified, thus it can be called
+    before the recompute.
     '''
     all_regions = list()
     edge_list = list()
@@ -616,14 +646,15 @@ def _get_working_edges(op, obj):
 
     # Second face-combining method attempted
     horizontal = PathGeom.combineHorizontalFaces(all_regions)
+    removalshape = None
     if horizontal:
-        obj.removalshape = Part.makeCompound(horizontal)
+        removalshape = Part.makeCompound(horizontal)
         for f in horizontal:
             for w in f.Wires:
                 for e in w.Edges:
                     edge_list.append([discretize(e)])
 
-    return edge_list
+    return (edge_list, removalshape)
 
 
 class PathAdaptive(PathOp.ObjectOp):
@@ -707,9 +738,34 @@ class PathAdaptive(PathOp.ObjectOp):
         See documentation of execute() for a list of base functionality provided.
         Should be overwritten by subclasses.'''
 
-        self.pathArray = _get_working_edges(self, obj)
+        # the edges are only looked up once if the op was prepared by PathOpScheduler
+        workingEdges = getattr(self, 'preparedEdges', None)
+        self.preparedEdges = None
+        if workingEdges is None:
+            workingEdges = _get_working_edges(self, obj)
+        (self.pathArray, removalshape) = workingEdges
+        if removalshape is not None:
+            obj.removalshape = removalshape
         Execute(self, obj)
 
+    def opPrepare(self, obj):
+        '''opPrepare(obj) ... returns a callable running the adaptive algorithm, None if the
+        results stored in obj are still valid. The working edges and the removal shape are kept
+        for the next opExecute(), which assigns the removal shape, the document is not modified.'''
+        self.preparedEdges = _get_working_edges(self, obj)
+        self.pathArray = self.preparedEdges[0]
+        if not self.pathArray:
+            return None
+        (inputStateObject, stockPath2d, path2d) = _getAdaptiveInput(self, obj)
+        if obj.AdaptiveOutputState and json.dumps(obj.AdaptiveInputState) == json.dumps(inputStateObject):
+            return None
+        if PathAdaptiveCache.defaultCache().contains(PathAdaptiveCache.inputKey(inputStateObject)):
+            return None
+
+        def compute():
+            return (inputStateObject, computeAdaptive(inputStateObject, stockPath2d, path2d, lambda tpaths: False))
+        return compute
+
     def opOnDocumentRestored(self, obj):
         if not hasattr(obj, 'HelixConeAngle'):
             obj.addProperty("App::PropertyAngle", "HelixConeAngle", "Adaptive", "Helix cone angle (degrees)")
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathLog as PathLog
+import PathScripts.PathPreferences as PathPreferences
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+
+__title__ = "Path Adaptive Cache"
+__author__ = "FreeCAD developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Content addressed on disk cache of adaptive results, shared by all operations and documents."
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+# bump whenever the adaptive algorithm or the format of its results changes
+Version = 1
+Suffix = '.json.gz'
+
+
+def inputKey(inputState):
+    '''inputKey(inputState) ... return the hash identifying the results of an adaptive input state.
+    The state is serialized with sorted keys so equal states hash equal regardless of their origin.'''
+    data = json.dumps([Version, inputState], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class AdaptiveCache(object):
+    '''Stores adaptive results as compressed json files named after their input key. Once the files
+    exceed maxBytes the least recently used ones are removed.'''
+
+    def __init__(self, directory, maxBytes):
+        self.directory = directory
+        self.maxBytes = maxBytes
+
+    def enabled(self):
+        return self.maxBytes > 0
+
+    def fileName(self, key):
+        return os.path.join(self.directory, key + Suffix)
+
+    def contains(self, key):
+        return self.enabled() and os.path.isfile(self.fileName(key))
+
+    def get(self, key):
+        '''get(key) ... return the results stored for key or None.'''
+        if not self.enabled():
+            return None
+        fileName = self.fileName(key)
+        try:
+            with gzip.open(fileName, 'rt', encoding='utf-8') as fp:
+                results = json.load(fp)
+            # the modification time tracks the last use for eviction
+            os.utime(fileName, None)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError) as e:
+            PathLog.warning("Discarding unreadable cache entry {}: {}".format(fileName, e))
+            self._remove(fileName)
+            return None
+        PathLog.debug("cache hit {}".format(key))
+        return results
+
+    def put(self, key, results):
+        '''put(key, results) ... store results for key and evict old entries if the cache is too big.'''
+        if not self.enabled():
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # write to a temporary file first so readers never see a partial entry
+            (fd, tmpName) = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+            try:
+                with gzip.open(os.fdopen(fd, 'wb'), 'wt', encoding='utf-8') as fp:
+                    json.dump(results, fp, separators=(',', ':'))
+                os.replace(tmpName, self.fileName(key))
+            except BaseException:
+                self._remove(tmpName)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            PathLog.warning("Cannot cache adaptive results in {}: {}".format(self.directory, e))
+            return
+        self.evict()
+
+    def entries(self):
+        '''entries() ... return (mtime, size, fileName) for all cache entries, oldest first.'''
+        entries = []
+        try:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(Suffix):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except FileNotFoundError:
+            pass
+        return sorted(entries)
+
+    def evict(self):
+        '''evict() ... remove least recently used entries until the cache fits into maxBytes.'''
+        entries = self.entries()
+        size = sum(e[1] for e in entries)
+        for (_, entrySize, fileName) in entries:
+            if size <= self.maxBytes:
+                break
+            self._remove(fileName)
+            size -= entrySize
+
+    def clear(self):
+        for (_, _, fileName) in self.entries():
+            self._remove(fileName)
+
+    def _remove(self, fileName):
+        try:
+            os.remove(fileName)
+        except OSError:
+            pass
+
+
+def defaultCache():
+    '''defaultCache() ... return the cache configured in the preferences.'''
+    return AdaptiveCache(PathPreferences.adaptiveCacheDirectory(), PathPreferences.adaptiveCacheSize() * 1024 * 1024)
@@ -23,6 +23,7 @@
 import FreeCAD
 import PathScripts.PathLog as PathLog
 import PathScripts.PathOp as PathOp
+import PathScripts.PathOrdering as PathOrdering
 import PathScripts.PathUtils as PathUtils
 
 from PySide import QtCore
@@ -71,6 +72,12 @@ class ObjectOp(PathOp.ObjectOp):
         obj.addProperty("App::PropertyStringList", "Disabled", "Base", QtCore.QT_TRANSLATE_NOOP("Path", "List of disabled features"))
         self.initCircularHoleOperation(obj)
 
+    def setupOptimizeOrder(self, obj):
+        '''setupOptimizeOrder(obj) ... adds the OptimizeOrder property used by sortHoles(obj, holes).
+        To be called by subclasses which sort their holes.'''
+        if not hasattr(obj, 'OptimizeOrder'):
+            obj.addProperty("App::PropertyBool", "OptimizeOrder", "Path", QtCore.QT_TRANSLATE_NOOP("Path", "Improve the order of the holes to shorten rapid moves between them"))
+
     def initCircularHoleOperation(self, obj):
         '''initCircularHoleOperation(obj) ... overwrite if the subclass needs initialisation.
         Can safely be overwritten by subclasses.'''
@@ -195,6 +202,14 @@ class ObjectOp(PathOp.ObjectOp):
         if len(holes) > 0:
             self.circularHoleExecute(obj, holes)
 
+    def sortHoles(self, obj, holes):
+        '''sortHoles(obj, holes) ... returns holes in the order they should be processed.
+        obj needs the OptimizeOrder property, see setupOptimizeOrder(obj).
+        Can safely be overwritten by subclasses.'''
+        (holes, saved) = PathOrdering.sortLocations(holes, ['x', 'y'], optimize=obj.OptimizeOrder)
+        PathLog.debug("hole order saves an estimated {:.2f} mm of rapid moves".format(saved))
+        return holes
+
     def circularHoleExecute(self, obj, holes):
         '''circularHoleExecute(obj, holes) ... implement processing of holes.
         holes is a list of dictionaries with 'x', 'y' and 'r' specified for each hole.
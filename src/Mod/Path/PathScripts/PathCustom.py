@@ -58,9 +58,8 @@ class ObjectCustom(PathOp.ObjectOp):
     def opExecute(self, obj):
         self.commandlist.append(Path.Command("(Begin Custom)"))
         if obj.Gcode:
-            for l in obj.Gcode:
-                newcommand = Path.Command(str(l))
-                self.commandlist.append(newcommand)
+            # Path parses each line into one command, all lines in a single call
+            self.commandlist.extend(Path.Path([str(l) for l in obj.Gcode]).Commands)
 
         self.commandlist.append(Path.Command("(End Custom)"))
 
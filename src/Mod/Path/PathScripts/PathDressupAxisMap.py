@@ -23,6 +23,7 @@
 import FreeCAD
 import Path
 import math
+import PathScripts.PathFingerprint as PathFingerprint
 import PathScripts.PathGeom as PathGeom
 import PathScripts.PathUtils as PathUtils
 import PathScripts.PathGui as PathGui
@@ -88,6 +89,7 @@ class ObjectDressup:
 
         return newcommandlist
 
+    @PathFingerprint.incremental
     def execute(self, obj):
 
         inAxis = obj.AxisMap[0]
@@ -24,6 +24,7 @@ from __future__ import print_function
 import FreeCAD
 import Path
 import PathScripts.PathDressup as PathDressup
+import PathScripts.PathFingerprint as PathFingerprint
 import PathScripts.PathGeom as PathGeom
 import PathScripts.PathLog as PathLog
 import PathScripts.PathUtil as PathUtil
@@ -744,6 +745,7 @@ class ObjectDressup(object):
 
         return commands, bones
 
+    @PathFingerprint.incremental
     def execute(self, obj, forReal=True):
         if not obj.Base:
             return
@@ -889,7 +891,7 @@ class ObjectDressup(object):
         state = {}
         # If the receiver was loaded from file, then it never generated the bone list.
         if not hasattr(self, 'bones'):
-            self.execute(obj)
+            self.execute(obj, True)
         for (nr, loc, enabled, inaccessible) in self.bones:
             item = state.get((loc[0], loc[1]))
             if item:
@@ -25,6 +25,7 @@ import FreeCAD
 import Path
 from PySide import QtCore
 import math
+import PathScripts.PathFingerprint as PathFingerprint
 import PathScripts.PathUtils as PathUtils
 import PathScripts.PathGui as PathGui
 
@@ -310,6 +311,7 @@ class ObjectDressup:
         replace = None
         return (results, replace)
 
+    @PathFingerprint.incremental
     def execute(self, obj):
         newpath = []
         global currLocation  # pylint: disable=global-statement
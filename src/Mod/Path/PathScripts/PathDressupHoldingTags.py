@@ -23,12 +23,15 @@
 import FreeCAD
 import Path
 import PathScripts.PathDressup as PathDressup
+import PathScripts.PathFingerprint as PathFingerprint
 import PathScripts.PathGeom as PathGeom
 import PathScripts.PathLog as PathLog
 import PathScripts.PathUtil as PathUtil
 import PathScripts.PathUtils as PathUtils
+import bisect
 import copy
 import math
+import numpy
 
 from PathScripts.PathDressupTagPreferences import HoldingTagPreferences
 from PathScripts.PathUtils import waiting_effects
@@ -94,7 +97,61 @@ def debugCone(vector, r1, r2, height, label, color=None):
             obj.ViewObject.ShapeColor = color
 
 
+def edgeKey(edge):
+    '''edgeKey(edge) ... return a hashable identification of the edge's geometry.'''
+    params = [edge.FirstParameter, (edge.FirstParameter + edge.LastParameter) / 2, edge.LastParameter]
+    return tuple(round(c, 6) for p in [edge.valueAt(u) for u in params] for c in (p.x, p.y, p.z))
+
+
+class TagCache:
+    '''Solids and commands computed for tags, reused as long as the tag and the path don't change.
+    Entries are kept for one more generation, entries not used during it are dropped.'''
+
+    def __init__(self):
+        self.previous = {}
+        self.current = {}
+
+    def get(self, key):
+        if key in self.current:
+            return self.current[key]
+        value = self.previous.get(key)
+        if value is not None:
+            self.current[key] = value
+        return value
+
+    def put(self, key, value):
+        self.current[key] = value
+
+    def nextGeneration(self):
+        self.previous = self.current
+        self.current = {}
+
+
+class EdgeIndex:
+    '''Bounding boxes of edges, to find the edges a shape or point can possibly touch.'''
+
+    def __init__(self, edges):
+        bounds = [(bb.XMin, bb.YMin, bb.ZMin, bb.XMax, bb.YMax, bb.ZMax) for bb in [e.BoundBox for e in edges]]
+        self.bounds = numpy.array(bounds, dtype=float).reshape(-1, 6)
+
+    def _near(self, lo, hi, tolerance):
+        mask = numpy.all(self.bounds[:, 0:3] <= numpy.array(hi) + tolerance, axis=1)
+        mask &= numpy.all(self.bounds[:, 3:6] >= numpy.array(lo) - tolerance, axis=1)
+        return numpy.flatnonzero(mask).tolist()
+
+    def near(self, bb, tolerance=PathGeom.Tolerance):
+        '''near(bb, tolerance) ... return the ascending indices of all edges overlapping the bound box.'''
+        return self._near((bb.XMin, bb.YMin, bb.ZMin), (bb.XMax, bb.YMax, bb.ZMax), tolerance)
+
+    def nearPoint(self, pt, tolerance=PathGeom.Tolerance):
+        '''nearPoint(pt, tolerance) ... return the ascending indices of all edges within tolerance of the point's bounds.'''
+        return self._near((pt.x, pt.y, pt.z), (pt.x, pt.y, pt.z), tolerance)
+
+
 class Tag:
+    # everything createSolidsAt sets up
+    SolidAttributes = ['z', 'toolRadius', 'r1', 'r2', 'actualHeight', 'isSquare', 'solid', 'realRadius']
+
     def __init__(self, nr, x, y, width, height, angle, radius, enabled=True):
         PathLog.track("%.2f, %.2f, %.2f, %.2f, %.2f, %.2f, %d" % (x, y, width, height, angle, radius, enabled))
         self.nr = nr
@@ -128,7 +185,26 @@ class Tag:
     def top(self):
         return self.z + self.actualHeight
 
-    def createSolidsAt(self, z, R):
+    def key(self):
+        '''key() ... return the parameters determining the tag's solid, after it has been created.'''
+        return (self.x, self.y, self.width, self.height, self.angle, self.radius.Value, self.z, self.toolRadius)
+
+    def createSolidsAt(self, z, R, cache=None):
+        '''createSolidsAt(z, R, cache=None) ... create the tag's solid for a path at z and a tool of radius R.
+        The solid is taken from the cache if a tag with the same parameters already created it.'''
+        key = None
+        if cache is not None:
+            key = ('solid', self.x, self.y, self.width, self.height, self.angle, self.radius.Value, z, R)
+            state = cache.get(key)
+            if state is not None:
+                for attr in Tag.SolidAttributes:
+                    setattr(self, attr, state[attr])
+                return
+        self._createSolidsAt(z, R)
+        if key is not None:
+            cache.put(key, {attr: getattr(self, attr) for attr in Tag.SolidAttributes})
+
+    def _createSolidsAt(self, z, R):
         self.z = z
         self.toolRadius = R
         r1 = self.fullWidth() / 2
@@ -239,9 +315,10 @@ class Tag:
 
 
 class MapWireToTag:
-    def __init__(self, edge, tag, i, segm, maxZ, hSpeed, vSpeed):
+    def __init__(self, edge, tag, i, segm, maxZ, hSpeed, vSpeed, cache=None):
         debugEdge(edge, 'MapWireToTag(%.2f, %.2f, %.2f)' % (i.x, i.y, i.z))
         self.tag = tag
+        self.cache = cache
         self.segm = segm
         self.maxZ = maxZ
         self.hSpeed = hSpeed
@@ -468,7 +545,28 @@ class MapWireToTag:
             return shell.removeShape(nullFaces)
         return shell
 
+    def cacheKey(self):
+        edges = tuple(edgeKey(e) for e in self.edges)
+        initial = edgeKey(self.initialEdge) if hasattr(self, 'initialEdge') else None
+        return ('span', self.tag.key(), self.segm, self.maxZ, self.hSpeed, self.vSpeed, edges, initial, edgeKey(self.finalEdge))
+
     def commandsForEdges(self):
+        '''commandsForEdges() ... return the commands going around the tag, the same tag over the same
+        edges again takes them from the cache.'''
+        if not self.edges or self.cache is None:
+            return self._commandsForEdges()
+        key = self.cacheKey()
+        cached = self.cache.get(key)
+        if cached is None:
+            commands = self._commandsForEdges()
+            cached = (commands, not self.tag.enabled)
+            self.cache.put(key, cached)
+        elif cached[1]:
+            self.tag.enabled = False
+            failures.append(self)
+        return list(cached[0])
+
+    def _commandsForEdges(self):
         global failures # pylint: disable=global-statement
         if self.edges:
             try:
@@ -560,7 +658,9 @@ class PathData:
             self.edges = self.wire.Edges
         else:
             self.edges = []
+        self.edgeIndex = EdgeIndex(self.edges)
         self.baseWire = self.findBottomWire(self.edges)
+        self.bottomIndex = EdgeIndex(self.bottomEdges)
 
     def findBottomWire(self, edges):
         (minZ, maxZ) = self.findZLimits(edges)
@@ -725,11 +825,28 @@ class PathData:
     def defaultTagRadius(self):
         return HoldingTagPreferences.defaultRadius()
 
+    def tagCandidates(self, tags):
+        '''tagCandidates(tags) ... return for each edge the ascending indices of the tags it might intersect.'''
+        candidates = [[] for e in self.edges]
+        for (i, tag) in enumerate(tags):
+            if tag.enabled:
+                for k in self.edgeIndex.near(tag.solid.BoundBox):
+                    candidates[k].append(i)
+        return candidates
+
     def sortedTags(self, tags):
+        # each tag belongs to the first bottom edge it's on, only edges close to its position are checked
+        onEdge = {}
+        for t in tags:
+            pt = t.originAt(self.minZ)
+            for k in self.bottomIndex.nearPoint(pt, 0.1):
+                if PathGeom.isRoughly(0, Part.Vertex(pt).distToShape(self.bottomEdges[k])[0], 0.1):
+                    onEdge.setdefault(k, []).append(t)
+                    break
         ordered = []
-        for edge in self.bottomEdges:
-            ts = [t for t in tags if PathGeom.isRoughly(0, Part.Vertex(t.originAt(self.minZ)).distToShape(edge)[0], 0.1)]
-            for t in sorted(ts, key=lambda t, edge=edge: (t.originAt(self.minZ) - edge.valueAt(edge.FirstParameter)).Length):
+        for k in sorted(onEdge):
+            edge = self.bottomEdges[k]
+            for t in sorted(onEdge[k], key=lambda t, edge=edge: (t.originAt(self.minZ) - edge.valueAt(edge.FirstParameter)).Length):
                 tags.remove(t)
                 ordered.append(t)
         # disable all tags that are not on the base wire.
@@ -773,6 +890,8 @@ class ObjectTagDressup:
         self.pathData = None
         self.toolRadius = None
         self.mappers = []
+        self.pathKey = None
+        self.cache = TagCache()
 
         obj.Proxy = self
         obj.Base = base
@@ -787,6 +906,8 @@ class ObjectTagDressup:
         self.pathData = None
         self.toolRadius = None
         self.mappers = []
+        self.pathKey = None
+        self.cache = TagCache()
         return None
 
     def onDocumentRestored(self, obj):
@@ -856,6 +977,8 @@ class ObjectTagDressup:
 
         self.mappers = []
         mapper = None
+        candidates = pathData.tagCandidates(tags)
+        edgeIndex = None
 
         tc = PathDressup.toolController(obj.Base)
         horizFeed = tc.HorizFeed.Value
@@ -868,6 +991,7 @@ class ObjectTagDressup:
             if not edge:
                 edge = pathData.edges[lastEdge]
                 debugEdge(edge, "=======  new edge: %d/%d" % (lastEdge, len(pathData.edges)))
+                edgeIndex = lastEdge
                 lastEdge += 1
                 # sameTag = None
 
@@ -881,13 +1005,19 @@ class ObjectTagDressup:
                     edge = None
 
             if edge:
-                tIndex = (t + lastTag) % len(tags)
-                t += 1
-                i = tags[tIndex].intersects(edge, edge.FirstParameter)
-                if i and self.isValidTagStartIntersection(edge, i):
-                    mapper = MapWireToTag(edge, tags[tIndex], i, segm, pathData.maxZ, hSpeed = horizFeed, vSpeed = vertFeed)
-                    self.mappers.append(mapper)
-                    edge = mapper.tail
+                # skip all tags too far away from the edge, tails of an edge are within its bounds
+                near = candidates[edgeIndex]
+                k = bisect.bisect_left(near, t)
+                if k < len(near):
+                    tIndex = near[k]
+                    t = tIndex + 1
+                    i = tags[tIndex].intersects(edge, edge.FirstParameter)
+                    if i and self.isValidTagStartIntersection(edge, i):
+                        mapper = MapWireToTag(edge, tags[tIndex], i, segm, pathData.maxZ, hSpeed = horizFeed, vSpeed = vertFeed, cache = self.cache)
+                        self.mappers.append(mapper)
+                        edge = mapper.tail
+                else:
+                    t = len(tags)
 
             if not mapper and t >= len(tags):
                 # gone through all tags, consume edge and move on
@@ -911,10 +1041,11 @@ class ObjectTagDressup:
         return list([m for m in self.mappers if m.haveProblem])
 
     def createTagsPositionDisabled(self, obj, positionsIn, disabledIn):
+        self.cache.nextGeneration()
         rawTags = []
         for i, pos in enumerate(positionsIn):
             tag = Tag(i, pos.x, pos.y, obj.Width.Value, obj.Height.Value, obj.Angle, obj.Radius, not i in disabledIn)
-            tag.createSolidsAt(self.pathData.minZ, self.toolRadius)
+            tag.createSolidsAt(self.pathData.minZ, self.toolRadius, self.cache)
             rawTags.append(tag)
         # disable all tags that intersect with their previous tag
         prev = None
@@ -924,7 +1055,7 @@ class ObjectTagDressup:
         for i, tag in enumerate(self.pathData.sortedTags(rawTags)):
             if tag.enabled:
                 if prev:
-                    if prev.solid.common(tag.solid).Faces:
+                    if prev.solid.BoundBox.intersect(tag.solid.BoundBox) and prev.solid.common(tag.solid).Faces:
                         PathLog.info("Tag #%d intersects with previous tag - disabling\n" % i)
                         PathLog.debug("this tag = %d [%s]" % (i, tag.solid.BoundBox))
                         tag.enabled = False
@@ -946,6 +1077,7 @@ class ObjectTagDressup:
             positions.append(tag.originAt(self.pathData.minZ))
         return (tags, positions, disabled)
 
+    @PathFingerprint.incremental
     def execute(self, obj):
         # import cProfile
         # pr = cProfile.Profile()
@@ -1024,6 +1156,11 @@ class ObjectTagDressup:
     def setup(self, obj, generate=False):
         PathLog.debug("setup")
         self.obj = obj
+        toolRadius = float(PathDressup.toolController(obj.Base).Tool.Diameter) / 2
+        pathKey = (obj.Base.Path.toGCode(), toolRadius)
+        if self.pathData and self.pathKey == pathKey and not generate:
+            # base path unchanged, so are its edges and everything cached for them
+            return self.pathData
         try:
             pathData = PathData(obj)
         except ValueError:
@@ -1034,8 +1171,10 @@ class ObjectTagDressup:
             #    traceback.print_exc()
             return None
 
-        self.toolRadius = float(PathDressup.toolController(obj.Base).Tool.Diameter) / 2
+        self.toolRadius = toolRadius
         self.pathData = pathData
+        self.pathKey = pathKey
+        self.cache = TagCache()
         if generate:
             obj.Height = self.pathData.defaultTagHeight()
             obj.Width = self.pathData.defaultTagWidth()
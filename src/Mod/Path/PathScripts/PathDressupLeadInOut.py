@@ -27,6 +27,7 @@ import FreeCAD
 import FreeCADGui
 import Path
 import PathScripts.PathDressup as PathDressup
+import PathScripts.PathFingerprint as PathFingerprint
 import PathScripts.PathGeom as PathGeom
 import PathScripts.PathLog as PathLog
 import PathScripts.PathUtils as PathUtils
@@ -98,6 +99,7 @@ class ObjectDressup:
         obj.RapidPlunge = False
         obj.IncludeLayers = True
 
+    @PathFingerprint.incremental
     def execute(self, obj):
         if not obj.Base:
             return
@@ -23,6 +23,7 @@
 import FreeCAD
 import Path
 import PathScripts.PathDressup as PathDressup
+import PathScripts.PathFingerprint as PathFingerprint
 import PathScripts.PathGeom as PathGeom
 import PathScripts.PathLog as PathLog
 import PathScripts.PathStock as PathStock
@@ -94,6 +95,7 @@ class DressupPathBoundary(object):
                 cmds.append(Path.Command('G1', {'Z': end.z, 'F': verticalFeed}))
         return cmds
 
+    @PathFingerprint.incremental
     def execute(self, obj):
         if not obj.Base or not obj.Base.isDerivedFrom('Path::Feature') or not obj.Base.Path:
             return
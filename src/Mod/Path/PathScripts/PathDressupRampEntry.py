@@ -23,6 +23,7 @@
 import FreeCAD
 import Path
 import PathScripts.PathDressup as PathDressup
+import PathScripts.PathFingerprint as PathFingerprint
 import PathScripts.PathGeom as PathGeom
 import PathScripts.PathLog as PathLog
 import math
@@ -102,6 +103,7 @@ class ObjectDressup:
         if PathDressup.baseOp(obj).StartDepth is not None:
             obj.DressupStartDepth = PathDressup.baseOp(obj).StartDepth
 
+    @PathFingerprint.incremental
     def execute(self, obj):
         if not obj.Base:
             return
@@ -22,6 +22,7 @@
 
 import FreeCAD
 import PathScripts.PathDressup as PathDressup
+import PathScripts.PathFingerprint as PathFingerprint
 import PathScripts.PathGeom as PathGeom
 import PathScripts.PathLog as PathLog
 import PathScripts.PathUtils as PathUtils
@@ -149,6 +150,7 @@ class ObjectDressup:
         self.obj.Angle = HoldingTagPreferences.defaultAngle()
         self.obj.Radius = HoldingTagPreferences.defaultRadius()
 
+    @PathFingerprint.incremental
     def execute(self, obj):
         PathLog.track()
         if not obj.Base:
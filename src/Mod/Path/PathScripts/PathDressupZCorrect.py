@@ -24,19 +24,26 @@
 # *                                                                         *
 # ***************************************************************************
 import FreeCAD
-import FreeCADGui
 import Path
+import PathScripts.PathFingerprint as PathFingerprint
 import PathScripts.PathGeom as PathGeom
 import PathScripts.PathLog as PathLog
+import PathScripts.PathProbeMap as PathProbeMap
 import PathScripts.PathUtils as PathUtils
+import math
+import numpy
+import os
 
 from PySide import QtCore, QtGui
 
+if FreeCAD.GuiUp:
+    import FreeCADGui
+
 # lazily loaded modules
 from lazy_loader.lazy_loader import LazyLoader
 Part = LazyLoader('Part', globals(), 'Part')
 
-"""Z Depth Correction Dressup.  This dressup takes a probe file as input and does bilinear interpolation of the Zdepths to correct for a surface which is not parallel to the milling table/bed.  The probe file should conform to the format specified by the linuxcnc G38 probe logging: 9-number coordinate consisting of XYZABCUVW http://linuxcnc.org/docs/html/gcode/g-code.html#gcode:g38
+"""Z Depth Correction Dressup.  This dressup takes a probe file as input and does bilinear or bicubic interpolation of the Zdepths to correct for a surface which is not parallel to the milling table/bed.  The probe file should conform to the format specified by the linuxcnc G38 probe logging: 9-number coordinate consisting of XYZABCUVW http://linuxcnc.org/docs/html/gcode/g-code.html#gcode:g38
 """
 
 LOGLEVEL = False
@@ -59,6 +66,9 @@ movecommands = ['G1', 'G01', 'G2', 'G02', 'G3', 'G03']
 rapidcommands = ['G0', 'G00']
 arccommands = ['G2', 'G3', 'G02', 'G03']
 
+# smallest arc deflection used, a deflection of 0 would never reach the end of the arc
+MinimumDeflection = 0.001
+
 
 class ObjectDressup:
 
@@ -71,6 +81,7 @@ class ObjectDressup:
         obj.addProperty("App::PropertyDistance", "SegInterpolate", "Interpolate", QtCore.QT_TRANSLATE_NOOP("Path_DressupZCorrectp", "break segments into smaller segments of this length."))
         obj.ArcInterpolate = 0.1
         obj.SegInterpolate = 1.0
+        self._setupInterpolationMethod(obj)
 
     def __getstate__(self):
         return None
@@ -78,6 +89,15 @@ class ObjectDressup:
     def __setstate__(self, state):
         return None
 
+    def onDocumentRestored(self, obj):
+        if not hasattr(obj, 'InterpolationMethod'):
+            self._setupInterpolationMethod(obj)
+
+    def _setupInterpolationMethod(self, obj):
+        obj.addProperty("App::PropertyEnumeration", "InterpolationMethod", "Interpolate", QtCore.QT_TRANSLATE_NOOP("Path_DressupZCorrect", "Interpolation of the probed heights between the probe points"))
+        obj.InterpolationMethod = PathProbeMap.Methods
+        obj.InterpolationMethod = PathProbeMap.Bicubic
+
     def onChanged(self, fp, prop):
         if str(prop) == "probefile":
             self._loadFile(fp, fp.probefile)
@@ -91,45 +111,92 @@ class ObjectDressup:
         points, curves = vertical_line.intersectCS(surface)
         return points[0].Z
 
+    def _fileKey(self, filename):
+        if filename and os.path.isfile(filename):
+            return (filename, os.path.getmtime(filename))
+        return None
+
     def _loadFile(self, obj, filename):
         if filename == "":
             return
+        if not os.path.isfile(filename):
+            PathLog.warning(translate("Path_DressupZCorrect", "Probe file {} not found").format(filename))
+            return
 
-        f1 = open(filename, 'r')
+        key = self._fileKey(filename)
+        probeMap = PathProbeMap.ProbeMap.fromFile(filename)
+        PathLog.debug("probe grid: {} x {}".format(len(probeMap.xs), len(probeMap.ys)))
 
         try:
-            pointlist = []
-            for line in f1.readlines():
-                if line == '\n':
-                    continue
-                w = line.split()
-                xval = round(float(w[0]), 2)
-                yval = round(float(w[1]), 2)
-                zval = round(float(w[2]), 2)
-
-                pointlist.append([xval, yval, zval])
-            PathLog.debug(pointlist)
-
-            cols = list(zip(*pointlist))
-            PathLog.debug("cols: {}".format(cols))
-            yindex = list(sorted(set(cols[1])))
-            PathLog.debug("yindex: {}".format(yindex))
-
-            array = []
-            for y in yindex:
-                points = sorted([p for p in pointlist if p[1] == y])
-                inner = []
-                for p in points:
-                    inner.append(FreeCAD.Vector(p[0], p[1], p[2]))
-                array.append(inner)
-
+            array = [[FreeCAD.Vector(p[0], p[1], p[2]) for p in row] for row in probeMap.points()]
             intSurf = Part.BSplineSurface()
             intSurf.interpolate(array)
-
-            obj.interpSurface = intSurf.toShape()
         except Exception:
             raise ValueError("File does not contain appropriate point data")
 
+        # the surface is only kept for display, the path is corrected with the map
+        self.probeMap = probeMap
+        self.probeKey = key
+        obj.interpSurface = intSurf.toShape()
+
+    def _probeMap(self, obj):
+        '''_probeMap(obj) ... return the probe map of the object, it's only rebuilt if the probe file
+        changed since it was loaded. Without the file the map is sampled from the stored surface.'''
+        key = self._fileKey(obj.probefile)
+        if getattr(self, 'probeMap', None) is not None and (key is None or key == self.probeKey):
+            return self.probeMap
+        if key is not None:
+            self._loadFile(obj, obj.probefile)
+        else:
+            self.probeMap = self._sampleSurface(obj.interpSurface)
+            self.probeKey = None
+        return self.probeMap
+
+    def _sampleSurface(self, shape, count=32):
+        surface = shape.toNurbs().Faces[0].Surface
+        bb = shape.BoundBox
+        xs = numpy.linspace(bb.XMin, bb.XMax, count)
+        ys = numpy.linspace(bb.YMin, bb.YMax, count)
+        zs = [[self._bilinearInterpolate(surface, x, y) for x in xs] for y in ys]
+        return PathProbeMap.ProbeMap(xs, ys, zs)
+
+    def _discretize(self, cmd, start, sampleD, curveD):
+        '''_discretize(cmd, start, sampleD, curveD) ... return the points along the move as array, arcs
+        deviate no more than curveD from their points, lines are split into pieces of about sampleD.
+        curveD is at least MinimumDeflection, lines are not split if sampleD is not positive.'''
+        params = cmd.Parameters
+        end = numpy.array([params.get(axis, start[i]) for (i, axis) in enumerate('XYZ')])
+        if cmd.Name in arccommands:
+            center = start[0:2] + numpy.array([params.get('I', 0.0), params.get('J', 0.0)])
+            radius = numpy.hypot(*(start[0:2] - center))
+            if radius < PathGeom.Tolerance:
+                return None
+            a0 = math.atan2(start[1] - center[1], start[0] - center[0])
+            a1 = math.atan2(end[1] - center[1], end[0] - center[0])
+            sign = 1.0 if cmd.Name in ['G3', 'G03'] else -1.0
+            sweep = (sign * (a1 - a0)) % (2 * math.pi)
+            if sweep < PathGeom.Tolerance:
+                sweep = 2 * math.pi
+            step = 2 * math.acos(max(1 - max(curveD, MinimumDeflection) / radius, -1.0))
+            t = numpy.linspace(0, 1, max(int(math.ceil(sweep / step)), 1) + 1)
+            angle = a0 + sign * sweep * t
+            return numpy.column_stack((center[0] + radius * numpy.cos(angle), center[1] + radius * numpy.sin(angle), start[2] + t * (end[2] - start[2])))
+
+        length = numpy.linalg.norm(end - start)
+        if length < PathGeom.Tolerance:
+            return None
+        count = int(length / sampleD) if sampleD > 0 else 0
+        if count > 1:
+            t = numpy.linspace(0, 1, count)
+        else:
+            t = numpy.array([0.0, 1.0])
+        return start + t[:, None] * (end - start)
+
+    def fingerprintExtra(self, obj):
+        # re-probing into the same file only changes its modification time
+        return [repr(self._fileKey(obj.probefile))]
+
+    @PathFingerprint.incremental
     def execute(self, obj):
 
         sampleD = obj.SegInterpolate.Value
@@ -139,7 +206,7 @@ class ObjectDressup:
             obj.Path = obj.Base.Path
             return
 
-        surface = obj.interpSurface.toNurbs().Faces[0].Surface
+        probeMap = self._probeMap(obj)
 
         if obj.Base:
             if obj.Base.isDerivedFrom("Path::Feature"):
@@ -147,38 +214,46 @@ class ObjectDressup:
                     if obj.Base.Path.Commands:
                         pathlist = obj.Base.Path.Commands
 
-                        newcommandlist = []
+                        # unchanged commands and the point count of each discretized move, in order
+                        items = []
+                        moves = []
                         currLocation = {'X': 0, 'Y': 0, 'Z': 0, 'F': 0}
 
                         for c in pathlist:
                             PathLog.debug(c)
                             PathLog.debug("     curLoc:{}".format(currLocation))
-                            newparams = dict(c.Parameters)
-                            zval = newparams.get("Z", currLocation['Z'])
                             if c.Name in movecommands:
-                                curVec = FreeCAD.Vector(currLocation['X'], currLocation['Y'], currLocation['Z'])
-                                arcwire = PathGeom.edgeForCmd(c, curVec)
-                                if arcwire is None:
+                                start = numpy.array([currLocation['X'], currLocation['Y'], currLocation['Z']], dtype=float)
+                                points = self._discretize(c, start, sampleD, curveD)
+                                if points is None:
                                     continue
-                                if c.Name in arccommands:
-                                    pointlist = arcwire.discretize(Deflection=curveD)
-                                else:
-                                    disc_number = int(arcwire.Length / sampleD)
-                                    if disc_number > 1:
-                                        pointlist = arcwire.discretize(Number=int(arcwire.Length / sampleD))
-                                    else:
-                                        pointlist = [v.Point for v in arcwire.Vertexes]
-                                for point in pointlist:
-                                    offset = self._bilinearInterpolate(surface, point.x, point.y)
-                                    newcommand = Path.Command("G1", {'X': point.x, 'Y': point.y, 'Z': point.z + offset})
-                                    newcommandlist.append(newcommand)
-                                    currLocation.update(newcommand.Parameters)
-                                    currLocation['Z'] = zval
-
+                                moves.append(points)
+                                items.append(len(points))
+                                currLocation.update({'X': points[-1][0], 'Y': points[-1][1], 'Z': c.Parameters.get('Z', currLocation['Z'])})
                             else:
                                 # Non Feed Command
-                                newcommandlist.append(c)
+                                items.append(c)
                                 currLocation.update(c.Parameters)
+
+                        # all points are corrected at once
+                        if moves:
+                            points = numpy.concatenate(moves)
+                            outside = numpy.count_nonzero(probeMap.outside(points[:, 0], points[:, 1]))
+                            if outside:
+                                PathLog.warning(translate("Path_DressupZCorrect", "{} of {} points are outside the probed area, their Z correction is extrapolated from its border").format(outside, len(points)))
+                            z = points[:, 2] + probeMap.interpolate(points[:, 0], points[:, 1], obj.InterpolationMethod)
+                            points = points.tolist()
+                            z = z.tolist()
+
+                        newcommandlist = []
+                        i = 0
+                        for item in items:
+                            if isinstance(item, int):
+                                for k in range(i, i + item):
+                                    newcommandlist.append(Path.Command("G1", {'X': points[k][0], 'Y': points[k][1], 'Z': z[k]}))
+                                i += item
+                            else:
+                                newcommandlist.append(item)
                         path = Path.Path(newcommandlist)
                         obj.Path = path
 
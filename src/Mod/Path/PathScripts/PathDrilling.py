@@ -69,6 +69,13 @@ class ObjectDrilling(PathCircularHoleBase.ObjectOp):
         obj.ReturnLevel = ['G99', 'G98']  # Canned Cycle Return Level
         obj.ExtraOffset = ['None', 'Drill Tip', '2x Drill Tip']  # Canned Cycle Return Level
 
+        self.setupOptimizeOrder(obj)
+        obj.OptimizeOrder = True
+
+    def opOnDocumentRestored(self, obj):
+        # upgrade ...
+        self.setupOptimizeOrder(obj)
+
     def circularHoleExecute(self, obj, holes):
         '''circularHoleExecute(obj, holes) ... generate drill operation for each hole in holes.'''
         PathLog.track()
@@ -84,7 +91,7 @@ class ObjectDrilling(PathCircularHoleBase.ObjectOp):
         elif obj.ExtraOffset == '2x Drill Tip':
             tiplength = PathUtils.drillTipLength(self.tool) * 2
 
-        holes = PathUtils.sort_jobs(holes, ['x', 'y'])
+        holes = self.sortHoles(obj, holes)
         self.commandlist.append(Path.Command('G90'))
         self.commandlist.append(Path.Command(obj.ReturnLevel))
 
@@ -0,0 +1,571 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "Path Drop Cutter Module"
+__author__ = "FreeCAD developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "NumPy drop cutter engine with the subset of the OpenCamLib interface used by 3D Surface and Waterline operations."
+
+import PathScripts.PathLog as PathLog
+import abc
+import math
+import numpy
+
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+
+EngineOpenCamLib = 'OpenCamLib'
+EngineBuiltIn = 'Built-in'
+Engines = [EngineOpenCamLib, EngineBuiltIn]
+
+# maximum number of point/triangle pairs evaluated at once
+PairChunkSize = 1 << 18
+# maximum number of cells of the triangle grid
+MaxGridCells = 1 << 22
+# iterations of the bisection for cutters without closed form edge contact
+EdgeIterations = 32
+
+
+def getEngine(name, ocl=None):
+    '''getEngine(name, ocl=None) ... Return the module providing the OpenCamLib interface
+    for the drop cutter engine name. Falls back to this module if ocl is not available.'''
+    if name == EngineOpenCamLib:
+        if ocl is not None:
+            return ocl
+        PathLog.warning('OpenCamLib is not available, using built-in drop cutter.')
+    return _thisModule()
+
+
+def _thisModule():
+    import sys
+    return sys.modules[__name__]
+
+
+class Point:
+    '''Point(x=0.0, y=0.0, z=0.0) ... Point with the attributes of ocl.Point.'''
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    def __repr__(self):
+        return 'Point({}, {}, {})'.format(self.x, self.y, self.z)
+
+
+class Triangle:
+    '''Triangle(p1, p2, p3) ... Triangle of three points, as ocl.Triangle.'''
+
+    def __init__(self, p1, p2, p3):
+        self.p = [p1, p2, p3]
+
+
+class STLSurf:
+    '''Triangulated surface, as ocl.STLSurf, with the triangles kept as (n, 3, 3) array.'''
+
+    def __init__(self):
+        self.triangles = []
+        self.arrays = []
+        self._array = None
+
+    def addTriangle(self, t):
+        self.triangles.append([(p.x, p.y, p.z) for p in t.p])
+        self._array = None
+
+    def addTriangles(self, triangles):
+        '''addTriangles(triangles) ... Add an (n, 3, 3) array of triangle vertices.'''
+        self._flush()
+        self.arrays.append(numpy.asarray(triangles, dtype=float).reshape(-1, 3, 3))
+        self._array = None
+
+    def _flush(self):
+        if self.triangles:
+            self.arrays.append(numpy.array(self.triangles, dtype=float).reshape(-1, 3, 3))
+            self.triangles = []
+
+    def getTriangleArray(self):
+        '''getTriangleArray() ... Return the (n, 3, 3) array of all triangle vertices.'''
+        if self._array is None:
+            self._flush()
+            if len(self.arrays) == 1:
+                self._array = self.arrays[0]
+            elif self.arrays:
+                self._array = numpy.concatenate(self.arrays)
+            else:
+                self._array = numpy.zeros((0, 3, 3))
+            self.arrays = [self._array]
+        return self._array
+
+    def size(self):
+        return len(self.getTriangleArray())
+
+    def rotate(self, xr, yr, zr):
+        '''rotate(xr, yr, zr) ... Rotate all triangles around the X, Y and Z axis, in that order.'''
+        tris = self.getTriangleArray().reshape(-1, 3).copy()
+        for (axis, ang) in enumerate((xr, yr, zr)):
+            if ang == 0.0:
+                continue
+            (i, j) = [k for k in range(3) if k != axis]
+            if axis == 1:
+                (i, j) = (j, i)
+            (c, s) = (math.cos(ang), math.sin(ang))
+            (a, b) = (tris[:, i].copy(), tris[:, j].copy())
+            tris[:, i] = a * c - b * s
+            tris[:, j] = a * s + b * c
+        self._array = tris.reshape(-1, 3, 3)
+        self.arrays = [self._array]
+
+
+class Line:
+    '''Line(p1, p2) ... Straight path span, as ocl.Line.'''
+
+    def __init__(self, p1, p2):
+        self.p1 = p1
+        self.p2 = p2
+
+    def length2d(self):
+        return math.hypot(self.p2.x - self.p1.x, self.p2.y - self.p1.y)
+
+    def getPoints(self, fractions):
+        p1 = numpy.array((self.p1.x, self.p1.y, self.p1.z))
+        p2 = numpy.array((self.p2.x, self.p2.y, self.p2.z))
+        return p1 + fractions[:, None] * (p2 - p1)
+
+
+class Arc:
+    '''Arc(p1, p2, c, dir) ... Circular path span around center c, as ocl.Arc.
+    dir is True for counter-clockwise arcs.'''
+
+    def __init__(self, p1, p2, c, dir):
+        self.p1 = p1
+        self.p2 = p2
+        self.c = c
+        self.dir = dir
+        self.radius = math.hypot(p1.x - c.x, p1.y - c.y)
+        a1 = math.atan2(p1.y - c.y, p1.x - c.x)
+        a2 = math.atan2(p2.y - c.y, p2.x - c.x)
+        ccw = (a2 - a1) % (2.0 * math.pi)
+        if dir:
+            self.dtheta = ccw
+        else:
+            self.dtheta = ccw - 2.0 * math.pi if ccw > 0.0 else 0.0
+        self.startAngle = a1
+
+    def length2d(self):
+        return math.fabs(self.dtheta * self.radius)
+
+    def getPoints(self, fractions):
+        ang = self.startAngle + self.dtheta * fractions
+        pnts = numpy.empty((len(fractions), 3))
+        pnts[:, 0] = self.c.x + self.radius * numpy.cos(ang)
+        pnts[:, 1] = self.c.y + self.radius * numpy.sin(ang)
+        pnts[:, 2] = self.p1.z + fractions * (self.p2.z - self.p1.z)
+        return pnts
+
+
+class Path:
+    '''Path() ... List of Line and Arc spans, as ocl.Path.'''
+
+    def __init__(self):
+        self.span_list = []
+
+    def append(self, span):
+        self.span_list.append(span)
+
+
+class Cutter(abc.ABC):
+    '''Base class of the axially symmetric cutters.
+    Subclasses implement height(r), the height of the cutter surface above the tip at
+    radius r, heightSlope(r), its derivative, and facetRadius(g), the contact radius
+    for planes. The edge contact offset is found numerically unless a subclass
+    overrides edgeOffset with a closed form.'''
+
+    def __init__(self, diameter, length):
+        self.diameter = float(diameter)
+        self.radius = self.diameter / 2.0
+        self.length = float(length)
+
+    def getDiameter(self):
+        return self.diameter
+
+    def getRadius(self):
+        return self.radius
+
+    def getLength(self):
+        return self.length
+
+    @abc.abstractmethod
+    def height(self, r):
+        '''height(r) ... Return the height of the cutter surface above the tip at the radii r.'''
+
+    @abc.abstractmethod
+    def heightSlope(self, r):
+        '''heightSlope(r) ... Return the derivative of height(r) at the radii r.'''
+
+    @abc.abstractmethod
+    def facetRadius(self, g):
+        '''facetRadius(g) ... Return the radius where the cutter touches a plane of slope g.'''
+
+    def edgeOffset(self, m, d, ua, ub):
+        '''edgeOffset(m, d, ua, ub) ... Return the offset u in [ua, ub] along a line of slope m
+        at horizontal distance d from the cutter axis, where the cutter touches the line.
+        The contact height m * u - height(sqrt(d*d + u*u)) is concave in u, so the root
+        of its derivative is found by bisection.'''
+        lo = ua.copy()
+        hi = ub.copy()
+        for i in range(EdgeIterations):
+            mid = 0.5 * (lo + hi)
+            r = numpy.sqrt(d * d + mid * mid)
+            rising = m * r > self.heightSlope(r) * mid
+            lo = numpy.where(rising, mid, lo)
+            hi = numpy.where(rising, hi, mid)
+        return 0.5 * (lo + hi)
+
+
+class CylCutter(Cutter):
+    '''CylCutter(diameter, length) ... Flat end mill, as ocl.CylCutter.'''
+
+    def height(self, r):
+        return numpy.zeros_like(r)
+
+    def heightSlope(self, r):
+        return numpy.zeros_like(r)
+
+    def facetRadius(self, g):
+        return numpy.where(g > 0.0, self.radius, 0.0)
+
+    def edgeOffset(self, m, d, ua, ub):
+        return numpy.where(m > 0.0, ub, ua)
+
+
+class BallCutter(Cutter):
+    '''BallCutter(diameter, length) ... Ball end mill, as ocl.BallCutter.'''
+
+    def height(self, r):
+        return self.radius - numpy.sqrt(numpy.maximum(self.radius * self.radius - r * r, 0.0))
+
+    def heightSlope(self, r):
+        return r / numpy.sqrt(numpy.maximum(self.radius * self.radius - r * r, 1e-30))
+
+    def facetRadius(self, g):
+        return self.radius * g / numpy.sqrt(1.0 + g * g)
+
+    def edgeOffset(self, m, d, ua, ub):
+        # the line cuts the sphere in a circle of radius rho, touch point where its slope is m
+        rho = numpy.sqrt(numpy.maximum(self.radius * self.radius - d * d, 0.0))
+        return numpy.clip(m * rho / numpy.sqrt(1.0 + m * m), ua, ub)
+
+
+class BullCutter(Cutter):
+    '''BullCutter(diameter, cornerRadius, length) ... Bull nose end mill, as ocl.BullCutter.'''
+
+    def __init__(self, diameter, cornerRadius, length):
+        Cutter.__init__(self, diameter, length)
+        self.cornerRadius = min(float(cornerRadius), self.radius)
+        self.flatRadius = self.radius - self.cornerRadius
+
+    def height(self, r):
+        t = numpy.maximum(r - self.flatRadius, 0.0)
+        return self.cornerRadius - numpy.sqrt(numpy.maximum(self.cornerRadius * self.cornerRadius - t * t, 0.0))
+
+    def heightSlope(self, r):
+        t = numpy.maximum(r - self.flatRadius, 0.0)
+        return t / numpy.sqrt(numpy.maximum(self.cornerRadius * self.cornerRadius - t * t, 1e-30))
+
+    def facetRadius(self, g):
+        return numpy.where(g > 0.0, self.flatRadius + self.cornerRadius * g / numpy.sqrt(1.0 + g * g), 0.0)
+
+
+class ConeCutter(Cutter):
+    '''ConeCutter(diameter, angle, length) ... V-bit with half angle in radians, as ocl.ConeCutter.'''
+
+    def __init__(self, diameter, angle, length):
+        Cutter.__init__(self, diameter, length)
+        self.angle = float(angle)
+        self.slope = 1.0 / math.tan(self.angle)
+
+    def height(self, r):
+        return r * self.slope
+
+    def heightSlope(self, r):
+        return numpy.full_like(r, self.slope)
+
+    def facetRadius(self, g):
+        return numpy.where(g > self.slope, self.radius, 0.0)
+
+    def edgeOffset(self, m, d, ua, ub):
+        # m * sqrt(d*d + u*u) = slope * u, steeper lines touch at the end of the chord
+        k = self.slope
+        steep = numpy.abs(m) >= k
+        u = m * d / numpy.sqrt(numpy.maximum(k * k - m * m, 1e-30))
+        u = numpy.where(steep, numpy.where(m > 0.0, ub, ua), u)
+        return numpy.clip(u, ua, ub)
+
+
+class TriangleGrid:
+    '''Uniform XY grid of the triangles, to find the triangles under a cutter.
+    TriangleGrid(triangles, radius)
+    `triangles` is the (n, 3, 3) vertex array and `radius` the cutter radius
+    by which the triangle bounds are grown.'''
+
+    def __init__(self, triangles, radius):
+        self.triangles = triangles
+        self.radius = radius
+        count = len(triangles)
+        xy = triangles[:, :, :2]
+        tmin = xy.min(axis=1) - radius
+        tmax = xy.max(axis=1) + radius
+        if count == 0:
+            self.origin = numpy.zeros(2)
+            self.shape = (1, 1)
+            self.cellSize = 1.0
+            self.cellStart = numpy.zeros(2, dtype=numpy.int64)
+            self.cellTris = numpy.zeros(0, dtype=numpy.int64)
+            return
+        self.origin = tmin.min(axis=0)
+        extent = tmax.max(axis=0) - self.origin
+        # cells of about the triangle size, but not much smaller than the cutter
+        cellSize = max(float(numpy.median(xy.max(axis=1) - xy.min(axis=1))), 0.5 * radius, 1e-6)
+        while numpy.prod(numpy.ceil(extent / cellSize) + 1) > MaxGridCells:
+            cellSize *= 2.0
+        self.cellSize = cellSize
+        self.shape = tuple((numpy.floor(extent / cellSize) + 1).astype(int))
+
+        # register every triangle in all cells its grown bounds overlap
+        cmin = self._cellIndex(tmin)
+        cmax = self._cellIndex(tmax)
+        span = cmax - cmin + 1
+        perTri = span[:, 0] * span[:, 1]
+        triIdx = numpy.repeat(numpy.arange(count), perTri)
+        local = numpy.arange(len(triIdx)) - numpy.repeat(numpy.cumsum(perTri) - perTri, perTri)
+        cx = cmin[triIdx, 0] + local % span[triIdx, 0]
+        cy = cmin[triIdx, 1] + local // span[triIdx, 0]
+        cells = cy * self.shape[0] + cx
+        order = numpy.argsort(cells, kind='stable')
+        self.cellTris = triIdx[order]
+        numCells = self.shape[0] * self.shape[1]
+        self.cellStart = numpy.zeros(numCells + 1, dtype=numpy.int64)
+        self.cellStart[1:] = numpy.cumsum(numpy.bincount(cells, minlength=numCells))
+        PathLog.debug('Triangle grid of {} x {} cells, {} entries.'.format(self.shape[0], self.shape[1], len(self.cellTris)))
+
+    def _cellIndex(self, xy):
+        idx = numpy.floor((xy - self.origin) / self.cellSize).astype(numpy.int64)
+        return numpy.clip(idx, 0, numpy.array(self.shape) - 1)
+
+    def candidates(self, xy):
+        '''candidates(xy) ... Return the (point index, triangle index) pairs of all
+        triangles which can touch the cutter at the (n, 2) positions, grouped by point.'''
+        rel = (xy - self.origin) / self.cellSize
+        inside = numpy.all((rel >= 0.0) & (rel < numpy.array(self.shape)), axis=1)
+        idx = numpy.floor(numpy.where(inside[:, None], rel, 0.0)).astype(numpy.int64)
+        cells = idx[:, 1] * self.shape[0] + idx[:, 0]
+        start = self.cellStart[cells]
+        counts = numpy.where(inside, self.cellStart[cells + 1] - start, 0)
+        pntIdx = numpy.repeat(numpy.arange(len(xy)), counts)
+        first = numpy.repeat(numpy.cumsum(counts) - counts, counts)
+        triIdx = self.cellTris[numpy.repeat(start, counts) + numpy.arange(len(pntIdx)) - first]
+        return (pntIdx, triIdx)
+
+
+class TriangleData:
+    '''Per triangle planes and edges for the contact computations.'''
+
+    def __init__(self, triangles):
+        self.triangles = triangles
+        p0 = triangles[:, 0]
+        e1 = triangles[:, 1] - p0
+        e2 = triangles[:, 2] - p0
+        n = numpy.cross(e1, e2)
+        area2 = n[:, 2]
+        self.facet = numpy.abs(area2) > 1e-12
+        nz = numpy.where(self.facet, area2, 1.0)
+        # plane z = a * x + b * y + c
+        self.a = -n[:, 0] / nz
+        self.b = -n[:, 1] / nz
+        self.c = p0[:, 2] - self.a * p0[:, 0] - self.b * p0[:, 1]
+        self.g = numpy.hypot(self.a, self.b)
+        gs = numpy.where(self.g > 0.0, self.g, 1.0)
+        self.ux = self.a / gs
+        self.uy = self.b / gs
+        # barycentric XY inside test relative to p0
+        self.p0 = p0[:, :2]
+        self.e1 = e1[:, :2]
+        self.e2 = e2[:, :2]
+        self.invArea = 1.0 / nz
+        self.xyMin = triangles[:, :, :2].min(axis=1)
+        self.xyMax = triangles[:, :, :2].max(axis=1)
+
+    def near(self, tri, x, y, radius):
+        '''near(tri, x, y, radius) ... Return the mask of the pairs where the XY bounds of
+        the triangle are within radius of the point.'''
+        dx = numpy.maximum(numpy.maximum(self.xyMin[tri, 0] - x, x - self.xyMax[tri, 0]), 0.0)
+        dy = numpy.maximum(numpy.maximum(self.xyMin[tri, 1] - y, y - self.xyMax[tri, 1]), 0.0)
+        return dx * dx + dy * dy <= radius * radius
+
+
+def _facetContact(cutter, data, tri, x, y):
+    g = data.g[tri]
+    r = cutter.facetRadius(g)
+    px = x + r * data.ux[tri] - data.p0[tri, 0]
+    py = y + r * data.uy[tri] - data.p0[tri, 1]
+    e1 = data.e1[tri]
+    e2 = data.e2[tri]
+    inv = data.invArea[tri]
+    s = (px * e2[:, 1] - py * e2[:, 0]) * inv
+    t = (e1[:, 0] * py - e1[:, 1] * px) * inv
+    eps = -1e-12
+    inside = numpy.flatnonzero(data.facet[tri] & (s >= eps) & (t >= eps) & (s + t <= 1.0 - eps))
+    z = numpy.full(len(tri), -numpy.inf)
+    tri = tri[inside]
+    r = r[inside]
+    z[inside] = data.a[tri] * x[inside] + data.b[tri] * y[inside] + data.c[tri] + r * g[inside] - cutter.height(r)
+    return z
+
+
+def _edgeContact(cutter, p1, p2, x, y):
+    ex = p2[:, 0] - p1[:, 0]
+    ey = p2[:, 1] - p1[:, 1]
+    length = numpy.hypot(ex, ey)
+    qx = x - p1[:, 0]
+    qy = y - p1[:, 1]
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        s0 = (qx * ex + qy * ey) / length  # along the edge from p1
+        d = numpy.abs(qx * ey - qy * ex) / length  # distance of the cutter axis to the edge line
+    R = cutter.radius
+    z = numpy.full(len(x), -numpy.inf)
+    # only edges crossing the cutter circle can touch
+    near = numpy.flatnonzero((length > 1e-12) & (d <= R) & (s0 >= -R) & (s0 <= length + R))
+    (s0, d, length) = (s0[near], d[near], length[near])
+    chord = numpy.sqrt(R * R - d * d)
+    ua = numpy.maximum(-s0, -chord)
+    ub = numpy.minimum(length - s0, chord)
+    z1 = p1[near, 2]
+    m = (p2[near, 2] - z1) / length
+    u = cutter.edgeOffset(m, d, ua, ub)
+    r = numpy.minimum(numpy.sqrt(d * d + u * u), R)
+    z[near] = numpy.where(ua <= ub, z1 + (s0 + u) * m - cutter.height(r), -numpy.inf)
+    return z
+
+
+def dropCutter(stl, cutter, xy, minZ, grid=None):
+    '''dropCutter(stl, cutter, xy, minZ, grid=None) ... Return the cutter location heights
+    at the (n, 2) positions, lowered onto the triangles of stl, but not below minZ.
+    stl is an STLSurf or an (m, 3, 3) triangle array.'''
+    if isinstance(stl, STLSurf):
+        triangles = stl.getTriangleArray()
+    else:
+        triangles = numpy.asarray(stl, dtype=float).reshape(-1, 3, 3)
+    xy = numpy.asarray(xy, dtype=float).reshape(-1, 2)
+    result = numpy.full(len(xy), float(minZ))
+    if len(triangles) == 0 or len(xy) == 0:
+        return result
+    if grid is None:
+        grid = TriangleGrid(triangles, cutter.radius)
+    data = TriangleData(triangles)
+
+    (pntIdx, triIdx) = grid.candidates(xy)
+    for begin in range(0, len(pntIdx), PairChunkSize):
+        pnt = pntIdx[begin:begin + PairChunkSize]
+        tri = triIdx[begin:begin + PairChunkSize]
+        near = data.near(tri, xy[pnt, 0], xy[pnt, 1], cutter.radius)
+        pnt = pnt[near]
+        tri = tri[near]
+        if len(pnt) == 0:
+            continue
+        x = xy[pnt, 0]
+        y = xy[pnt, 1]
+        verts = triangles[tri]
+        z = _facetContact(cutter, data, tri, x, y)
+        for k in range(3):
+            z = numpy.maximum(z, _edgeContact(cutter, verts[:, k], verts[:, (k + 1) % 3], x, y))
+        # pairs are grouped by point, reduce each group to its highest contact
+        groupStart = numpy.flatnonzero(numpy.r_[True, pnt[1:] != pnt[:-1]])
+        zmax = numpy.maximum.reduceat(z, groupStart)
+        numpy.maximum.at(result, pnt[groupStart], zmax)
+    return result
+
+
+def samplePath(path, sampling):
+    '''samplePath(path, sampling) ... Return the (n, 3) positions along the spans of path,
+    with the same sampling as ocl.PathDropCutter.'''
+    pnts = []
+    for span in path.span_list:
+        steps = int(span.length2d() / sampling + 1)
+        pnts.append(span.getPoints(numpy.arange(steps + 1) / float(steps)))
+    if not pnts:
+        return numpy.zeros((0, 3))
+    return numpy.concatenate(pnts)
+
+
+class PathDropCutter:
+    '''Drop cutter along a path, with the interface of ocl.PathDropCutter.'''
+
+    def __init__(self):
+        self.stl = None
+        self.cutter = None
+        self.path = None
+        self.minZ = 0.0
+        self.sampling = 0.1
+        self.clPoints = numpy.zeros((0, 3))
+        self._grid = None
+        self._gridTriangles = None
+        self._gridRadius = None
+
+    def setSTL(self, stl):
+        self.stl = stl
+
+    def setCutter(self, cutter):
+        self.cutter = cutter
+
+    def setZ(self, z):
+        self.minZ = z
+
+    def getZ(self):
+        return self.minZ
+
+    def setSampling(self, sampling):
+        self.sampling = sampling
+
+    def setPath(self, path):
+        self.path = path
+
+    def _getGrid(self, triangles):
+        # the grid is reused while the triangles and cutter are unchanged
+        if self._gridTriangles is not triangles or self._gridRadius != self.cutter.radius:
+            self._grid = TriangleGrid(triangles, self.cutter.radius)
+            self._gridTriangles = triangles
+            self._gridRadius = self.cutter.radius
+        return self._grid
+
+    def run(self):
+        pnts = samplePath(self.path, self.sampling)
+        triangles = self.stl.getTriangleArray()
+        pnts[:, 2] = dropCutter(triangles, self.cutter, pnts[:, :2], self.minZ, self._getGrid(triangles))
+        self.clPoints = pnts
+
+    def getCLPointArray(self):
+        '''getCLPointArray() ... Return the cutter locations of the last run as (n, 3) array.'''
+        return self.clPoints
+
+    def getCLPoints(self):
+        return [Point(x, y, z) for (x, y, z) in self.clPoints.tolist()]
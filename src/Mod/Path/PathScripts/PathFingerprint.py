@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import FreeCAD
+import Part
+import PathScripts.PathLog as PathLog
+import PathScripts.PathPreferences as PathPreferences
+import functools
+import hashlib
+
+__title__ = "Path Fingerprint"
+__author__ = "FreeCAD developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Digests of the inputs of ops and dressups, used to skip recomputes which would produce the same path."
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+# properties which are results of a recompute, or don't influence it
+Ignored = ['Path', 'Shape', 'CycleTime', 'Fingerprint', 'removalshape', 'Label2', 'ExpressionEngine', 'Visibility', 'Proxy']
+
+
+def surfaceKey(face):
+    '''surfaceKey(face) ... return the surface type and data of face. Spline surfaces are represented
+    by their poles, weights and knots, all surfaces by points sampled over the face's parameter range.'''
+    surface = face.Surface
+    data = [type(surface).__name__]
+    for attr in ['getPoles', 'getWeights', 'getUKnots', 'getVKnots']:
+        if hasattr(surface, attr):
+            data.append(getattr(surface, attr)())
+    (u0, u1, v0, v1) = face.ParameterRange
+    for i in range(3):
+        for j in range(3):
+            p = face.valueAt(u0 + (u1 - u0) * i / 2, v0 + (v1 - v0) * j / 2)
+            data.extend([p.x, p.y, p.z])
+    return data
+
+
+def curveKey(edge):
+    '''curveKey(edge) ... return the curve type and data of edge. Spline curves are represented by their
+    poles, weights and knots, all curves by points sampled over the edge's parameter range.'''
+    try:
+        curve = edge.Curve
+    except (Part.OCCError, TypeError):
+        # degenerated edges and curve types without a python wrapper are only sampled
+        curve = None
+    data = [type(curve).__name__]
+    for attr in ['getPoles', 'getWeights', 'getKnots']:
+        if hasattr(curve, attr):
+            data.append(getattr(curve, attr)())
+    (t0, t1) = edge.ParameterRange
+    for i in range(5):
+        p = edge.valueAt(t0 + (t1 - t0) * i / 4)
+        data.extend([p.x, p.y, p.z])
+    return data
+
+
+def shapeDigest(shape):
+    '''shapeDigest(shape) ... return the digest of the shape's topology, vertex positions, mass properties,
+    the curves of its edges and the surfaces of its faces.'''
+    if shape is None or shape.isNull():
+        return 'null'
+    bb = shape.BoundBox
+    data = [shape.ShapeType, len(shape.Faces), len(shape.Edges), bb.XMin, bb.YMin, bb.ZMin, bb.XMax, bb.YMax, bb.ZMax]
+    data.extend([shape.Area, shape.Volume])
+    for v in shape.Vertexes:
+        data.extend([v.X, v.Y, v.Z])
+    for e in shape.Edges:
+        data.append(curveKey(e))
+    for f in shape.Faces:
+        data.append(surfaceKey(f))
+    return hashlib.sha1(repr(data).encode('utf-8')).hexdigest()
+
+
+# shapes and digests of objects by document and name while a recompute is running, None otherwise
+_digests = None
+
+
+def beginRecompute():
+    '''beginRecompute() ... start caching the digests of objectShapeDigest(obj) until endRecompute().'''
+    global _digests  # pylint: disable=global-statement
+    _digests = {}
+
+
+def endRecompute():
+    '''endRecompute() ... drop the digests cached since beginRecompute().'''
+    global _digests  # pylint: disable=global-statement
+    _digests = None
+
+
+def objectShapeDigest(obj):
+    '''objectShapeDigest(obj) ... return the digest of obj's shape. During a recompute the digest is only
+    computed once for every shape, so the model and stock shared by all ops of a job are digested once.'''
+    shape = obj.Shape
+    if _digests is None:
+        return shapeDigest(shape)
+    key = (obj.Document.Name, obj.Name)
+    cached = _digests.get(key)
+    # a recomputed object gets a new shape, the cached one is kept alive so it can't be confused with it
+    if cached is not None and cached[0].isSame(shape):
+        return cached[1]
+    digest = shapeDigest(shape)
+    _digests[key] = (shape, digest)
+    return digest
+
+
+def valueKey(value):
+    '''valueKey(value) ... return a representation of a property value for the digest. Linked objects are
+    represented by their name and, if they have one, the digest of their shape.'''
+    if isinstance(value, Part.Shape):
+        return shapeDigest(value)
+    if isinstance(value, FreeCAD.DocumentObject):
+        if hasattr(value, 'Shape') and not hasattr(value, 'Path'):
+            return (value.Name, shapeDigest(value.Shape))
+        return value.Name
+    if isinstance(value, (list, tuple)):
+        return tuple(valueKey(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, valueKey(v)) for (k, v) in value.items()))
+    if hasattr(value, 'templateAttrs'):
+        return valueKey(value.templateAttrs())
+    return str(value)
+
+
+def objectDigest(obj, ignore=None):
+    '''objectDigest(obj, ignore=None) ... return the digest of all input properties of obj.'''
+    skip = Ignored + (ignore if ignore else [])
+    data = [(prop, valueKey(obj.getPropertyByName(prop))) for prop in sorted(obj.PropertiesList) if prop not in skip]
+    return hashlib.sha1(repr(data).encode('utf-8')).hexdigest()
+
+
+def combine(parts):
+    '''combine(parts) ... return the digest of a list of digests.'''
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def pathFingerprint(obj):
+    '''pathFingerprint(obj) ... return the fingerprint of the path object obj, which is the one it stored
+    if it has one or the digest of its G-code otherwise.'''
+    if getattr(obj, 'Fingerprint', ''):
+        return obj.Fingerprint
+    return hashlib.sha1(obj.Path.toGCode().encode('utf-8')).hexdigest()
+
+
+def dressupFingerprint(obj, extra=None):
+    '''dressupFingerprint(obj, extra=None) ... return the fingerprint of a dressup, its own inputs and those of
+    its base, so a chain of dressups only changes with the ops and dressups below it.
+    extra is a list of strings for inputs which are not properties of the dressup.'''
+    parts = [objectDigest(obj)] + (extra if extra else [])
+    if getattr(obj, 'Base', None) and hasattr(obj.Base, 'Path'):
+        parts.append(pathFingerprint(obj.Base))
+    return combine(parts)
+
+
+def isRecomputing(obj):
+    return 'Touched' in obj.State or 'Recompute' in obj.State
+
+
+def isUnchanged(obj, fingerprint):
+    '''isUnchanged(obj, fingerprint) ... return True if obj is being recomputed although its path was
+    computed from inputs with the same fingerprint. Explicit calls of execute() on an object which is not
+    being recomputed always return False.'''
+    if not PathPreferences.incrementalRecompute() or not isRecomputing(obj):
+        return False
+    return bool(getattr(obj, 'Fingerprint', '')) and obj.Fingerprint == fingerprint
+
+
+def store(obj, fingerprint):
+    '''store(obj, fingerprint) ... remember the fingerprint of the inputs obj's path was computed from.'''
+    if not hasattr(obj, 'Fingerprint'):
+        obj.addProperty('App::PropertyString', 'Fingerprint', 'Path', 'Digest of the inputs of the current path')
+        obj.setEditorMode('Fingerprint', 2)  # hide
+    if obj.Fingerprint != fingerprint:
+        obj.Fingerprint = fingerprint
+
+
+def clear(obj):
+    '''clear(obj) ... forget the fingerprint of obj, so its next recompute computes its path.'''
+    if getattr(obj, 'Fingerprint', ''):
+        obj.Fingerprint = ''
+
+
+def forceRecompute(obj):
+    '''forceRecompute(obj) ... clear the fingerprints of obj and of all paths depending on it and mark them
+    for recompute, so the next recompute computes their paths even though their inputs didn't change.
+    If obj is a job all its operations are forced.'''
+    objs = [obj]
+    if hasattr(obj, 'Operations'):
+        objs.extend(obj.Operations.Group)
+    forced = set()
+    for o in objs:
+        for dep in [o] + o.InListRecursive:
+            if dep.Name not in forced and hasattr(dep, 'Path'):
+                forced.add(dep.Name)
+                clear(dep)
+                dep.touch()
+
+
+def incremental(execute):
+    '''incremental(execute) ... decorator for the execute() of a dressup, skipping it if neither the
+    dressup nor its base changed since the path was computed. Calls with additional arguments always run.
+    A proxy can add inputs which are not properties with a fingerprintExtra(obj) method returning a list
+    of strings.'''
+    def fingerprint(self, obj):
+        extra = self.fingerprintExtra(obj) if hasattr(self, 'fingerprintExtra') else None
+        return dressupFingerprint(obj, extra)
+
+    @functools.wraps(execute)
+    def wrapper(self, obj, *args, **kwargs):
+        if args or kwargs:
+            return execute(self, obj, *args, **kwargs)
+        if isUnchanged(obj, fingerprint(self, obj)):
+            PathLog.debug("{} unchanged, keeping its path".format(obj.Label))
+            return None
+        result = execute(self, obj)
+        store(obj, fingerprint(self, obj))
+        return result
+    return wrapper
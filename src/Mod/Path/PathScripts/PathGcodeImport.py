@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathLog as PathLog
+import io
+import os
+import re
+
+__title__ = "Path G-code Import"
+__author__ = "FreeCAD developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Streaming tokenizer for G-code files which splits them into sections on tool changes."
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+# Only gcodes that are supported by Path are imported
+SupportedCommands = ['G0', 'G00',
+                     'G1', 'G01',
+                     'G2', 'G02',
+                     'G3', 'G03',
+                     'G81', 'G82', 'G83',
+                     'G90', 'G91']
+
+AxisWords = 'XYZABCUVW'
+
+# tool changes in the format 'M6 Tn', 'M06Tn' or 'Tn M6'
+ToolChange = re.compile(r'[mM]\s?0?6\s?[tT]\s?(\d+)|[tT]\s?(\d+)\s?[mM]\s?0?6(?!\d)')
+
+ChunkSize = 1 << 20
+
+
+class GcodeReader(object):
+    '''GcodeReader(supported=SupportedCommands, chunkSize=ChunkSize) ... splits G-code into sections on tool changes.
+    Each section is a tuple (toolNumber, lines) where lines only contains supported commands. Lines without
+    a command, continuing the modal command before them, are prefixed with that command.'''
+
+    def __init__(self, supported=None, chunkSize=ChunkSize):
+        self.supported = set(SupportedCommands if supported is None else supported)
+        self.chunkSize = chunkSize
+        self.cancelled = False
+        self.lastCommand = None
+        self.toolNumber = 0
+        self.lines = []
+        self.sections = []
+
+    def addLine(self, line):
+        '''addLine(line) ... processes a single line of G-code.'''
+        # remove any leftover trailing and preceding spaces, discard empty lines
+        line = line.strip()
+        if not line:
+            return
+
+        # remove line numbers
+        if line[0] in 'Nn':
+            line = line.split(None, 1)
+            if len(line) < 2:
+                return
+            line = line[1]
+
+        # the words before a tool change still belong to the previous tool, those after it to the new one
+        m = ToolChange.search(line) if ('T' in line or 't' in line) else None
+        if m:
+            self.addLine(line[:m.start()])
+            self.endSection()
+            self.toolNumber = int(m.group(1) or m.group(2))
+            self.addLine(line[m.end():])
+            return
+
+        # Anything else not a G/M code or an axis move is ignored.
+        first = line[0]
+        if first != 'G' and first != 'M' and first not in AxisWords:
+            return
+
+        # if the remaining line is supported, store it
+        command = line.split(None, 1)[0]
+        if command in self.supported:
+            self.lines.append(line)
+            self.lastCommand = command
+
+        # modal commands have no G or M but have axis moves. append those too.
+        elif first in AxisWords and self.lastCommand:
+            self.lines.append(self.lastCommand + ' ' + line)
+
+    def endSection(self):
+        '''endSection() ... stores the lines collected so far as a section, if there are any.'''
+        if self.lines:
+            self.sections.append((self.toolNumber, self.lines))
+            self.lines = []
+
+    def parse(self, gcode):
+        '''parse(gcode) ... returns the sections of the given G-code string.'''
+        for line in gcode.splitlines():
+            self.addLine(line)
+        self.endSection()
+        return self.sections
+
+    def read(self, filename, progress=None):
+        '''read(filename, progress=None) ... returns the sections of the G-code file.
+        The file is read in chunks, after each chunk progress(bytesRead, fileSize) is called. If it
+        returns False reading stops, cancelled is set and None is returned.'''
+        size = os.path.getsize(filename)
+        done = 0
+        rest = b''
+        with io.open(filename, 'rb') as fp:
+            while True:
+                chunk = fp.read(self.chunkSize)
+                if not chunk:
+                    break
+                done += len(chunk)
+                block = rest + chunk
+                end = block.rfind(b'\n') + 1
+                rest = block[end:]
+                for line in block[:end].decode('utf-8', 'replace').split('\n'):
+                    self.addLine(line)
+                if progress is not None and progress(done, size) is False:
+                    self.cancelled = True
+                    return None
+        self.addLine(rest.decode('utf-8', 'replace'))
+        self.endSection()
+        return self.sections
+
+
+class ProgressBar(object):
+    '''ProgressBar(title, size, chunkSize=ChunkSize) ... progress callback for GcodeReader.read() showing
+    FreeCAD's progress indicator, which lets the user cancel the import.'''
+
+    def __init__(self, title, size, chunkSize=ChunkSize):
+        import FreeCAD
+        self.chunkSize = chunkSize
+        self.steps = 0
+        self.running = True
+        self.indicator = FreeCAD.Base.ProgressIndicator()
+        self.indicator.start(title, max(1, -(-size // chunkSize)))
+
+    def __call__(self, done, size):
+        while self.steps < -(-done // self.chunkSize):
+            self.steps += 1
+            try:
+                self.indicator.next(True)
+            except RuntimeError:
+                # the user aborted, the indicator is already stopped
+                self.running = False
+                return False
+        return True
+
+    def stop(self):
+        if self.running:
+            self.running = False
+            self.indicator.stop()
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "Path Height Map Support Module"
+__author__ = "FreeCAD developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "NumPy height map, waterline tracing and point array to path command support for 3D Surface and Waterline operations."
+
+import Path
+import PathScripts.PathLog as PathLog
+import numpy
+
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+
+# Cell corners in counter-clockwise order as (row, column) offsets, rows run along +Y
+# and columns along +X. Edge k of a cell runs from corner k to corner k + 1.
+CELL_CORNERS = ((0, 0), (0, 1), (1, 1), (1, 0))
+
+
+def _buildSegmentTable():
+    '''_buildSegmentTable() ... Return the marching squares segments of all 16 cell cases.
+    A case has bit k set if corner k is above the layer. Every segment runs from an edge
+    which goes from high to low to the next edge which goes from low to high, which keeps
+    the high corners on the left and joins diagonal high corners of saddle cells.'''
+    table = []
+    for case in range(16):
+        high = [bool(case & (1 << k)) for k in range(4)]
+        segments = []
+        for k in range(4):
+            if high[k] and not high[(k + 1) % 4]:
+                for n in range(1, 4):
+                    m = (k + n) % 4
+                    if not high[m] and high[(m + 1) % 4]:
+                        segments.append((k, m))
+                        break
+        table.append(segments)
+    return table
+
+
+SEGMENT_TABLE = _buildSegmentTable()
+
+
+def clPointsToArray(clPoints, zOffset=0.0):
+    '''clPointsToArray(clPoints, zOffset=0.0) ... Return the OCL cutter location points
+    as (n, 3) array, with zOffset added to the heights.
+    clPoints can also be a (n, 3) array from the built-in drop cutter.'''
+    if isinstance(clPoints, numpy.ndarray):
+        points = numpy.array(clPoints, dtype=float).reshape(-1, 3)
+    else:
+        points = numpy.array([(p.x, p.y, p.z) for p in clPoints], dtype=float).reshape(-1, 3)
+    if zOffset != 0.0:
+        points[:, 2] += zOffset
+    return points
+
+
+def pointsToArray(points):
+    '''pointsToArray(points) ... Return a list of vectors as (n, 3) array.'''
+    if isinstance(points, numpy.ndarray):
+        return points
+    return numpy.array([(p.x, p.y, p.z) for p in points], dtype=float).reshape(-1, 3)
+
+
+def simplifyPoints(points, tolerance=1e-4):
+    '''simplifyPoints(points, tolerance=1e-4) ... Return the indices of the points to keep
+    of a (n, 3) point array, while keeping the maximum deviation from the original line
+    within tolerance. Same result as PathUtils.simplify3dLine(), with the distances of a
+    range computed for all points at once.'''
+    count = len(points)
+    if count < 3:
+        return numpy.arange(count)
+    keep = [count - 1]
+    stack = [(0, count - 1)]
+    while stack:
+        (start, end) = stack.pop()
+        if end - start < 2:
+            if end > start:
+                keep.append(start)
+            continue
+        a = points[start]
+        ab = points[end] - a
+        ap = points[start + 1:end] - a
+        lenSq = numpy.dot(ab, ab)
+        if lenSq > 0.0:
+            t = numpy.clip(ap.dot(ab) / lenSq, 0.0, 1.0)
+            dist = numpy.linalg.norm(ap - t[:, None] * ab, axis=1)
+        else:
+            dist = numpy.linalg.norm(ap, axis=1)
+        i = int(numpy.argmax(dist))
+        if dist[i] > tolerance:
+            # push second branch first, to be executed last
+            stack.append((start + 1 + i, end))
+            stack.append((start, start + 1 + i))
+        else:
+            keep.append(start)
+    return numpy.array(sorted(keep))
+
+
+def linearMoveCommands(points, feed, axes='XYZ'):
+    '''linearMoveCommands(points, feed, axes='XYZ') ... Return a G1 command for every row
+    of the point array, using the first len(axes) columns.'''
+    axes = list(axes)
+    commands = []
+    for row in points[:, :len(axes)].tolist():
+        params = dict(zip(axes, row))
+        params['F'] = feed
+        commands.append(Path.Command('G1', params))
+    return commands
+
+
+class HeightMap:
+    '''Regular grid of cutter location heights from a drop cutter scan.
+    HeightMap(x, y, z, sampleInterval)
+    `x` holds the X value of every column, `y` the Y value of every row (scan line),
+    and `z` the (rows, columns) array of cutter location heights.'''
+
+    def __init__(self, x, y, z, sampleInterval):
+        self.x = numpy.asarray(x, dtype=float)
+        self.y = numpy.asarray(y, dtype=float)
+        self.z = numpy.asarray(z, dtype=float)
+        self.sampleInterval = sampleInterval
+
+    @classmethod
+    def fromScanPoints(cls, points, numScanLines, sampleInterval):
+        '''fromScanPoints(points, numScanLines, sampleInterval) ... Return the height map
+        of a (n, 3) array of scan points, which holds numScanLines lines of equal length.'''
+        pntsPerLine = len(points) // numScanLines
+        grid = points[:numScanLines * pntsPerLine].reshape(numScanLines, pntsPerLine, 3)
+        return cls(grid[0, :, 0], grid[:, 0, 1], grid[:, :, 2], sampleInterval)
+
+    def topoMap(self, layDep):
+        '''topoMap(layDep) ... Return the boolean map of the points above layDep,
+        with a border of points below the layer on all sides.'''
+        return numpy.pad(self.z > layDep, 1, mode='constant', constant_values=False)
+
+    def _paddedAxis(self, values):
+        if len(values) > 1:
+            first = values[0] - (values[1] - values[0])
+            last = values[-1] + (values[-1] - values[-2])
+        else:
+            first = values[0] - self.sampleInterval
+            last = values[0] + self.sampleInterval
+        return numpy.concatenate(([first], values, [last]))
+
+    def waterlines(self, layDep, climb=False):
+        '''waterlines(layDep, climb=False) ... Return the closed waterline loops at layDep
+        as list of (n, 2) XY point arrays, first point repeated at the end.
+        The loops run through the scan points below the layer next to the material.
+        They are counter-clockwise around material, clockwise if climb is True.'''
+        topo = self.topoMap(layDep)
+        rows, cols = topo.shape
+        cellCases = (topo[:-1, :-1].astype(numpy.int8) |
+                     (topo[:-1, 1:].astype(numpy.int8) << 1) |
+                     (topo[1:, 1:].astype(numpy.int8) << 2) |
+                     (topo[1:, :-1].astype(numpy.int8) << 3))
+
+        # edge ids: horizontal edges first, then vertical edges
+        numHorizontal = rows * (cols - 1)
+
+        def edgeIds(k, r, c):
+            if k == 0:
+                return r * (cols - 1) + c
+            if k == 1:
+                return numHorizontal + r * cols + c + 1
+            if k == 2:
+                return (r + 1) * (cols - 1) + c
+            return numHorizontal + r * cols + c
+
+        cells = []
+        fromEdges = []
+        toEdges = []
+        vertexRows = []
+        vertexCols = []
+        for case in range(1, 15):
+            (r, c) = numpy.nonzero(cellCases == case)
+            if len(r) == 0:
+                continue
+            for (n, (k, m)) in enumerate(SEGMENT_TABLE[case]):
+                cells.append((r * (cols - 1) + c) * 2 + n)
+                fromEdges.append(edgeIds(k, r, c))
+                toEdges.append(edgeIds(m, r, c))
+                # the low corner of the high to low edge
+                (dr, dc) = CELL_CORNERS[(k + 1) % 4]
+                vertexRows.append(r + dr)
+                vertexCols.append(c + dc)
+        if not cells:
+            return []
+
+        order = numpy.argsort(numpy.concatenate(cells), kind='stable')
+        fromEdges = numpy.concatenate(fromEdges)[order]
+        toEdges = numpy.concatenate(toEdges)[order]
+        vertexRows = numpy.concatenate(vertexRows)[order]
+        vertexCols = numpy.concatenate(vertexCols)[order]
+
+        # every crossed edge starts exactly one segment and ends exactly one other
+        segmentByEdge = numpy.full(numHorizontal + (rows - 1) * cols, -1, dtype=numpy.int64)
+        segmentByEdge[fromEdges] = numpy.arange(len(fromEdges))
+        nextSegment = segmentByEdge[toEdges].tolist()
+
+        xs = self._paddedAxis(self.x)
+        ys = self._paddedAxis(self.y)
+        visited = [False] * len(nextSegment)
+        loops = []
+        for start in range(len(nextSegment)):
+            if visited[start]:
+                continue
+            segments = []
+            seg = start
+            while seg >= 0 and not visited[seg]:
+                visited[seg] = True
+                segments.append(seg)
+                seg = nextSegment[seg]
+            loop = self._loopPoints(vertexRows[segments], vertexCols[segments], xs, ys)
+            if loop is not None:
+                loops.append(loop[::-1] if climb else loop)
+        PathLog.debug('Waterline at {} has {} loops.'.format(layDep, len(loops)))
+        return loops
+
+    def _loopPoints(self, rows, cols, xs, ys):
+        # drop repeated vertices, segments of neighbor cells share their low corners
+        grid = numpy.column_stack((rows, cols))
+        keep = numpy.any(grid != numpy.roll(grid, 1, axis=0), axis=1)
+        grid = grid[keep] if keep.any() else grid[:1]
+        if len(grid) < 2:
+            return None
+        # drop the vertices inside straight runs
+        step = numpy.roll(grid, -1, axis=0) - grid
+        keep = numpy.any(step != numpy.roll(step, 1, axis=0), axis=1)
+        if keep.any():
+            grid = grid[keep]
+        grid = numpy.vstack((grid, grid[:1]))
+        return numpy.column_stack((xs[grid[:, 1]], ys[grid[:, 0]]))
@@ -36,6 +36,7 @@ from PySide import QtCore
 from lazy_loader.lazy_loader import LazyLoader
 ArchPanel = LazyLoader('ArchPanel', globals(), 'ArchPanel')
 Draft = LazyLoader('Draft', globals(), 'Draft')
+PathOpScheduler = LazyLoader('PathScripts.PathOpScheduler', globals(), 'PathScripts.PathOpScheduler')
 
 
 PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
@@ -109,6 +110,7 @@ class ObjectJob:
 
     def __init__(self, obj, models, templateFile=None):
         self.obj = obj
+        PathOpScheduler.install()
         obj.addProperty("App::PropertyFile", "PostProcessorOutputFile", "Output", QtCore.QT_TRANSLATE_NOOP("PathJob", "The NC output file for this project"))
         obj.addProperty("App::PropertyEnumeration", "PostProcessor", "Output", QtCore.QT_TRANSLATE_NOOP("PathJob", "Select the Post Processor"))
         obj.addProperty("App::PropertyString", "PostProcessorArgs", "Output", QtCore.QT_TRANSLATE_NOOP("PathJob", "Arguments for the Post Processor (specific to the script)"))
@@ -289,6 +291,7 @@ class ObjectJob:
                 ops.Label = label
 
     def onDocumentRestored(self, obj):
+        PathOpScheduler.install()
         self.setupBaseModel(obj)
         self.fixupOperations(obj)
         self.setupSetupSheet(obj)
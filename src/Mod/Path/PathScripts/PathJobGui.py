@@ -40,6 +40,7 @@ import PathScripts.PathGuiInit as PathGuiInit
 import PathScripts.PathLog as PathLog
 import PathScripts.PathPreferences as PathPreferences
 import PathScripts.PathSetupSheetGui as PathSetupSheetGui
+import PathScripts.PathStatistics as PathStatistics
 import PathScripts.PathStock as PathStock
 import PathScripts.PathToolControllerGui as PathToolControllerGui
 import PathScripts.PathToolLibraryEditor as PathToolLibraryEditor
@@ -560,6 +561,51 @@ class StockFromExistingEdit(StockEdit):
         self.form.stockExisting.currentIndexChanged.connect(lambda: self.getFields(obj))
 
 
+class UsageToolTips(QtCore.QObject):
+    '''Event filter showing the usage of ops and tool controllers as tool tips of the panel's lists.
+    The job statistics are only computed once a tool tip is requested, and kept until invalidate().'''
+
+    def __init__(self, panel):
+        QtCore.QObject.__init__(self)
+        self.panel = panel
+        self.usage = None
+
+    def invalidate(self):
+        self.usage = None
+
+    def getUsage(self):
+        if self.usage is None:
+            stats = PathStatistics.jobStatistics(self.panel.obj)
+            acceleration = PathPreferences.cycleTimeAcceleration()
+            self.usage = (stats, stats.blockUsage(acceleration), stats.toolUsage(acceleration))
+        return self.usage
+
+    def install(self, widget):
+        widget.viewport().installEventFilter(self)
+
+    def eventFilter(self, viewport, event):
+        if event.type() != QtCore.QEvent.ToolTip:
+            return False
+        widget = viewport.parent()
+        item = widget.itemAt(event.pos())
+        if item is None:
+            return False
+        obj = item.data(self.panel.DataObject)
+        (stats, opUsage, toolUsage) = self.getUsage()
+        if widget is self.panel.form.operationsList:
+            usage = opUsage.get(stats.blockIndex(obj))
+        elif item.column() == 0:
+            usage = toolUsage.get(obj.ToolNumber)
+        else:
+            return False
+        text = self.panel.usageToolTip(usage)
+        if text:
+            QtGui.QToolTip.showText(event.globalPos(), text, viewport)
+        else:
+            QtGui.QToolTip.hideText()
+        return True
+
+
 class TaskPanel:
     DataObject = QtCore.Qt.ItemDataRole.UserRole
     DataProperty = QtCore.Qt.ItemDataRole.UserRole + 1
@@ -594,6 +640,8 @@ class TaskPanel:
 
         self.vproxy.setupEditVisibility(self.obj)
 
+        self.usageToolTips = UsageToolTips(self)
+
         self.stockFromBase = None
         self.stockFromExisting = None
         self.stockCreateBox = None
@@ -691,6 +739,7 @@ class TaskPanel:
             widget.blockSignals(False)
 
     def updateToolController(self):
+        self.usageToolTips.invalidate()
         tcRow = self.form.toolControllerList.currentRow()
         tcCol = self.form.toolControllerList.currentColumn()
 
@@ -749,6 +798,14 @@ class TaskPanel:
         self.form.activeToolController.blockSignals(False)
         self.form.toolControllerList.blockSignals(False)
 
+    def usageToolTip(self, usage):
+        if usage is None:
+            return ''
+        def length(value):
+            return FreeCAD.Units.Quantity(value, FreeCAD.Units.Length).UserString
+        return translate("Path_Job", "Cycle Time: %s\nFeed Distance: %s\nRapid Distance: %s") % (
+                PathStatistics.formatTime(usage.time), length(usage.feedDistance), length(usage.rapidDistance))
+
     def setFields(self):
         '''sets fields in the form to match the object'''
 
@@ -771,6 +828,9 @@ class TaskPanel:
         # self.obj.Proxy.onChanged(self.obj, "PostProcessor")
         self.updateTooltips()
 
+        # the paths may have changed, statistics are computed again on the next tool tip
+        self.usageToolTips.invalidate()
+
         self.form.operationsList.clear()
         for child in self.obj.Operations.Group:
             item = QtGui.QListWidgetItem(child.Label)
@@ -1288,6 +1348,8 @@ class TaskPanel:
         self.form.postProcessorSetOutputFile.clicked.connect(self.setPostProcessorOutputFile)
 
         # Workplan
+        self.usageToolTips.install(self.form.operationsList)
+        self.usageToolTips.install(self.form.toolControllerList)
         self.form.operationsList.itemSelectionChanged.connect(self.operationSelect)
         self.form.operationsList.indexesMoved.connect(self.getFields)
         self.form.operationDelete.clicked.connect(self.operationDelete)
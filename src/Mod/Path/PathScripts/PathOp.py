@@ -24,7 +24,9 @@ import time
 
 from PySide import QtCore
 
+import FreeCAD
 import Path
+import PathScripts.PathFingerprint as PathFingerprint
 import PathScripts.PathGeom as PathGeom
 import PathScripts.PathLog as PathLog
 import PathScripts.PathPreferences as PathPreferences
@@ -127,6 +129,7 @@ class ObjectOp(object):
         obj.addProperty("App::PropertyString", "UserLabel", "Path", QtCore.QT_TRANSLATE_NOOP("PathOp", "User Assigned Label"))
         obj.addProperty("App::PropertyString", "CycleTime", "Path", QtCore.QT_TRANSLATE_NOOP("PathOp", "Operations Cycle Time Estimation"))
         obj.setEditorMode('CycleTime', 1)  # read-only
+        self.addFingerprintProperty(obj)
 
         features = self.opFeatures(obj)
 
@@ -196,12 +199,18 @@ class ObjectOp(object):
                 obj.recompute()
                 obj.Proxy = self
 
+    def addFingerprintProperty(self, obj):
+        obj.addProperty("App::PropertyString", "Fingerprint", "Path", QtCore.QT_TRANSLATE_NOOP("PathOp", "Digest of the inputs the current path was generated from"))
+        obj.setEditorMode('Fingerprint', 2)  # hide
+
     def setEditorModes(self, obj, features):
         '''Editor modes are not preserved during document store/restore, set editor modes for all properties'''
 
         for op in ['OpStartDepth', 'OpFinalDepth', 'OpToolDiameter', 'CycleTime']:
             if hasattr(obj, op):
                 obj.setEditorMode(op, 1)  # read-only
+        if hasattr(obj, 'Fingerprint'):
+            obj.setEditorMode('Fingerprint', 2)  # hide
 
         if FeatureDepths & features:
             if FeatureNoFinalDepth & features:
@@ -235,6 +244,9 @@ class ObjectOp(object):
         if not hasattr(obj, 'CycleTime'):
             obj.addProperty("App::PropertyString", "CycleTime", "Path", QtCore.QT_TRANSLATE_NOOP("PathOp", "Operations Cycle Time Estimation"))
 
+        if not hasattr(obj, 'Fingerprint'):
+            self.addFingerprintProperty(obj)
+
         self.setEditorModes(obj, features)
         self.opOnDocumentRestored(obj)
 
@@ -291,6 +303,15 @@ class ObjectOp(object):
         Should be overwritten by subclasses.'''
         pass  # pylint: disable=unnecessary-pass
 
+    def opPrepare(self, obj):
+        '''opPrepare(obj) ... return a callable computing the heavy geometry of the operation, or None.
+        Called by PathOpScheduler before the document is recomputed, once the instance variables listed
+        in execute() are set. opPrepare() must only compute values, changes of the document are left to
+        opExecute(). The callable is run in a worker thread and must not access the document, its return
+        value is available to opExecute() as self.precomputed.
+        Can safely be overwritten by subclasses.'''
+        return None
+
     def opRejectAddBase(self, obj, base, sub):
         '''opRejectAddBase(base, sub) ... if op returns True the addition of the feature is prevented.
         Should be overwritten by subclasses.'''
@@ -498,11 +519,15 @@ class ObjectOp(object):
             self.tool         ... the actual tool being used
             self.radius       ... the main radius of the tool being used
             self.commandlist  ... a list for collecting all commands produced by the operation
+            self.precomputed  ... result of the callable returned by opPrepare(obj), if PathOpScheduler ran it
+            self.preparedFingerprint ... fingerprint(obj), if PathOpScheduler computed it when preparing obj
 
         Once everything is validated and above variables are set the implementation calls
         opExecute(obj) - which is expected to add the generated commands to self.commandlist
         Finally the base implementation adds a rapid move to clearance height and assigns
         the receiver's Path property from the command list.
+        If the fingerprint of the op's inputs, see fingerprint(obj), didn't change since the Path
+        was generated, opExecute(obj) is skipped and the Path is kept.
         '''
         PathLog.track()
 
@@ -511,21 +536,78 @@ class ObjectOp(object):
             obj.Path = path
             return
 
-        if not self._setBaseAndStock(obj):
+        if not self._setupExecute(obj):
+            return
+
+        # PathOpScheduler computed the fingerprint already when it prepared the op
+        fingerprint = getattr(self, 'preparedFingerprint', None) or self.fingerprint(obj)
+        self.preparedFingerprint = None
+        if PathFingerprint.isUnchanged(obj, fingerprint):
+            PathLog.debug("{} unchanged, keeping its path".format(obj.Label))
+            self.precomputed = None
             return
 
+        self.commandlist = []
+        self.commandlist.append(Path.Command("(%s)" % obj.Label))
+        if obj.Comment:
+            self.commandlist.append(Path.Command("(%s)" % obj.Comment))
+
+        result = self.opExecute(obj)  # pylint: disable=assignment-from-no-return
+        self.precomputed = None
+
+        if self.commandlist and (FeatureHeights & self.opFeatures(obj)):
+            # Let's finish by rapid to clearance...just for safety
+            self.commandlist.append(Path.Command("G0", {"Z": obj.ClearanceHeight.Value}))
+
+        path = Path.Path(self.commandlist)
+        obj.Path = path
+        # the job sums up the cycle times once all its ops are recomputed
+        obj.CycleTime = self.getCycleTimeEstimate(obj)
+        # taken after opExecute, which may update some of the op's own properties
+        PathFingerprint.store(obj, self.fingerprint(obj))
+        return result
+
+    def fingerprint(self, obj):
+        '''fingerprint(obj) ... return the digest of everything the op's path is generated from: its own
+        properties including the shapes of its base geometry, the tool controller and its tool, the shapes
+        of the job's model and stock and the job's geometry tolerance. Only valid after _setupExecute(obj).
+        Can safely be overwritten by subclasses depending on further inputs, they should include this digest.'''
+        parts = [PathFingerprint.objectDigest(obj)]
+        tc = getattr(obj, 'ToolController', None)
+        if tc:
+            parts.append(PathFingerprint.objectDigest(tc))
+            if isinstance(getattr(tc, 'Tool', None), FreeCAD.DocumentObject):
+                parts.append(PathFingerprint.objectDigest(tc.Tool))
+        parts.extend(PathFingerprint.objectShapeDigest(o) for o in self.model)
+        if self.stock:
+            parts.append(PathFingerprint.objectShapeDigest(self.stock))
+        parts.append(str(getattr(self.job, 'GeometryTolerance', '')))
+        return PathFingerprint.combine(parts)
+
+    def _setupExecute(self, obj, precompute=False):
+        '''_setupExecute(obj, precompute=False) ... validates obj and sets the instance variables listed in execute().
+        Returns True if the operation can be executed. If precompute is set errors are not reported, stale
+        Base geometry is not cleared and expressions are not updated - execute() takes care of all that.'''
+        if not self._setBaseAndStock(obj, precompute):
+            return False
+
         # make sure Base is still valid or clear it
-        self.sanitizeBase(obj)
+        if precompute:
+            if hasattr(obj, 'Base') and self._hasStaleBase(obj):
+                return False
+        else:
+            self.sanitizeBase(obj)
 
         if FeatureCoolant & self.opFeatures(obj):
-            if not hasattr(obj, 'CoolantMode'):
+            if not hasattr(obj, 'CoolantMode') and not precompute:
                 PathLog.error(translate("Path", "No coolant property found. Please recreate operation."))
 
         if FeatureTool & self.opFeatures(obj):
             tc = obj.ToolController
             if tc is None or tc.ToolNumber == 0:
-                PathLog.error(translate("Path", "No Tool Controller is selected. We need a tool to build a Path."))
-                return
+                if not precompute:
+                    PathLog.error(translate("Path", "No Tool Controller is selected. We need a tool to build a Path."))
+                return False
             else:
                 self.vertFeed = tc.VertFeed.Value
                 self.horizFeed = tc.HorizFeed.Value
@@ -533,33 +615,29 @@ class ObjectOp(object):
                 self.horizRapid = tc.HorizRapid.Value
                 tool = tc.Proxy.getTool(tc)
                 if not tool or float(tool.Diameter) == 0:
-                    PathLog.error(translate("Path", "No Tool found or diameter is zero. We need a tool to build a Path."))
-                    return
+                    if not precompute:
+                        PathLog.error(translate("Path", "No Tool found or diameter is zero. We need a tool to build a Path."))
+                    return False
                 self.radius = float(tool.Diameter) / 2.0
                 self.tool = tool
-                obj.OpToolDiameter = tool.Diameter
-
-        self.updateDepths(obj)
-        # now that all op values are set make sure the user properties get updated accordingly,
-        # in case they still have an expression referencing any op values
-        obj.recompute()
-
-        self.commandlist = []
-        self.commandlist.append(Path.Command("(%s)" % obj.Label))
-        if obj.Comment:
-            self.commandlist.append(Path.Command("(%s)" % obj.Comment))
-
-        result = self.opExecute(obj)  # pylint: disable=assignment-from-no-return
-
-        if self.commandlist and (FeatureHeights & self.opFeatures(obj)):
-            # Let's finish by rapid to clearance...just for safety
-            self.commandlist.append(Path.Command("G0", {"Z": obj.ClearanceHeight.Value}))
+                if not precompute:
+                    obj.OpToolDiameter = tool.Diameter
+
+        if not precompute:
+            self.updateDepths(obj)
+            # now that all op values are set make sure the user properties get updated accordingly,
+            # in case they still have an expression referencing any op values
+            obj.recompute()
+        return True
 
-        path = Path.Path(self.commandlist)
-        obj.Path = path
-        obj.CycleTime = self.getCycleTimeEstimate(obj)
-        self.job.Proxy.getCycleTime()
-        return result
+    def _hasStaleBase(self, obj):
+        try:
+            for (o, sublist) in obj.Base:
+                for sub in sublist:
+                    o.Shape.getElement(sub)
+        except Part.OCCError:
+            return True
+        return False
 
     def getCycleTimeEstimate(self, obj):
 
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import FreeCAD
+import PathScripts.PathFingerprint as PathFingerprint
+import PathScripts.PathLog as PathLog
+import PathScripts.PathOp as PathOp
+import concurrent.futures
+import os
+
+__title__ = "Path Operation Scheduler"
+__author__ = "FreeCAD developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Computes the heavy geometry of independent operations of a job in a worker pool before the document is recomputed."
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+Workers = os.cpu_count() or 1
+
+
+def isPending(obj):
+    '''isPending(obj) ... return True if obj is going to be recomputed.'''
+    return 'Touched' in obj.State or 'Invalid' in obj.State
+
+
+def independentOperations(job):
+    '''independentOperations(job) ... return the pending ops of job which can prepare their geometry
+    and only depend on objects, like the model, stock and tool controller, which are up to date.
+    Ops depending on other pending objects, e.g. dressups of a pending op, are left to the recompute.'''
+    ops = []
+    for op in job.Operations.Group:
+        proxy = getattr(op, 'Proxy', None)
+        if not isinstance(proxy, PathOp.ObjectOp) or not getattr(op, 'Active', False):
+            continue
+        if type(proxy).opPrepare is PathOp.ObjectOp.opPrepare:
+            continue
+        if isPending(op) and not any(isPending(dep) for dep in op.OutListRecursive):
+            ops.append(op)
+    return ops
+
+
+def precompute(jobs, workers=None):
+    '''precompute(jobs, workers=None) ... prepare the independent ops of jobs on the main thread and run
+    their geometry computations in a pool of workers. Each op's result and fingerprint are handed to its
+    next execute(). Preparing only computes values, all document changes are left to execute().
+    Returns the number of ops computed in the pool.'''
+    tasks = []
+    for job in jobs:
+        for op in independentOperations(job):
+            op.Proxy.precomputed = None
+            if op.Proxy._setupExecute(op, True):  # pylint: disable=protected-access
+                # handed to execute(), the op's inputs don't change until it is executed
+                op.Proxy.preparedFingerprint = op.Proxy.fingerprint(op)
+                if PathFingerprint.isUnchanged(op, op.Proxy.preparedFingerprint):
+                    # execute() is going to keep the op's path
+                    continue
+                task = op.Proxy.opPrepare(op)
+                if task is not None:
+                    tasks.append((op, task))
+
+    # a single op gains nothing from being computed ahead of the recompute
+    if len(tasks) < 2:
+        return 0
+
+    PathLog.debug("computing {} operations in the worker pool".format(len(tasks)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers or Workers) as pool:
+        futures = [(op, pool.submit(task)) for (op, task) in tasks]
+        for (op, future) in futures:
+            try:
+                op.Proxy.precomputed = future.result()
+            except Exception as e:  # pylint: disable=broad-except
+                # execute() computes it again and reports the error properly
+                PathLog.debug("{}: {}".format(op.Label, e))
+    return len(tasks)
+
+
+def release(jobs):
+    '''release(jobs) ... drop what precompute() prepared for ops of jobs which were not executed,
+    so it can't be used by a later recompute with different inputs.'''
+    for job in jobs:
+        for op in job.Operations.Group:
+            proxy = getattr(op, 'Proxy', None)
+            if isinstance(proxy, PathOp.ObjectOp):
+                proxy.precomputed = None
+                proxy.preparedFingerprint = None
+                if hasattr(proxy, 'preparedEdges'):
+                    proxy.preparedEdges = None
+
+
+class DocumentObserver(object):
+    '''Precomputes the jobs of a document whenever it is about to be recomputed and caches the digests
+    of the shapes of their models and stock during the recompute.'''
+
+    def jobs(self, doc):
+        return [o for o in doc.Objects if hasattr(o, 'Operations') and hasattr(getattr(o, 'Proxy', None), 'getCycleTime')]
+
+    def slotBeforeRecomputeDocument(self, doc):
+        jobs = self.jobs(doc)
+        if jobs:
+            PathFingerprint.beginRecompute()
+            precompute(jobs)
+
+    def slotRecomputedDocument(self, doc):
+        PathFingerprint.endRecompute()
+        jobs = self.jobs(doc)
+        if jobs:
+            release(jobs)
+
+
+_observer = None
+
+
+def install():
+    '''install() ... register the document observer, calling it again has no effect.'''
+    global _observer  # pylint: disable=global-statement
+    if _observer is None:
+        _observer = DocumentObserver()
+        FreeCAD.addDocumentObserver(_observer)
@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathLog as PathLog
+import math
+
+__title__ = "Path Ordering"
+__author__ = "FreeCAD developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Orders holes and wires to reduce rapid moves, using a grid index for nearest neighbour queries and optional 2-opt improvement."
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+TwoOptPasses = 8
+TwoOptNeighbours = 8
+
+
+class PointGrid(object):
+    '''PointGrid(points, indices=None) ... uniform grid over the 2D points with the given indices.
+    Supports nearest neighbour queries and removal of points. Queries return the point with the lowest
+    squared distance plus weight, ties are resolved in favour of the lower index. Once three quarters of
+    the points are removed the grid is rebuilt, so the cell size follows the density of what's left.'''
+
+    def __init__(self, points, indices=None, weights=None):
+        self.points = points
+        self.weights = weights
+        self.build(range(len(points)) if indices is None else indices)
+
+    def build(self, indices):
+        indices = sorted(indices)
+        self.size = len(indices)
+        self.count = self.size
+        self.cells = {}
+        if not indices:
+            return
+        xs = [self.points[i][0] for i in indices]
+        ys = [self.points[i][1] for i in indices]
+        self.x0 = min(xs)
+        self.y0 = min(ys)
+        width = max(xs) - self.x0
+        height = max(ys) - self.y0
+        area = width * height
+        if area > 0:
+            self.cell = math.sqrt(area / len(indices))
+        else:
+            self.cell = max(width, height) / len(indices)
+        self.cell = max(self.cell, 1e-9)
+        self.nx = int(width / self.cell) + 1
+        self.ny = int(height / self.cell) + 1
+        for i in indices:
+            self.cells.setdefault(self.cellOf(self.points[i]), []).append(i)
+
+    def cellOf(self, pt):
+        return (int(math.floor((pt[0] - self.x0) / self.cell)), int(math.floor((pt[1] - self.y0) / self.cell)))
+
+    def remove(self, index):
+        '''remove(index) ... remove the point with index from the grid.'''
+        key = self.cellOf(self.points[index])
+        cell = self.cells[key]
+        cell.remove(index)
+        if not cell:
+            del self.cells[key]
+        self.count -= 1
+        if self.count and self.count * 4 < self.size:
+            self.build([i for cell in self.cells.values() for i in cell])
+
+    def _ring(self, cx, cy, r):
+        '''_ring(cx, cy, r) ... yields the non empty cells at Chebyshev distance r of (cx, cy).'''
+        cells = self.cells
+        if r == 0:
+            if (cx, cy) in cells:
+                yield cells[(cx, cy)]
+            return
+        xlo = max(cx - r, 0)
+        xhi = min(cx + r, self.nx - 1)
+        for y in (cy - r, cy + r):
+            if 0 <= y < self.ny:
+                for x in range(xlo, xhi + 1):
+                    if (x, y) in cells:
+                        yield cells[(x, y)]
+        ylo = max(cy - r + 1, 0)
+        yhi = min(cy + r - 1, self.ny - 1)
+        for x in (cx - r, cx + r):
+            if 0 <= x < self.nx:
+                for y in range(ylo, yhi + 1):
+                    if (x, y) in cells:
+                        yield cells[(x, y)]
+
+    def _search(self, pt, visit):
+        '''_search(pt, visit) ... calls visit(cell) for cells in rings of increasing distance around pt
+        until visit returns a squared distance bound the next ring can't beat.'''
+        (cx, cy) = self.cellOf(pt)
+        first = max(0, -cx, cx - self.nx + 1, -cy, cy - self.ny + 1)
+        last = max(cx, self.nx - 1 - cx, cy, self.ny - 1 - cy)
+        bound = None
+        for r in range(first, last + 1):
+            for cell in self._ring(cx, cy, r):
+                bound = visit(cell)
+            if bound is not None and bound <= (r * self.cell) ** 2:
+                break
+
+    def nearest(self, pt):
+        '''nearest(pt) ... returns the index of the point closest to pt, None if the grid is empty.'''
+        if not self.count:
+            return None
+        (px, py) = (pt[0], pt[1])
+        points = self.points
+        weights = self.weights
+        best = [None, None]
+
+        def visit(cell):
+            for i in cell:
+                (x, y) = (points[i][0], points[i][1])
+                cost = (x - px) ** 2 + (y - py) ** 2
+                if weights is not None:
+                    cost += weights[i]
+                if best[0] is None or cost < best[0] or (cost == best[0] and i < best[1]):
+                    best[0] = cost
+                    best[1] = i
+            return best[0]
+
+        self._search(pt, visit)
+        return best[1]
+
+    def nearestK(self, pt, k):
+        '''nearestK(pt, k) ... returns the indices of the up to k points closest to pt, closest first.'''
+        if not self.count:
+            return []
+        (px, py) = (pt[0], pt[1])
+        points = self.points
+        found = []
+
+        def visit(cell):
+            for i in cell:
+                found.append(((points[i][0] - px) ** 2 + (points[i][1] - py) ** 2, i))
+            if len(found) < k:
+                return None
+            found.sort()
+            del found[k:]
+            return found[-1][0]
+
+        self._search(pt, visit)
+        found.sort()
+        return [i for _, i in found[:k]]
+
+
+def _distance(a, b):
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+def rapidDistance(begins, ends, order, start=(0.0, 0.0)):
+    '''rapidDistance(begins, ends, order, start=(0, 0)) ... returns the length of the rapid moves from start
+    through the items in order, a list of (index, reversed) tuples.'''
+    distance = 0.0
+    pos = start
+    for (i, rev) in order:
+        if rev:
+            distance += _distance(pos, ends[i])
+            pos = begins[i]
+        else:
+            distance += _distance(pos, begins[i])
+            pos = ends[i]
+    return distance
+
+
+def nearestNeighbourOrder(begins, ends=None, start=(0.0, 0.0), weights=None):
+    '''nearestNeighbourOrder(begins, ends=None, start=(0, 0), weights=None) ... returns the items, given by their
+    begin and end points, in nearest neighbour order as a list of (index, reversed) tuples.
+    If ends is None the items are points and never reversed, otherwise an item can be entered at either end, on
+    ties entering at the end is preferred. Optional non-negative weights are added to the squared distances.'''
+    n = len(begins)
+    if ends is None:
+        grid = PointGrid(begins, weights=weights)
+        order = []
+        pos = start
+        while grid.count:
+            i = grid.nearest(pos)
+            grid.remove(i)
+            order.append((i, False))
+            pos = begins[i]
+        return order
+
+    # endpoints 0..n-1 are the ends, n..2n-1 the begins of the items
+    grid = PointGrid(list(ends) + list(begins))
+    order = []
+    pos = start
+    while grid.count:
+        e = grid.nearest(pos)
+        i = e % n
+        grid.remove(i)
+        grid.remove(i + n)
+        if e < n:
+            order.append((i, True))
+            pos = begins[i]
+        else:
+            order.append((i, False))
+            pos = ends[i]
+    return order
+
+
+def twoOpt(begins, ends, order, start=(0.0, 0.0), passes=TwoOptPasses, neighbours=TwoOptNeighbours):
+    '''twoOpt(begins, ends, order, start=(0, 0), passes=TwoOptPasses, neighbours=TwoOptNeighbours) ... returns order
+    improved by reversing sub sequences as long as that shortens the rapid moves.
+    Only reversals connecting an item to one of the items owning its closest endpoints are tried. Reversing a
+    sequence also reverses the direction of its items, so ends must be given if items have a direction.'''
+    if ends is None:
+        ends = begins
+    n = len(order)
+    if n < 3:
+        return list(order)
+
+    items = [None] + [i for (i, _) in order]
+    flip = [False] + [rev for (_, rev) in order]
+    pos = {}
+    for k in range(1, n + 1):
+        pos[items[k]] = k
+
+    def entry(k):
+        if k == 0:
+            return start
+        return ends[items[k]] if flip[k] else begins[items[k]]
+
+    def exit(k):
+        if k == 0:
+            return start
+        return begins[items[k]] if flip[k] else ends[items[k]]
+
+    # the endpoints of item i are i and i + m, points only have one
+    m = len(begins)
+    endpoints = list(begins) if ends is begins else list(begins) + list(ends)
+    grid = PointGrid(endpoints)
+    candidates = {}
+
+    def near(pt, owner):
+        key = (pt[0], pt[1])
+        if key not in candidates:
+            candidates[key] = [e % m for e in grid.nearestK(pt, neighbours + 2)]
+        return [c for c in candidates[key] if c != owner and c in pos]
+
+    for _ in range(passes):
+        improved = False
+        for k in range(n):
+            ex = exit(k)
+            for c in near(ex, items[k]):
+                j = pos[c]
+                (lo, hi) = (k + 1, j) if j > k else (j + 1, k)
+                if lo >= hi:
+                    continue
+                before = _distance(exit(lo - 1), entry(lo))
+                after = _distance(exit(lo - 1), exit(hi))
+                if hi < n:
+                    before += _distance(exit(hi), entry(hi + 1))
+                    after += _distance(entry(lo), entry(hi + 1))
+                if after < before - 1e-9:
+                    items[lo:hi + 1] = items[lo:hi + 1][::-1]
+                    flip[lo:hi + 1] = [not f for f in flip[lo:hi + 1][::-1]]
+                    for p in range(lo, hi + 1):
+                        pos[items[p]] = p
+                    improved = True
+                    ex = exit(k)
+        if not improved:
+            break
+    if ends is begins:
+        return [(items[k], False) for k in range(1, n + 1)]
+    return [(items[k], flip[k]) for k in range(1, n + 1)]
+
+
+def sortLocations(locations, keys, attractors=None, optimize=False):
+    '''sortLocations(locations, keys, attractors=None, optimize=False) ... returns (sorted, saved).
+    locations are dictionaries, keys the two keys of their X and Y coordinates. Locations are ordered
+    nearest neighbour first, starting at the origin; the absolute values of the attractors, by default the X
+    coordinate, are added to the squared distances. If optimize is set the order is improved with 2-opt.
+    saved is the estimated rapid distance saved compared to the given order.'''
+    attractors = attractors or [keys[0]]
+    points = [(loc[keys[0]], loc[keys[1]]) for loc in locations]
+    weights = [sum(abs(loc[k]) for k in attractors) for loc in locations]
+    order = nearestNeighbourOrder(points, weights=weights)
+    if optimize:
+        order = twoOpt(points, None, order)
+    saved = rapidDistance(points, points, [(i, False) for i in range(len(points))]) - rapidDistance(points, points, order)
+    return ([locations[i] for (i, _) in order], saved)
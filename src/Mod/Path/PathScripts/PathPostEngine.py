@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathLog as PathLog
+import io
+
+__title__ = "Path Post Processor Engine"
+__author__ = "FreeCAD developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Streaming engine shared by post processors which emit G-code word by word."
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+# Parameter order most controllers accept, K is omitted on purpose - arcs in
+# the XY plane must not carry it.
+ParameterOrder = ['X', 'Y', 'Z', 'A', 'B', 'C', 'I', 'J', 'F', 'S', 'T', 'Q', 'R', 'L', 'H', 'D', 'P']
+IntegerParameters = ['S', 'T', 'H', 'D']
+RapidMoves = ['G0', 'G00']
+
+# Path stores lengths in mm and feed rates in mm/s
+MillimeterPerInch = 25.4
+SecondsPerMinute = 60.0
+
+# buffer size of the output files posts stream into
+BufferSize = 1 << 20
+
+
+class Dialect(object):
+    '''Dialect(units='G21', precision=3, ...) ... description of the G-code a post processor emits.
+    All unit conversions and number formats are resolved once on construction, so formatting a word
+    is a division and a call to format().'''
+
+    def __init__(self, units='G21', precision=3, modal=False, outputDoubles=True, outputComments=True,
+                 lineNumbers=False, commandSpace=' ', trailingSpace=True, toolChange='', toolLengthOffset=True,
+                 parameterOrder=None, integerParameters=None, rapidMoves=None):
+        # pylint: disable=too-many-arguments
+        self.units = units
+        self.precision = int(precision)
+        self.modal = modal
+        self.outputDoubles = outputDoubles
+        self.outputComments = outputComments
+        self.lineNumbers = lineNumbers
+        self.commandSpace = commandSpace
+        self.trailingSpace = trailingSpace
+        self.toolChange = toolChange
+        self.toolLengthOffset = toolLengthOffset
+        self.parameterOrder = ParameterOrder if parameterOrder is None else parameterOrder
+        self.integerParameters = set(IntegerParameters if integerParameters is None else integerParameters)
+        self.rapidMoves = set(RapidMoves if rapidMoves is None else rapidMoves)
+
+        self.lengthDivisor = MillimeterPerInch if units == 'G20' else 1.0
+        self.speedDivisor = self.lengthDivisor / SecondsPerMinute
+        self.numberFormat = '.%df' % self.precision
+        self.templates = self._compileTemplates()
+
+    def _compileTemplates(self):
+        '''_compileTemplates() ... returns a list of (param, divisor, format) tuples in output order.
+        Integer parameters have a divisor of None.'''
+        templates = []
+        for param in self.parameterOrder:
+            if param in self.integerParameters:
+                templates.append((param, None, None))
+            elif param == 'F':
+                templates.append((param, self.speedDivisor, self.numberFormat))
+            else:
+                templates.append((param, self.lengthDivisor, self.numberFormat))
+        return templates
+
+    def formatLength(self, value):
+        '''formatLength(value) ... returns value, given in mm, converted and formatted for output.'''
+        return format(value / self.lengthDivisor, self.numberFormat)
+
+    def formatSpeed(self, value):
+        '''formatSpeed(value) ... returns value, given in mm/s, converted and formatted for output.'''
+        return format(value / self.speedDivisor, self.numberFormat)
+
+
+class ModalState(object):
+    '''ModalState() ... tracks the last command and the last value of each parameter.'''
+
+    def __init__(self):
+        self.command = None
+        self.parameters = None
+        self.reset()
+
+    def reset(self):
+        '''reset() ... forget everything, the next command and all its parameters are output.'''
+        self.command = None
+        self.parameters = {'X': -1, 'Y': -1, 'Z': -1, 'F': 0.0}
+
+    def update(self, command, parameters):
+        self.command = command
+        self.parameters.update(parameters)
+
+
+class PostProcessor(object):
+    '''PostProcessor(dialect, writer=None, lineNumber=None) ... streams path commands into writer.
+    If no writer is given the output is collected and available through getOutput().
+    lineNumber is a callable returning the line number prefix, posts pass their own so the
+    numbering of the header and the operations is continuous.
+    Posts customise the output by overriding beginPath(), commandName() and extraWords().'''
+
+    def __init__(self, dialect, writer=None, lineNumber=None):
+        self.dialect = dialect
+        self.writer = io.StringIO() if writer is None else writer
+        self.state = ModalState()
+        self.lineNr = 100
+        if lineNumber is not None:
+            self.lineNumber = lineNumber
+
+    def lineNumber(self):
+        '''lineNumber() ... returns the prefix for the next line, empty if line numbers are disabled.'''
+        if self.dialect.lineNumbers:
+            self.lineNr += 10
+            return "N%d " % self.lineNr
+        return ''
+
+    def getOutput(self):
+        '''getOutput() ... returns everything written so far, only valid if no writer was given.'''
+        return self.writer.getvalue()
+
+    def writeToolChange(self, params, words):
+        '''writeToolChange(params, words) ... writes the lines preceding a tool change and adds the
+        tool length offset to words, the words of the M6 command.'''
+        # stop the spindle
+        self.writer.write(self.lineNumber() + 'M5\n')
+        self.write(self.dialect.toolChange)
+
+        # add height offset
+        if self.dialect.toolLengthOffset:
+            words.append('\nG43 H' + str(int(params['T'])))
+
+    def write(self, text):
+        '''write(text) ... writes text, each line prefixed with its line number.'''
+        for line in text.splitlines(True):
+            self.writer.write(self.lineNumber() + line)
+
+    def writeWords(self, words):
+        '''writeWords(words) ... writes one line consisting of words.'''
+        if self.dialect.lineNumbers:
+            words.insert(0, self.lineNumber())
+        space = self.dialect.commandSpace
+        line = space.join(words) + space
+        if not self.dialect.trailingSpace:
+            line = line.rstrip()
+        self.writer.write(line + '\n')
+
+    def beginPath(self, pathobj):
+        '''beginPath(pathobj) ... called before the commands of pathobj are processed.'''
+
+    def commandName(self, name, params):
+        '''commandName(name, params) ... returns the command word to output for name.'''
+        # pylint: disable=unused-argument
+        return name
+
+    def extraWords(self, name, params):
+        '''extraWords(name, params) ... returns additional words appended after the parameters.'''
+        # pylint: disable=unused-argument
+        return []
+
+    def parameterWords(self, name, params):
+        '''parameterWords(name, params) ... returns the formatted parameters of a command.'''
+        dialect = self.dialect
+        last = self.state.parameters
+        doubles = dialect.outputDoubles
+        words = []
+        for param, divisor, fmt in dialect.templates:
+            if param not in params:
+                continue
+            value = params[param]
+            if divisor is None:
+                words.append(param + str(int(value)))
+            elif not doubles and param in last and last[param] == value:
+                continue
+            elif param == 'F':
+                # most controllers don't take a feed rate for rapid moves
+                if name in dialect.rapidMoves:
+                    continue
+                value = value / divisor
+                if value > 0.0:
+                    words.append(param + format(value, fmt))
+            else:
+                words.append(param + format(value / divisor, fmt))
+        return words
+
+    def processCommand(self, command):
+        '''processCommand(command) ... formats command and writes it.'''
+        dialect = self.dialect
+        name = command.Name
+        if name[0] == '(' and not dialect.outputComments:
+            return
+        params = command.Parameters
+
+        outName = self.commandName(name, params)
+        if dialect.modal and outName == self.state.command:
+            words = []
+        else:
+            words = [outName]
+        words.extend(self.parameterWords(name, params))
+        words.extend(self.extraWords(name, params))
+        self.state.update(outName, params)
+
+        if outName == 'M6':
+            self.writeToolChange(params, words)
+
+        if outName == 'message':
+            if not dialect.outputComments:
+                return
+            if words and words[0] == outName:
+                words.pop(0)
+
+        if words:
+            self.writeWords(words)
+
+    def parse(self, pathobj):
+        '''parse(pathobj) ... processes the commands of pathobj, or all its members if it is a group.'''
+        if hasattr(pathobj, 'Group'):
+            for p in pathobj.Group:
+                self.parse(p)
+            return
+
+        # groups might contain non-path things like stock.
+        if not hasattr(pathobj, 'Path'):
+            return
+
+        self.state.reset()
+        self.beginPath(pathobj)
+        for c in pathobj.Path.Commands:
+            self.processCommand(c)
+
+
+def openOutput(filename, editor=False):
+    '''openOutput(filename, editor=False) ... returns the writer a post's export() streams its G-code into.
+    The G-code is written straight into the file, it is only collected in memory if filename is '-' or
+    if it is shown in an editor before it is written.'''
+    if filename == '-' or editor:
+        return io.StringIO()
+    return open(filename, 'w', buffering=BufferSize)
+
+
+def closeOutput(writer, filename, edit=None):
+    '''closeOutput(writer, filename, edit=None) ... finishes the output opened by openOutput() and returns the
+    G-code. If the G-code was collected in memory it is passed through edit, if given, which returns the
+    final G-code, and then written to filename unless that is '-'.'''
+    if isinstance(writer, io.StringIO):
+        gcode = writer.getvalue()
+        if edit is not None:
+            gcode = edit(gcode)
+        if filename != '-':
+            with open(filename, 'w') as fp:
+                fp.write(gcode)
+        return gcode
+
+    writer.close()
+    # export() returns the G-code, it's read in one go instead of being concatenated while it's generated
+    with open(filename, 'r') as fp:
+        return fp.read()
@@ -57,6 +57,16 @@ UseAbsoluteToolPaths            = "UseAbsoluteToolPaths"
 GeometryTolerance               = "GeometryTolerance"
 LibAreaCurveAccuracy            = "LibAreaCurveAccuarcy"
 
+# On disk cache of adaptive results, size in MB - 0 disables the cache
+AdaptiveCacheDirectory          = "AdaptiveCacheDirectory"
+AdaptiveCacheSize               = "AdaptiveCacheSize"
+
+# Machine acceleration in mm/s^2 used for cycle time estimates - 0 ignores acceleration
+CycleTimeAcceleration           = "CycleTimeAcceleration"
+
+# Ops and dressups whose inputs didn't change keep their path instead of being recomputed
+IncrementalRecompute            = "IncrementalRecompute"
+
 WarningSuppressRapidSpeeds      = "WarningSuppressRapidSpeeds"
 WarningSuppressAllSpeeds        = "WarningSuppressAllSpeeds"
 WarningSuppressSelectionMode    = "WarningSuppressSelectionMode"
@@ -116,6 +126,25 @@ def defaultLibAreaCurveAccuracy():
     return preferences().GetFloat(LibAreaCurveAccuracy, 0.01)
 
 
+def adaptiveCacheDirectory():
+    path = preferences().GetString(AdaptiveCacheDirectory, "")
+    if not path:
+        path = os.path.join(FreeCAD.getUserAppDataDir(), "Path", "AdaptiveCache")
+    return path
+
+
+def adaptiveCacheSize():
+    return preferences().GetInt(AdaptiveCacheSize, 256)
+
+
+def cycleTimeAcceleration():
+    return preferences().GetFloat(CycleTimeAcceleration, 0.0)
+
+
+def incrementalRecompute():
+    return preferences().GetBool(IncrementalRecompute, True)
+
+
 def defaultFilePath():
     return preferences().GetString(DefaultFilePath)
 
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathLog as PathLog
+import numpy
+
+__title__ = "Path Probe Map"
+__author__ = "FreeCAD developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Regular grid of probed surface heights with vectorized interpolation."
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+Bilinear = 'Bilinear'
+Bicubic = 'Bicubic'
+Methods = [Bilinear, Bicubic]
+
+
+def readProbeFile(filename, decimals=2):
+    '''readProbeFile(filename, decimals=2) ... return the XYZ coordinates of all probe points in the file
+    as an array of shape (n, 3). Each line holds the coordinates of one point as logged by G38, any
+    further axes are ignored. Coordinates are rounded so points of the same row or column compare equal.'''
+    try:
+        points = numpy.loadtxt(filename, usecols=(0, 1, 2), ndmin=2)
+    except (ValueError, IndexError) as e:
+        raise ValueError("File does not contain appropriate point data: {}".format(e))
+    return numpy.round(points, decimals)
+
+
+def _intervals(grid, v):
+    '''_intervals(grid, v) ... return the index of the grid interval of each value and the parameter
+    within it, values outside the grid are clamped to its border.'''
+    i = numpy.clip(numpy.searchsorted(grid, v, side='right') - 1, 0, len(grid) - 2)
+    t = numpy.clip((v - grid[i]) / (grid[i + 1] - grid[i]), 0.0, 1.0)
+    return (i, t)
+
+
+def _linearWeights(grid, v):
+    (i, t) = _intervals(grid, v)
+    return ([i, i + 1], [1 - t, t])
+
+
+def _cubicWeights(grid, v):
+    '''_cubicWeights(grid, v) ... return the 4 neighbour indices and weights of a cubic Hermite spline
+    whose tangents are the central differences of the neighbours, Catmull-Rom on uneven spacing.
+    Indices past the border are clamped, which turns the border tangents into one sided differences.'''
+    (i, t) = _intervals(grid, v)
+    last = len(grid) - 1
+    idx = [numpy.maximum(i - 1, 0), i, i + 1, numpy.minimum(i + 2, last)]
+    h = grid[i + 1] - grid[i]
+    d0 = h * 1.0 / (grid[idx[2]] - grid[idx[0]])
+    d1 = h * 1.0 / (grid[idx[3]] - grid[idx[1]])
+    t2 = t * t
+    t3 = t2 * t
+    h00 = 2 * t3 - 3 * t2 + 1
+    h10 = t3 - 2 * t2 + t
+    h01 = -2 * t3 + 3 * t2
+    h11 = t3 - t2
+    return (idx, [-h10 * d0, h00 - h11 * d1, h01 + h10 * d0, h11 * d1])
+
+
+class ProbeMap(object):
+    '''ProbeMap(xs, ys, zs) ... probed heights zs[j, i] at the grid positions (xs[i], ys[j]).
+    The grid has to be rectilinear, its spacing may vary along each axis.'''
+
+    def __init__(self, xs, ys, zs):
+        self.xs = numpy.asarray(xs, dtype=float)
+        self.ys = numpy.asarray(ys, dtype=float)
+        self.zs = numpy.asarray(zs, dtype=float)
+        if len(self.xs) < 2 or len(self.ys) < 2:
+            raise ValueError("Probe grid needs at least 2 positions in X and Y, got {} x {}".format(len(self.xs), len(self.ys)))
+        if self.zs.shape != (len(self.ys), len(self.xs)):
+            raise ValueError("Probe heights of shape {} do not match a grid of {} x {}".format(self.zs.shape, len(self.xs), len(self.ys)))
+        if numpy.any(numpy.diff(self.xs) <= 0) or numpy.any(numpy.diff(self.ys) <= 0):
+            raise ValueError("Probe grid positions have to be strictly increasing")
+
+    @classmethod
+    def fromPoints(cls, points):
+        '''fromPoints(points) ... return the map of the probe points, which have to cover every
+        position of their grid exactly once.'''
+        points = numpy.asarray(points, dtype=float).reshape(-1, 3)
+        (xs, ix) = numpy.unique(points[:, 0], return_inverse=True)
+        (ys, iy) = numpy.unique(points[:, 1], return_inverse=True)
+        counts = numpy.bincount(iy * len(xs) + ix, minlength=len(xs) * len(ys))
+        if numpy.any(counts != 1):
+            missing = numpy.count_nonzero(counts == 0)
+            repeated = numpy.count_nonzero(counts > 1)
+            raise ValueError("Probe points do not form a regular grid of {} x {}: {} positions missing, {} probed more than once".format(len(xs), len(ys), missing, repeated))
+        zs = numpy.empty((len(ys), len(xs)))
+        zs[iy, ix] = points[:, 2]
+        return cls(xs, ys, zs)
+
+    @classmethod
+    def fromFile(cls, filename, decimals=2):
+        '''fromFile(filename, decimals=2) ... return the map of the probe file, see readProbeFile.'''
+        return cls.fromPoints(readProbeFile(filename, decimals))
+
+    def points(self):
+        '''points() ... return the probe points as an array of shape (rows, columns, 3) ordered by Y then X.'''
+        (x, y) = numpy.meshgrid(self.xs, self.ys)
+        return numpy.dstack((x, y, self.zs))
+
+    def outside(self, x, y, tolerance=1e-6):
+        '''outside(x, y, tolerance=1e-6) ... return for all positions if they lie outside of the probed area.'''
+        x = numpy.asarray(x, dtype=float)
+        y = numpy.asarray(y, dtype=float)
+        return (x < self.xs[0] - tolerance) | (x > self.xs[-1] + tolerance) | (y < self.ys[0] - tolerance) | (y > self.ys[-1] + tolerance)
+
+    def interpolate(self, x, y, method=Bilinear):
+        '''interpolate(x, y, method=Bilinear) ... return the interpolated heights at all positions.
+        Bicubic interpolation is smooth across the grid lines, both pass through the probed heights.
+        Positions outside the grid get the height of the nearest border position.'''
+        x = numpy.asarray(x, dtype=float)
+        y = numpy.asarray(y, dtype=float)
+        weights = _cubicWeights if method == Bicubic else _linearWeights
+        (ix, wx) = weights(self.xs, x)
+        (iy, wy) = weights(self.ys, y)
+        z = numpy.zeros(numpy.broadcast(x, y).shape)
+        for (j, v) in zip(iy, wy):
+            for (i, u) in zip(ix, wx):
+                z += v * u * self.zs[j, i]
+        return z
@@ -36,6 +36,7 @@ import PathScripts
 import PathScripts.PathLog as PathLog
 import PathScripts.PathUtil as PathUtil
 import PathScripts.PathPreferences as PathPreferences
+import PathScripts.PathStatistics as PathStatistics
 from collections import Counter
 from datetime import datetime
 import os
@@ -259,12 +260,15 @@ class CommandPathSanity:
         zMaxLabel = translate("Path_Sanity", "Maximum Z Height")
         cycleTimeLabel = translate("Path_Sanity", "Cycle Time")
         coolantLabel = translate("Path_Sanity", "Coolant")
+        feedDistanceLabel = translate("Path_Sanity", "Feed Distance")
+        rapidDistanceLabel = translate("Path_Sanity", "Rapid Distance")
         jobTotalLabel = translate("Path_Sanity", "TOTAL JOB")
 
         d = data['runData']
 
         runTable += "|*" + opLabel + "*|*" + zMinLabel + "*|*" + zMaxLabel + \
-            "*|*" + coolantLabel + "*|*" + cycleTimeLabel + "*\n"
+            "*|*" + coolantLabel + "*|*" + cycleTimeLabel + \
+            "*|*" + feedDistanceLabel + "*|*" + rapidDistanceLabel + "*\n"
 
         for i in d['items']:
             runTable += "|{}".format(i['opName'])
@@ -272,11 +276,15 @@ class CommandPathSanity:
             runTable += "|{}".format(i['maxZ'])
             runTable += "|{}".format(i['coolantMode'])
             runTable += "|{}".format(i['cycleTime'])
+            runTable += "|{}".format(i['feedDistance'])
+            runTable += "|{}".format(i['rapidDistance'])
 
-        runTable += "|*" + jobTotalLabel + "* |{} |{} |{}".format(
+        runTable += "|*" + jobTotalLabel + "* |{} |{} | |{} |{} |{}".format(
             d['jobMinZ'],
             d['jobMaxZ'],
-            d['cycletotal'])
+            d['cycletotal'],
+            d['jobFeedDistance'],
+            d['jobRapidDistance'])
 
         # Generate the markup for the Tool Data Section
         toolTables = ""
@@ -308,6 +316,8 @@ class CommandPathSanity:
             toolTables += "|*{}* 2+| {}\n".format(inspectionNotesLabel, value['inspectionNotes'])
             toolTables += "|*{}* 2+| {}\n".format(shapeLabel, value['shape'])
             toolTables += "|*{}* 2+| {}\n".format(diameterLabel, value['diameter'])
+            toolTables += "|*{}* 2+| {}\n".format(cycleTimeLabel, value['cycleTime'])
+            toolTables += "|*{}* 2+| {}\n".format(feedDistanceLabel, value['feedDistance'])
             toolTables += "|===\n"
 
             toolTables += "|===\n"
@@ -431,6 +441,11 @@ class CommandPathSanity:
         Returns a dictionary of sections
         """
         data = {}
+        try:
+            self.statistics = PathStatistics.jobStatistics(obj)
+        except Exception as e:
+            self.statistics = None
+            self.squawk("PathSanity(__summarize)", e, squawkType="CAUTION")
         data['baseData'] = self.__baseObjectData(obj)
         data['designData'] = self.__designData(obj)
         data['toolData'] = self.__toolData(obj)
@@ -517,6 +532,9 @@ class CommandPathSanity:
         data = {}
 
         try:
+            usage = {}
+            if self.statistics is not None:
+                usage = self.statistics.toolUsage(PathPreferences.cycleTimeAcceleration())
             for TC in obj.Tools.Group:
                 if not hasattr(TC.Tool, 'BitBody'):
                     self.squawk("PathSanity",
@@ -537,6 +555,10 @@ class CommandPathSanity:
                 tooldata['inspectionNotes'] = ""
                 tooldata['diameter'] = str(TC.Tool.Diameter)
                 tooldata['shape'] = TC.Tool.ShapeName
+                toolUsage = usage.get(TC.ToolNumber)
+                tooldata['cycleTime'] = PathStatistics.formatTime(toolUsage.time if toolUsage else 0)
+                tooldata['feedDistance'] = FreeCAD.Units.Quantity(toolUsage.feedDistance if toolUsage else 0,
+                        FreeCAD.Units.Length).UserString
 
                 tooldata['partNumber'] = ""
                 imagedata = TC.Tool.Proxy.getBitThumbnail(TC.Tool)
@@ -584,13 +606,24 @@ class CommandPathSanity:
         data = {'cycletotal': '',
                 'jobMinZ': '',
                 'jobMaxZ': '',
+                'jobFeedDistance': '',
+                'jobRapidDistance': '',
                 'jobDescription': '',
                 'items': []}
         try:
-            data['cycletotal'] = str(obj.CycleTime)
-            data['jobMinZ'] = FreeCAD.Units.Quantity(obj.Path.BoundBox.ZMin,
+            stats = self.statistics
+            acceleration = PathPreferences.cycleTimeAcceleration()
+            usage = stats.blockUsage(acceleration)
+            data['cycletotal'] = PathStatistics.formatTime(stats.cycleTime(acceleration))
+            bb = stats.boundBox()
+            if bb.isValid():
+                data['jobMinZ'] = FreeCAD.Units.Quantity(bb.ZMin,
+                        FreeCAD.Units.Length).UserString
+                data['jobMaxZ'] = FreeCAD.Units.Quantity(bb.ZMax,
+                        FreeCAD.Units.Length).UserString
+            data['jobFeedDistance'] = FreeCAD.Units.Quantity(stats.feedDistance(),
                     FreeCAD.Units.Length).UserString
-            data['jobMaxZ'] = FreeCAD.Units.Quantity(obj.Path.BoundBox.ZMax,
+            data['jobRapidDistance'] = FreeCAD.Units.Quantity(stats.rapidDistance(),
                     FreeCAD.Units.Length).UserString
             data['jobDescription'] = obj.Description
 
@@ -598,20 +631,24 @@ class CommandPathSanity:
             for op in obj.Operations.Group:
 
                 oplabel = op.Label
-                ctime = op.CycleTime if hasattr(op, "CycleTime") else 0.0
                 cool = op.CoolantMode if hasattr(op, "CoolantMode") else "N/A"
 
                 o = op
                 while len(o.ViewObject.claimChildren()) != 0:  # dressup
                     oplabel = "{}:{}".format(oplabel, o.Base.Label)
                     o = o.Base
-                    if hasattr(o, 'CycleTime'):
-                        ctime = o.CycleTime
                     cool = o.CoolantMode if hasattr(o, "CoolantMode") else cool
 
-                if hasattr(op, 'Active') and not op.Active:
+                ctime = 0.0
+                feedDistance = 0.0
+                rapidDistance = 0.0
+                block = stats.blockIndex(op)
+                if block is None:
                     oplabel = "{} (INACTIVE)".format(oplabel)
-                    ctime = 0.0
+                elif block in usage:
+                    ctime = PathStatistics.formatTime(usage[block].time)
+                    feedDistance = usage[block].feedDistance
+                    rapidDistance = usage[block].rapidDistance
 
                 if op.Path.BoundBox.isValid():
                     zmin = FreeCAD.Units.Quantity(op.Path.BoundBox.ZMin,
@@ -626,6 +663,10 @@ class CommandPathSanity:
                           "minZ": zmin,
                           "maxZ": zmax,
                           "cycleTime": ctime,
+                          "feedDistance": FreeCAD.Units.Quantity(feedDistance,
+                              FreeCAD.Units.Length).UserString,
+                          "rapidDistance": FreeCAD.Units.Quantity(rapidDistance,
+                              FreeCAD.Units.Length).UserString,
                           "coolantMode": cool}
                 data['items'].append(opdata)
 
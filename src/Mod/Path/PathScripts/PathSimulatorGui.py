@@ -74,6 +74,7 @@ class PathSimulation:
         self.numCommands = 0
         self.simperiod = 20
         self.accuracy = 0.1
+        self.batchSize = 100
         self.resetSimulation = False
 
     def Connect(self, but, sig):
@@ -273,6 +274,15 @@ class PathSimulation:
             return
         self.busy = True
 
+        # without animation a batch of commands is applied per timer tick
+        for i in range(self.batchSize if self.disableAnim else 1):  # pylint: disable=unused-variable
+            if not self.ApplyVoxelCommand():
+                return
+        self.UpdateProgress()
+        self.busy = False
+
+    def ApplyVoxelCommand(self):
+        '''ApplyVoxelCommand() ... apply the next command to the voxel stock, return False once the simulation ended.'''
         cmd = self.opCommands[self.icmd]
         # for cmd in job.Path.Commands:
         if cmd.Name in ['G0', 'G1', 'G2', 'G3']:
@@ -298,15 +308,14 @@ class PathSimulation:
                     (self.cutMaterial.Mesh, self.cutMaterialIn.Mesh) = self.voxSim.GetResultMesh()
         self.icmd += 1
         self.iprogress += 1
-        self.UpdateProgress()
         if self.icmd >= len(self.opCommands):
             self.ioperation += 1
             if self.ioperation >= len(self.activeOps):
                 self.EndSimulation()
-                return
+                return False
             else:
                 self.SetupOperation(self.ioperation)
-        self.busy = False
+        return True
 
     def PerformCut(self):
         if (self.isVoxel):
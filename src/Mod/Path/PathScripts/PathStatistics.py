@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import FreeCAD
+import PathScripts.PathLog as PathLog
+import PathScripts.PathUtil as PathUtil
+import math
+import numpy
+import time
+
+__title__ = "Path Statistics"
+__author__ = "FreeCAD developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Converts the commands of paths into a table of segments and computes cycle time, distances, bounding box and usage breakdowns from it."
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+MotionRapid = 0
+MotionFeed = 1
+MotionArcCW = 2
+MotionArcCCW = 3
+
+CmdMoveRapid = ['G0', 'G00']
+CmdMoveStraight = ['G1', 'G01']
+CmdMoveCW = ['G2', 'G02']
+CmdMoveCCW = ['G3', 'G03']
+CmdDrill = ['G73', 'G81', 'G82', 'G83', 'G84', 'G85', 'G86', 'G87', 'G88', 'G89']
+
+# columns of the segment rows, start and end points followed by the arc center
+Columns = 11
+
+
+def formatTime(seconds):
+    '''formatTime(seconds) ... return seconds as HH:MM:SS string, as used for the CycleTime properties.'''
+    return time.strftime("%H:%M:%S", time.gmtime(seconds))
+
+
+class Block(object):
+    '''The rates and tool of the commands of one path, usually an operation.
+    Rapid rates fall back to the feed rates if they are not set, like Path.getCycleTime() does.'''
+
+    def __init__(self, label, tool, hFeed, vFeed, hRapid, vRapid, obj=None):
+        self.label = label
+        self.tool = tool
+        self.hFeed = hFeed
+        self.vFeed = vFeed
+        self.hRapid = hRapid if hRapid else hFeed
+        self.vRapid = vRapid if vRapid else vFeed
+        self.obj = obj
+
+    @classmethod
+    def fromToolController(cls, label, tc, obj=None):
+        if tc is None:
+            return cls(label, 0, 0.0, 0.0, 0.0, 0.0, obj)
+        return cls(label, tc.ToolNumber, tc.HorizFeed.Value, tc.VertFeed.Value, tc.HorizRapid.Value, tc.VertRapid.Value, obj)
+
+
+class Usage(object):
+    '''Time and distances accumulated over a group of segments.'''
+
+    def __init__(self, seconds, feedDistance, rapidDistance, segments):
+        self.time = seconds
+        self.feedDistance = feedDistance
+        self.rapidDistance = rapidDistance
+        self.segments = segments
+
+    def __repr__(self):
+        return "Usage({}, {:.3f}, {:.3f}, {})".format(formatTime(self.time), self.feedDistance, self.rapidDistance, self.segments)
+
+
+class SegmentTable(object):
+    '''SegmentTable(items, start=(0, 0, 0)) ... columnar table of all moves of items, a list of (path, block) tuples.
+    The commands are converted once, each move becomes one row holding its start and end point, arc center,
+    motion type, commanded feed and block index. Consecutive paths continue from the end of the previous one.
+    Canned drill cycles are broken up into their rapid and feed moves.
+    All statistics are computed from these columns with numpy.'''
+
+    def __init__(self, items, start=(0, 0, 0)):
+        self.blocks = []
+        rows = []
+        pos = tuple(start)
+        for (path, block) in items:
+            pos = self._addCommands(rows, path.Commands, len(self.blocks), pos)
+            self.blocks.append(block)
+
+        table = numpy.array(rows, dtype=float).reshape(-1, Columns)
+        self.start = table[:, 0:3]
+        self.end = table[:, 3:6]
+        self.center = table[:, 6:8]
+        self.motion = table[:, 8].astype(int)
+        self.feed = table[:, 9]
+        self.block = table[:, 10].astype(int)
+        self._lengths = None
+
+    def _addCommands(self, rows, commands, block, pos):
+        feed = 0.0
+        retractToInitial = True
+        for cmd in commands:
+            name = cmd.Name
+            params = cmd.Parameters
+            if 'F' in params:
+                feed = params['F']
+            if name in CmdMoveRapid or name in CmdMoveStraight:
+                nxt = (params.get('X', pos[0]), params.get('Y', pos[1]), params.get('Z', pos[2]))
+                motion = MotionRapid if name in CmdMoveRapid else MotionFeed
+                rows.append(pos + nxt + (0.0, 0.0, motion, feed, block))
+                pos = nxt
+            elif name in CmdMoveCW or name in CmdMoveCCW:
+                nxt = (params.get('X', pos[0]), params.get('Y', pos[1]), params.get('Z', pos[2]))
+                center = (pos[0] + params.get('I', 0.0), pos[1] + params.get('J', 0.0))
+                motion = MotionArcCW if name in CmdMoveCW else MotionArcCCW
+                rows.append(pos + nxt + center + (motion, feed, block))
+                pos = nxt
+            elif name in ['G98', 'G99']:
+                retractToInitial = name == 'G98'
+            elif name in CmdDrill:
+                x = params.get('X', pos[0])
+                y = params.get('Y', pos[1])
+                z = params.get('Z', pos[2])
+                r = params.get('R', pos[2])
+                retract = max(pos[2], r) if retractToInitial else r
+                moves = [(MotionRapid, (x, y, pos[2])), (MotionRapid, (x, y, r)), (MotionFeed, (x, y, z)), (MotionRapid, (x, y, retract))]
+                for (motion, nxt) in moves:
+                    rows.append(pos + nxt + (0.0, 0.0, motion, feed, block))
+                    pos = nxt
+        return pos
+
+    def __len__(self):
+        return len(self.motion)
+
+    def isArc(self):
+        return self.motion >= MotionArcCW
+
+    def isRapid(self):
+        return self.motion == MotionRapid
+
+    def arcs(self):
+        '''arcs() ... return (indices, radius, start angle, sweep) of all arcs. The sweep is positive,
+        arcs ending where they start are full circles.'''
+        idx = numpy.flatnonzero(self.isArc())
+        s = self.start[idx, 0:2] - self.center[idx]
+        e = self.end[idx, 0:2] - self.center[idx]
+        radius = numpy.hypot(s[:, 0], s[:, 1])
+        a0 = numpy.arctan2(s[:, 1], s[:, 0])
+        a1 = numpy.arctan2(e[:, 1], e[:, 0])
+        ccw = self.motion[idx] == MotionArcCCW
+        sweep = numpy.mod(numpy.where(ccw, a1 - a0, a0 - a1), 2 * math.pi)
+        sweep[sweep < 1e-9] = 2 * math.pi
+        return (idx, radius, a0, sweep)
+
+    def lengths(self):
+        '''lengths() ... return the length of each segment, helical arcs included.'''
+        if self._lengths is None:
+            self._lengths = numpy.linalg.norm(self.end - self.start, axis=1)
+            (idx, radius, _, sweep) = self.arcs()
+            if len(idx):
+                self._lengths[idx] = numpy.hypot(radius * sweep, self.end[idx, 2] - self.start[idx, 2])
+        return self._lengths
+
+    def rates(self):
+        '''rates() ... return the rate of each segment from its block, vertical rates apply to any
+        segment changing Z - same as Path.getCycleTime().'''
+        def column(attr):
+            return numpy.array([getattr(b, attr) for b in self.blocks], dtype=float).reshape(-1)[self.block]
+        vertical = self.start[:, 2] != self.end[:, 2]
+        rapid = self.isRapid()
+        horizontal = numpy.where(rapid, column('hRapid'), column('hFeed'))
+        return numpy.where(vertical, numpy.where(rapid, column('vRapid'), column('vFeed')), horizontal)
+
+    def _directions(self):
+        '''_directions() ... return the unit directions of all segments at their start and end.'''
+        d = self.end - self.start
+        length = numpy.linalg.norm(d, axis=1)
+        d = numpy.divide(d, length[:, None], out=numpy.zeros_like(d), where=length[:, None] > 0)
+        entering = d.copy()
+        leaving = d
+        (idx, _, a0, sweep) = self.arcs()
+        if len(idx):
+            sign = numpy.where(self.motion[idx] == MotionArcCCW, 1.0, -1.0)
+            a1 = a0 + sign * sweep
+            entering[idx] = numpy.column_stack((-sign * numpy.sin(a0), sign * numpy.cos(a0), numpy.zeros(len(idx))))
+            leaving[idx] = numpy.column_stack((-sign * numpy.sin(a1), sign * numpy.cos(a1), numpy.zeros(len(idx))))
+        return (entering, leaving)
+
+    def times(self, acceleration=None):
+        '''times(acceleration=None) ... return the time in seconds for each segment.
+        Without acceleration every segment runs at its rate. Otherwise each segment accelerates and
+        decelerates at acceleration (mm/s^2) between its junction speeds. The junction speed is the lower
+        rate of the two segments scaled by the cosine of the angle between them, the machine stops at
+        corners of 90 degrees and more and between blocks.'''
+        lengths = self.lengths()
+        rates = self.rates()
+        times = numpy.zeros(len(lengths))
+        moving = numpy.flatnonzero((lengths > 0) & (rates > 0))
+        if not len(moving):
+            return times
+        length = lengths[moving]
+        rate = rates[moving]
+        if not acceleration:
+            times[moving] = length / rate
+            return times
+
+        (entering, leaving) = self._directions()
+        cos = numpy.einsum('ij,ij->i', leaving[moving[:-1]], entering[moving[1:]])
+        continuous = self.block[moving[:-1]] == self.block[moving[1:]]
+        junction = numpy.where(continuous, numpy.minimum(rate[:-1], rate[1:]) * numpy.clip(cos, 0.0, 1.0), 0.0)
+        vi = numpy.concatenate(([0.0], junction))
+        ve = numpy.concatenate((junction, [0.0]))
+
+        a = float(acceleration)
+        accelerate = (rate * rate - vi * vi) / (2 * a)
+        decelerate = (rate * rate - ve * ve) / (2 * a)
+        cruise = length - accelerate - decelerate
+        peak = numpy.sqrt((2 * a * length + vi * vi + ve * ve) / 2)
+        reachable = peak >= numpy.maximum(vi, ve)
+        # segments too short to change between their junction speeds keep a constant acceleration
+        constant = numpy.divide(2 * length, vi + ve, out=numpy.zeros_like(length), where=(vi + ve) > 0)
+        times[moving] = numpy.where(cruise >= 0,
+                                    (2 * rate - vi - ve) / a + numpy.maximum(cruise, 0) / rate,
+                                    numpy.where(reachable, (2 * peak - vi - ve) / a, constant))
+        return times
+
+    def cycleTime(self, acceleration=None):
+        '''cycleTime(acceleration=None) ... return the total time in seconds.'''
+        return float(numpy.sum(self.times(acceleration)))
+
+    def feedDistance(self, mask=None):
+        return float(numpy.sum(self.lengths()[self._select(~self.isRapid(), mask)]))
+
+    def rapidDistance(self, mask=None):
+        return float(numpy.sum(self.lengths()[self._select(self.isRapid(), mask)]))
+
+    def _select(self, selection, mask):
+        if mask is None:
+            return selection
+        return selection & mask
+
+    def boundBox(self, mask=None):
+        '''boundBox(mask=None) ... return the bounding box of the segments selected by mask, including
+        the extreme points of arcs.'''
+        selected = numpy.ones(len(self), dtype=bool) if mask is None else mask
+        points = [self.end[selected]]
+        first = numpy.flatnonzero(selected)[:1]
+        if len(first):
+            points.append(self.start[first])
+        (idx, radius, a0, sweep) = self.arcs()
+        ccw = self.motion[idx] == MotionArcCCW
+        for quadrant in range(4):
+            angle = quadrant * math.pi / 2
+            offset = numpy.mod(numpy.where(ccw, angle - a0, a0 - angle), 2 * math.pi)
+            hit = (offset <= sweep) & selected[idx]
+            if numpy.any(hit):
+                center = self.center[idx[hit]]
+                z = self.start[idx[hit], 2]
+                r = radius[hit]
+                points.append(numpy.column_stack((center[:, 0] + r * math.cos(angle), center[:, 1] + r * math.sin(angle), z)))
+        points = numpy.concatenate(points)
+        if not len(points):
+            return FreeCAD.BoundBox()
+        lo = points.min(axis=0)
+        hi = points.max(axis=0)
+        return FreeCAD.BoundBox(lo[0], lo[1], lo[2], hi[0], hi[1], hi[2])
+
+    def breakdown(self, keys, mask=None, acceleration=None):
+        '''breakdown(keys, mask=None, acceleration=None) ... return a dictionary mapping each of the
+        distinct keys, one per segment, to the Usage of its segments. Segments not in mask are ignored.'''
+        keys = numpy.asarray(keys)
+        times = self.times(acceleration)
+        lengths = self.lengths()
+        rapid = self.isRapid()
+        if mask is not None:
+            keys = keys[mask]
+            times = times[mask]
+            lengths = lengths[mask]
+            rapid = rapid[mask]
+        (unique, inverse) = numpy.unique(keys, return_inverse=True)
+        count = len(unique)
+        timeSum = numpy.bincount(inverse, times, count)
+        feedSum = numpy.bincount(inverse, numpy.where(rapid, 0.0, lengths), count)
+        rapidSum = numpy.bincount(inverse, numpy.where(rapid, lengths, 0.0), count)
+        segments = numpy.bincount(inverse, None, count)
+        return {unique[i].item(): Usage(timeSum[i], feedSum[i], rapidSum[i], int(segments[i])) for i in range(count)}
+
+    def blockUsage(self, acceleration=None):
+        '''blockUsage(acceleration=None) ... return the Usage of each block, by block index.'''
+        return self.breakdown(self.block, None, acceleration)
+
+    def toolUsage(self, acceleration=None):
+        '''toolUsage(acceleration=None) ... return the Usage of each tool, by tool number.'''
+        tools = numpy.array([b.tool for b in self.blocks], dtype=int).reshape(-1)
+        return self.breakdown(tools[self.block], None, acceleration)
+
+    def feedUsage(self, acceleration=None):
+        '''feedUsage(acceleration=None) ... return the Usage of the feed moves by their commanded feed.'''
+        return self.breakdown(self.feed, ~self.isRapid(), acceleration)
+
+    def depthUsage(self, acceleration=None, decimals=3):
+        '''depthUsage(acceleration=None, decimals=3) ... return the Usage of the horizontal feed moves
+        by their depth.'''
+        level = (self.start[:, 2] == self.end[:, 2]) & ~self.isRapid()
+        return self.breakdown(numpy.round(self.end[:, 2], decimals), level, acceleration)
+
+    def blockIndex(self, obj):
+        '''blockIndex(obj) ... return the index of the block created for obj, or None.'''
+        for i, block in enumerate(self.blocks):
+            if block.obj == obj:
+                return i
+        return None
+
+
+def pathStatistics(path, tc, label=''):
+    '''pathStatistics(path, tc, label='') ... return the SegmentTable of path using the rates of tool controller tc.'''
+    return SegmentTable([(path, Block.fromToolController(label, tc))])
+
+
+def jobStatistics(job):
+    '''jobStatistics(job) ... return the SegmentTable of all active operations of job, one block per operation.'''
+    items = []
+    for op in job.Operations.Group:
+        if PathUtil.opProperty(op, 'Active') is False:
+            continue
+        tc = PathUtil.toolControllerForOp(op)
+        items.append((op.Path, Block.fromToolController(op.Label, tc, op)))
+    return SegmentTable(items)
@@ -0,0 +1,429 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathLog as PathLog
+import PathScripts.PathStatistics as PathStatistics
+import PathScripts.PathUtil as PathUtil
+import math
+import numpy
+
+# lazily loaded modules
+from lazy_loader.lazy_loader import LazyLoader
+Mesh = LazyLoader('Mesh', globals(), 'Mesh')
+PathDropCutter = LazyLoader('PathScripts.PathDropCutter', globals(), 'PathScripts.PathDropCutter')
+PathSurfaceSupport = LazyLoader('PathScripts.PathSurfaceSupport', globals(), 'PathScripts.PathSurfaceSupport')
+
+__title__ = "Path Stock Simulation"
+__author__ = "FreeCAD developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Headless height map simulation of the material removed by the commands of a job, with incremental meshing and gouge detection."
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+DefaultBlockSize = 32
+# upper limit of (sample, cell) pairs processed at once
+MaxPairs = 1 << 22
+
+
+class StockSimulation(object):
+    '''StockSimulation(xmin, ymin, zmin, xmax, ymax, zmax, resolution, tolerance=None, blockSize=DefaultBlockSize)
+    The stock is a height map with one height per cell of resolution size. Every move lowers the cells
+    under the cutter to the cutter surface. Cells are grouped into square blocks of blockSize cells, only
+    blocks with cells lowered since the last updateMesh() are meshed again, each with the coarsest grid
+    which deviates less than tolerance from its heights. Block borders are meshed at full resolution, so
+    the blocks and the walls form a closed mesh.
+    If a model is set, cells cut below the model surface are reported as gouges, cuts by rapid moves
+    are always reported.'''
+
+    def __init__(self, xmin, ymin, zmin, xmax, ymax, zmax, resolution, tolerance=None, blockSize=DefaultBlockSize):
+        self.resolution = float(resolution)
+        self.tolerance = self.resolution / 10 if tolerance is None else float(tolerance)
+        self.blockSize = int(blockSize)
+        self.bounds = (xmin, ymin, zmin, xmax, ymax, zmax)
+        nx = max(1, int(math.ceil((xmax - xmin) / self.resolution)))
+        ny = max(1, int(math.ceil((ymax - ymin) / self.resolution)))
+        self.xs = xmin + (numpy.arange(nx) + 0.5) * self.resolution
+        self.ys = ymin + (numpy.arange(ny) + 0.5) * self.resolution
+        self.heights = numpy.full((ny, nx), float(zmax))
+        self.blocks = (-(-ny // self.blockSize), -(-nx // self.blockSize))
+        self.dirty = numpy.ones(self.blocks, dtype=bool)
+        self.tiles = {}
+        self.cutter = None
+        self.label = ''
+        self.position = (0.0, 0.0, float(zmax))
+        self.model = None
+        self.gougeSource = numpy.full(self.heights.size, -1, dtype=int)
+        self.rapidCuts = {}
+        self.sources = []
+
+    @classmethod
+    def fromBoundBox(cls, bb, resolution, tolerance=None, blockSize=DefaultBlockSize):
+        return cls(bb.XMin, bb.YMin, bb.ZMin, bb.XMax, bb.YMax, bb.ZMax, resolution, tolerance, blockSize)
+
+    def setCutter(self, cutter, label=''):
+        '''setCutter(cutter, label='') ... set the PathDropCutter cutter used by all following moves,
+        label names the operation in the reports.'''
+        self.cutter = cutter
+        self.label = label
+
+    def setModel(self, triangles):
+        '''setModel(triangles) ... set the (n, 3, 3) triangles of the model for the gouge detection.'''
+        (x, y) = numpy.meshgrid(self.xs, self.ys)
+        xy = numpy.column_stack((x.ravel(), y.ravel()))
+        probe = PathDropCutter.CylCutter(self.resolution / 100, 1.0)
+        self.model = PathDropCutter.dropCutter(triangles, probe, xy, -numpy.inf)
+
+    def applyPath(self, path):
+        '''applyPath(path) ... apply all moves of path, continuing from the current position.'''
+        block = PathStatistics.Block(self.label, 0, 0.0, 0.0, 0.0, 0.0)
+        table = PathStatistics.SegmentTable([(path, block)], self.position)
+        self.applySegments(table)
+
+    def applySegments(self, table):
+        '''applySegments(table) ... apply the moves of a PathStatistics.SegmentTable in batches.'''
+        if not len(table):
+            return
+        if self.cutter is None:
+            raise ValueError("No cutter set for the simulation")
+        self.sources.append(self.label)
+        (points, segment) = self._samples(table)
+        rapid = table.isRapid()[segment]
+
+        # cells within the cutter radius around the cell of the cutter axis
+        res = self.resolution
+        n = int(math.ceil(self.cutter.getRadius() / res)) + 1
+        (dr, dc) = numpy.mgrid[-n:n + 1, -n:n + 1]
+        keep = numpy.hypot(numpy.maximum(numpy.abs(dr) - 1, 0), numpy.maximum(numpy.abs(dc) - 1, 0)) * res <= self.cutter.getRadius()
+        (dr, dc) = (dr[keep], dc[keep])
+
+        # a border of 2n cells saves all range checks, samples further out can't reach the stock
+        (ny, nx) = self.heights.shape
+        row = numpy.floor((points[:, 1] - self.bounds[1]) / res).astype(int)
+        col = numpy.floor((points[:, 0] - self.bounds[0]) / res).astype(int)
+        near = (row >= -n) & (row < ny + n) & (col >= -n) & (col < nx + n)
+        pad = 2 * n
+        work = numpy.full((ny + 2 * pad, nx + 2 * pad), -numpy.inf)
+        work[pad:pad + ny, pad:pad + nx] = self.heights
+        cut = _Cut(self, work, pad, dr, dc, len(self.sources) - 1)
+        batch = max(1, MaxPairs // len(dr))
+        for begin in range(0, len(points), batch):
+            sel = slice(begin, begin + batch)
+            ok = near[sel]
+            cut.apply(points[sel][ok], row[sel][ok], col[sel][ok], rapid[sel][ok])
+        self.heights[:, :] = work[pad:pad + ny, pad:pad + nx]
+        self.position = tuple(table.end[-1])
+
+    def _samples(self, table):
+        '''_samples(table) ... return the tip positions along all segments, no further apart than half
+        the resolution, and the segment of each.'''
+        step = self.resolution / 2
+        lengths = numpy.linalg.norm(table.end[:, 0:2] - table.start[:, 0:2], axis=1)
+        (arcs, radius, a0, sweep) = table.arcs()
+        lengths[arcs] = radius * sweep
+        counts = numpy.maximum(numpy.ceil(lengths / step), 1).astype(int)
+        segment = numpy.repeat(numpy.arange(len(table)), counts)
+        first = numpy.repeat(numpy.cumsum(counts) - counts, counts)
+        t = (numpy.arange(len(segment)) - first + 1) / numpy.repeat(counts, counts)
+        start = table.start[segment]
+        points = start + t[:, None] * (table.end[segment] - start)
+        if len(arcs):
+            # arc samples on the circle, all others on their line
+            isArc = numpy.zeros(len(table), dtype=bool)
+            isArc[arcs] = True
+            pick = isArc[segment]
+            arcOf = numpy.zeros(len(table), dtype=int)
+            arcOf[arcs] = numpy.arange(len(arcs))
+            k = arcOf[segment[pick]]
+            sign = numpy.where(table.motion[arcs] == PathStatistics.MotionArcCCW, 1.0, -1.0)[k]
+            angle = a0[k] + sign * sweep[k] * t[pick]
+            center = table.center[arcs][k]
+            points[pick, 0] = center[:, 0] + radius[k] * numpy.cos(angle)
+            points[pick, 1] = center[:, 1] + radius[k] * numpy.sin(angle)
+        # the tip also cuts where the first segment starts
+        points = numpy.concatenate((table.start[:1], points))
+        segment = numpy.concatenate(([0], segment))
+        return (points, segment)
+
+    def _markDirty(self, row, col):
+        '''_markDirty(row, col) ... mark the blocks containing the cells as changed.'''
+        bs = self.blockSize
+        br = row // bs
+        bc = col // bs
+        self.dirty[br, bc] = True
+        # tiles share their first row and column with the previous tile
+        up = (row % bs == 0) & (br > 0)
+        left = (col % bs == 0) & (bc > 0)
+        self.dirty[br[up] - 1, bc[up]] = True
+        self.dirty[br[left], bc[left] - 1] = True
+        corner = up & left
+        self.dirty[br[corner] - 1, bc[corner] - 1] = True
+
+    def updateMesh(self):
+        '''updateMesh() ... mesh all blocks changed since the last call, return their number.'''
+        changed = numpy.argwhere(self.dirty)
+        for (br, bc) in changed:
+            self.tiles[(br, bc)] = self._tileFacets(br, bc)
+        self.dirty[:] = False
+        return len(changed)
+
+    def _tileFacets(self, br, bc):
+        (ny, nx) = self.heights.shape
+        bs = self.blockSize
+        # tiles share their last row and column with the next tile
+        r0 = br * bs
+        c0 = bc * bs
+        r1 = min(r0 + bs, ny - 1)
+        c1 = min(c0 + bs, nx - 1)
+        h = self.heights[r0:r1 + 1, c0:c1 + 1]
+        if h.shape[0] < 2 or h.shape[1] < 2:
+            return numpy.zeros((0, 3, 3))
+
+        stride = bs
+        while True:
+            ri = _gridIndices(h.shape[0], stride)
+            ci = _gridIndices(h.shape[1], stride)
+            sub = h[numpy.ix_(ri, ci)]
+            if stride == 1 or numpy.max(numpy.abs(_interpolationMatrix(h.shape[0], ri).dot(sub).dot(_interpolationMatrix(h.shape[1], ci).T) - h)) <= self.tolerance:
+                break
+            stride //= 2
+
+        x = self._vertexCoordinates(self.xs, self.bounds[0], self.bounds[3])[c0:c1 + 1]
+        y = self._vertexCoordinates(self.ys, self.bounds[1], self.bounds[4])[r0:r1 + 1]
+
+        def vertex(r, c):
+            return numpy.column_stack((x[c], y[r], h[r, c]))
+
+        # quads on the tile border are fanned out to all cells along the border, so neighbouring tiles and
+        # the walls share their vertices regardless of the grid each tile is meshed with
+        (qi, qj) = [q.ravel() for q in numpy.mgrid[0:len(ri) - 1, 0:len(ci) - 1]]
+        (ra, rb, ca, cb) = (ri[qi], ri[qi + 1], ci[qj], ci[qj + 1])
+        bottom = qi == 0
+        top = qi == len(ri) - 2
+        left = qj == 0
+        right = qj == len(ci) - 2
+        border = bottom | top | left | right
+
+        inner = ~border
+        p00 = vertex(ra[inner], ca[inner])
+        p01 = vertex(ra[inner], cb[inner])
+        p10 = vertex(rb[inner], ca[inner])
+        p11 = vertex(rb[inner], cb[inner])
+        facets = [numpy.stack((p00, p01, p11), axis=1), numpy.stack((p00, p11, p10), axis=1)]
+
+        (ra, rb, ca, cb) = (ra[border], rb[border], ca[border], cb[border])
+        center = numpy.column_stack(((x[ca] + x[cb]) / 2, (y[ra] + y[rb]) / 2,
+                                     (h[ra, ca] + h[ra, cb] + h[rb, ca] + h[rb, cb]) / 4))
+        # counterclockwise around each quad
+        for (r0_, c0_, r1_, c1_, full) in [(ra, ca, ra, cb, bottom[border]), (ra, cb, rb, cb, right[border]),
+                                           (rb, cb, rb, ca, top[border]), (rb, ca, ra, ca, left[border])]:
+            (q, start, end) = _edgeSegments(numpy.column_stack((r0_, c0_)), numpy.column_stack((r1_, c1_)), full)
+            facets.append(numpy.stack((center[q], vertex(start[:, 0], start[:, 1]), vertex(end[:, 0], end[:, 1])), axis=1))
+        return numpy.concatenate(facets)
+
+    def _vertexCoordinates(self, centers, lo, hi):
+        # the outermost vertices lie on the stock boundary
+        coords = centers.copy()
+        coords[0] = lo
+        coords[-1] = hi
+        return coords
+
+    def topFacets(self):
+        '''topFacets() ... return the (n, 3, 3) facets of the stock top, meshing changed blocks first.'''
+        self.updateMesh()
+        if not self.tiles:
+            return numpy.zeros((0, 3, 3))
+        return numpy.concatenate([self.tiles[k] for k in sorted(self.tiles)])
+
+    def facets(self):
+        '''facets() ... return the (n, 3, 3) facets of the closed stock mesh, outward oriented.'''
+        (xmin, ymin, zmin, xmax, ymax, zmax) = self.bounds
+        x = self._vertexCoordinates(self.xs, xmin, xmax)
+        y = self._vertexCoordinates(self.ys, ymin, ymax)
+        h = self.heights
+        walls = [
+            _wallFacets(x, numpy.full(len(x), ymin), h[0, :], zmin, False),
+            _wallFacets(x, numpy.full(len(x), ymax), h[-1, :], zmin, True),
+            _wallFacets(numpy.full(len(y), xmin), y, h[:, 0], zmin, True),
+            _wallFacets(numpy.full(len(y), xmax), y, h[:, -1], zmin, False)]
+        a = (xmin, ymin, zmin)
+        b = (xmax, ymin, zmin)
+        c = (xmax, ymax, zmin)
+        d = (xmin, ymax, zmin)
+        bottom = numpy.array([(a, d, c), (a, c, b)], dtype=float)
+        return numpy.concatenate([self.topFacets()] + walls + [bottom])
+
+    def mesh(self):
+        '''mesh() ... return the closed stock as Mesh.Mesh.'''
+        return Mesh.Mesh(self.facets().reshape(-1, 3).tolist())
+
+    def gouges(self):
+        '''gouges() ... return a dictionary with an entry for each operation which cut into the model,
+        holding the number of cells, the deepest gouge and its position.'''
+        report = {}
+        if self.model is None:
+            return report
+        flat = self.heights.reshape(-1)
+        depth = self.model - flat
+        for source in numpy.unique(self.gougeSource[self.gougeSource >= 0]):
+            cells = numpy.flatnonzero(self.gougeSource == source)
+            worst = cells[numpy.argmax(depth[cells])]
+            (row, col) = divmod(int(worst), self.heights.shape[1])
+            entry = report.setdefault(self.sources[source], {'cells': 0, 'depth': 0.0})
+            entry['cells'] += len(cells)
+            if depth[worst] > entry['depth']:
+                entry['depth'] = float(depth[worst])
+                entry['x'] = float(self.xs[col])
+                entry['y'] = float(self.ys[row])
+        return report
+
+
+class _Cut(object):
+    '''Applies batches of tip positions to the padded work copy of the heights of sim.'''
+
+    def __init__(self, sim, work, pad, dr, dc, source):
+        self.sim = sim
+        self.work = work.reshape(-1)
+        self.pad = pad
+        self.width = work.shape[1]
+        self.offsets = dr * self.width + dc
+        self.ox = dc * sim.resolution
+        self.oy = dr * sim.resolution
+        self.radius2 = sim.cutter.getRadius() ** 2
+        self.source = source
+
+    def apply(self, points, row, col, rapid):
+        sim = self.sim
+        if not len(points):
+            return
+        # position of the cutter axis relative to the center of its cell
+        fx = points[:, 0] - (sim.bounds[0] + (col + 0.5) * sim.resolution)
+        fy = points[:, 1] - (sim.bounds[1] + (row + 0.5) * sim.resolution)
+        r2 = numpy.square(fx[:, None] - self.ox) + numpy.square(fy[:, None] - self.oy)
+        pair = numpy.nonzero(r2 <= self.radius2)
+        cells = ((row + self.pad) * self.width + col + self.pad)[pair[0]] + self.offsets[pair[1]]
+        z = points[pair[0], 2] + sim.cutter.height(numpy.sqrt(r2[pair]))
+        lowered = z < self.work[cells]
+        below = z < self.work[cells] - sim.tolerance
+        if numpy.any(below):
+            hits = below & rapid[pair[0]]
+            if numpy.any(hits):
+                sim.rapidCuts[sim.label] = sim.rapidCuts.get(sim.label, 0) + int(numpy.count_nonzero(hits))
+            if sim.model is not None:
+                self._gouges(cells[below], z[below])
+        numpy.minimum.at(self.work, cells, z)
+        # only blocks with lowered cells are meshed again, the padding is never lowered
+        (r, c) = divmod(numpy.unique(cells[lowered]), self.width)
+        sim._markDirty(r - self.pad, c - self.pad)  # pylint: disable=protected-access
+
+    def _gouges(self, cells, z):
+        sim = self.sim
+        nx = sim.heights.shape[1]
+        (r, c) = divmod(cells, self.width)
+        index = (r - self.pad) * nx + (c - self.pad)
+        gouge = z < sim.model[index] - sim.tolerance
+        fresh = index[gouge][sim.gougeSource[index[gouge]] < 0]
+        sim.gougeSource[fresh] = self.source
+
+
+def _gridIndices(count, stride):
+    '''_gridIndices(count, stride) ... every stride-th index of count, including the last one.'''
+    return numpy.unique(numpy.r_[numpy.arange(0, count, stride), count - 1])
+
+
+def _interpolationMatrix(count, indices):
+    '''_interpolationMatrix(count, indices) ... return the matrix linearly interpolating values at
+    indices to all count positions.'''
+    m = numpy.zeros((count, len(indices)))
+    for k in range(len(indices) - 1):
+        (i0, i1) = (indices[k], indices[k + 1])
+        t = (numpy.arange(i0, i1 + 1) - i0) / float(i1 - i0)
+        m[i0:i1 + 1, k] = 1 - t
+        m[i0:i1 + 1, k + 1] = t
+    if len(indices) == 1:
+        m[:, 0] = 1
+    return m
+
+
+def _edgeSegments(start, end, full):
+    '''_edgeSegments(start, end, full) ... split the edges from the (row, col) start to the (row, col) end into
+    segments of one cell where full is set. Returns the edge of each segment, its start and its end.'''
+    length = numpy.abs(end - start).max(axis=1)
+    direction = numpy.sign(end - start)
+    count = numpy.where(full, length, 1)
+    step = numpy.where(full, 1, length)
+    edge = numpy.repeat(numpy.arange(len(start)), count)
+    k = numpy.arange(len(edge)) - numpy.repeat(numpy.cumsum(count) - count, count)
+    begin = start[edge] + direction[edge] * (k * step[edge])[:, None]
+    return (edge, begin, begin + direction[edge] * step[edge][:, None])
+
+
+def _wallFacets(x, y, h, zmin, reverse):
+    '''_wallFacets(x, y, h, zmin, reverse) ... return the facets of the vertical wall from zmin up to
+    the heights h along the boundary points x, y. The top edge has a vertex at every point, the bottom
+    edge only at its ends, matching the bottom of the stock. Walls face to the right of the boundary
+    direction, reverse flips them.'''
+    top = numpy.column_stack((x, y, h))
+    first = numpy.array([x[0], y[0], zmin])
+    last = numpy.array([x[-1], y[-1], zmin])
+    fan = numpy.stack((numpy.broadcast_to(first, (len(top) - 1, 3)), top[1:], top[:-1]), axis=1)
+    facets = numpy.concatenate((fan, [(first, last, top[-1])]))
+    if reverse:
+        return facets[:, ::-1]
+    return facets
+
+
+def cutterForOperation(op):
+    '''cutterForOperation(op) ... return the PathDropCutter cutter for the tool of op, or None.'''
+    while not hasattr(op, 'ToolController') and hasattr(op, 'Base'):
+        op = op.Base
+    if getattr(op, 'ToolController', None) is None:
+        return None
+    cutter = PathSurfaceSupport.OCL_Tool(PathDropCutter, op).getOclTool()
+    return cutter if cutter else None
+
+
+def simulateJob(job, resolution=None, tolerance=None, progress=None):
+    '''simulateJob(job, resolution=None, tolerance=None, progress=None) ... simulate all active operations
+    of job on its stock and return the StockSimulation. The resolution defaults to 1/500 of the longer
+    stock side. The model is set so the simulation reports gouges. progress is called with the number
+    of operations done and their total, returning False cancels the simulation and returns None.'''
+    bb = job.Stock.Shape.BoundBox
+    if resolution is None:
+        resolution = max(bb.XLength, bb.YLength) / 500
+    sim = StockSimulation.fromBoundBox(bb, resolution, tolerance)
+    sim.position = (0.0, 0.0, bb.ZMax)
+
+    triangles = [PathSurfaceSupport.getShapeTriangles(m.Shape, resolution / 2) for m in job.Model.Group]
+    if triangles:
+        sim.setModel(numpy.concatenate(triangles))
+
+    ops = [op for op in job.Operations.Group if PathUtil.opProperty(op, 'Active') is not False]
+    for (i, op) in enumerate(ops):
+        cutter = cutterForOperation(op)
+        if cutter is None:
+            PathLog.warning("{}: no tool to simulate".format(op.Label))
+        else:
+            sim.setCutter(cutter, op.Label)
+            sim.applyPath(op.Path)
+        if progress is not None and progress(i + 1, len(ops)) is False:
+            return None
+    return sim
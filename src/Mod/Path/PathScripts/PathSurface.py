@@ -32,20 +32,17 @@ __contributors__ = "russ4262 (Russell Johnson)"
 import FreeCAD
 from PySide import QtCore
 
-# OCL must be installed
+# OCL is optional, the built-in drop cutter is used without it
 try:
     import ocl
 except ImportError:
-    msg = QtCore.QCoreApplication.translate("PathSurface",
-        "This operation requires OpenCamLib to be installed.")
-    FreeCAD.Console.PrintError(msg + "\n")
-    raise ImportError
-    # import sys
-    # sys.exit(msg)
+    ocl = None
 
 import Path
+import PathScripts.PathDropCutter as PathDropCutter
 import PathScripts.PathLog as PathLog
 import PathScripts.PathUtils as PathUtils
+import PathScripts.PathHeightMap as PathHeightMap
 import PathScripts.PathOp as PathOp
 import PathScripts.PathSurfaceSupport as PathSurfaceSupport
 import time
@@ -139,6 +136,8 @@ class ObjectSurface(PathOp.ObjectOp):
             ("App::PropertyFloat", "StopIndex", "Rotation",
                 QtCore.QT_TRANSLATE_NOOP("App::Property", "Stop index(angle) for rotational scan")),
 
+            ("App::PropertyEnumeration", "DropCutterEngine", "Surface",
+                QtCore.QT_TRANSLATE_NOOP("App::Property", "Drop cutter engine: OpenCamLib, or the built-in engine which does not require OpenCamLib.")),
             ("App::PropertyEnumeration", "ScanType", "Surface",
                 QtCore.QT_TRANSLATE_NOOP("App::Property", "Planar: Flat, 3D surface scan.  Rotational: 4th-axis rotational scan.")),
 
@@ -207,6 +206,7 @@ class ObjectSurface(PathOp.ObjectOp):
             'CutMode': ['Conventional', 'Climb'],
             'CutPattern': ['Circular', 'CircularZigZag', 'Line', 'Offset', 'Spiral', 'ZigZag'],  # Additional goals ['Offset', 'ZigZagOffset', 'Grid', 'Triangle']
             'DropCutterDir': ['X', 'Y'],
+            'DropCutterEngine': PathDropCutter.Engines,
             'HandleMultipleFeatures': ['Collectively', 'Individually'],
             'LayerMode': ['Single-pass', 'Multi-pass'],
             'ProfileEdges': ['None', 'Only', 'First', 'Last'],
@@ -230,6 +230,7 @@ class ObjectSurface(PathOp.ObjectOp):
             'ProfileEdges': 'None',
             'LayerMode': 'Single-pass',
             'ScanType': 'Planar',
+            'DropCutterEngine': PathDropCutter.EngineOpenCamLib if ocl else PathDropCutter.EngineBuiltIn,
             'RotationAxis': 'X',
             'CutMode': 'Conventional',
             'CutPattern': 'Line',
@@ -506,7 +507,8 @@ class ObjectSurface(PathOp.ObjectOp):
         self.resetOpVariables()
 
         # Setup cutter for OCL and cutout value for operation - based on tool controller properties
-        oclTool = PathSurfaceSupport.OCL_Tool(ocl, obj)
+        self.ocl = PathDropCutter.getEngine(obj.DropCutterEngine, ocl)
+        oclTool = PathSurfaceSupport.OCL_Tool(self.ocl, obj)
         self.cutter = oclTool.getOclTool()
         if not self.cutter:
             PathLog.error(translate('PathSurface', "Canceling 3D Surface operation. Error creating OCL cutter."))
@@ -602,7 +604,7 @@ class ObjectSurface(PathOp.ObjectOp):
 
             for m in range(0, len(JOB.Model.Group)):
                 # Create OCL.stl model objects
-                PathSurfaceSupport._prepareModelSTLs(self, JOB, obj, m, ocl)
+                PathSurfaceSupport._prepareModelSTLs(self, JOB, obj, m, self.ocl)
 
                 Mdl = JOB.Model.Group[m]
                 if FACES[m]:
@@ -612,7 +614,7 @@ class ObjectSurface(PathOp.ObjectOp):
                         CMDS.append(Path.Command('N (Transition to base: {}.)'.format(Mdl.Label)))
                         CMDS.append(Path.Command('G0', {'Z': obj.ClearanceHeight.Value, 'F': self.vertRapid}))
                     # make stock-model-voidShapes STL model for avoidance detection on transitions
-                    PathSurfaceSupport._makeSafeSTL(self, JOB, obj, m, FACES[m], VOIDS[m], ocl)
+                    PathSurfaceSupport._makeSafeSTL(self, JOB, obj, m, FACES[m], VOIDS[m], self.ocl)
                     # Process model/faces - OCL objects must be ready
                     CMDS.extend(self._processCutAreas(JOB, obj, m, FACES[m], VOIDS[m]))
                 else:
@@ -974,10 +976,10 @@ class ObjectSurface(PathOp.ObjectOp):
     def _planarDropCutScan(self, pdc, A, B):
         (x1, y1) = A
         (x2, y2) = B
-        path = ocl.Path()                   # create an empty path object
-        p1 = ocl.Point(x1, y1, 0)   # start-point of line
-        p2 = ocl.Point(x2, y2, 0)   # end-point of line
-        lo = ocl.Line(p1, p2)     # line-object
+        path = self.ocl.Path()                   # create an empty path object
+        p1 = self.ocl.Point(x1, y1, 0)   # start-point of line
+        p2 = self.ocl.Point(x2, y2, 0)   # end-point of line
+        lo = self.ocl.Line(p1, p2)     # line-object
         path.append(lo)        # add the line to the path
         pdc.setPath(path)
         pdc.run()  # run dropcutter algorithm on path
@@ -986,14 +988,14 @@ class ObjectSurface(PathOp.ObjectOp):
         return PNTS  # pdc.getCLPoints()
 
     def _planarCircularDropCutScan(self, pdc, Arc, cMode):
-        path = ocl.Path()  # create an empty path object
+        path = self.ocl.Path()  # create an empty path object
         (sp, ep, cp) = Arc
 
         # process list of segment tuples (vect, vect)
-        p1 = ocl.Point(sp[0], sp[1], 0)   # start point of arc
-        p2 = ocl.Point(ep[0], ep[1], 0)   # end point of arc
-        C = ocl.Point(cp[0], cp[1], 0)   # center point of arc
-        ao = ocl.Arc(p1, p2, C, cMode)     # arc object
+        p1 = self.ocl.Point(sp[0], sp[1], 0)   # start point of arc
+        p2 = self.ocl.Point(ep[0], ep[1], 0)   # end point of arc
+        C = self.ocl.Point(cp[0], cp[1], 0)   # center point of arc
+        ao = self.ocl.Arc(p1, p2, C, cMode)     # arc object
         path.append(ao)        # add the arc to the path
         pdc.setPath(path)
         pdc.run()  # run dropcutter algorithm on path
@@ -1088,20 +1090,13 @@ class ObjectSurface(PathOp.ObjectOp):
         return GCODE
 
     def _planarSinglepassProcess(self, obj, points):
+        # Convert ocl points list to array for simplification and gcode output
+        pnts = PathHeightMap.pointsToArray(points)
         if obj.OptimizeLinearPaths:
-            points = PathUtils.simplify3dLine(points,
-                    tolerance=obj.LinearDeflection.Value)
-        # Begin processing ocl points list into gcode
-        commands = []
-        for pnt in points:
-            commands.append(
-                Path.Command('G1', {
-                    'X': pnt.x,
-                    'Y': pnt.y,
-                    'Z': pnt.z,
-                    'F': self.horizFeed
-                }))
-        return commands
+            pnts = pnts[PathHeightMap.simplifyPoints(pnts,
+                    tolerance=obj.LinearDeflection.Value)]
+        # Begin processing ocl points array into gcode
+        return PathHeightMap.linearMoveCommands(pnts, self.horizFeed)
 
     def _planarDropCutMulti(self, JOB, obj, pdc, safePDC, depthparams, SCANDATA):
         GCODE = [Path.Command('N (Beginning of Multi-pass layers.)', {})]
@@ -1523,7 +1518,7 @@ class ObjectSurface(PathOp.ObjectOp):
                         SCANDATA[s][prt][pt].z += DepthOffset
 
     def _planarGetPDC(self, stl, finalDep, SampleInterval, cutter):
-        pdc = ocl.PathDropCutter()   # create a pdc [PathDropCutter] object
+        pdc = self.ocl.PathDropCutter()   # create a pdc [PathDropCutter] object
         pdc.setSTL(stl)  # add stl model
         pdc.setCutter(cutter)  # add cutter
         pdc.setZ(finalDep)  # set minimumZ (final / target depth value)
@@ -1762,7 +1757,7 @@ class ObjectSurface(PathOp.ObjectOp):
         Lines = []
         result = None
 
-        pdc = ocl.PathDropCutter()   # create a pdc
+        pdc = self.ocl.PathDropCutter()   # create a pdc
         pdc.setCutter(self.cutter)
         pdc.setZ(layDep)  # set minimumZ (final / ta9rget depth value)
         pdc.setSampling(sample)
@@ -1788,31 +1783,31 @@ class ObjectSurface(PathOp.ObjectOp):
 
             # add Line objects to the path in this loop
             if obj.RotationAxis == 'X':
-                p1 = ocl.Point(xmin, cutterOfst, 0.0)   # start-point of line
-                p2 = ocl.Point(xmax, cutterOfst, 0.0)   # end-point of line
+                p1 = self.ocl.Point(xmin, cutterOfst, 0.0)   # start-point of line
+                p2 = self.ocl.Point(xmax, cutterOfst, 0.0)   # end-point of line
             else:
-                p1 = ocl.Point(cutterOfst, ymin, 0.0)   # start-point of line
-                p2 = ocl.Point(cutterOfst, ymax, 0.0)   # end-point of line
+                p1 = self.ocl.Point(cutterOfst, ymin, 0.0)   # start-point of line
+                p2 = self.ocl.Point(cutterOfst, ymax, 0.0)   # end-point of line
 
             # Create line object
             if obj.RotationAxis == obj.DropCutterDir:  # parallel cut
                 if obj.CutPattern == 'ZigZag':
                     if (iCnt % 2 == 0.0):  # even
-                        lo = ocl.Line(p1, p2)
+                        lo = self.ocl.Line(p1, p2)
                     else:  # odd
-                        lo = ocl.Line(p2, p1)
+                        lo = self.ocl.Line(p2, p1)
                 elif obj.CutPattern == 'Line':
                     if self.CutClimb is True:
-                        lo = ocl.Line(p2, p1)
+                        lo = self.ocl.Line(p2, p1)
                     else:
-                        lo = ocl.Line(p1, p2)
+                        lo = self.ocl.Line(p1, p2)
                 else:
                     # default to line-object
-                    lo = ocl.Line(p1, p2)
+                    lo = self.ocl.Line(p1, p2)
             else:
-                lo = ocl.Line(p1, p2)   # line-object
+                lo = self.ocl.Line(p1, p2)   # line-object
 
-            path = ocl.Path()                   # create an empty path object
+            path = self.ocl.Path()                   # create an empty path object
             path.append(lo)         # add the line to the path
             pdc.setPath(path)       # set path
             pdc.run()               # run drop-cutter on the path
@@ -2062,35 +2057,35 @@ class ObjectSurface(PathOp.ObjectOp):
         PathLog.debug('ToolType: {}'.format(obj.ToolController.Tool.ToolType))
         if obj.ToolController.Tool.ToolType == 'EndMill':
             # Standard End Mill
-            return ocl.CylCutter(diam_1, (CEH + lenOfst))
+            return self.ocl.CylCutter(diam_1, (CEH + lenOfst))
 
         elif obj.ToolController.Tool.ToolType == 'BallEndMill' and FR == 0.0:
             # Standard Ball End Mill
             # OCL -> BallCutter::BallCutter(diameter, length)
             self.useTiltCutter = True
-            return ocl.BallCutter(diam_1, (diam_1 / 2 + lenOfst))
+            return self.ocl.BallCutter(diam_1, (diam_1 / 2 + lenOfst))
 
         elif obj.ToolController.Tool.ToolType == 'BallEndMill' and FR > 0.0:
             # Bull Nose or Corner Radius cutter
             # Reference: https://www.fine-tools.com/halbstabfraeser.html
             # OCL -> BallCutter::BallCutter(diameter, length)
-            return ocl.BullCutter(diam_1, FR, (CEH + lenOfst))
+            return self.ocl.BullCutter(diam_1, FR, (CEH + lenOfst))
 
         elif obj.ToolController.Tool.ToolType == 'Engraver' and FR > 0.0:
             # Bull Nose or Corner Radius cutter
             # Reference: https://www.fine-tools.com/halbstabfraeser.html
             # OCL -> ConeCutter::ConeCutter(diameter, angle, lengthOffset)
-            return ocl.ConeCutter(diam_1, (CEA / 2), lenOfst)
+            return self.ocl.ConeCutter(diam_1, (CEA / 2), lenOfst)
 
         elif obj.ToolController.Tool.ToolType == 'ChamferMill':
             # Bull Nose or Corner Radius cutter
             # Reference: https://www.fine-tools.com/halbstabfraeser.html
             # OCL -> ConeCutter::ConeCutter(diameter, angle, lengthOffset)
-            return ocl.ConeCutter(diam_1, (CEA / 2), lenOfst)
+            return self.ocl.ConeCutter(diam_1, (CEA / 2), lenOfst)
         else:
             # Default to standard end mill
             PathLog.warning("Defaulting cutter to standard end mill.")
-            return ocl.CylCutter(diam_1, (CEH + lenOfst))
+            return self.ocl.CylCutter(diam_1, (CEH + lenOfst))
 
     def _getTransitionLine(self, pdc, p1, p2, obj):
         """Use an OCL PathDropCutter to generate a safe transition path between
@@ -34,7 +34,9 @@ import Path
 import PathScripts.PathLog as PathLog
 import PathScripts.PathUtils as PathUtils
 import PathScripts.PathOpTools as PathOpTools
+import collections
 import math
+import numpy
 
 # lazily loaded modules
 from lazy_loader.lazy_loader import LazyLoader
@@ -1216,15 +1218,17 @@ def _makeSafeSTL(self, JOB, obj, mdlIdx, faceShapes, voidShapes, ocl):
         voidEnv = PathUtils.getEnvelope(partshape=voidComp, depthparams=self.depthParams)  # Produces .Shape
         fuseShapes.append(voidEnv)
 
-    fused = Part.makeCompound(fuseShapes)
-
     if self.showDebugObjects:
         T = FreeCAD.ActiveDocument.addObject('Part::Feature', 'safeSTLShape')
-        T.Shape = fused
+        T.Shape = Part.makeCompound(fuseShapes)
         T.purgeTouched()
         self.tempGroup.addObject(T)
 
-    self.safeSTLs[mdlIdx] = _makeSTL(fused, obj, ocl)
+    # Tessellate the shapes one by one, so the model tessellation comes from the cache
+    dfl = obj.LinearDeflection.Value
+    triangles = [getShapeTriangles(fuseShapes[0], dfl)]
+    triangles.extend([getShapeTriangles(shp, dfl, cache=False) for shp in fuseShapes[1:]])
+    self.safeSTLs[mdlIdx] = _trianglesToSTL(numpy.concatenate(triangles), ocl)
 
 
 def _makeSTL(model, obj, ocl, model_type=None):
@@ -1232,19 +1236,25 @@ def _makeSTL(model, obj, ocl, model_type=None):
     tolerance specified in obj.LinearDeflection.
     Returns an ocl.STLSurf()."""
     if model_type == 'M':
-        facets = model.Mesh.Facets.Points
+        (vertices, facet_indices) = model.Mesh.Topology
+        triangles = tessellationToArray(vertices, facet_indices)
     else:
         if hasattr(model, 'Shape'):
             shape = model.Shape
         else:
             shape = model
-        vertices, facet_indices = shape.tessellate(
-            obj.LinearDeflection.Value)
-        facets = ((vertices[f[0]], vertices[f[1]], vertices[f[2]])
-                  for f in facet_indices)
+        triangles = getShapeTriangles(shape, obj.LinearDeflection.Value)
+    return _trianglesToSTL(triangles, ocl)
+
+
+def _trianglesToSTL(triangles, ocl):
+    """Return an ocl.STLSurf() of the (n, 3, 3) triangle array.
+    The built-in drop cutter takes the array in one call."""
     stl = ocl.STLSurf()
-    for tri in facets:
-        v1, v2, v3 = tri
+    if hasattr(stl, 'addTriangles'):
+        stl.addTriangles(triangles)
+        return stl
+    for (v1, v2, v3) in triangles.tolist():
         t = ocl.Triangle(ocl.Point(v1[0], v1[1], v1[2]),
                          ocl.Point(v2[0], v2[1], v2[2]),
                          ocl.Point(v3[0], v3[1], v3[2]))
@@ -1252,6 +1262,70 @@ def _makeSTL(model, obj, ocl, model_type=None):
     return stl
 
 
+def tessellationToArray(vertices, facet_indices):
+    """tessellationToArray(vertices, facet_indices) ... Return the (n, 3, 3) triangle
+    array of a tessellation, as returned by shape.tessellate() or Mesh.Topology."""
+    if len(facet_indices) == 0:
+        return numpy.zeros((0, 3, 3))
+    pnts = numpy.array([(v.x, v.y, v.z) for v in vertices], dtype=float)
+    return pnts[numpy.array(facet_indices, dtype=numpy.int64)]
+
+
+class TessellationCache:
+    """Least recently used cache of shape tessellations as triangle arrays.
+    TessellationCache(size)
+    Entries are keyed by the shape hash code, placement and deflection. A changed
+    model has a new shape and misses the cache, its old entry ages out. Every entry
+    keeps its shape, which is compared with isSame() on a hit."""
+
+    def __init__(self, size=16):
+        self.size = size
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, shape, deflection):
+        return (shape.hashCode(), tuple(shape.Placement.toMatrix().A), deflection)
+
+    def getTriangles(self, shape, deflection):
+        """getTriangles(shape, deflection) ... Return the read only triangle array of
+        the shape tessellation, from the cache if available."""
+        key = self._key(shape, deflection)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0].isSame(shape):
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        triangles = tessellationToArray(*shape.tessellate(deflection))
+        triangles.flags.writeable = False
+        self.entries[key] = (shape, triangles)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return triangles
+
+    def clear(self):
+        self.entries.clear()
+
+
+_tessellationCache = TessellationCache()
+
+
+def getShapeTriangles(shape, deflection, cache=True):
+    """getShapeTriangles(shape, deflection, cache=True) ... Return the (n, 3, 3) triangle array
+    of the shape tessellated with deflection. Model tessellations are shared by all operations
+    through the tessellation cache, cache=False is for temporary shapes."""
+    if cache:
+        return _tessellationCache.getTriangles(shape, deflection)
+    return tessellationToArray(*shape.tessellate(deflection))
+
+
+def clearTessellationCache():
+    """clearTessellationCache() ... Drop all cached model tessellations."""
+    _tessellationCache.clear()
+
+
 # Functions to convert path geometry into line/arc segments for OCL input or directly to g-code
 def pathGeomToLinesPointSet(self, obj, compGeoShp):
     '''pathGeomToLinesPointSet(self, obj, compGeoShp)...
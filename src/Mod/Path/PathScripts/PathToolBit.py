@@ -33,6 +33,7 @@ import zipfile
 # lazily loaded modules
 from lazy_loader.lazy_loader import LazyLoader
 Part = LazyLoader('Part', globals(), 'Part')
+PathToolBitIndex = LazyLoader('PathScripts.PathToolBitIndex', globals(), 'PathScripts.PathToolBitIndex')
 
 __title__ = "Tool bits."
 __author__ = "sliptonic (Brad Collette)"
@@ -244,7 +245,7 @@ class ToolBit(object):
                 doc = FreeCAD.getDocument(d)
                 break
         if doc is None:
-            p = findToolShape(p, path if path else obj.File)
+            p = PathToolBitIndex.defaultIndex().findToolShape(p, path if path else obj.File)
             if not path and p != obj.BitShape:
                 obj.BitShape = p
             PathLog.debug("ToolBit {} using shape file: {}".format(obj.Label, p))
@@ -352,7 +353,7 @@ class ToolBit(object):
 
     def getBitThumbnail(self, obj):
         if obj.BitShape:
-            path = findToolShape(obj.BitShape)
+            path = PathToolBitIndex.defaultIndex().findToolShape(obj.BitShape)
             if path:
                 with open(path, 'rb') as fd:
                     try:
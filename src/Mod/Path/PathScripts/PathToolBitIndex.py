@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import FreeCAD
+import PathScripts.PathLog as PathLog
+import PathScripts.PathPreferences as PathPreferences
+import PathScripts.PathToolBit as PathToolBit
+import json
+import os
+import tempfile
+
+__title__ = "Path Tool Bit Index"
+__author__ = "FreeCAD developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Manifest of tool bit declarations and libraries, validated by file modification times."
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+# bump whenever the layout of the manifest changes
+Version = 1
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return [st.st_mtime, st.st_size]
+
+
+def _diameter(declaration):
+    '''_diameter(declaration) ... return the diameter of the tool bit in mm, or None if it has none.'''
+    value = declaration.get('parameter', {}).get('Diameter')
+    if value is None:
+        return None
+    try:
+        return FreeCAD.Units.Quantity(value).Value
+    except (ValueError, TypeError):
+        return None
+
+
+def shapeType(declaration):
+    '''shapeType(declaration) ... return the name of the bit's shape file without extension, e.g. "endmill".'''
+    return os.path.splitext(os.path.basename(declaration.get('shape', '')))[0]
+
+
+class ToolBitIndex(object):
+    '''ToolBitIndex(path=None) ... index of tool bits, libraries and file lookups, persisted in path.
+    Every entry carries the modification time and size of its file and is re-read once they change.
+    Only the declarations are indexed, the bit and its shape document are loaded by create().'''
+
+    def __init__(self, path=None):
+        self.path = path
+        self.bits = {}
+        self.libraries = {}
+        self.lookups = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        '''load() ... read the manifest, an unreadable or outdated manifest is silently dropped.'''
+        if not self.path or not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path) as fp:
+                data = json.load(fp)
+            if not isinstance(data, dict):
+                raise ValueError("not a tool bit index")
+            if data.get('version') == Version:
+                if not all(isinstance(data[k], dict) for k in ['bits', 'libraries', 'lookups']):
+                    raise ValueError("not a tool bit index")
+                self.bits = data['bits']
+                self.libraries = data['libraries']
+                self.lookups = data['lookups']
+        except (OSError, IOError, ValueError, KeyError, AttributeError) as e:
+            PathLog.warning("Ignoring tool bit index {}: {}".format(self.path, e))
+
+    def save(self):
+        '''save() ... write the manifest if anything changed since it was loaded.'''
+        if not self.path or not self.dirty:
+            return
+        directory = os.path.dirname(self.path)
+        try:
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            (fd, tmp) = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as fp:
+                json.dump({'version': Version, 'bits': self.bits, 'libraries': self.libraries, 'lookups': self.lookups}, fp)
+            os.replace(tmp, self.path)
+            self.dirty = False
+        except (OSError, IOError) as e:
+            PathLog.warning("Could not save tool bit index {}: {}".format(self.path, e))
+
+    def _lookup(self, typ, name, fileName, container, find):
+        # same search order as PathToolBit._findToolFile
+        paths = [os.path.join(os.path.dirname(os.path.dirname(container)), typ)] if container else []
+        paths.extend(PathPreferences.searchPathsTool(typ))
+        key = '|'.join([typ, name] + paths)
+        path = self.lookups.get(key)
+        if path and os.path.isfile(path):
+            for p in paths:
+                candidate = os.path.join(p, fileName)
+                if candidate == path:
+                    return path
+                if os.path.exists(candidate):
+                    # a file of the same name showed up in a directory searched first
+                    path = None
+                    break
+            if path:
+                return path
+        path = find(name, container)
+        if path:
+            self.lookups[key] = path
+            self.dirty = True
+        return path
+
+    def findToolBit(self, name, container=None):
+        '''findToolBit(name, container=None) ... like PathToolBit.findToolBit, previous results are reused while
+        the file exists, the search paths are the same and no file of the same name precedes it.'''
+        fileName = name if name.endswith('.fctb') else "{}.fctb".format(name)
+        return self._lookup('Bit', name, fileName, container, PathToolBit.findToolBit)
+
+    def findToolShape(self, name, container=None):
+        '''findToolShape(name, container=None) ... like PathToolBit.findToolShape, previous results are reused
+        while the file exists, the search paths are the same and no file of the same name precedes it.'''
+        return self._lookup('Shape', name, name, container, PathToolBit.findToolShape)
+
+    def _entry(self, path):
+        stamp = _stamp(path)
+        entry = self.bits.get(path)
+        if entry is None or entry['stamp'] != stamp:
+            declaration = PathToolBit.Declaration(path)
+            entry = {'stamp': stamp, 'declaration': declaration, 'shape': shapeType(declaration), 'diameter': _diameter(declaration)}
+            self.bits[path] = entry
+            self.dirty = True
+        return entry
+
+    def declaration(self, path):
+        '''declaration(path) ... return the declaration of the tool bit file, see PathToolBit.Declaration.'''
+        return self._entry(path)['declaration']
+
+    def libraryTools(self, path):
+        '''libraryTools(path) ... return (nr, name, bitPath, declaration) of all tools of the library.
+        bitPath is None for tools which cannot be found, declaration also for files which cannot be read.'''
+        stamp = _stamp(path)
+        library = self.libraries.get(path)
+        if library is None or library['stamp'] != stamp:
+            with open(path) as fp:
+                tools = json.load(fp)['tools']
+            library = {'stamp': stamp, 'tools': [[tool['nr'], tool['path']] for tool in tools]}
+            self.libraries[path] = library
+            self.dirty = True
+
+        result = []
+        for (nr, name) in library['tools']:
+            bit = self.findToolBit(name, path)
+            declaration = None
+            if bit:
+                try:
+                    declaration = self.declaration(bit)
+                except (OSError, IOError, ValueError) as e:
+                    PathLog.error("Error loading tool: {} : {}".format(bit, e))
+            result.append((nr, name, bit, declaration))
+        return result
+
+    def scan(self, directories=None):
+        '''scan(directories=None) ... index all tool bit files in the directories, by default the bit
+        search paths. Entries of files which no longer exist are removed. Returns the indexed files.'''
+        if directories is None:
+            directories = PathPreferences.searchPathsTool('Bit')
+        found = []
+        for directory in directories:
+            for root, ds, fs in os.walk(directory):
+                for f in sorted(fs):
+                    if f.endswith('.fctb'):
+                        path = os.path.join(root, f)
+                        try:
+                            self._entry(path)
+                            found.append(path)
+                        except (OSError, IOError, ValueError) as e:
+                            PathLog.warning("Skipping tool bit {}: {}".format(path, e))
+        for path in [p for p in self.bits if not os.path.isfile(p)]:
+            del self.bits[path]
+            self.dirty = True
+        return found
+
+    def find(self, diameter=None, shape=None, name=None, tolerance=0.001):
+        '''find(diameter=None, shape=None, name=None, tolerance=0.001) ... return the paths of all indexed
+        tool bits matching all given criteria, sorted by diameter. The diameter is compared in mm within
+        tolerance, shape is the name of the shape file without extension and name a substring of the bit's name.'''
+        matches = []
+        for (path, entry) in self.bits.items():
+            if diameter is not None and (entry['diameter'] is None or abs(entry['diameter'] - diameter) > tolerance):
+                continue
+            if shape is not None and entry['shape'] != shape:
+                continue
+            if name is not None and name.lower() not in entry['declaration'].get('name', '').lower():
+                continue
+            matches.append(path)
+        return sorted(matches, key=lambda p: (self.bits[p]['diameter'] or 0, p))
+
+    def create(self, path, name='ToolBit'):
+        '''create(path, name='ToolBit') ... load the tool bit with its shape into the active document.'''
+        return PathToolBit.Factory.CreateFrom(path, name)
+
+
+_Index = None
+
+
+def defaultIndex():
+    '''defaultIndex() ... return the index shared by all users, kept in the user's application data.'''
+    global _Index # pylint: disable=global-statement
+    if _Index is None:
+        _Index = ToolBitIndex(os.path.join(FreeCAD.getUserAppDataDir(), 'Path', 'ToolBitIndex.json'))
+    return _Index
@@ -30,6 +30,7 @@ import PathScripts.PathPreferences as PathPreferences
 import PathScripts.PathToolBit as PathToolBit
 import PathScripts.PathToolBitEdit as PathToolBitEdit
 import PathScripts.PathToolBitGui as PathToolBitGui
+import PathScripts.PathToolBitIndex as PathToolBitIndex
 import PathScripts.PathToolControllerGui as PathToolControllerGui
 import PathScripts.PathUtilsGui as PathUtilsGui
 import PySide
@@ -218,22 +219,19 @@ class ModelFactory(object):
         PathPreferences.setLastFileToolLibrary(path)
         # self.currenLib = path
 
-        with open(path) as fp:
-            library = json.load(fp)
-
-        for toolBit in library['tools']:
+        # bits are resolved and declared through the index, only changed files are read
+        index = PathToolBitIndex.defaultIndex()
+        for (nr, name, bit, tool) in index.libraryTools(path):
             try:
-                nr = toolBit['nr']
-                bit = PathToolBit.findToolBit(toolBit['path'], path)
-                if bit:
+                if bit and tool:
                     PathLog.track(bit)
-                    tool = PathToolBit.Declaration(bit)
                     datamodel.appendRow(self._toolAdd(nr, tool, bit))
-                else:
-                    PathLog.error("Could not find tool #{}: {}".format(nr, toolBit['path']))
+                elif not bit:
+                    PathLog.error("Could not find tool #{}: {}".format(nr, name))
             except Exception as e:
-                msg = "Error loading tool: {} : {}".format(toolBit['path'], e)
+                msg = "Error loading tool: {} : {}".format(name, e)
                 FreeCAD.Console.PrintError(msg)
+        index.save()
 
     def _toolAdd(self, nr, tool, path):
 
@@ -271,7 +269,7 @@ class ModelFactory(object):
                 itemNr = int(datamodel.item(row, 0).data(PySide.QtCore.Qt.EditRole))
                 nr = max(nr, itemNr)
             nr += 1
-            tool = PathToolBit.Declaration(path)
+            tool = PathToolBitIndex.defaultIndex().declaration(path)
         except Exception as e:
             PathLog.error(e)
 
@@ -25,6 +25,7 @@ import Path
 # import PathScripts
 import PathScripts.PathJob as PathJob
 import PathScripts.PathGeom as PathGeom
+import PathScripts.PathOrdering as PathOrdering
 import math
 import numpy
 
@@ -655,59 +656,14 @@ def rampPlunge(edge, rampangle, destZ, startZ):
     return rampCmds
 
 
-def sort_jobs(locations, keys, attractors=None):
+def sort_jobs(locations, keys, attractors=None, optimize=False):
     """ sort holes by the nearest neighbor method
         keys: two-element list of keys for X and Y coordinates. for example ['x','y']
+        optimize: improve the nearest neighbor order with 2-opt
         originally written by m0n5t3r for PathHelix
     """
-    if attractors is None:
-        attractors = []
-    try:
-        from queue import PriorityQueue
-    except ImportError:
-        from Queue import PriorityQueue
-    from collections import defaultdict
-
-    attractors = attractors or [keys[0]]
-
-    def sqdist(a, b):
-        """ square Euclidean distance """
-        d = 0
-        for k in keys:
-            d += (a[k] - b[k]) ** 2
-
-        return d
-
-    def weight(location):
-        w = 0
-
-        for k in attractors:
-            w += abs(location[k])
-
-        return w
-
-    def find_closest(location_list, location, dist):
-        q = PriorityQueue()
-
-        for i, j in enumerate(location_list):
-            # prevent dictionary comparison by inserting the index
-            q.put((dist(j, location) + weight(j), i, j))
-
-        prio, i, result = q.get()  # pylint: disable=unused-variable
-
-        return result
-
-    out = []
-    zero = defaultdict(lambda: 0)
-
-    out.append(find_closest(locations, zero, sqdist))
-    locations.remove(out[-1])
-
-    while locations:
-        closest = find_closest(locations, out[-1], sqdist)
-        out.append(closest)
-        locations.remove(closest)
-
+    (out, saved) = PathOrdering.sortLocations(locations, keys, attractors, optimize)
+    PathLog.debug('ordering saves an estimated {:.2f} of rapid moves'.format(saved))
     return out
 
 
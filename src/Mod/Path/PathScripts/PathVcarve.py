@@ -27,6 +27,7 @@ import Path
 import PathScripts.PathEngraveBase as PathEngraveBase
 import PathScripts.PathLog as PathLog
 import PathScripts.PathOp as PathOp
+import PathScripts.PathOrdering as PathOrdering
 import PathScripts.PathUtils as PathUtils
 import PathScripts.PathGeom as PathGeom
 import PathScripts.PathPreferences as PathPreferences
@@ -123,38 +124,24 @@ def _collectVoronoiWires(vd):
     return wires
 
 
-def _sortVoronoiWires(wires, start=FreeCAD.Vector(0, 0, 0)):
-    def closestTo(start, point):
-        p = None
-        l = None
-        for i in point:
-            if l is None or l > start.distanceToPoint(point[i]):
-                l = start.distanceToPoint(point[i])
-                p = i
-        return (p, l)
+def _sortVoronoiWires(wires, start=FreeCAD.Vector(0, 0, 0), optimize=False):
+    begins = [(v.x, v.y) for v in (w[0].Vertices[0].toPoint() for w in wires)]
+    ends   = [(v.x, v.y) for v in (w[-1].Vertices[1].toPoint() for w in wires)]
+    start  = (start.x, start.y)
 
-    begin = {}
-    end   = {}
-
-    for i, w in enumerate(wires):
-        begin[i] = w[0].Vertices[0].toPoint()
-        end[i]   = w[-1].Vertices[1].toPoint()
+    order = PathOrdering.nearestNeighbourOrder(begins, ends, start)
+    if optimize:
+        order = PathOrdering.twoOpt(begins, ends, order, start)
+    PathLog.debug('wire order saves an estimated {:.2f} mm of rapid moves'.format(
+        PathOrdering.rapidDistance(begins, ends, [(i, False) for i in range(len(wires))], start) -
+        PathOrdering.rapidDistance(begins, ends, order, start)))
 
     result = []
-    while begin:
-        (bIdx, bLen) = closestTo(start, begin)
-        (eIdx, eLen) = closestTo(start, end)
-        if bLen < eLen:
-            result.append(wires[bIdx])
-            start =   end[bIdx]
-            del     begin[bIdx]
-            del       end[bIdx]
+    for (i, rev) in order:
+        if rev:
+            result.append([e.Twin for e in reversed(wires[i])])
         else:
-            result.append([e.Twin for e in reversed(wires[eIdx])])
-            start = begin[eIdx]
-            del     begin[eIdx]
-            del       end[eIdx]
-
+            result.append(wires[i])
     return result
 
 class _Geometry(object):
@@ -210,6 +197,10 @@ class ObjectVcarve(PathEngraveBase.ObjectOp):
                             QtCore.QT_TRANSLATE_NOOP("PathVcarve",
                                 "Additional base objects to be engraved"))
         obj.setEditorMode('BaseShapes', 2)  # hide
+        if not hasattr(obj, 'OptimizeOrder'):
+            obj.addProperty("App::PropertyBool", "OptimizeOrder", "Path",
+                            QtCore.QT_TRANSLATE_NOOP("PathVcarve",
+                                "Improve the order of the wires to shorten rapid moves between them"))
 
     def initOperation(self, obj):
         '''initOperation(obj) ... create vcarve specific properties.'''
@@ -226,6 +217,7 @@ class ObjectVcarve(PathEngraveBase.ObjectOp):
         obj.Discretize = 0.01
         obj.Tolerance = PathPreferences.defaultGeometryTolerance()
         self.setupAdditionalProperties(obj)
+        obj.OptimizeOrder = True
 
     def opOnDocumentRestored(self, obj):
         # upgrade ...
@@ -283,12 +275,12 @@ class ObjectVcarve(PathEngraveBase.ObjectOp):
 
             wires = _collectVoronoiWires(vd)
             if _sorting != 'global':
-                wires = _sortVoronoiWires(wires)
+                wires = _sortVoronoiWires(wires, optimize=obj.OptimizeOrder)
             voronoiWires.extend(wires)
             VD.append((f, vd, wires))
 
         if _sorting == 'global':
-            voronoiWires = _sortVoronoiWires(voronoiWires)
+            voronoiWires = _sortVoronoiWires(voronoiWires, optimize=obj.OptimizeOrder)
 
         geom = _Geometry.FromObj(obj, self.model[0])
 
@@ -33,19 +33,17 @@ __contributors__ = ""
 import FreeCAD
 from PySide import QtCore
 
-# OCL must be installed
+# OCL is optional, the built-in drop cutter is used without it
 try:
     import ocl
 except ImportError:
-    msg = QtCore.QCoreApplication.translate("PathWaterline", "This operation requires OpenCamLib to be installed.")
-    FreeCAD.Console.PrintError(msg + "\n")
-    raise ImportError
-    # import sys
-    # sys.exit(msg)
+    ocl = None
 
 import Path
+import PathScripts.PathDropCutter as PathDropCutter
 import PathScripts.PathLog as PathLog
 import PathScripts.PathUtils as PathUtils
+import PathScripts.PathHeightMap as PathHeightMap
 import PathScripts.PathOp as PathOp
 import PathScripts.PathSurfaceSupport as PathSurfaceSupport
 import time
@@ -142,6 +140,8 @@ class ObjectWaterline(PathOp.ObjectOp):
 
             ("App::PropertyEnumeration", "Algorithm", "Clearing Options",
                 QtCore.QT_TRANSLATE_NOOP("App::Property", "Select the algorithm to use: OCL Dropcutter*, or Experimental (Not OCL based).")),
+            ("App::PropertyEnumeration", "DropCutterEngine", "Clearing Options",
+                QtCore.QT_TRANSLATE_NOOP("App::Property", "Drop cutter engine: OpenCamLib, or the built-in engine which does not require OpenCamLib.")),
             ("App::PropertyEnumeration", "BoundBox", "Clearing Options",
                 QtCore.QT_TRANSLATE_NOOP("App::Property", "Select the overall boundary for the operation.")),
             ("App::PropertyEnumeration", "ClearLastLayer", "Clearing Options",
@@ -192,6 +192,7 @@ class ObjectWaterline(PathOp.ObjectOp):
             'PatternCenterAt': ['CenterOfMass', 'CenterOfBoundBox', 'XminYmin', 'Custom'],
             'ClearLastLayer': ['Off', 'Circular', 'CircularZigZag', 'Line', 'Offset', 'Spiral', 'ZigZag'],
             'CutMode': ['Conventional', 'Climb'],
+            'DropCutterEngine': PathDropCutter.Engines,
             'CutPattern': ['None', 'Circular', 'CircularZigZag', 'Line', 'Offset', 'Spiral', 'ZigZag'],  # Additional goals ['Offset', 'Spiral', 'ZigZagOffset', 'Grid', 'Triangle']
             'HandleMultipleFeatures': ['Collectively', 'Individually'],
             'LayerMode': ['Single-pass', 'Multi-pass'],
@@ -211,6 +212,7 @@ class ObjectWaterline(PathOp.ObjectOp):
             'IgnoreOuterAbove': obj.StartDepth.Value + 0.00001,
             'StartPoint': FreeCAD.Vector(0.0, 0.0, obj.ClearanceHeight.Value),
             'Algorithm': 'OCL Dropcutter',
+            'DropCutterEngine': PathDropCutter.EngineOpenCamLib if ocl else PathDropCutter.EngineBuiltIn,
             'LayerMode': 'Single-pass',
             'CutMode': 'Conventional',
             'CutPattern': 'None',
@@ -296,6 +298,7 @@ class ObjectWaterline(PathOp.ObjectOp):
         obj.setEditorMode('SampleInterval', G)
         obj.setEditorMode('LinearDeflection', expMode)
         obj.setEditorMode('AngularDeflection', expMode)
+        obj.setEditorMode('DropCutterEngine', expMode)
 
     def onChanged(self, obj, prop):
         if hasattr(self, 'propertiesReady'):
@@ -491,7 +494,8 @@ class ObjectWaterline(PathOp.ObjectOp):
         self.resetOpVariables()
 
         # Setup cutter for OCL and cutout value for operation - based on tool controller properties
-        oclTool = PathSurfaceSupport.OCL_Tool(ocl, obj)
+        self.ocl = PathDropCutter.getEngine(obj.DropCutterEngine, ocl)
+        oclTool = PathSurfaceSupport.OCL_Tool(self.ocl, obj)
         self.cutter = oclTool.getOclTool()
         if not self.cutter:
             PathLog.error(translate('PathWaterline', "Canceling Waterline operation. Error creating OCL cutter."))
@@ -600,7 +604,7 @@ class ObjectWaterline(PathOp.ObjectOp):
             for m in range(0, len(JOB.Model.Group)):
                 # Create OCL.stl model objects
                 if obj.Algorithm == 'OCL Dropcutter':
-                    PathSurfaceSupport._prepareModelSTLs(self, JOB, obj, m, ocl)
+                    PathSurfaceSupport._prepareModelSTLs(self, JOB, obj, m, self.ocl)
 
                 Mdl = JOB.Model.Group[m]
                 if FACES[m] is False:
@@ -613,7 +617,7 @@ class ObjectWaterline(PathOp.ObjectOp):
                         PathLog.info('Working on Model.Group[{}]: {}'.format(m, Mdl.Label))
                     # make stock-model-voidShapes STL model for avoidance detection on transitions
                     if obj.Algorithm == 'OCL Dropcutter':
-                        PathSurfaceSupport._makeSafeSTL(self, JOB, obj, m, FACES[m], VOIDS[m], ocl)
+                        PathSurfaceSupport._makeSafeSTL(self, JOB, obj, m, FACES[m], VOIDS[m], self.ocl)
                     # Process model/faces - OCL objects must be ready
                     CMDS.extend(self._processWaterlineAreas(JOB, obj, m, FACES[m], VOIDS[m]))
 
@@ -851,7 +855,7 @@ class ObjectWaterline(PathOp.ObjectOp):
         return cmds
 
     def _planarGetPDC(self, stl, finalDep, SampleInterval, cutter):
-        pdc = ocl.PathDropCutter()   # create a pdc [PathDropCutter] object
+        pdc = self.ocl.PathDropCutter()   # create a pdc [PathDropCutter] object
         pdc.setSTL(stl)  # add stl model
         pdc.setCutter(cutter)  # add cutter
         pdc.setZ(finalDep)  # set minimumZ (final / target depth value)
@@ -912,309 +916,74 @@ class ObjectWaterline(PathOp.ObjectOp):
         lenDP = len(depthparams)
 
         # Scan the piece to depth at smplInt
-        oclScan = []
         oclScan = self._waterlineDropCutScan(stl, smplInt, xmin, xmax, ymin, depthparams[lenDP - 1], numScanLines)
-        oclScan = [FreeCAD.Vector(P.x, P.y, P.z + depOfst) for P in oclScan]
-        lenOS = len(oclScan)
-        ptPrLn = int(lenOS / numScanLines)
-
-        # Convert oclScan list of points to multi-dimensional list
-        scanLines = []
-        for L in range(0, numScanLines):
-            scanLines.append([])
-            for P in range(0, ptPrLn):
-                pi = L * ptPrLn + P
-                scanLines[L].append(oclScan[pi])
-        lenSL = len(scanLines)
-        pntsPerLine = len(scanLines[0])
+        # Convert oclScan list of points to height map array, one row per scan line
+        scanPnts = PathHeightMap.clPointsToArray(oclScan, depOfst)
+        heightMap = PathHeightMap.HeightMap.fromScanPoints(scanPnts, numScanLines, smplInt)
+        (lenSL, pntsPerLine) = heightMap.z.shape
         msg = "--OCL scan: " + str(lenSL * pntsPerLine) + " points, with "
         msg += str(numScanLines) + " lines and " + str(pntsPerLine) + " pts/line"
         PathLog.debug(msg)
 
         # Extract Wl layers per depthparams
-        lyr = 0
-        cmds = []
         layTime = time.time()
-        self.topoMap = []
         for layDep in depthparams:
-            cmds = self._getWaterline(obj, scanLines, layDep, lyr, lenSL, pntsPerLine)
+            cmds = self._getWaterline(obj, heightMap, layDep)
             commands.extend(cmds)
-            lyr += 1
         PathLog.debug("--All layer scans combined took " + str(time.time() - layTime) + " s")
         return commands
 
     def _waterlineDropCutScan(self, stl, smplInt, xmin, xmax, ymin, fd, numScanLines):
         '''_waterlineDropCutScan(stl, smplInt, xmin, xmax, ymin, fd, numScanLines) ...
         Perform OCL scan for waterline purpose.'''
-        pdc = ocl.PathDropCutter()   # create a pdc
+        pdc = self.ocl.PathDropCutter()   # create a pdc
         pdc.setSTL(stl)
         pdc.setCutter(self.cutter)
         pdc.setZ(fd)  # set minimumZ (final / target depth value)
         pdc.setSampling(smplInt)
 
         # Create line object as path
-        path = ocl.Path()                   # create an empty path object
+        path = self.ocl.Path()                   # create an empty path object
         for nSL in range(0, numScanLines):
             yVal = ymin + (nSL * smplInt)
-            p1 = ocl.Point(xmin, yVal, fd)   # start-point of line
-            p2 = ocl.Point(xmax, yVal, fd)   # end-point of line
-            path.append(ocl.Line(p1, p2))
+            p1 = self.ocl.Point(xmin, yVal, fd)   # start-point of line
+            p2 = self.ocl.Point(xmax, yVal, fd)   # end-point of line
+            path.append(self.ocl.Line(p1, p2))
             # path.append(l)        # add the line to the path
         pdc.setPath(path)
         pdc.run()  # run drop-cutter on the path
 
-        # return the list of points
+        # return the list of points, as array from the built-in drop cutter
+        if hasattr(pdc, 'getCLPointArray'):
+            return pdc.getCLPointArray()
         return pdc.getCLPoints()
 
-    def _getWaterline(self, obj, scanLines, layDep, lyr, lenSL, pntsPerLine):
-        '''_getWaterline(obj, scanLines, layDep, lyr, lenSL, pntsPerLine) ... Get waterline.'''
+    def _getWaterline(self, obj, heightMap, layDep):
+        '''_getWaterline(obj, heightMap, layDep) ... Get waterline.'''
         commands = []
-        cmds = []
-        loopList = []
-        self.topoMap = []
-        # Create topo map from scanLines (highs and lows)
-        self.topoMap = self._createTopoMap(scanLines, layDep, lenSL, pntsPerLine)
-        # Add buffer lines and columns to topo map
-        self._bufferTopoMap(lenSL, pntsPerLine)
-        # Identify layer waterline from OCL scan
-        self._highlightWaterline(4, 9)
-        # Extract waterline and convert to gcode
-        loopList = self._extractWaterlines(obj, scanLines, lyr, layDep)
-        # save commands
-        for loop in loopList:
+        # Extract waterline loops from the height map and convert to gcode
+        for loop in heightMap.waterlines(layDep, self.CutClimb):
             cmds = self._loopToGcode(obj, layDep, loop)
             commands.extend(cmds)
         return commands
 
-    def _createTopoMap(self, scanLines, layDep, lenSL, pntsPerLine):
-        '''_createTopoMap(scanLines, layDep, lenSL, pntsPerLine) ... Create topo map version of OCL scan data.'''
-        topoMap = []
-        for L in range(0, lenSL):
-            topoMap.append([])
-            for P in range(0, pntsPerLine):
-                if scanLines[L][P].z > layDep:
-                    topoMap[L].append(2)
-                else:
-                    topoMap[L].append(0)
-        return topoMap
-
-    def _bufferTopoMap(self, lenSL, pntsPerLine):
-        '''_bufferTopoMap(lenSL, pntsPerLine) ... Add buffer boarder of zeros to all sides to topoMap data.'''
-        pre = [0, 0]
-        post = [0, 0]
-        for p in range(0, pntsPerLine):
-            pre.append(0)
-            post.append(0)
-        for i in range(0, lenSL):
-            self.topoMap[i].insert(0, 0)
-            self.topoMap[i].append(0)
-        self.topoMap.insert(0, pre)
-        self.topoMap.append(post)
-        return True
-
-    def _highlightWaterline(self, extraMaterial, insCorn):
-        '''_highlightWaterline(extraMaterial, insCorn) ... Highlight the waterline data, separating from extra material.'''
-        TM = self.topoMap
-        lastPnt = len(TM[1]) - 1
-        lastLn = len(TM) - 1
-        highFlag = 0
-
-        # ("--Convert parallel data to ridges")
-        for lin in range(1, lastLn):
-            for pt in range(1, lastPnt):  # Ignore first and last points
-                if TM[lin][pt] == 0:
-                    if TM[lin][pt + 1] == 2:  # step up
-                        TM[lin][pt] = 1
-                    if TM[lin][pt - 1] == 2:  # step down
-                        TM[lin][pt] = 1
-
-        # ("--Convert perpendicular data to ridges and highlight ridges")
-        for pt in range(1, lastPnt):  # Ignore first and last points
-            for lin in range(1, lastLn):
-                if TM[lin][pt] == 0:
-                    highFlag = 0
-                    if TM[lin + 1][pt] == 2:  # step up
-                        TM[lin][pt] = 1
-                    if TM[lin - 1][pt] == 2:  # step down
-                        TM[lin][pt] = 1
-                elif TM[lin][pt] == 2:
-                    highFlag += 1
-                    if highFlag == 3:
-                        if TM[lin - 1][pt - 1] < 2 or TM[lin - 1][pt + 1] < 2:
-                            highFlag = 2
-                        else:
-                            TM[lin - 1][pt] = extraMaterial
-                            highFlag = 2
-
-        # ("--Square corners")
-        for pt in range(1, lastPnt):
-            for lin in range(1, lastLn):
-                if TM[lin][pt] == 1:                    # point == 1
-                    cont = True
-                    if TM[lin + 1][pt] == 0:            # forward == 0
-                        if TM[lin + 1][pt - 1] == 1:    # forward left == 1
-                            if TM[lin][pt - 1] == 2:    # left == 2
-                                TM[lin + 1][pt] = 1     # square the corner
-                                cont = False
-
-                        if cont is True and TM[lin + 1][pt + 1] == 1:  # forward right == 1
-                            if TM[lin][pt + 1] == 2:    # right == 2
-                                TM[lin + 1][pt] = 1     # square the corner
-                        cont = True
-
-                    if TM[lin - 1][pt] == 0:          # back == 0
-                        if TM[lin - 1][pt - 1] == 1:    # back left == 1
-                            if TM[lin][pt - 1] == 2:    # left == 2
-                                TM[lin - 1][pt] = 1     # square the corner
-                                cont = False
-
-                        if cont is True and TM[lin - 1][pt + 1] == 1:  # back right == 1
-                            if TM[lin][pt + 1] == 2:    # right == 2
-                                TM[lin - 1][pt] = 1     # square the corner
-
-        # remove inside corners
-        for pt in range(1, lastPnt):
-            for lin in range(1, lastLn):
-                if TM[lin][pt] == 1:                    # point == 1
-                    if TM[lin][pt + 1] == 1:
-                        if TM[lin - 1][pt + 1] == 1 or TM[lin + 1][pt + 1] == 1:
-                            TM[lin][pt + 1] = insCorn
-                    elif TM[lin][pt - 1] == 1:
-                        if TM[lin - 1][pt - 1] == 1 or TM[lin + 1][pt - 1] == 1:
-                            TM[lin][pt - 1] = insCorn
-
-        return True
-
-    def _extractWaterlines(self, obj, oclScan, lyr, layDep):
-        '''_extractWaterlines(obj, oclScan, lyr, layDep) ... Extract water lines from OCL scan data.'''
-        srch = True
-        lastPnt = len(self.topoMap[0]) - 1
-        lastLn = len(self.topoMap) - 1
-        maxSrchs = 5
-        srchCnt = 1
-        loopList = []
-        loop = []
-        loopNum = 0
-
-        if self.CutClimb is True:
-            lC = [-1, -1, -1, 0, 1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0]
-            pC = [-1, 0, 1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0, -1, -1]
-        else:
-            lC = [1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0, -1, -1, -1, 0]
-            pC = [-1, 0, 1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0, -1, -1]
-
-        while srch is True:
-            srch = False
-            if srchCnt > maxSrchs:
-                PathLog.debug("Max search scans, " + str(maxSrchs) + " reached\nPossible incomplete waterline result!")
-                break
-            for L in range(1, lastLn):
-                for P in range(1, lastPnt):
-                    if self.topoMap[L][P] == 1:
-                        # start loop follow
-                        srch = True
-                        loopNum += 1
-                        loop = self._trackLoop(oclScan, lC, pC, L, P, loopNum)
-                        self.topoMap[L][P] = 0  # Mute the starting point
-                        loopList.append(loop)
-            srchCnt += 1
-        PathLog.debug("Search count for layer " + str(lyr) + " is " + str(srchCnt) + ", with " + str(loopNum) + " loops.")
-        return loopList
-
-    def _trackLoop(self, oclScan, lC, pC, L, P, loopNum):
-        '''_trackLoop(oclScan, lC, pC, L, P, loopNum) ... Track the loop direction.'''
-        loop = [oclScan[L - 1][P - 1]]  # Start loop point list
-        cur = [L, P, 1]
-        prv = [L, P - 1, 1]
-        nxt = [L, P + 1, 1]
-        follow = True
-        ptc = 0
-        ptLmt = 200000
-        while follow is True:
-            ptc += 1
-            if ptc > ptLmt:
-                PathLog.debug("Loop number " + str(loopNum) + " at [" + str(nxt[0]) + ", " + str(nxt[1]) + "] pnt count exceeds, " + str(ptLmt) + ".  Stopped following loop.")
-                break
-            nxt = self._findNextWlPoint(lC, pC, cur[0], cur[1], prv[0], prv[1])  # get next point
-            loop.append(oclScan[nxt[0] - 1][nxt[1] - 1])  # add it to loop point list
-            self.topoMap[nxt[0]][nxt[1]] = nxt[2]  # Mute the point, if not Y stem
-            if nxt[0] == L and nxt[1] == P:  # check if loop complete
-                follow = False
-            elif nxt[0] == cur[0] and nxt[1] == cur[1]:  # check if line cannot be detected
-                follow = False
-            prv = cur
-            cur = nxt
-        return loop
-
-    def _findNextWlPoint(self, lC, pC, cl, cp, pl, pp):
-        '''_findNextWlPoint(lC, pC, cl, cp, pl, pp) ...
-        Find the next waterline point in the point cloud layer provided.'''
-        dl = cl - pl
-        dp = cp - pp
-        num = 0
-        i = 3
-        s = 0
-        mtch = 0
-        found = False
-        while mtch < 8:  # check all 8 points around current point
-            if lC[i] == dl:
-                if pC[i] == dp:
-                    s = i - 3
-                    found = True
-                    # Check for y branch where current point is connection between branches
-                    for y in range(1, mtch):
-                        if lC[i + y] == dl:
-                            if pC[i + y] == dp:
-                                num = 1
-                                break
-                    break
-            i += 1
-            mtch += 1
-        if found is False:
-            # ("_findNext: No start point found.")
-            return [cl, cp, num]
-
-        for r in range(0, 8):
-            l = cl + lC[s + r]
-            p = cp + pC[s + r]
-            if self.topoMap[l][p] == 1:
-                return [l, p, num]
-
-        # ("_findNext: No next pnt found")
-        return [cl, cp, num]
-
     def _loopToGcode(self, obj, layDep, loop):
-        '''_loopToGcode(obj, layDep, loop) ... Convert set of loop points to Gcode.'''
+        '''_loopToGcode(obj, layDep, loop) ... Convert array of XY loop points to Gcode.'''
         # generate the path commands
         output = []
 
-        # prev = FreeCAD.Vector(2135984513.165, -58351896873.17455, 13838638431.861)
-        nxt = FreeCAD.Vector(0.0, 0.0, 0.0)
-
-        # Create first point
-        pnt = FreeCAD.Vector(loop[0].x, loop[0].y, layDep)
-
         # Position cutter to begin loop
+        (x, y) = loop[0].tolist()
         output.append(Path.Command('G0', {'Z': obj.ClearanceHeight.Value, 'F': self.vertRapid}))
-        output.append(Path.Command('G0', {'X': pnt.x, 'Y': pnt.y, 'F': self.horizRapid}))
-        output.append(Path.Command('G1', {'Z': pnt.z, 'F': self.vertFeed}))
+        output.append(Path.Command('G0', {'X': x, 'Y': y, 'F': self.horizRapid}))
+        output.append(Path.Command('G1', {'Z': layDep, 'F': self.vertFeed}))
 
-        lenCLP = len(loop)
-        lastIdx = lenCLP - 1
         # Cycle through each point on loop
-        for i in range(0, lenCLP):
-            if i < lastIdx:
-                nxt.x = loop[i + 1].x
-                nxt.y = loop[i + 1].y
-                nxt.z = layDep
-
-            output.append(Path.Command('G1', {'X': pnt.x, 'Y': pnt.y, 'F': self.horizFeed}))
-
-            # Rotate point data
-            pnt = nxt
+        output.extend(PathHeightMap.linearMoveCommands(loop, self.horizFeed, 'XY'))
 
         # Save layer end point for use in transitioning to next layer
-        self.layerEndPnt = pnt
+        (x, y) = loop[-1].tolist()
+        self.layerEndPnt = FreeCAD.Vector(x, y, layDep)
 
         return output
 
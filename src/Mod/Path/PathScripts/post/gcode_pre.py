@@ -46,7 +46,7 @@ import os
 import FreeCAD
 import PathScripts.PathUtils as PathUtils
 import PathScripts.PathLog as PathLog
-import re
+import PathScripts.PathGcodeImport as PathGcodeImport
 import PathScripts.PathCustom as PathCustom
 import PathScripts.PathCustomGui as PathCustomGui
 import PathScripts.PathOpGui as PathOpGui
@@ -85,31 +85,21 @@ def matchToolController(op, toolnumber):
 def insert(filename, docname):
     "called when freecad imports a file"
     PathLog.track(filename)
-    gfile = pythonopen(filename)
-    gcode = gfile.read()
-    gfile.close()
 
-    # Regular expression to match tool changes in the format 'M6 Tn'
-    p = re.compile('[mM]+?\s?0?6\s?T\d*\s')
+    # read the gcode in chunks and split it on tool changes
+    reader = PathGcodeImport.GcodeReader()
+    progress = PathGcodeImport.ProgressBar("Importing " + os.path.basename(filename) + "...", os.path.getsize(filename))
+    try:
+        sections = reader.read(filename, progress)
+    finally:
+        progress.stop()
 
-    # split the gcode on tool changes
-    paths = re.split('([mM]+?\s?0?6\s?T\d*\s)', gcode)
+    if reader.cancelled:
+        PathLog.info("import of {} cancelled".format(filename))
+        return
 
     # iterate the gcode sections and add customs for each
-    toolnumber = 0
-
-    for path in paths:
-
-        # if the section is a tool change, extract the tool number
-        m = p.match(path)
-        if m:
-            toolnumber = int(m.group().split('T')[-1])
-            continue
-
-        # Parse the gcode and throw away any empty lists
-        gcode = parse(path)
-        if len(gcode) == 0:
-            continue
+    for toolnumber, gcode in sections:
 
         # Create a custom and viewobject
         obj = PathCustom.Create("Custom")
@@ -127,57 +117,13 @@ def insert(filename, docname):
     FreeCAD.ActiveDocument.recompute()
 
 
-
 def parse(inputstring):
     "parse(inputstring): returns a parsed output string"
-
-    supported = ['G0', 'G00',
-                 'G1', 'G01',
-                 'G2', 'G02',
-                 'G3', 'G03',
-                 'G81', 'G82', 'G83',
-                 'G90', 'G91']
-
-    axis = ["X", "Y", "Z", "A", "B", "C", "U", "V", "W"]
-
     print("preprocessing...")
     PathLog.track(inputstring)
-    # split the input by line
-    lines = inputstring.splitlines()
     output = []
-    lastcommand = None
-
-    for lin in lines:
-        # remove any leftover trailing and preceding spaces
-        lin = lin.strip()
-
-        # discard empty lines
-        if not lin:
-            continue
-
-        # remove line numbers
-        if lin[0].upper() in ["N"]:
-            lin = lin.split(" ", 1)
-            if len(lin) >= 1:
-                lin = lin[1].strip()
-            else:
-                continue
-
-        # Anything else not a G/M code or an axis move is ignored.
-        if lin[0] not in ["G", "M", "X", "Y", "Z", "A", "B", "C", "U", "V", "W"]:
-            continue
-
-        # if the remaining line is supported, store it
-        currcommand = lin.split()[0]
-
-        if currcommand in supported:
-            output.append(lin)
-            lastcommand = currcommand
-
-        # modal commands have no G or M but have axis moves. append those too.
-        elif currcommand[0] in axis and lastcommand:
-            output.append(lastcommand + " " + lin)
-
+    for _, gcode in PathGcodeImport.GcodeReader().parse(inputstring):
+        output.extend(gcode)
     print("done preprocessing.")
     return output
 
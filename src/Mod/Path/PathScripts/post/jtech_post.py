@@ -23,11 +23,10 @@
 
 from __future__ import print_function
 import FreeCAD
-from FreeCAD import Units
-import Path
 import argparse
 import datetime
 import shlex
+from PathScripts import PathPostEngine
 from PathScripts import PostUtils
 
 TOOLTIP = '''
@@ -169,64 +168,63 @@ def export(objectslist, filename, argstring):
             return None
 
     print("postprocessing...")
-    gcode = ""
+    out = PathPostEngine.openOutput(filename, FreeCAD.GuiUp and SHOW_EDITOR)
+    post = JtechPostProcessor(dialect(), writer=out, lineNumber=linenumber)
 
     # write header
     if OUTPUT_HEADER:
-        gcode += linenumber() + "(Exported by FreeCAD)\n"
-        gcode += linenumber() + "(Post Processor: " + __name__ + ")\n"
-        gcode += linenumber() + "(Output Time:" + str(now) + ")\n"
+        out.write(linenumber() + "(Exported by FreeCAD)\n")
+        out.write(linenumber() + "(Post Processor: " + __name__ + ")\n")
+        out.write(linenumber() + "(Output Time:" + str(now) + ")\n")
 
     # Write the preamble
     if OUTPUT_COMMENTS:
-        gcode += linenumber() + "(begin preamble)\n"
+        out.write(linenumber() + "(begin preamble)\n")
     for line in PREAMBLE.splitlines(False):
-        gcode += linenumber() + line + "\n"
-    gcode += linenumber() + UNITS + "\n"
+        out.write(linenumber() + line + "\n")
+    out.write(linenumber() + UNITS + "\n")
 
     for obj in objectslist:
 
         # do the pre_op
         if OUTPUT_COMMENTS:
-            gcode += linenumber() + "(begin operation: %s)\n" % obj.Label
+            out.write(linenumber() + "(begin operation: %s)\n" % obj.Label)
         for line in PRE_OPERATION.splitlines(True):
-            gcode += linenumber() + line
+            out.write(linenumber() + line)
 
-        gcode += parse(obj)
+        post.parse(obj)
 
         # do the post_op
         if OUTPUT_COMMENTS:
-            gcode += linenumber() + "(finish operation: %s)\n" % obj.Label
+            out.write(linenumber() + "(finish operation: %s)\n" % obj.Label)
         for line in POST_OPERATION.splitlines(True):
-            gcode += linenumber() + line
+            out.write(linenumber() + line)
 
     # do the post_amble
     if OUTPUT_COMMENTS:
-        gcode += "(begin postamble)\n"
+        out.write("(begin postamble)\n")
     for line in POSTAMBLE.splitlines(True):
-        gcode += linenumber() + line
+        out.write(linenumber() + line)
 
+    edit = None
     if FreeCAD.GuiUp and SHOW_EDITOR:
-        dia = PostUtils.GCodeEditorDialog()
-        dia.editor.setText(gcode)
-        result = dia.exec_()
-        if result:
-            final = dia.editor.toPlainText()
-        else:
-            final = gcode
-    else:
-        final = gcode
+        edit = editor
+    final = PathPostEngine.closeOutput(out, filename, edit)
 
     print("done postprocessing.")
 
-    if not filename == '-':
-        gfile = pythonopen(filename, "wb")
-        gfile.write(final)
-        gfile.close()
-
     return final
 
 
+def editor(gcode):
+    dia = PostUtils.GCodeEditorDialog()
+    dia.editor.setText(gcode)
+    result = dia.exec_()
+    if result:
+        return dia.editor.toPlainText()
+    return gcode
+
+
 def linenumber():
     global LINENR # pylint: disable=global-statement
     if OUTPUT_LINE_NUMBERS is True:
@@ -235,102 +233,35 @@ def linenumber():
     return ""
 
 
+RAPID_MOVES = ["G0", "G00"]
+FEED_MOVES = ["G1", "G01", "G2", "G02", "G3", "G03"]
+
+
+class JtechPostProcessor(PathPostEngine.PostProcessor):
+    '''Switches the laser on before the first feed move following a rapid and off before the first rapid
+    following a feed. Tool changes are dropped, the laser has a single tool.'''
+
+    def processCommand(self, command):
+        name = command.Name
+        lastcommand = self.state.command
+        if name in FEED_MOVES and lastcommand in RAPID_MOVES:
+            self.writer.write(PRE_FEED.format(POWER_ON_DELAY))
+        elif name in RAPID_MOVES and lastcommand in FEED_MOVES:
+            self.writer.write(POST_FEED)
+
+        if name == 'M6':
+            self.state.update(name, command.Parameters)
+            return
+        super(JtechPostProcessor, self).processCommand(command)
+
+
+def dialect():
+    return PathPostEngine.Dialect(units=UNITS, precision=PRECISION, modal=MODAL, outputDoubles=OUTPUT_DOUBLES,
+                                  outputComments=OUTPUT_COMMENTS, lineNumbers=OUTPUT_LINE_NUMBERS,
+                                  commandSpace=COMMAND_SPACE, trailingSpace=False, rapidMoves=RAPID_MOVES)
+
+
 def parse(pathobj):
-    out = ""
-    lastcommand = None
-    precision_string = '.' + str(PRECISION) + 'f'
-    currLocation = {}  # keep track for no doubles
-    RAPID_MOVES = ["G0", "G00"]
-    FEED_MOVES = ["G1", "G01", "G2", "G02", "G3", "G03"]
-    # the order of parameters
-    params = ['X', 'Y', 'Z', 'A', 'B', 'C', 'I', 'J', 'F', 'S', 'T', 'Q', 'R', 'L', 'H', 'D', 'P']
-    firstmove = Path.Command("G0", {"X": -1, "Y": -1, "Z": -1, "F": 0.0})
-    currLocation.update(firstmove.Parameters)  # set First location Parameters
-
-    if hasattr(pathobj, "Group"):  # We have a compound or project.
-        for p in pathobj.Group:
-            out += parse(p)
-        return out
-    else:  # parsing simple path
-
-        # groups might contain non-path things like stock.
-        if not hasattr(pathobj, "Path"):
-            return out
-
-        for c in pathobj.Path.Commands:
-
-            outstring = []
-            command = c.Name
-
-            controlstring = ""
-            if command in FEED_MOVES and lastcommand in RAPID_MOVES:
-                controlstring = PRE_FEED.format(POWER_ON_DELAY)
-            elif command in RAPID_MOVES and lastcommand in FEED_MOVES:
-                controlstring = POST_FEED
-            if len(controlstring) > 0:
-                out += controlstring
-
-            outstring.append(command)
-
-            # if modal: suppress the command if it is the same as the last one
-            if MODAL is True:
-                if command == lastcommand:
-                    outstring.pop(0)
-
-            if c.Name[0] == '(' and not OUTPUT_COMMENTS:  # command is a comment
-                continue
-
-            # Now add the remaining parameters in order
-            for param in params:
-                if param in c.Parameters:
-                    if param == 'F' and (currLocation[param] != c.Parameters[param] or OUTPUT_DOUBLES):
-                        if c.Name not in RAPID_MOVES:  # linuxcnc doesn't use rapid speeds
-                            speed = Units.Quantity(c.Parameters['F'], FreeCAD.Units.Velocity)
-                            if speed.getValueAs(UNIT_SPEED_FORMAT) > 0.0:
-                                outstring.append(param + format(float(speed.getValueAs(UNIT_SPEED_FORMAT)), precision_string))
-                        else:
-                            continue
-                    elif param == 'T':
-                        outstring.append(param + str(int(c.Parameters['T'])))
-                    elif param == 'H':
-                        outstring.append(param + str(int(c.Parameters['H'])))
-                    elif param == 'D':
-                        outstring.append(param + str(int(c.Parameters['D'])))
-                    elif param == 'S':
-                        outstring.append(param + str(int(c.Parameters['S'])))
-                    else:
-                        if (not OUTPUT_DOUBLES) and (param in currLocation) and (currLocation[param] == c.Parameters[param]):
-                            continue
-                        else:
-                            pos = Units.Quantity(c.Parameters[param], FreeCAD.Units.Length)
-                            outstring.append(
-                                param + format(float(pos.getValueAs(UNIT_FORMAT)), precision_string))
-
-            # store the latest command
-            lastcommand = command
-            currLocation.update(c.Parameters)
-
-            # Check for Tool Change:
-            if command == 'M6':
-                continue
-
-            if command == "message":
-                if OUTPUT_COMMENTS is False:
-                    out = []
-                else:
-                    outstring.pop(0)  # remove the command
-
-            # prepend a line number and append a newline
-            if len(outstring) >= 1:
-                if OUTPUT_LINE_NUMBERS:
-                    outstring.insert(0, (linenumber()))
-
-                # append the line to the final output
-                for w in outstring:
-                    out += w + COMMAND_SPACE
-                out = out.strip() + "\n"
-
-        return out
-
-
-# print(__name__ + " gcode postprocessor loaded.")
+    post = JtechPostProcessor(dialect(), lineNumber=linenumber)
+    post.parse(pathobj)
+    return post.getOutput()
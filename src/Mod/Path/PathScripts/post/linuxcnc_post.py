@@ -23,11 +23,10 @@
 
 from __future__ import print_function
 import FreeCAD
-from FreeCAD import Units
-import Path
 import argparse
 import datetime
 import shlex
+from PathScripts import PathPostEngine
 from PathScripts import PostUtils
 
 TOOLTIP = '''
@@ -167,20 +166,21 @@ def export(objectslist, filename, argstring):
             return None
 
     print("postprocessing...")
-    gcode = ""
+    out = PathPostEngine.openOutput(filename, FreeCAD.GuiUp and SHOW_EDITOR)
+    post = PathPostEngine.PostProcessor(dialect(), writer=out, lineNumber=linenumber)
 
     # write header
     if OUTPUT_HEADER:
-        gcode += linenumber() + "(Exported by FreeCAD)\n"
-        gcode += linenumber() + "(Post Processor: " + __name__ + ")\n"
-        gcode += linenumber() + "(Output Time:" + str(now) + ")\n"
+        out.write(linenumber() + "(Exported by FreeCAD)\n")
+        out.write(linenumber() + "(Post Processor: " + __name__ + ")\n")
+        out.write(linenumber() + "(Output Time:" + str(now) + ")\n")
 
     # Write the preamble
     if OUTPUT_COMMENTS:
-        gcode += linenumber() + "(begin preamble)\n"
+        out.write(linenumber() + "(begin preamble)\n")
     for line in PREAMBLE.splitlines(False):
-        gcode += linenumber() + line + "\n"
-    gcode += linenumber() + UNITS + "\n"
+        out.write(linenumber() + line + "\n")
+    out.write(linenumber() + UNITS + "\n")
 
     for obj in objectslist:
 
@@ -194,10 +194,10 @@ def export(objectslist, filename, argstring):
 
         # do the pre_op
         if OUTPUT_COMMENTS:
-            gcode += linenumber() + "(begin operation: %s)\n" % obj.Label
-            gcode += linenumber() + "(machine units: %s)\n" % (UNIT_SPEED_FORMAT)
+            out.write(linenumber() + "(begin operation: %s)\n" % obj.Label)
+            out.write(linenumber() + "(machine units: %s)\n" % (UNIT_SPEED_FORMAT))
         for line in PRE_OPERATION.splitlines(True):
-            gcode += linenumber() + line
+            out.write(linenumber() + line)
 
         # get coolant mode
         coolantMode = 'None'
@@ -210,56 +210,55 @@ def export(objectslist, filename, argstring):
         # turn coolant on if required
         if OUTPUT_COMMENTS:
             if not coolantMode == 'None':
-                gcode += linenumber() + '(Coolant On:' + coolantMode + ')\n'
+                out.write(linenumber() + '(Coolant On:' + coolantMode + ')\n')
         if coolantMode == 'Flood':
-            gcode  += linenumber() + 'M8' + '\n'
+            out.write(linenumber() + 'M8' + '\n')
         if coolantMode == 'Mist':
-            gcode += linenumber() + 'M7' + '\n'
+            out.write(linenumber() + 'M7' + '\n')
 
         # process the operation gcode
-        gcode += parse(obj)
+        post.parse(obj)
 
         # do the post_op
         if OUTPUT_COMMENTS:
-            gcode += linenumber() + "(finish operation: %s)\n" % obj.Label
+            out.write(linenumber() + "(finish operation: %s)\n" % obj.Label)
         for line in POST_OPERATION.splitlines(True):
-            gcode += linenumber() + line
+            out.write(linenumber() + line)
 
         # turn coolant off if required
         if not coolantMode == 'None':
             if OUTPUT_COMMENTS:
-                gcode += linenumber() + '(Coolant Off:' + coolantMode + ')\n'
-            gcode  += linenumber() +'M9' + '\n'
+                out.write(linenumber() + '(Coolant Off:' + coolantMode + ')\n')
+            out.write(linenumber() +'M9' + '\n')
 
     # do the post_amble
     if OUTPUT_COMMENTS:
-        gcode += "(begin postamble)\n"
+        out.write("(begin postamble)\n")
     for line in POSTAMBLE.splitlines(True):
-        gcode += linenumber() + line
+        out.write(linenumber() + line)
 
+    edit = None
     if FreeCAD.GuiUp and SHOW_EDITOR:
-        final = gcode
-        if len(gcode) > 100000:
-            print("Skipping editor since output is greater than 100kb")
-        else:
-            dia = PostUtils.GCodeEditorDialog()
-            dia.editor.setText(gcode)
-            result = dia.exec_()
-            if result:
-                final = dia.editor.toPlainText()
-    else:
-        final = gcode
+        edit = editor
+    final = PathPostEngine.closeOutput(out, filename, edit)
 
     print("done postprocessing.")
 
-    if not filename == '-':
-        gfile = pythonopen(filename, "w")
-        gfile.write(final)
-        gfile.close()
-
     return final
 
 
+def editor(gcode):
+    if len(gcode) > 100000:
+        print("Skipping editor since output is greater than 100kb")
+        return gcode
+    dia = PostUtils.GCodeEditorDialog()
+    dia.editor.setText(gcode)
+    result = dia.exec_()
+    if result:
+        return dia.editor.toPlainText()
+    return gcode
+
+
 def linenumber():
     # pylint: disable=global-statement
     global LINENR
@@ -269,114 +268,15 @@ def linenumber():
     return ""
 
 
-def parse(pathobj):
-    # pylint: disable=global-statement
-    global PRECISION
-    global MODAL
-    global OUTPUT_DOUBLES
-    global UNIT_FORMAT
-    global UNIT_SPEED_FORMAT
-
-    out = ""
-    lastcommand = None
-    precision_string = '.' + str(PRECISION) + 'f'
-    currLocation = {}  # keep track for no doubles
-
-    # the order of parameters
-    # linuxcnc doesn't want K properties on XY plane  Arcs need work.
-    params = ['X', 'Y', 'Z', 'A', 'B', 'C', 'I', 'J', 'F', 'S', 'T', 'Q', 'R', 'L', 'H', 'D', 'P']
-    firstmove = Path.Command("G0", {"X": -1, "Y": -1, "Z": -1, "F": 0.0})
-    currLocation.update(firstmove.Parameters)  # set First location Parameters
-
-    if hasattr(pathobj, "Group"):  # We have a compound or project.
-        # if OUTPUT_COMMENTS:
-        #     out += linenumber() + "(compound: " + pathobj.Label + ")\n"
-        for p in pathobj.Group:
-            out += parse(p)
-        return out
-    else:  # parsing simple path
-
-        # groups might contain non-path things like stock.
-        if not hasattr(pathobj, "Path"):
-            return out
-
-        # if OUTPUT_COMMENTS:
-        #     out += linenumber() + "(" + pathobj.Label + ")\n"
+def dialect():
+    return PathPostEngine.Dialect(units=UNITS, precision=PRECISION, modal=MODAL, outputDoubles=OUTPUT_DOUBLES,
+                                  outputComments=OUTPUT_COMMENTS, lineNumbers=OUTPUT_LINE_NUMBERS,
+                                  commandSpace=COMMAND_SPACE, toolChange=TOOL_CHANGE, toolLengthOffset=USE_TLO)
 
-        for c in pathobj.Path.Commands:
 
-            outstring = []
-            command = c.Name
-            outstring.append(command)
-
-            # if modal: suppress the command if it is the same as the last one
-            if MODAL is True:
-                if command == lastcommand:
-                    outstring.pop(0)
-
-            if c.Name[0] == '(' and not OUTPUT_COMMENTS: # command is a comment
-                continue
-
-            # Now add the remaining parameters in order
-            for param in params:
-                if param in c.Parameters:
-                    if param == 'F' and (currLocation[param] != c.Parameters[param] or OUTPUT_DOUBLES):
-                        if c.Name not in ["G0", "G00"]:  # linuxcnc doesn't use rapid speeds
-                            speed = Units.Quantity(c.Parameters['F'], FreeCAD.Units.Velocity)
-                            if speed.getValueAs(UNIT_SPEED_FORMAT) > 0.0:
-                                outstring.append(param + format(float(speed.getValueAs(UNIT_SPEED_FORMAT)), precision_string))
-                        else:
-                            continue
-                    elif param == 'T':
-                        outstring.append(param + str(int(c.Parameters['T'])))
-                    elif param == 'H':
-                        outstring.append(param + str(int(c.Parameters['H'])))
-                    elif param == 'D':
-                        outstring.append(param + str(int(c.Parameters['D'])))
-                    elif param == 'S':
-                        outstring.append(param + str(int(c.Parameters['S'])))
-                    else:
-                        if (not OUTPUT_DOUBLES) and (param in currLocation) and (currLocation[param] == c.Parameters[param]):
-                            continue
-                        else:
-                            pos = Units.Quantity(c.Parameters[param], FreeCAD.Units.Length)
-                            outstring.append(
-                                param + format(float(pos.getValueAs(UNIT_FORMAT)), precision_string))
-
-            # store the latest command
-            lastcommand = command
-            currLocation.update(c.Parameters)
-
-            # Check for Tool Change:
-            if command == 'M6':
-                # stop the spindle
-                out += linenumber() + "M5\n"
-                for line in TOOL_CHANGE.splitlines(True):
-                    out += linenumber() + line
-
-                # add height offset
-                if USE_TLO:
-                    tool_height = '\nG43 H' + str(int(c.Parameters['T']))
-                    outstring.append(tool_height)
-
-            if command == "message":
-                if OUTPUT_COMMENTS is False:
-                    out = []
-                else:
-                    outstring.pop(0)  # remove the command
-
-            # prepend a line number and append a newline
-            if len(outstring) >= 1:
-                if OUTPUT_LINE_NUMBERS:
-                    outstring.insert(0, (linenumber()))
-
-                # append the line to the final output
-                for w in outstring:
-                    out += w + COMMAND_SPACE
-                # Note: Do *not* strip `out`, since that forces the allocation
-                # of a contiguous string & thus quadratic complexity.
-                out += "\n"
-
-        return out
+def parse(pathobj):
+    post = PathPostEngine.PostProcessor(dialect(), lineNumber=linenumber)
+    post.parse(pathobj)
+    return post.getOutput()
 
 # print(__name__ + " gcode postprocessor loaded.")
@@ -59,7 +59,7 @@ def parse(inputstring):
 
     # split the input by line
     lines = inputstring.split("\n")
-    output = ""
+    output = []
     lastcommand = None
 
     for l in lines:
@@ -77,7 +77,7 @@ def parse(inputstring):
             l = l + ")"
         if l[0].upper() in ["G", "M", "("]:
             # found a G or M command: we store it
-            output += l + "\n"
+            output.append(l)
             last = l[0].upper()
             for c in l[1:]:
                 if not c.isdigit():
@@ -87,10 +87,10 @@ def parse(inputstring):
             lastcommand = last
         elif lastcommand:
             # no G or M command: we repeat the last one
-            output += lastcommand + " " + l + "\n"
+            output.append(lastcommand + " " + l)
 
     print("done preprocessing.")
-    return output
+    return "".join(line + "\n" for line in output)
 
 
 print (__name__ + " gcode preprocessor loaded.")
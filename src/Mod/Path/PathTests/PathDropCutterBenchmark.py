@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "Path Drop Cutter Benchmark"
+__author__ = "FreeCAD developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Accuracy and speed of the built-in drop cutter against OpenCamLib. Run PathDropCutterBenchmark.run() from the FreeCAD python console."
+
+import PathScripts.PathDropCutter as PathDropCutter
+import math
+import numpy
+import time
+
+
+def waveSurface(size, step=1.0):
+    '''waveSurface(size, step=1.0) ... Return the (n, 3, 3) triangles of a wavy square surface.'''
+    count = int(size / step) + 1
+    grid = numpy.linspace(-size / 2.0, size / 2.0, count)
+    (x, y) = numpy.meshgrid(grid, grid)
+    z = 0.1 * size * numpy.sin(x / size * 7.0) * numpy.cos(y / size * 5.0)
+    pnts = numpy.stack((x.ravel(), y.ravel(), z.ravel()), axis=1)
+    (i, j) = numpy.meshgrid(numpy.arange(count - 1), numpy.arange(count - 1))
+    a = (j * count + i).ravel()
+    (b, c) = (a + 1, a + count)
+    d = c + 1
+    return numpy.concatenate((numpy.stack((pnts[a], pnts[b], pnts[d]), axis=1),
+                              numpy.stack((pnts[a], pnts[d], pnts[c]), axis=1)))
+
+
+def makeCutters(engine, diameter=4.0):
+    return [('CylCutter', engine.CylCutter(diameter, 10.0)),
+            ('BallCutter', engine.BallCutter(diameter, 10.0)),
+            ('BullCutter', engine.BullCutter(diameter, diameter / 8.0, 10.0)),
+            ('ConeCutter', engine.ConeCutter(diameter, math.radians(45.0), 10.0))]
+
+
+def makeSTL(engine, triangles):
+    stl = engine.STLSurf()
+    for tri in triangles.tolist():
+        stl.addTriangle(engine.Triangle(*[engine.Point(*p) for p in tri]))
+    return stl
+
+
+def scan(engine, stl, cutter, size, lines, sampling):
+    '''scan(engine, stl, cutter, size, lines, sampling) ... Return the cutter locations
+    of lines parallel scan lines over the surface and the time it took.'''
+    begin = time.time()
+    pdc = engine.PathDropCutter()
+    pdc.setSTL(stl)
+    pdc.setCutter(cutter)
+    pdc.setZ(-size)
+    pdc.setSampling(sampling)
+    path = engine.Path()
+    for y in numpy.linspace(-size / 2.0, size / 2.0, lines).tolist():
+        path.append(engine.Line(engine.Point(-size / 2.0, y, 0.0), engine.Point(size / 2.0, y, 0.0)))
+    pdc.setPath(path)
+    pdc.run()
+    clp = numpy.array([(p.x, p.y, p.z) for p in pdc.getCLPoints()])
+    return (clp, time.time() - begin)
+
+
+def compareEngines(ocl, size=100, lines=100, sampling=0.25):
+    '''compareEngines(ocl, size=100, lines=100, sampling=0.25) ... Scan a wavy surface with
+    both engines and return (cutter name, maximum height difference, speedup) per cutter.'''
+    triangles = waveSurface(size)
+    oclSTL = makeSTL(ocl, triangles)
+    stl = PathDropCutter.STLSurf()
+    stl.addTriangles(triangles)
+    results = []
+    for ((name, oclCutter), (_, cutter)) in zip(makeCutters(ocl), makeCutters(PathDropCutter)):
+        (expected, oclTime) = scan(ocl, oclSTL, oclCutter, size, lines, sampling)
+        (clp, builtInTime) = scan(PathDropCutter, stl, cutter, size, lines, sampling)
+        error = float(numpy.abs(clp - expected).max()) if len(clp) == len(expected) else float('inf')
+        results.append((name, error, oclTime / max(builtInTime, 1e-9)))
+    return results
+
+
+def run(size=100, lines=100, sampling=0.25):
+    import ocl
+    print('{} triangles, {} scan lines'.format(len(waveSurface(size)), lines))
+    for (name, error, speedup) in compareEngines(ocl, size, lines, sampling):
+        print('{:12} max difference {:.3g}, speed relative to OpenCamLib {:.2f}'.format(name, error, speedup))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+
+__title__ = "Path Post Processor Benchmark"
+__author__ = "FreeCAD developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Lines per second of each post processor. Run PathPostBenchmark.run() from FreeCADCmd, some posts open an editor when the GUI is up."
+
+import Path
+import PathScripts.PathPostProcessor as PathPostProcessor
+import PathScripts.PathPreferences as PathPreferences
+import math
+import os
+import tempfile
+import time
+
+
+class PathObject(object):
+    '''Minimal stand-in for an operation, posts only need its Name, Label and Path.'''
+
+    def __init__(self, name, path):
+        self.Name = name
+        self.Label = name
+        self.Path = path
+
+
+def surfacePath(count):
+    '''surfacePath(count) ... Return a Path of count commands resembling a 3D surface finishing pass.'''
+    commands = [Path.Command('(surface)'), Path.Command('G0', {'Z': 15.0}), Path.Command('G0', {'X': 0.0, 'Y': 0.0})]
+    for i in range(count):
+        x = (i % 500) * 0.2
+        y = (i // 500) * 0.5
+        z = math.sin(x * 0.1) * math.cos(y * 0.1)
+        commands.append(Path.Command('G1', {'X': x, 'Y': y, 'Z': z, 'F': 20.0}))
+    commands.append(Path.Command('G0', {'Z': 15.0}))
+    return Path.Path(commands)
+
+
+def postLinesPerSecond(name, objects, args='--no-show-editor'):
+    '''postLinesPerSecond(name, objects, args='--no-show-editor') ... Post objects with the
+    named post processor and return (lines, seconds).'''
+    processor = PathPostProcessor.PostProcessor.load(name)
+    (fd, filename) = tempfile.mkstemp(suffix='.nc')
+    os.close(fd)
+    try:
+        begin = time.time()
+        gcode = processor.export(objects, filename, args)
+        seconds = time.time() - begin
+        if not gcode:
+            with open(filename, 'r') as fp:
+                gcode = fp.read()
+    finally:
+        os.remove(filename)
+    return (len(gcode.splitlines()), seconds)
+
+
+def run(count=100000, posts=None):
+    objects = [PathObject('Surface', surfacePath(count))]
+    print('{} commands'.format(count))
+    for name in posts if posts else PathPreferences.allAvailablePostProcessors():
+        try:
+            (lines, seconds) = postLinesPerSecond(name, objects)
+            print('{:20} {:10d} lines {:8.2f}s {:12.0f} lines/s'.format(name, lines, seconds, lines / max(seconds, 1e-9)))
+        except Exception as e: # pylint: disable=broad-except
+            print('{:20} failed: {}'.format(name, e))
+
+
+if __name__ == '__main__':
+    run()
@@ -26,7 +26,13 @@ import FreeCAD
 import Part
 import PathScripts.PathJob as PathJob
 import PathScripts.PathAdaptive as PathAdaptive
+import PathScripts.PathAdaptiveCache as PathAdaptiveCache
 import PathScripts.PathGeom as PathGeom
+import PathScripts.PathOpScheduler as PathOpScheduler
+import PathScripts.PathPreferences as PathPreferences
+import PathScripts.PathUtils as PathUtils
+import shutil
+import tempfile
 from PathTests.PathTestUtils import PathTestBase
 if FreeCAD.GuiUp:
     import PathScripts.PathAdaptiveGui as PathAdaptiveGui
@@ -47,6 +53,11 @@ class TestPathAdaptive(PathTestBase):
         is able to call static methods within this same class.
         '''
 
+        # Keep the results of the tests out of the user's adaptive cache
+        cls.cacheDirectory = tempfile.mkdtemp()
+        cls.userCacheDirectory = PathPreferences.preferences().GetString(PathPreferences.AdaptiveCacheDirectory, "")
+        PathPreferences.preferences().SetString(PathPreferences.AdaptiveCacheDirectory, cls.cacheDirectory)
+
         # Open existing FreeCAD document with test geometry
         doc = FreeCAD.open(FreeCAD.getHomePath() + 'Mod/Path/PathTests/test_adaptive.fcstd')
 
@@ -77,6 +88,9 @@ class TestPathAdaptive(PathTestBase):
         # Close geometry document without saving
         FreeCAD.closeDocument(FreeCAD.ActiveDocument.Name)
 
+        PathPreferences.preferences().SetString(PathPreferences.AdaptiveCacheDirectory, cls.userCacheDirectory)
+        shutil.rmtree(cls.cacheDirectory, ignore_errors=True)
+
     # Setup and tear down methods called before and after each unit test
     def setUp(self):
         '''setUp()...
@@ -322,6 +336,47 @@ class TestPathAdaptive(PathTestBase):
                 isInBox = True
                 break
         self.assertTrue(isInBox, "No paths originating within the inner hole.")
+
+    def test08(self):
+        '''test08() Verify paths computed in the worker pool match the serial computation.'''
+
+        ops = []
+        for face in ["Face3", "Face10"]:
+            adaptive = PathAdaptive.Create('Adaptive')
+            adaptive.Base = [(self.doc.Fusion, [face])]
+            adaptive.Label = "test08+"
+            adaptive.FinishingProfile = False
+            adaptive.StepOver = 75
+            adaptive.setExpression('StepDown', None)
+            adaptive.StepDown.Value = 20.0
+            _addViewProvider(adaptive)
+            ops.append(adaptive)
+
+        job = PathUtils.findParentJob(ops[0])
+        self.assertTrue(all(op in PathOpScheduler.independentOperations(job) for op in ops))
+        for op in ops:
+            op.removalshape = Part.Shape()
+        self.assertTrue(PathOpScheduler.precompute([job], 2) >= 2)
+        self.assertTrue(all(op.Proxy.precomputed for op in ops))
+        self.assertTrue(all(op.Proxy.preparedFingerprint for op in ops))
+        # preparing the ops doesn't modify them, execute() assigns the removal shape
+        self.assertTrue(all(op.removalshape.isNull() for op in ops))
+        self.doc.recompute()
+        self.assertFalse(any(op.removalshape.isNull() for op in ops))
+        self.assertFalse(any(op.Proxy.preparedFingerprint for op in ops))
+        pooled = [op.Path.toGCode() for op in ops]
+
+        # clearing the stored state and the cache forces each op to compute its paths serially
+        cache = PathAdaptiveCache.defaultCache()
+        self.assertEqual(cache.directory, self.cacheDirectory)
+        cache.clear()
+        self.assertEqual(cache.entries(), [])
+        for op in ops:
+            op.AdaptiveInputState = ""
+            op.Proxy.execute(op)
+            self.assertIsNone(op.Proxy.precomputed)
+
+        self.assertEqual(pooled, [op.Path.toGCode() for op in ops])
 # Eclass
 
 
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+
+import PathScripts.PathAdaptiveCache as PathAdaptiveCache
+import gzip
+import os
+import shutil
+import tempfile
+
+from PathTests.PathTestUtils import PathTestBase
+
+
+def results(n):
+    return [{"HelixCenterPoint": [1.0, 2.0], "StartPoint": [3.0, 4.0],
+             "AdaptivePaths": [[0, [[float(i), float(i) / 3] for i in range(n)]]], "ReturnMotionType": 1}]
+
+
+class TestPathAdaptiveCache(PathTestBase):
+    '''Unit tests for the on disk cache of adaptive results.'''
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test00(self):
+        '''Verify the input key does not depend on the order of the input state.'''
+        state = {"tool": 5.0, "stepover": 20.0, "geometry": [[[0.0, 0.0], [1.0, 0.5]]]}
+        other = {"geometry": [[[0.0, 0.0], [1.0, 0.5]]], "stepover": 20.0, "tool": 5.0}
+        self.assertEqual(PathAdaptiveCache.inputKey(state), PathAdaptiveCache.inputKey(other))
+        other["stepover"] = 20.000001
+        self.assertNotEqual(PathAdaptiveCache.inputKey(state), PathAdaptiveCache.inputKey(other))
+
+    def test01(self):
+        '''Verify results are stored and read back.'''
+        cache = PathAdaptiveCache.AdaptiveCache(self.directory, 1024 * 1024)
+        key = PathAdaptiveCache.inputKey({"tool": 5.0})
+        self.assertIsNone(cache.get(key))
+        self.assertFalse(cache.contains(key))
+        cache.put(key, results(10))
+        self.assertTrue(cache.contains(key))
+        self.assertEqual(results(10), cache.get(key))
+        # a second instance, e.g. of another document, shares the entries
+        self.assertEqual(results(10), PathAdaptiveCache.AdaptiveCache(self.directory, 1024 * 1024).get(key))
+        self.assertEqual([], [f for f in os.listdir(self.directory) if f.endswith('.tmp')])
+
+    def test02(self):
+        '''Verify least recently used entries are evicted.'''
+        cache = PathAdaptiveCache.AdaptiveCache(self.directory, 1024 * 1024)
+        for i in range(3):
+            cache.put(str(i), results(100 + i))
+            os.utime(cache.fileName(str(i)), (i, i))
+        size = sum(e[1] for e in cache.entries())
+
+        cache.get('0')
+        cache.maxBytes = size - 1
+        cache.evict()
+        self.assertTrue(cache.contains('0'))
+        self.assertFalse(cache.contains('1'))
+        self.assertTrue(cache.contains('2'))
+
+        cache.clear()
+        self.assertEqual([], cache.entries())
+
+    def test03(self):
+        '''Verify a disabled cache and unreadable entries.'''
+        cache = PathAdaptiveCache.AdaptiveCache(self.directory, 0)
+        cache.put('0', results(10))
+        self.assertFalse(cache.contains('0'))
+        self.assertIsNone(cache.get('0'))
+
+        cache.maxBytes = 1024 * 1024
+        with gzip.open(cache.fileName('0'), 'wt') as fp:
+            fp.write('[{"HelixCenterPoint"')
+        self.assertIsNone(cache.get('0'))
+        self.assertFalse(cache.contains('0'))
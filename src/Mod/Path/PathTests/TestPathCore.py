@@ -124,6 +124,12 @@ G0 Z0.500000
         p.setFromGCode(lines)
         self.assertEqual (p.toGCode(), output)
 
+        #create a path from a list of gcode lines, each line is one command
+        lines = ['G0 X1 Y2', 'T1 M6', 'X10 Y10', 'S1000', '(comment)']
+        p = Path.Path(lines)
+        self.assertEqual(p.Size, len(lines))
+        self.assertEqual(str(p.Commands), str([Path.Command(l) for l in lines]))
+
     def test20(self):
         """Test Path Tool and ToolTable object core functionality"""
 
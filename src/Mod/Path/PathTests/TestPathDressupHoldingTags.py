@@ -20,11 +20,55 @@
 # *                                                                         *
 # ***************************************************************************
 
+import FreeCAD
+import Part
+import Path
+import PathScripts.PathDressupHoldingTags as PathDressupHoldingTags
+import PathScripts.PathToolController as PathToolController
 import PathTests.PathTestUtils as PathTestUtils
 import math
 
 from FreeCAD import Vector
-from PathScripts.PathDressupHoldingTags import Tag
+from PathScripts.PathDressupHoldingTags import EdgeIndex, Tag, TagCache
+
+
+def createProfileWithTags(doc, positions):
+    '''createProfileWithTags(doc, positions) ... return the holding tags dressup of a square profile
+    from (10, 10) to (60, 60) at Z=0, with tags at the given positions.'''
+    base = doc.addObject('Path::FeaturePython', 'Profile')
+    base.addProperty('App::PropertyLink', 'ToolController', 'Path')
+    base.ToolController = PathToolController.Create()
+    commands = [Path.Command('G0', {'Z': 10}), Path.Command('G0', {'X': 10, 'Y': 10, 'Z': 10}), Path.Command('G1', {'Z': 0})]
+    for (x, y) in [(60, 10), (60, 60), (10, 60), (10, 10)]:
+        commands.append(Path.Command('G1', {'X': x, 'Y': y, 'Z': 0}))
+    commands.append(Path.Command('G0', {'Z': 10}))
+    base.Path = Path.Path(commands)
+
+    obj = doc.addObject('Path::FeaturePython', 'DressupTag')
+    PathDressupHoldingTags.ObjectTagDressup(obj, base)
+    obj.Width = 4
+    obj.Height = 2
+    obj.Angle = 45
+    obj.Radius = 0
+    obj.Positions = [Vector(x, y, 0) for (x, y) in positions]
+    obj.Disabled = []
+    return obj
+
+
+def unindexedPath(obj):
+    '''unindexedPath(obj) ... return the G-code of the dressup with every tag checked against every edge
+    and nothing taken from the cache.'''
+    proxy = obj.Proxy
+    pathData = proxy.pathData
+    cache = proxy.cache
+    proxy.cache = None
+    pathData.tagCandidates = lambda tags: [list(range(len(tags))) for e in pathData.edges]
+    try:
+        return proxy.createPath(obj, pathData, proxy.tags).toGCode()
+    finally:
+        del pathData.tagCandidates
+        proxy.cache = cache
+
 
 class TestHoldingTags(PathTestUtils.PathTestBase):
     """Unit tests for the HoldingTags dressup."""
@@ -68,3 +112,66 @@ class TestHoldingTags(PathTestUtils.PathTestBase):
         print(h)
         self.assertConeAt(tag.solid, Vector(0,0,-h * 0.01), 2.5, 0, h)
 
+    def test05(self):
+        """Verify tag solids are reused for equal tags and recreated once a tag moved."""
+        cache = TagCache()
+        tag = Tag(0, 10, 20, 4, 5, 60, 0, True)
+        tag.createSolidsAt(3, 1, cache)
+        same = Tag(1, 10, 20, 4, 5, 60, 0, True)
+        same.createSolidsAt(3, 1, cache)
+        self.assertIs(same.solid, tag.solid)
+        self.assertEqual(same.key(), tag.key())
+        self.assertRoughly(same.actualHeight, tag.actualHeight)
+
+        cache.nextGeneration()
+        moved = Tag(0, 11, 20, 4, 5, 60, 0, True)
+        moved.createSolidsAt(3, 1, cache)
+        self.assertIsNot(moved.solid, tag.solid)
+        cache.nextGeneration()
+        again = Tag(0, 10, 20, 4, 5, 60, 0, True)
+        again.createSolidsAt(3, 1, cache)
+        self.assertIsNot(again.solid, tag.solid)
+
+    def test06(self):
+        """Verify the edge index only returns edges close to the given bounds."""
+        pts = [Vector(0, 0, 0), Vector(10, 0, 0), Vector(10, 10, 0), Vector(0, 10, 0)]
+        edges = [Part.Edge(Part.LineSegment(pts[i], pts[(i + 1) % 4])) for i in range(4)]
+        index = EdgeIndex(edges)
+        self.assertEqual(index.nearPoint(Vector(5, 0, 0)), [0])
+        self.assertEqual(index.nearPoint(Vector(10, 0, 0)), [0, 1])
+        self.assertEqual(index.nearPoint(Vector(5, 5, 0)), [])
+        self.assertEqual(index.nearPoint(Vector(5, 0.05, 0), 0.1), [0])
+
+        tag = Tag(0, 10, 5, 4, 5, 90, 0, True)
+        tag.createSolidsAt(-1, 0)
+        self.assertEqual(index.near(tag.solid.BoundBox), [1])
+
+    def test07(self):
+        """Verify the indexed path matches the unindexed one and moving a tag only regenerates its span."""
+        doc = FreeCAD.newDocument('TestHoldingTags')
+        spans = []
+        commandsForEdges = PathDressupHoldingTags.MapWireToTag._commandsForEdges
+
+        def countingCommandsForEdges(mapper):
+            spans.append(mapper.tag.nr)
+            return commandsForEdges(mapper)
+
+        PathDressupHoldingTags.MapWireToTag._commandsForEdges = countingCommandsForEdges
+        try:
+            obj = createProfileWithTags(doc, [(35, 10), (60, 35), (35, 60), (10, 35)])
+            obj.Proxy.execute(obj)
+            self.assertEqual(sorted(spans), [0, 1, 2, 3])
+            self.assertEqual(obj.Disabled, [])
+            gcode = obj.Path.toGCode()
+            self.assertNotEqual(gcode, obj.Base.Path.toGCode())
+            self.assertEqual(gcode, unindexedPath(obj))
+
+            spans[:] = []
+            obj.Positions = [Vector(35, 10, 0), Vector(60, 40, 0), Vector(35, 60, 0), Vector(10, 35, 0)]
+            obj.Proxy.execute(obj)
+            self.assertEqual(spans, [1])
+            self.assertNotEqual(obj.Path.toGCode(), gcode)
+            self.assertEqual(obj.Path.toGCode(), unindexedPath(obj))
+        finally:
+            PathDressupHoldingTags.MapWireToTag._commandsForEdges = commandsForEdges
+            FreeCAD.closeDocument(doc.Name)
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import FreeCAD
+import Path
+import PathScripts.PathDressupZCorrect as PathDressupZCorrect
+import PathScripts.PathLog as PathLog
+import math
+import numpy
+import os
+import tempfile
+
+from PathTests.PathTestUtils import PathTestBase
+
+
+def plane(x, y):
+    return 0.5 + 0.01 * x - 0.02 * y
+
+
+class TestPathDressupZCorrect(PathTestBase):
+    '''Unit tests for the move discretization and execute of the Z correction dressup.'''
+
+    def setUp(self):
+        self.dressup = PathDressupZCorrect.ObjectDressup.__new__(PathDressupZCorrect.ObjectDressup)
+
+    def discretize(self, name, params, start, sampleD=1.0, curveD=0.01):
+        return self.dressup._discretize(Path.Command(name, params), numpy.array(start, dtype=float), sampleD, curveD)
+
+    def test00(self):
+        '''Verify G2 arcs turn clockwise and G3 arcs counter clockwise.'''
+        params = {'X': 0, 'Y': 10, 'I': -10, 'J': 0}
+        ccw = self.discretize('G3', params, (10, 0, 0))
+        cw = self.discretize('G2', params, (10, 0, 0))
+        for points in (ccw, cw):
+            self.assertTrue(numpy.allclose(numpy.hypot(points[:, 0], points[:, 1]), 10))
+            self.assertTrue(numpy.allclose(points[0], (10, 0, 0)))
+            self.assertTrue(numpy.allclose(points[-1], (0, 10, 0)))
+        # the quarter arc stays in the first quadrant, the three quarter arc passes through all others
+        self.assertGreater(ccw[:, 1].min(), -PathDressupZCorrect.PathGeom.Tolerance)
+        self.assertGreater(ccw[:, 0].min(), -PathDressupZCorrect.PathGeom.Tolerance)
+        self.assertRoughly(cw[:, 0].min(), -10, 0.01)
+        self.assertRoughly(cw[:, 1].min(), -10, 0.01)
+        self.assertGreater(len(cw), len(ccw))
+
+    def test01(self):
+        '''Verify an arc ending at its start is a full circle, its Z changes linearly along a helix.'''
+        points = self.discretize('G2', {'X': 10, 'Y': 0, 'Z': -3, 'I': -10, 'J': 0}, (10, 0, 0))
+        self.assertTrue(numpy.allclose(points[0], (10, 0, 0)))
+        self.assertTrue(numpy.allclose(points[-1], (10, 0, -3)))
+        self.assertRoughly(points[:, 0].min(), -10, 0.01)
+        self.assertRoughly(points[:, 1].max(), 10, 0.01)
+        self.assertRoughly(points[:, 1].min(), -10, 0.01)
+        # clockwise the angle decreases, the depth follows the swept angle
+        angle = numpy.unwrap(numpy.arctan2(points[:, 1], points[:, 0]))
+        self.assertTrue(numpy.all(numpy.diff(angle) < 0))
+        self.assertTrue(numpy.allclose(points[:, 2], -3 * angle / (-2 * math.pi)))
+
+    def test02(self):
+        '''Verify zero interpolation distances neither fail nor split without bounds.'''
+        points = self.discretize('G3', {'X': -10, 'Y': 0, 'I': -10, 'J': 0}, (10, 0, 0), curveD=0)
+        self.assertTrue(numpy.allclose(points[-1], (-10, 0, 0)))
+        self.assertLess(len(points), 1000)
+        step = 2 * math.acos(1 - PathDressupZCorrect.MinimumDeflection / 10)
+        self.assertEqual(len(points), int(math.ceil(math.pi / step)) + 1)
+
+        points = self.discretize('G1', {'X': 20, 'Y': 0}, (0, 0, 0), sampleD=0)
+        self.assertTrue(numpy.allclose(points, [(0, 0, 0), (20, 0, 0)]))
+        points = self.discretize('G1', {'X': 20, 'Y': 0}, (0, 0, 0), sampleD=2)
+        self.assertEqual(len(points), 10)
+        self.assertTrue(numpy.allclose(points[-1], (20, 0, 0)))
+
+
+class TestPathDressupZCorrectExecute(PathTestBase):
+    '''Tests of the Z correction dressup applied to the path of a document object.'''
+
+    def setUp(self):
+        self.doc = FreeCAD.newDocument("TestPathDressupZCorrect")
+        (fd, self.probefile) = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(fd, 'w') as f:
+            for y in [0, 10, 20]:
+                for x in [0, 10, 20]:
+                    f.write("{} {} {} 0 0 0 0 0 0\n".format(x, y, plane(x, y)))
+        self.warnings = []
+        self.warning = PathLog.warning
+        PathLog.warning = lambda msg: self.warnings.append(msg)
+
+    def tearDown(self):
+        PathLog.warning = self.warning
+        FreeCAD.closeDocument(self.doc.Name)
+        os.remove(self.probefile)
+
+    def createDressup(self, commands):
+        base = self.doc.addObject('Path::Feature', 'Base')
+        base.Path = Path.Path([Path.Command(name, params) for (name, params) in commands])
+        obj = self.doc.addObject('Path::FeaturePython', 'ZCorrect')
+        PathDressupZCorrect.ObjectDressup(obj)
+        obj.Base = base
+        obj.probefile = self.probefile
+        self.doc.recompute()
+        return obj
+
+    def test00(self):
+        '''Verify all feed moves are lifted onto the probed plane and rapids are kept.'''
+        obj = self.createDressup([
+            ('G0', {'X': 0, 'Y': 0, 'Z': 0}),
+            ('G1', {'X': 20, 'Y': 0}),
+            ('G2', {'X': 20, 'Y': 10, 'I': 0, 'J': 5}),
+            ('G1', {'X': 0, 'Y': 10})])
+        for method in ['Bilinear', 'Bicubic']:
+            obj.InterpolationMethod = method
+            self.doc.recompute()
+            commands = obj.Path.Commands
+            self.assertEqual(commands[0].Name, 'G0')
+            self.assertRoughly(commands[0].Parameters['Z'], 0)
+            self.assertTrue(all(cmd.Name == 'G1' for cmd in commands[1:]))
+            moves = [(cmd.Parameters['X'], cmd.Parameters['Y'], cmd.Parameters['Z']) for cmd in commands[1:]]
+            self.assertGreater(len(moves), 20)
+            for (x, y, z) in moves:
+                self.assertRoughly(z, plane(x, y))
+            # the arc bulges towards the center of the probed area
+            self.assertRoughly(min(x for (x, y, z) in moves if 0 < y < 10), 15, 0.01)
+            self.assertRoughly(moves[-1][0], 0)
+            self.assertRoughly(moves[-1][1], 10)
+        self.assertEqual(self.warnings, [])
+
+    def test01(self):
+        '''Verify moves leaving the probed area are corrected with the border and logged.'''
+        obj = self.createDressup([
+            ('G0', {'X': 0, 'Y': 0, 'Z': 0}),
+            ('G1', {'X': 25, 'Y': 0})])
+        self.assertEqual(len(self.warnings), 1)
+        self.assertRoughly(obj.Path.Commands[-1].Parameters['Z'], plane(20, 0))
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathDropCutter as PathDropCutter
+import PathTests.PathDropCutterBenchmark as PathDropCutterBenchmark
+import math
+import numpy
+import unittest
+
+from PathTests.PathTestUtils import PathTestBase
+
+try:
+    import ocl
+except ImportError:
+    ocl = None
+
+
+def flatSquare(z, size=10.0):
+    s = size / 2.0
+    return numpy.array([
+        [(-s, -s, z), (s, -s, z), (s, s, z)],
+        [(-s, -s, z), (s, s, z), (-s, s, z)]])
+
+
+class TestPathDropCutter(PathTestBase):
+    '''Test the built-in drop cutter engine.'''
+
+    def cutters(self):
+        return [PathDropCutter.CylCutter(4.0, 10.0),
+                PathDropCutter.BallCutter(4.0, 10.0),
+                PathDropCutter.BullCutter(4.0, 0.5, 10.0),
+                PathDropCutter.ConeCutter(4.0, math.radians(45.0), 10.0)]
+
+    def test00(self):
+        '''Verify all cutters rest on a flat surface and stay at minimum Z off the model.'''
+        tris = flatSquare(1.0)
+        xy = numpy.array([(0.0, 0.0), (4.0, -3.0), (20.0, 0.0)])
+        for cutter in self.cutters():
+            z = PathDropCutter.dropCutter(tris, cutter, xy, -5.0)
+            self.assertRoughly(z[0], 1.0)
+            self.assertRoughly(z[1], 1.0)
+            self.assertRoughly(z[2], -5.0)
+
+    def test01(self):
+        '''Verify ball cutter facet contact on an inclined plane.'''
+        g = 0.5
+        tris = flatSquare(0.0, 40.0)
+        tris[:, :, 2] = g * tris[:, :, 0]
+        cutter = PathDropCutter.BallCutter(4.0, 10.0)
+        z = PathDropCutter.dropCutter(tris, cutter, numpy.array([(1.0, 2.0)]), -50.0)
+        self.assertRoughly(z[0], g * 1.0 + 2.0 * (math.sqrt(1.0 + g * g) - 1.0))
+
+    def test02(self):
+        '''Verify edge contact next to a raised triangle.'''
+        tris = numpy.array([[(-5.0, 0.0, 3.0), (5.0, 0.0, 3.0), (0.0, 5.0, 3.0)]])
+        xy = numpy.array([(0.0, -1.0), (0.0, -2.5)])
+        cyl = PathDropCutter.dropCutter(tris, PathDropCutter.CylCutter(4.0, 10.0), xy, 0.0)
+        self.assertRoughly(cyl[0], 3.0)
+        self.assertRoughly(cyl[1], 0.0)
+        ball = PathDropCutter.dropCutter(tris, PathDropCutter.BallCutter(4.0, 10.0), xy, 0.0)
+        self.assertRoughly(ball[0], 3.0 - (2.0 - math.sqrt(3.0)))
+        cone = PathDropCutter.dropCutter(tris, PathDropCutter.ConeCutter(4.0, math.radians(45.0), 10.0), xy, 0.0)
+        self.assertRoughly(cone[0], 2.0)
+
+    def test03(self):
+        '''Verify path sampling and cutter locations of PathDropCutter.'''
+        stl = PathDropCutter.STLSurf()
+        stl.addTriangles(flatSquare(2.0))
+        pdc = PathDropCutter.PathDropCutter()
+        pdc.setSTL(stl)
+        pdc.setCutter(PathDropCutter.CylCutter(2.0, 10.0))
+        pdc.setZ(-1.0)
+        pdc.setSampling(1.0)
+        path = PathDropCutter.Path()
+        path.append(PathDropCutter.Line(PathDropCutter.Point(-4, 0, 0), PathDropCutter.Point(5.5, 0, 0)))
+        path.append(PathDropCutter.Arc(PathDropCutter.Point(3, 0, 0), PathDropCutter.Point(0, 3, 0), PathDropCutter.Point(0, 0, 0), True))
+        pdc.setPath(path)
+        pdc.run()
+        clp = pdc.getCLPoints()
+        self.assertEqual(len(clp), 11 + 6)
+        self.assertRoughly(clp[0].x, -4.0)
+        self.assertRoughly(clp[10].x, 5.5)
+        self.assertRoughly(clp[10].z, 2.0)
+        self.assertRoughly(clp[-1].x, 0.0)
+        self.assertRoughly(clp[-1].y, 3.0)
+        # arc stays on the circle
+        for p in clp[11:]:
+            self.assertRoughly(math.hypot(p.x, p.y), 3.0)
+            self.assertRoughly(p.z, 2.0)
+
+    def test04(self):
+        '''Verify STLSurf rotation.'''
+        stl = PathDropCutter.STLSurf()
+        stl.addTriangle(PathDropCutter.Triangle(PathDropCutter.Point(0, 1, 0), PathDropCutter.Point(1, 0, 0), PathDropCutter.Point(0, 0, 1)))
+        stl.rotate(math.pi / 2, 0.0, 0.0)
+        tri = stl.getTriangleArray()[0]
+        self.assertRoughly(tri[0][1], 0.0)
+        self.assertRoughly(tri[0][2], 1.0)
+        self.assertRoughly(tri[2][1], -1.0)
+        stl.rotate(0.0, math.pi / 2, 0.0)
+        tri = stl.getTriangleArray()[0]
+        self.assertRoughly(tri[1][0], 0.0)
+        self.assertRoughly(tri[1][2], -1.0)
+
+    @unittest.skipIf(ocl is None, 'OpenCamLib is not available')
+    def test05(self):
+        '''Verify the built-in drop cutter matches OpenCamLib.'''
+        for (name, error, speedup) in PathDropCutterBenchmark.compareEngines(ocl, size=40, lines=20):
+            self.assertTrue(error < 1e-6, '{} differs by {}'.format(name, error))
+
+    def test06(self):
+        '''Verify the Cutter base class can not be instantiated.'''
+        with self.assertRaises(TypeError):
+            PathDropCutter.Cutter(4.0, 10.0)
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+
+import FreeCAD
+import Part
+import Path
+import PathScripts.PathFingerprint as PathFingerprint
+
+from PathTests.PathTestUtils import PathTestBase
+
+
+class CountingDressup(object):
+    '''Minimal dressup copying the path of its base and counting its executions.'''
+
+    def __init__(self, obj, base):
+        obj.addProperty('App::PropertyLink', 'Base', 'Path')
+        obj.addProperty('App::PropertyLength', 'Offset', 'Path')
+        obj.Base = base
+        obj.Proxy = self
+        self.count = 0
+
+    @PathFingerprint.incremental
+    def execute(self, obj):
+        self.count += 1
+        obj.Path = obj.Base.Path
+
+
+class TestPathFingerprint(PathTestBase):
+    '''Unit tests for the fingerprints of ops and dressups.'''
+
+    def setUp(self):
+        self.doc = FreeCAD.newDocument('TestPathFingerprint')
+
+    def tearDown(self):
+        FreeCAD.closeDocument(self.doc.Name)
+
+    def test00(self):
+        '''Verify shape digests only depend on the geometry.'''
+        box = Part.makeBox(10, 20, 30)
+        self.assertEqual(PathFingerprint.shapeDigest(box), PathFingerprint.shapeDigest(Part.makeBox(10, 20, 30)))
+        self.assertNotEqual(PathFingerprint.shapeDigest(box), PathFingerprint.shapeDigest(Part.makeBox(10, 20, 31)))
+        moved = box.copy()
+        moved.translate(FreeCAD.Vector(1, 0, 0))
+        self.assertNotEqual(PathFingerprint.shapeDigest(box), PathFingerprint.shapeDigest(moved))
+        self.assertEqual(PathFingerprint.shapeDigest(Part.Shape()), 'null')
+
+        # mirrored bumps of a spline surface share vertices, bounds and area, only the surface differs
+        def bump(x):
+            surface = Part.makePlane(10, 10).toNurbs().Faces[0].Surface
+            surface.increaseDegree(2, 2)
+            surface.setPole(2, 2, FreeCAD.Vector(x, 5, 3))
+            return surface.toShape()
+        self.assertEqual(PathFingerprint.shapeDigest(bump(4)), PathFingerprint.shapeDigest(bump(4)))
+        self.assertNotEqual(PathFingerprint.shapeDigest(bump(4)), PathFingerprint.shapeDigest(bump(6)))
+
+    def test01(self):
+        '''Verify object digests follow input properties and linked shapes, but not results.'''
+        model = self.doc.addObject('Part::Box', 'Box')
+        obj = self.doc.addObject('Path::FeaturePython', 'Op')
+        obj.addProperty('App::PropertyLink', 'Model', 'Path')
+        obj.addProperty('App::PropertyLength', 'Depth', 'Path')
+        obj.Model = model
+        self.doc.recompute()
+
+        digest = PathFingerprint.objectDigest(obj)
+        obj.Path = Path.Path([Path.Command('G0', {'X': 1})])
+        self.assertEqual(PathFingerprint.objectDigest(obj), digest)
+        obj.Depth = 3
+        self.assertNotEqual(PathFingerprint.objectDigest(obj), digest)
+
+        digest = PathFingerprint.objectDigest(obj)
+        model.Height = 20
+        self.doc.recompute()
+        self.assertNotEqual(PathFingerprint.objectDigest(obj), digest)
+
+    def test02(self):
+        '''Verify dressups are only recomputed if they or their base changed.'''
+        base = self.doc.addObject('Path::Feature', 'Base')
+        base.Path = Path.Path([Path.Command('G1', {'X': 1})])
+        obj = self.doc.addObject('Path::FeaturePython', 'Dressup')
+        proxy = CountingDressup(obj, base)
+        self.doc.recompute()
+        self.assertEqual(proxy.count, 1)
+        self.assertNotEqual(obj.Fingerprint, '')
+
+        obj.touch()
+        self.doc.recompute()
+        self.assertEqual(proxy.count, 1)
+
+        obj.Offset = 2
+        self.doc.recompute()
+        self.assertEqual(proxy.count, 2)
+
+        base.Path = Path.Path([Path.Command('G1', {'X': 2})])
+        self.doc.recompute()
+        self.assertEqual(proxy.count, 3)
+        self.assertEqual(obj.Path.Commands[0].Parameters['X'], 2)
+
+        # explicit calls always execute
+        proxy.execute(obj)
+        self.assertEqual(proxy.count, 4)
+
+        PathFingerprint.clear(obj)
+        obj.touch()
+        self.doc.recompute()
+        self.assertEqual(proxy.count, 5)
+
+    def test03(self):
+        '''Verify forcing a recompute also recomputes the dressups depending on an object.'''
+        base = self.doc.addObject('Path::Feature', 'Base')
+        base.Path = Path.Path([Path.Command('G1', {'X': 1})])
+        obj = self.doc.addObject('Path::FeaturePython', 'Dressup')
+        proxy = CountingDressup(obj, base)
+        self.doc.recompute()
+        self.assertEqual(proxy.count, 1)
+
+        PathFingerprint.forceRecompute(base)
+        self.assertEqual(obj.Fingerprint, '')
+        self.doc.recompute()
+        self.assertEqual(proxy.count, 2)
+
+    def test04(self):
+        '''Verify shape properties are digested by their geometry and result shapes are ignored.'''
+        obj = self.doc.addObject('Path::FeaturePython', 'Op')
+        obj.addProperty('Part::PropertyPartShape', 'Surface', 'Path')
+        obj.addProperty('Part::PropertyPartShape', 'removalshape', 'Path')
+        obj.Surface = Part.makeBox(1, 1, 1)
+        digest = PathFingerprint.objectDigest(obj)
+        obj.Surface = Part.makeBox(1, 1, 1)
+        self.assertEqual(PathFingerprint.objectDigest(obj), digest)
+        obj.removalshape = Part.makeBox(2, 2, 2)
+        self.assertEqual(PathFingerprint.objectDigest(obj), digest)
+        obj.Surface = Part.makeBox(1, 1, 2)
+        self.assertNotEqual(PathFingerprint.objectDigest(obj), digest)
+
+    def test05(self):
+        '''Verify shape digests of face-less shapes follow the curves of their edges.'''
+        def wire(y):
+            spline = Part.BSplineCurve()
+            spline.buildFromPoles([FreeCAD.Vector(0, 0, 0), FreeCAD.Vector(3, y, 0), FreeCAD.Vector(7, 2, 0), FreeCAD.Vector(10, 0, 0)])
+            line = Part.makeLine(FreeCAD.Vector(10, 0, 0), FreeCAD.Vector(10, 10, 0))
+            return Part.Wire([spline.toShape(), line])
+        self.assertEqual(PathFingerprint.shapeDigest(wire(1)), PathFingerprint.shapeDigest(wire(1)))
+        # the vertexes are the same and the line spans the bounding box, only an interior pole of the spline moves
+        self.assertEqual(wire(1).BoundBox, wire(1.5).BoundBox)
+        self.assertNotEqual(PathFingerprint.shapeDigest(wire(1)), PathFingerprint.shapeDigest(wire(1.5)))
+
+    def test06(self):
+        '''Verify object shape digests are cached during a recompute and follow recomputed shapes.'''
+        box = self.doc.addObject('Part::Box', 'Box')
+        self.doc.recompute()
+        digest = PathFingerprint.objectShapeDigest(box)
+        PathFingerprint.beginRecompute()
+        try:
+            self.assertEqual(PathFingerprint.objectShapeDigest(box), digest)
+            self.assertEqual(PathFingerprint.objectShapeDigest(box), digest)
+            box.Height = 20
+            self.doc.recompute()
+            self.assertNotEqual(PathFingerprint.objectShapeDigest(box), digest)
+            self.assertEqual(PathFingerprint.objectShapeDigest(box), PathFingerprint.shapeDigest(box.Shape))
+        finally:
+            PathFingerprint.endRecompute()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathGcodeImport as PathGcodeImport
+import os
+import tempfile
+
+from PathTests.PathTestUtils import PathTestBase
+
+Gcode = '''(header)
+N10 G90
+N20 M6 T3
+G0 X1 Y2
+G1 Z-1 F100
+X2
+Y3
+G43 H3
+M3 S1000
+T5 M06
+N30 G2 X0 Y0 I1 J1
+x4
+M6T7
+'''
+
+
+class TestPathGcodeImport(PathTestBase):
+    '''Test splitting and cleaning of imported G-code.'''
+
+    def test00(self):
+        '''Verify line numbers, modal moves and unsupported commands.'''
+        sections = PathGcodeImport.GcodeReader().parse(Gcode)
+        self.assertEqual([tool for tool, _ in sections], [0, 3, 5])
+        self.assertEqual(sections[0][1], ['G90'])
+        self.assertEqual(sections[1][1], ['G0 X1 Y2', 'G1 Z-1 F100', 'G1 X2', 'G1 Y3'])
+        self.assertEqual(sections[2][1], ['G2 X0 Y0 I1 J1'])
+
+    def test01(self):
+        '''Verify reading a file in chunks gives the same result as parsing it.'''
+        (fd, filename) = tempfile.mkstemp(suffix='.nc')
+        with os.fdopen(fd, 'w') as fp:
+            fp.write(Gcode * 10)
+        try:
+            expected = PathGcodeImport.GcodeReader().parse(Gcode * 10)
+            for chunkSize in [3, 16, 1000]:
+                progress = []
+                reader = PathGcodeImport.GcodeReader(chunkSize=chunkSize)
+                self.assertEqual(reader.read(filename, lambda done, size: progress.append((done, size))), expected)
+                self.assertFalse(reader.cancelled)
+                self.assertEqual(progress[-1], (os.path.getsize(filename), os.path.getsize(filename)))
+        finally:
+            os.remove(filename)
+
+    def test02(self):
+        '''Verify reading stops when progress returns False.'''
+        (fd, filename) = tempfile.mkstemp(suffix='.nc')
+        with os.fdopen(fd, 'w') as fp:
+            fp.write(Gcode * 10)
+        try:
+            progress = []
+
+            def cancel(done, size):
+                progress.append(done)
+                return len(progress) < 3
+
+            reader = PathGcodeImport.GcodeReader(chunkSize=16)
+            self.assertIsNone(reader.read(filename, cancel))
+            self.assertTrue(reader.cancelled)
+            self.assertEqual(progress, [16, 32, 48])
+        finally:
+            os.remove(filename)
+
+    def test03(self):
+        '''Verify only the tool change is removed from a line, the moves around it are kept.'''
+        sections = PathGcodeImport.GcodeReader().parse('G0 X1\nG0 Z5 M6 T2\nG1 X3 T4 M6 Y2\nN40 M6 T5 G0 X0\n')
+        self.assertEqual([tool for tool, _ in sections], [0, 2, 4, 5])
+        self.assertEqual(sections[0][1], ['G0 X1', 'G0 Z5'])
+        self.assertEqual(sections[1][1], ['G1 X3'])
+        self.assertEqual(sections[2][1], ['G1 Y2'])
+        self.assertEqual(sections[3][1], ['G0 X0'])
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathHeightMap as PathHeightMap
+import PathScripts.PathUtils as PathUtils
+import numpy
+
+from FreeCAD import Vector
+from PathTests.PathTestUtils import PathTestBase
+
+
+def loopArea(loop):
+    return 0.5 * numpy.sum(loop[:-1, 0] * loop[1:, 1] - loop[1:, 0] * loop[:-1, 1])
+
+
+class TestPathHeightMap(PathTestBase):
+    '''Test height map waterlines and point array helpers.'''
+
+    def islandMap(self):
+        z = numpy.zeros((8, 10))
+        z[2:5, 3:7] = 5.0
+        return PathHeightMap.HeightMap(numpy.arange(10.0), numpy.arange(8.0) * 2, z, 1.0)
+
+    def test00(self):
+        '''Verify height map construction from scan points.'''
+        pnts = numpy.array([(x, y, x * y) for y in range(3) for x in range(4)], dtype=float)
+        hm = PathHeightMap.HeightMap.fromScanPoints(pnts, 3, 1.0)
+        self.assertEqual(hm.z.shape, (3, 4))
+        self.assertEqual(hm.x.tolist(), [0, 1, 2, 3])
+        self.assertEqual(hm.y.tolist(), [0, 1, 2])
+        self.assertEqual(hm.z[2].tolist(), [0, 2, 4, 6])
+        self.assertEqual(hm.topoMap(1.5).shape, (5, 6))
+        self.assertFalse(hm.topoMap(1.5)[0].any())
+
+    def test01(self):
+        '''Verify waterline around a single island.'''
+        hm = self.islandMap()
+        loops = hm.waterlines(1.0)
+        self.assertEqual(len(loops), 1)
+        loop = loops[0]
+        self.assertEqual(loop[0].tolist(), loop[-1].tolist())
+        # counter-clockwise around material, outside of the island
+        self.assertRoughly(loopArea(loop), 36.0)
+        self.assertRoughly(loop[:, 0].min(), 2.0)
+        self.assertRoughly(loop[:, 0].max(), 7.0)
+        self.assertRoughly(loop[:, 1].min(), 2.0)
+        self.assertRoughly(loop[:, 1].max(), 10.0)
+        # climb milling reverses the direction
+        self.assertRoughly(loopArea(hm.waterlines(1.0, True)[0]), -36.0)
+        # no waterline above the material
+        self.assertEqual(hm.waterlines(6.0), [])
+
+    def test02(self):
+        '''Verify waterlines of a pocket inside an island.'''
+        z = numpy.zeros((9, 9))
+        z[1:8, 1:8] = 5.0
+        z[3:6, 3:6] = 0.0
+        hm = PathHeightMap.HeightMap(numpy.arange(9.0), numpy.arange(9.0), z, 1.0)
+        areas = sorted(loopArea(loop) for loop in hm.waterlines(1.0))
+        self.assertEqual(len(areas), 2)
+        self.assertRoughly(areas[0], -4.0)
+        self.assertRoughly(areas[1], 62.0)
+
+    def test03(self):
+        '''Verify simplifyPoints matches simplify3dLine.'''
+        pnts = [Vector(x, 0.1 * (x % 3), 0.5 * (x // 4)) for x in range(30)]
+        expected = PathUtils.simplify3dLine(pnts, tolerance=0.15)
+        arr = PathHeightMap.pointsToArray(pnts)
+        result = arr[PathHeightMap.simplifyPoints(arr, tolerance=0.15)]
+        self.assertEqual(len(result), len(expected))
+        for (pnt, row) in zip(expected, result):
+            self.assertCoincide(pnt, Vector(*row.tolist()))
+
+    def test04(self):
+        '''Verify linear move commands from point arrays.'''
+        cmds = PathHeightMap.linearMoveCommands(numpy.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]), 100.0, 'XY')
+        self.assertEqual(len(cmds), 2)
+        self.assertEqual(cmds[1].Name, 'G1')
+        self.assertRoughly(cmds[1].Parameters['X'], 4.0)
+        self.assertRoughly(cmds[1].Parameters['Y'], 5.0)
+        self.assertFalse('Z' in cmds[1].Parameters)
+        self.assertRoughly(cmds[1].Parameters['F'], 100.0)
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+
+import FreeCAD
+import Part
+import Path
+import PathScripts.PathFingerprint as PathFingerprint
+import PathScripts.PathJob as PathJob
+import PathScripts.PathOp as PathOp
+import PathScripts.PathOpScheduler as PathOpScheduler
+
+from PathTests.PathTestUtils import PathTestBase
+
+
+class PlainOp(PathOp.ObjectOp):
+    '''Minimal op without any features, computing its path on the main thread.'''
+
+    def opFeatures(self, obj):
+        return 0
+
+    def initOperation(self, obj):
+        self.executed = []
+
+    def opExecute(self, obj):
+        self.executed.append(self.precomputed)
+        self.commandlist.append(Path.Command('G0', {'X': 1.0}))
+
+
+class PreparedOp(PlainOp):
+    '''Minimal op computing its path in the worker pool.'''
+
+    def opPrepare(self, obj):
+        label = obj.Label
+        return lambda: label
+
+
+def createOp(cls, name):
+    obj = FreeCAD.ActiveDocument.addObject('Path::FeaturePython', name)
+    obj.Proxy = cls(obj, name)
+    return obj
+
+
+class TestPathOpScheduler(PathTestBase):
+    '''Unit tests for the computation of independent ops in the worker pool.'''
+
+    def setUp(self):
+        self.doc = FreeCAD.newDocument('TestPathOpScheduler')
+        box = self.doc.addObject('Part::Feature', 'Box')
+        box.Shape = Part.makeBox(10, 10, 10)
+        self.job = PathJob.Create('Job', [box])
+        self.ops = [createOp(PreparedOp, 'Op1'), createOp(PreparedOp, 'Op2')]
+        self.doc.recompute()
+
+    def tearDown(self):
+        FreeCAD.closeDocument(self.doc.Name)
+
+    def change(self, ops):
+        # a changed input, touching alone keeps the paths of unchanged ops
+        for op in ops:
+            op.Comment = op.Comment + '+'
+
+    def test00(self):
+        '''Verify only pending active ops which can prepare and don't depend on pending objects are independent.'''
+        self.assertEqual(PathOpScheduler.independentOperations(self.job), [])
+        self.change(self.ops)
+        self.assertEqual(PathOpScheduler.independentOperations(self.job), self.ops)
+
+        self.ops[1].addProperty('App::PropertyLink', 'Dependency', 'Path')
+        self.ops[1].Dependency = self.ops[0]
+        self.assertEqual(PathOpScheduler.independentOperations(self.job), [self.ops[0]])
+
+        self.ops[0].Active = False
+        self.assertEqual(PathOpScheduler.independentOperations(self.job), [])
+
+        plain = createOp(PlainOp, 'Plain')
+        self.assertFalse(plain in PathOpScheduler.independentOperations(self.job))
+
+    def test01(self):
+        '''Verify prepared results and fingerprints are handed to execute.'''
+        self.change(self.ops)
+        self.assertEqual(PathOpScheduler.precompute([self.job], 2), 2)
+        self.assertEqual([op.Proxy.precomputed for op in self.ops], ['Op1', 'Op2'])
+        self.assertTrue(all(op.Proxy.preparedFingerprint for op in self.ops))
+
+        self.doc.recompute()
+        self.assertEqual([op.Proxy.executed[-1] for op in self.ops], ['Op1', 'Op2'])
+        self.assertTrue(all(op.Proxy.precomputed is None for op in self.ops))
+        self.assertTrue(all(op.Proxy.preparedFingerprint is None for op in self.ops))
+
+        # unchanged ops are neither prepared nor executed
+        count = [len(op.Proxy.executed) for op in self.ops]
+        for op in self.ops:
+            op.touch()
+        self.assertEqual(PathOpScheduler.precompute([self.job], 2), 0)
+        self.doc.recompute()
+        self.assertEqual([len(op.Proxy.executed) for op in self.ops], count)
+
+    def test02(self):
+        '''Verify a single op is left to the recompute.'''
+        self.change(self.ops[:1])
+        self.assertEqual(PathOpScheduler.precompute([self.job], 2), 0)
+        self.assertIsNone(self.ops[0].Proxy.precomputed)
+
+    def test03(self):
+        '''Verify release drops what was prepared for ops which weren't executed.'''
+        self.change(self.ops)
+        PathOpScheduler.precompute([self.job], 2)
+        PathOpScheduler.release([self.job])
+        self.assertTrue(all(op.Proxy.precomputed is None for op in self.ops))
+        self.assertTrue(all(op.Proxy.preparedFingerprint is None for op in self.ops))
+
+    def test04(self):
+        '''Verify the observer prepares the jobs of a document and caches shape digests until it's recomputed.'''
+        observer = PathOpScheduler.DocumentObserver()
+        self.assertEqual(observer.jobs(self.doc), [self.job])
+
+        self.change(self.ops)
+        observer.slotBeforeRecomputeDocument(self.doc)
+        try:
+            self.assertEqual([op.Proxy.precomputed for op in self.ops], ['Op1', 'Op2'])
+            self.assertIsNotNone(PathFingerprint._digests)  # pylint: disable=protected-access
+        finally:
+            observer.slotRecomputedDocument(self.doc)
+        self.assertIsNone(PathFingerprint._digests)  # pylint: disable=protected-access
+        self.assertTrue(all(op.Proxy.precomputed is None for op in self.ops))
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathOrdering as PathOrdering
+import math
+import random
+
+from PathTests.PathTestUtils import PathTestBase
+
+
+def bruteForceOrder(points, weights, start=(0.0, 0.0)):
+    remaining = list(range(len(points)))
+    order = []
+    pos = start
+    while remaining:
+        i = min(remaining, key=lambda j: ((points[j][0] - pos[0]) ** 2 + (points[j][1] - pos[1]) ** 2 + weights[j], j))
+        remaining.remove(i)
+        order.append(i)
+        pos = points[i]
+    return order
+
+
+class TestPathOrdering(PathTestBase):
+    '''Test nearest neighbour and 2-opt ordering of holes and wires.'''
+
+    def test00(self):
+        '''Verify grid nearest neighbour queries match a brute force search.'''
+        rnd = random.Random(7)
+        points = [(rnd.uniform(-50, 50), rnd.uniform(0, 20)) for _ in range(300)]
+        grid = PathOrdering.PointGrid(points)
+        for pt in [(0, 0), (-200, 300), (10, 10), points[17]]:
+            expected = sorted(range(len(points)), key=lambda i: (points[i][0] - pt[0]) ** 2 + (points[i][1] - pt[1]) ** 2)
+            self.assertEqual(grid.nearest(pt), expected[0])
+            self.assertEqual(grid.nearestK(pt, 5), expected[:5])
+
+    def test01(self):
+        '''Verify locations are sorted like the nearest neighbour method including ties.'''
+        rnd = random.Random(11)
+        grid = [{'x': float(i % 6) * 5, 'y': float(i // 6) * 5} for i in range(42)]
+        line = [{'x': 3.0, 'y': rnd.choice([1.0, 2.0, 5.0])} for i in range(20)]
+        scatter = [{'x': rnd.uniform(-100, 100), 'y': rnd.uniform(-100, 100)} for i in range(200)]
+        for locations in [grid, line, scatter]:
+            points = [(loc['x'], loc['y']) for loc in locations]
+            expected = bruteForceOrder(points, [abs(p[0]) for p in points])
+            (result, _) = PathOrdering.sortLocations(locations, ['x', 'y'])
+            self.assertEqual([id(loc) for loc in result], [id(locations[i]) for i in expected])
+
+    def test02(self):
+        '''Verify wires are entered at their closest end.'''
+        begins = [(10, 0), (20, 0), (0, 5)]
+        ends = [(15, 0), (16, 0), (0, 1)]
+        order = PathOrdering.nearestNeighbourOrder(begins, ends)
+        self.assertEqual(order, [(2, True), (0, False), (1, True)])
+        self.assertRoughly(PathOrdering.rapidDistance(begins, ends, order), 1 + math.hypot(10, 5) + 1)
+
+    def test03(self):
+        '''Verify 2-opt returns a permutation which isn't longer than the nearest neighbour order.'''
+        rnd = random.Random(5)
+        begins = [(rnd.uniform(0, 100), rnd.uniform(0, 100)) for _ in range(400)]
+        ends = [(x + rnd.uniform(-3, 3), y + rnd.uniform(-3, 3)) for (x, y) in begins]
+        for e in [None, ends]:
+            order = PathOrdering.nearestNeighbourOrder(begins, e)
+            better = PathOrdering.twoOpt(begins, e, order)
+            self.assertEqual(sorted(i for (i, _) in better), list(range(len(begins))))
+            e = begins if e is None else e
+            self.assertTrue(PathOrdering.rapidDistance(begins, e, better) < PathOrdering.rapidDistance(begins, e, order))
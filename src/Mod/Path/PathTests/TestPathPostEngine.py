@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import Path
+import PathScripts.PathPostEngine as PathPostEngine
+import os
+import tempfile
+
+from PathTests.PathTestUtils import PathTestBase
+
+
+class PathObject(object):
+    def __init__(self, commands):
+        self.Name = 'Profile'
+        self.Label = 'Profile'
+        self.Path = Path.Path(commands)
+
+
+class TestPathPostEngine(PathTestBase):
+    '''Test the streaming post processor engine.'''
+
+    def post(self, commands, **kwargs):
+        post = PathPostEngine.PostProcessor(PathPostEngine.Dialect(**kwargs))
+        post.parse(PathObject(commands))
+        return post.getOutput()
+
+    def test00(self):
+        '''Verify parameter order, precision and unit conversion.'''
+        cmds = [Path.Command('G1', {'F': 10.0, 'Z': 1.0, 'Y': 2.0, 'X': 25.4, 'K': 3.0})]
+        self.assertEqual(self.post(cmds), 'G1 X25.400 Y2.000 Z1.000 F600.000 \n')
+        self.assertEqual(self.post(cmds, units='G20', precision=4), 'G1 X1.0000 Y0.0787 Z0.0394 F23.6220 \n')
+
+    def test01(self):
+        '''Verify rapid moves and integer parameters.'''
+        cmds = [Path.Command('G0', {'X': 1.0, 'F': 10.0}),
+                Path.Command('M3', {'S': 12000.0}),
+                Path.Command('G81', {'Z': -1.0, 'R': 2.0, 'F': 0.0})]
+        self.assertEqual(self.post(cmds, trailingSpace=False), 'G0 X1.000\nM3 S12000\nG81 Z-1.000 R2.000\n')
+
+    def test02(self):
+        '''Verify modal commands and suppression of doubles.'''
+        cmds = [Path.Command('G1', {'X': 1.0, 'Y': 1.0, 'F': 5.0}),
+                Path.Command('G1', {'X': 2.0, 'Y': 1.0, 'F': 5.0}),
+                Path.Command('G0', {'X': 2.0, 'Z': 3.0})]
+        self.assertEqual(self.post(cmds, modal=True, trailingSpace=False),
+                         'G1 X1.000 Y1.000 F300.000\nX2.000 Y1.000 F300.000\nG0 X2.000 Z3.000\n')
+        self.assertEqual(self.post(cmds, outputDoubles=False, trailingSpace=False),
+                         'G1 X1.000 Y1.000 F300.000\nG1 X2.000\nG0 Z3.000\n')
+
+    def test03(self):
+        '''Verify comments, messages and tool changes.'''
+        cmds = [Path.Command('(Profile)'),
+                Path.Command('message', {}),
+                Path.Command('M6', {'T': 2.0})]
+        self.assertEqual(self.post(cmds, trailingSpace=False, toolChange='M0\n'), '(Profile)\nM5\nM0\nM6 T2 \nG43 H2\n')
+        self.assertEqual(self.post(cmds, trailingSpace=False, outputComments=False, toolLengthOffset=False),
+                         'M5\nM6 T2\n')
+
+    def test04(self):
+        '''Verify line numbers and group recursion.'''
+        class Group(object):
+            Group = [PathObject([Path.Command('G0', {'Z': 1.0})]), object(), PathObject([Path.Command('G0', {'Z': 1.0})])]
+
+        post = PathPostEngine.PostProcessor(PathPostEngine.Dialect(lineNumbers=True, trailingSpace=False))
+        post.parse(Group())
+        self.assertEqual(post.getOutput(), 'N110  G0 Z1.000\nN120  G0 Z1.000\n')
+
+    def test05(self):
+        '''Verify export streams into the output file and returns what it wrote.'''
+        from PathScripts.post import linuxcnc_post as postprocessor
+        cmds = [Path.Command('G0', {'Z': 5.0}), Path.Command('G1', {'X': 1.0, 'F': 1.0})]
+        args = '--no-header --no-comments --no-show-editor'
+        gcode = postprocessor.export([PathObject(cmds)], '-', args)
+        self.assertTrue('G1 X' in gcode)
+
+        (fd, filename) = tempfile.mkstemp(suffix='.ngc')
+        os.close(fd)
+        try:
+            self.assertEqual(postprocessor.export([PathObject(cmds)], filename, args), gcode)
+            with open(filename, 'r') as fp:
+                self.assertEqual(fp.read(), gcode)
+        finally:
+            os.remove(filename)
+
+    def test06(self):
+        '''Verify the jtech post switches the laser between feed and rapid moves and drops tool changes.'''
+        from PathScripts.post import jtech_post as postprocessor
+        cmds = [Path.Command('M6', {'T': 1.0}),
+                Path.Command('G0', {'X': 1.0}),
+                Path.Command('G1', {'X': 2.0, 'F': 1.0}),
+                Path.Command('G0', {'X': 3.0})]
+        postprocessor.POWER_ON_DELAY = 0.5
+        self.assertEqual(postprocessor.parse(PathObject(cmds)),
+                         'G0 X1.000\nM03\nG4 P0.5\nG1 X2.000 F60.000\nM05\nG0 X3.000\n')
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+
+import PathScripts.PathProbeMap as PathProbeMap
+import numpy
+import os
+import tempfile
+
+from PathTests.PathTestUtils import PathTestBase
+
+
+def plane(x, y):
+    return 0.5 + 0.01 * x - 0.02 * y
+
+
+class TestPathProbeMap(PathTestBase):
+    '''Unit tests for the probe map of the Z correction dressup.'''
+
+    def gridPoints(self, func, xs, ys):
+        return [(x, y, func(x, y)) for y in ys for x in xs]
+
+    def test00(self):
+        '''Verify probe points are arranged into a grid regardless of their order.'''
+        points = self.gridPoints(plane, [0, 10, 20], [0, 5])
+        probeMap = PathProbeMap.ProbeMap.fromPoints(list(reversed(points)))
+        self.assertEqual(list(probeMap.xs), [0, 10, 20])
+        self.assertEqual(list(probeMap.ys), [0, 5])
+        self.assertRoughly(probeMap.zs[1, 2], plane(20, 5))
+        self.assertEqual(probeMap.points().shape, (2, 3, 3))
+
+    def test01(self):
+        '''Verify incomplete and repeated grids are rejected.'''
+        points = self.gridPoints(plane, [0, 10, 20], [0, 5])
+        self.assertRaises(ValueError, PathProbeMap.ProbeMap.fromPoints, points[:-1])
+        self.assertRaises(ValueError, PathProbeMap.ProbeMap.fromPoints, points + points[:1])
+        self.assertRaises(ValueError, PathProbeMap.ProbeMap.fromPoints, points[:3])
+
+    def test02(self):
+        '''Verify both methods reproduce the probed heights and planes, and clamp at the border.'''
+        xs = [0, 10, 25, 30]
+        ys = [0, 5, 10, 20]
+        probeMap = PathProbeMap.ProbeMap.fromPoints(self.gridPoints(plane, xs, ys))
+        (x, y) = numpy.meshgrid(numpy.linspace(0, 30, 13), numpy.linspace(0, 20, 9))
+        for method in PathProbeMap.Methods:
+            z = probeMap.interpolate(x, y, method)
+            self.assertEqual(z.shape, x.shape)
+            self.assertTrue(numpy.allclose(z, plane(x, y)), method)
+            self.assertTrue(numpy.allclose(probeMap.interpolate(probeMap.points()[:, :, 0], probeMap.points()[:, :, 1], method), probeMap.zs))
+            self.assertRoughly(probeMap.interpolate(-5, 40, method), plane(0, 20))
+
+    def test03(self):
+        '''Verify bicubic interpolation follows a curved surface closer than bilinear.'''
+        def bowl(x, y):
+            return 0.001 * (x * x + y * y)
+
+        grid = numpy.arange(0, 51, 10)
+        probeMap = PathProbeMap.ProbeMap.fromPoints(self.gridPoints(bowl, grid, grid))
+        (x, y) = numpy.meshgrid(numpy.linspace(10, 40, 31), numpy.linspace(10, 40, 31))
+        linear = numpy.abs(probeMap.interpolate(x, y, PathProbeMap.Bilinear) - bowl(x, y)).max()
+        cubic = numpy.abs(probeMap.interpolate(x, y, PathProbeMap.Bicubic) - bowl(x, y)).max()
+        self.assertRoughly(cubic, 0)
+        self.assertGreater(linear, 0.01)
+
+    def test04(self):
+        '''Verify probe files are read and rounded like G38 logs.'''
+        (fd, name) = tempfile.mkstemp(suffix='.txt')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                for (x, y, z) in self.gridPoints(plane, [0, 10], [0, 10]):
+                    f.write("{} {} {} 0 0 0 0 0 0\n\n".format(x + 0.001, y, z))
+            probeMap = PathProbeMap.ProbeMap.fromFile(name)
+            self.assertEqual(list(probeMap.xs), [0, 10])
+            self.assertRoughly(probeMap.zs[1, 1], round(plane(10, 10), 2))
+            with open(name, 'w') as f:
+                f.write("G38.2 X10\n")
+            self.assertRaises(ValueError, PathProbeMap.readProbeFile, name)
+        finally:
+            os.remove(name)
+
+    def test05(self):
+        '''Verify positions past the border of the grid are reported as outside.'''
+        probeMap = PathProbeMap.ProbeMap.fromPoints(self.gridPoints(plane, [0, 10, 20], [0, 5]))
+        x = numpy.array([0, 20, 10, -0.1, 20.1, 10, 10])
+        y = numpy.array([0, 5, 2.5, 0, 0, -0.1, 5.1])
+        self.assertEqual(list(probeMap.outside(x, y)), [False, False, False, True, True, True, True])
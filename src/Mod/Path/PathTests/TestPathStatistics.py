@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+
+import Path
+import PathScripts.PathStatistics as PathStatistics
+import math
+
+from PathTests.PathTestUtils import PathTestBase
+
+
+def statistics(commands, hFeed=10.0, vFeed=5.0, hRapid=100.0, vRapid=50.0, tool=1):
+    block = PathStatistics.Block('op', tool, hFeed, vFeed, hRapid, vRapid)
+    return PathStatistics.SegmentTable([(Path.Path(commands), block)])
+
+
+class TestPathStatistics(PathTestBase):
+    '''Unit tests for the segment table and the statistics computed from it.'''
+
+    def test00(self):
+        '''Verify distances, cycle time and bounding box of straight moves.'''
+        stats = statistics([
+            Path.Command('G0', {'Z': 10}),
+            Path.Command('G0', {'X': 30, 'Y': 40}),
+            Path.Command('G1', {'Z': 0}),
+            Path.Command('G1', {'X': 60}),
+            Path.Command('M3'),
+            Path.Command('G1', {'X': 60})])
+        self.assertEqual(5, len(stats))
+        self.assertRoughly(40, stats.feedDistance())
+        self.assertRoughly(60, stats.rapidDistance())
+        # vertical moves use the vertical rates
+        self.assertRoughly(0.2 + 0.5 + 2 + 3, stats.cycleTime())
+        bb = stats.boundBox()
+        self.assertRoughly(0, bb.XMin)
+        self.assertRoughly(60, bb.XMax)
+        self.assertRoughly(40, bb.YMax)
+        self.assertRoughly(10, bb.ZMax)
+
+        # unset rapid rates fall back to the feed rates
+        stats = statistics([Path.Command('G0', {'X': 20})], hRapid=0)
+        self.assertRoughly(2, stats.cycleTime())
+
+    def test01(self):
+        '''Verify arc lengths and their extent.'''
+        # full circle with radius 5 around (5, 0)
+        stats = statistics([Path.Command('G2', {'X': 0, 'Y': 0, 'I': 5, 'J': 0})])
+        self.assertRoughly(10 * math.pi, stats.feedDistance())
+        bb = stats.boundBox()
+        self.assertRoughly(0, bb.XMin)
+        self.assertRoughly(10, bb.XMax)
+        self.assertRoughly(-5, bb.YMin)
+        self.assertRoughly(5, bb.YMax)
+
+        # three quarters counter clockwise from (10, 0) to (0, -10) around the origin, rising 3 * pi
+        stats = statistics([
+            Path.Command('G0', {'X': 10}),
+            Path.Command('G3', {'X': 0, 'Y': -10, 'Z': 3 * math.pi, 'I': -10, 'J': 0})])
+        self.assertRoughly(math.hypot(15 * math.pi, 3 * math.pi), stats.feedDistance())
+        bb = stats.boundBox()
+        self.assertRoughly(-10, bb.XMin)
+        self.assertRoughly(10, bb.YMax)
+        self.assertRoughly(-10, bb.YMin)
+
+        # the same end point reached clockwise is a quarter
+        stats = statistics([
+            Path.Command('G0', {'X': 10}),
+            Path.Command('G2', {'X': 0, 'Y': -10, 'I': -10, 'J': 0})])
+        self.assertRoughly(5 * math.pi, stats.feedDistance())
+        self.assertRoughly(0, stats.boundBox().YMax)
+
+    def test02(self):
+        '''Verify the acceleration aware cycle time.'''
+        # from rest to rest: 1s accelerating and decelerating each, covering 10mm, plus 9s cruising
+        stats = statistics([Path.Command('G1', {'X': 100})])
+        self.assertRoughly(10, stats.cycleTime())
+        self.assertRoughly(11, stats.cycleTime(10))
+
+        # a straight move split up takes just as long
+        stats = statistics([Path.Command('G1', {'X': x}) for x in range(10, 101, 10)])
+        self.assertRoughly(11, stats.cycleTime(10))
+
+        # the machine stops at a right angle
+        stats = statistics([Path.Command('G1', {'X': 50}), Path.Command('G1', {'Y': 50})])
+        self.assertRoughly(12, stats.cycleTime(10))
+
+        # a short move never reaches its rate: 1mm from rest to rest with 10mm/s^2
+        stats = statistics([Path.Command('G1', {'X': 1})])
+        self.assertRoughly(2 * math.sqrt(0.1), stats.cycleTime(10))
+
+    def test03(self):
+        '''Verify drill cycles and usage breakdowns.'''
+        stats = statistics([
+            Path.Command('G0', {'Z': 10}),
+            Path.Command('G98'),
+            Path.Command('G81', {'X': 10, 'Y': 0, 'Z': -5, 'R': 2, 'F': 5}),
+            Path.Command('G81', {'X': 20, 'Y': 0, 'Z': -5, 'R': 2, 'F': 5}),
+            Path.Command('G80'),
+            Path.Command('G1', {'X': 30, 'F': 10}),
+            Path.Command('G1', {'Z': -1})])
+        # each hole is a rapid to R, a feed of 7mm into it and a rapid back up to the initial height
+        self.assertRoughly(14 + 10 + 11, stats.feedDistance())
+        self.assertRoughly(10 + 10 + 8 + 15 + 10 + 8 + 15, stats.rapidDistance())
+        self.assertRoughly(-5, stats.boundBox().ZMin)
+
+        feeds = stats.feedUsage()
+        self.assertEqual([5.0, 10.0], sorted(feeds))
+        self.assertRoughly(14, feeds[5.0].feedDistance)
+        self.assertRoughly(0, feeds[5.0].rapidDistance)
+        self.assertEqual(2, feeds[10.0].segments)
+
+        depths = stats.depthUsage()
+        self.assertEqual([10.0], sorted(depths))
+        self.assertRoughly(10, depths[10.0].feedDistance)
+
+        tools = stats.toolUsage()
+        self.assertEqual([1], list(tools))
+        self.assertRoughly(stats.cycleTime(), tools[1].time)
+
+    def test04(self):
+        '''Verify consecutive blocks continue from the previous end and are kept apart.'''
+        first = PathStatistics.Block('first', 1, 10.0, 10.0, 100.0, 100.0)
+        second = PathStatistics.Block('second', 2, 5.0, 5.0, 0.0, 0.0)
+        stats = PathStatistics.SegmentTable([
+            (Path.Path([Path.Command('G1', {'X': 10})]), first),
+            (Path.Path([Path.Command('G1', {'X': 20})]), second)])
+        self.assertEqual(2, len(stats))
+        self.assertRoughly(3, stats.cycleTime())
+        usage = stats.blockUsage()
+        self.assertRoughly(1, usage[0].time)
+        self.assertRoughly(2, usage[1].time)
+        self.assertEqual([1, 2], sorted(stats.toolUsage()))
+        # the tool change stops the machine
+        self.assertRoughly(2 + 2.5, stats.cycleTime(10))
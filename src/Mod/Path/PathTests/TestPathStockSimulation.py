@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+
+import Path
+import PathScripts.PathDropCutter as PathDropCutter
+import PathScripts.PathStockSimulation as PathStockSimulation
+import collections
+import numpy
+
+from PathTests.PathTestUtils import PathTestBase
+
+
+def meshVolume(facets):
+    '''meshVolume(facets) ... signed volume enclosed by the facets, positive if they face outwards.'''
+    return numpy.sum(numpy.einsum('ij,ij->i', facets[:, 0], numpy.cross(facets[:, 1], facets[:, 2]))) / 6
+
+
+def openEdges(facets):
+    '''openEdges(facets) ... the directed edges which aren't matched by exactly one edge in the opposite
+    direction, empty for a closed and consistently oriented mesh.'''
+    edges = collections.Counter()
+    for facet in facets.tolist():
+        for i in range(3):
+            edges[(tuple(facet[i]), tuple(facet[i - 2]))] += 1
+    return [e for (e, n) in edges.items() if n != 1 or edges.get((e[1], e[0])) != 1]
+
+
+def box(blockSize=8):
+    return PathStockSimulation.StockSimulation(0, 0, 0, 20, 10, 5, 0.25, 0.01, blockSize)
+
+
+class TestPathStockSimulation(PathTestBase):
+    '''Unit tests for the height map stock simulation.'''
+
+    def test00(self):
+        '''Verify an uncut stock meshes into a closed box with one quad per block.'''
+        sim = box()
+        self.assertEqual((40, 80), sim.heights.shape)
+        self.assertEqual(50, sim.updateMesh())
+        self.assertEqual(0, sim.updateMesh())
+        # flat blocks are meshed as one quad, fanned out to the cells along the block border
+        self.assertEqual(2 * (10 * 39 + 5 * 79), len(sim.topFacets()))
+        self.assertRoughly(20 * 10 * 5, meshVolume(sim.facets()))
+        self.assertEqual([], openEdges(sim.facets()))
+
+    def test01(self):
+        '''Verify a slot cut with a flat end mill.'''
+        sim = box()
+        sim.updateMesh()
+        sim.setCutter(PathDropCutter.CylCutter(2.0, 10), 'slot')
+        sim.position = (0, 5, 10)
+        sim.applyPath(Path.Path([
+            Path.Command('G0', {'X': 5, 'Y': 5}),
+            Path.Command('G1', {'Z': 3}),
+            Path.Command('G1', {'X': 15})]))
+        self.assertEqual((15, 5, 3), sim.position)
+        self.assertRoughly(3, sim.heights[20, 40])
+        self.assertRoughly(5, sim.heights[20, 10])
+        self.assertRoughly(5, sim.heights[10, 40])
+
+        # only the blocks around the slot are meshed again
+        self.assertTrue(0 < sim.updateMesh() < 50)
+        # slot of 2mm depth, 2mm wide between the centers of the end arcs 10mm apart
+        expected = 20 * 10 * 5 - 2 * (10 * 2 + numpy.pi)
+        self.assertRoughly(expected, meshVolume(sim.facets()), 1.5)
+        self.assertEqual({}, sim.rapidCuts)
+
+    def test02(self):
+        '''Verify ball end arcs and rapid cuts.'''
+        sim = box()
+        sim.setCutter(PathDropCutter.BallCutter(2.0, 10), 'arc')
+        sim.position = (10, 2, 4)
+        sim.applyPath(Path.Path([Path.Command('G3', {'X': 10, 'Y': 8, 'I': 0, 'J': 3})]))
+        # the tip runs through the ends of the half circle and its rightmost point
+        self.assertRoughly(4, sim.heights[8, 40], 0.05)
+        self.assertRoughly(4, sim.heights[20, 52], 0.05)
+        self.assertRoughly(5, sim.heights[20, 40])
+        self.assertRoughly(5, sim.heights[20, 28])
+        self.assertEqual({}, sim.rapidCuts)
+
+        sim.applyPath(Path.Path([Path.Command('G0', {'X': 18})]))
+        self.assertTrue(sim.rapidCuts['arc'] > 0)
+
+    def test03(self):
+        '''Verify gouges are reported for the operation cutting into the model.'''
+        sim = box()
+        # model top at 3mm on the right half of the stock
+        triangles = numpy.array([[(10, 0, 3), (20, 0, 3), (20, 10, 3)], [(10, 0, 3), (20, 10, 3), (10, 10, 3)]], dtype=float)
+        sim.setModel(triangles)
+        sim.setCutter(PathDropCutter.CylCutter(2.0, 10), 'rough')
+        sim.position = (2, 5, 3.5)
+        sim.applyPath(Path.Path([Path.Command('G1', {'X': 18})]))
+        self.assertEqual({}, sim.gouges())
+
+        sim.setCutter(PathDropCutter.CylCutter(2.0, 10), 'finish')
+        sim.position = (2, 5, 2.5)
+        sim.applyPath(Path.Path([Path.Command('G1', {'X': 6})]))
+        sim.applyPath(Path.Path([Path.Command('G1', {'X': 14})]))
+        gouges = sim.gouges()
+        self.assertEqual(['finish'], list(gouges))
+        self.assertRoughly(0.5, gouges['finish']['depth'])
+        self.assertTrue(gouges['finish']['x'] > 9)
+
+    def test04(self):
+        '''Verify moves above the stock don't mesh blocks again and cut blocks fit their flat neighbours.'''
+        sim = box()
+        sim.updateMesh()
+        sim.setCutter(PathDropCutter.BallCutter(2.0, 10), 'pocket')
+        sim.position = (5, 5, 10)
+        sim.applyPath(Path.Path([Path.Command('G0', {'X': 15}), Path.Command('G0', {'X': 5})]))
+        self.assertEqual(0, sim.updateMesh())
+
+        sim.applyPath(Path.Path([Path.Command('G1', {'Z': 3}), Path.Command('G1', {'X': 6})]))
+        self.assertTrue(0 < sim.updateMesh() < 50)
+        facets = sim.facets()
+        self.assertEqual([], openEdges(facets))
+        self.assertTrue(meshVolume(facets) < 20 * 10 * 5)
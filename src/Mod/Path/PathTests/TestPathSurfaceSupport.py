@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import FreeCAD
+import Part
+import PathScripts.PathSurfaceSupport as PathSurfaceSupport
+
+from PathTests.PathTestUtils import PathTestBase
+
+
+class TestPathSurfaceSupport(PathTestBase):
+    '''Test the tessellation cache of 3D Surface and Waterline operations.'''
+
+    def test00(self):
+        '''Verify tessellation to triangle array.'''
+        box = Part.makeBox(10, 20, 30)
+        triangles = PathSurfaceSupport.getShapeTriangles(box, 0.1, cache=False)
+        self.assertEqual(triangles.shape, (12, 3, 3))
+        self.assertRoughly(triangles[:, :, 0].max(), 10.0)
+        self.assertRoughly(triangles[:, :, 1].max(), 20.0)
+        self.assertRoughly(triangles[:, :, 2].max(), 30.0)
+
+    def test01(self):
+        '''Verify cache hits, misses and eviction.'''
+        cache = PathSurfaceSupport.TessellationCache(2)
+        box = Part.makeBox(10, 10, 10)
+        first = cache.getTriangles(box, 0.1)
+        self.assertTrue(cache.getTriangles(box, 0.1) is first)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertFalse(first.flags.writeable)
+
+        # other deflection and moved shape are tessellated again
+        cache.getTriangles(box, 0.2)
+        moved = box.copy()
+        moved.Placement = FreeCAD.Placement(FreeCAD.Vector(5, 0, 0), FreeCAD.Rotation())
+        self.assertRoughly(cache.getTriangles(moved, 0.1)[:, :, 0].min(), 5.0)
+        self.assertEqual(cache.misses, 3)
+
+        # least recently used entry was dropped
+        self.assertEqual(len(cache.entries), 2)
+        cache.getTriangles(box, 0.1)
+        self.assertEqual(cache.misses, 4)
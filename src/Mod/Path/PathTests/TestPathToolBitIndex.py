@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+
+import PathScripts.PathToolBitIndex as PathToolBitIndex
+import json
+import os
+import shutil
+import tempfile
+
+from PathTests.PathTestUtils import PathTestBase
+
+ToolDir = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'Tools')
+
+
+class TestPathToolBitIndex(PathTestBase):
+    '''Unit tests for the tool bit index.'''
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        for sub in ['Bit', 'Library']:
+            shutil.copytree(os.path.join(ToolDir, sub), os.path.join(self.dir, sub))
+        self.library = os.path.join(self.dir, 'Library', 'Default.fctl')
+        self.manifest = os.path.join(self.dir, 'index.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def bit(self, name):
+        return os.path.join(self.dir, 'Bit', name)
+
+    def test00(self):
+        '''Verify library tools are resolved and declared.'''
+        index = PathToolBitIndex.ToolBitIndex(self.manifest)
+        tools = index.libraryTools(self.library)
+        self.assertEqual(tools[0][0:3], (1, '5mm_Endmill.fctb', self.bit('5mm_Endmill.fctb')))
+        self.assertEqual(tools[0][3]['name'], '5mm Endmill')
+        self.assertTrue(all(bit and declaration for (nr, name, bit, declaration) in tools))
+
+    def test01(self):
+        '''Verify the manifest is persisted and stale entries are read again.'''
+        index = PathToolBitIndex.ToolBitIndex(self.manifest)
+        index.libraryTools(self.library)
+        index.save()
+        self.assertFalse(index.dirty)
+
+        index = PathToolBitIndex.ToolBitIndex(self.manifest)
+        path = self.bit('5mm_Endmill.fctb')
+        self.assertIn(path, index.bits)
+        index.libraryTools(self.library)
+        self.assertFalse(index.dirty)
+
+        with open(path) as fp:
+            declaration = json.load(fp)
+        declaration['name'] = 'Renamed Endmill'
+        with open(path, 'w') as fp:
+            json.dump(declaration, fp)
+        os.utime(path, (0, 0))
+        self.assertEqual(index.declaration(path)['name'], 'Renamed Endmill')
+        self.assertTrue(index.dirty)
+
+    def test02(self):
+        '''Verify bits can be found by diameter, shape and name.'''
+        index = PathToolBitIndex.ToolBitIndex()
+        found = index.scan([os.path.join(self.dir, 'Bit')])
+        self.assertEqual(len(found), len(os.listdir(os.path.join(self.dir, 'Bit'))))
+
+        self.assertEqual(index.find(diameter=5, shape='endmill'), [self.bit('5mm_Endmill.fctb')])
+        self.assertIn(self.bit('5mm_Drill.fctb'), index.find(diameter=5))
+        self.assertEqual(index.find(shape='ballend'), [self.bit('6mm_Ball_End.fctb')])
+        self.assertEqual(index.find(name='bull nose'), [self.bit('6mm_Bullnose.fctb')])
+        self.assertEqual(index.find(diameter=1234), [])
+
+        os.remove(self.bit('5mm_Endmill.fctb'))
+        index.scan([os.path.join(self.dir, 'Bit')])
+        self.assertEqual(index.find(diameter=5, shape='endmill'), [])
+
+    def test03(self):
+        '''Verify a corrupt manifest is ignored.'''
+        with open(self.manifest, 'w') as fp:
+            fp.write('{not json')
+        index = PathToolBitIndex.ToolBitIndex(self.manifest)
+        self.assertEqual(index.bits, {})
+        with open(self.manifest, 'w') as fp:
+            fp.write('[1, 2]')
+        index = PathToolBitIndex.ToolBitIndex(self.manifest)
+        self.assertEqual(index.bits, {})
+        with open(self.library) as fp:
+            count = len(json.load(fp)['tools'])
+        self.assertEqual(len(index.libraryTools(self.library)), count)
+
+    def test04(self):
+        '''Verify cached lookups are dropped when a file of the same name is found first.'''
+        index = PathToolBitIndex.ToolBitIndex(self.manifest)
+        other = os.path.join(self.dir, 'Other')
+        os.makedirs(os.path.join(other, 'Library'))
+        library = os.path.join(other, 'Library', 'Default.fctl')
+        shutil.copy(self.library, library)
+        # the bits of the library are found through the search paths
+        found = index.findToolBit('5mm_Endmill', library)
+        self.assertTrue(found)
+        self.assertNotEqual(os.path.dirname(found), os.path.join(other, 'Bit'))
+
+        # a bit next to the library takes precedence over the search paths
+        shutil.copytree(os.path.join(self.dir, 'Bit'), os.path.join(other, 'Bit'))
+        self.assertEqual(index.findToolBit('5mm_Endmill', library), os.path.join(other, 'Bit', '5mm_Endmill.fctb'))
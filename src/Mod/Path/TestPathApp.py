@@ -24,22 +24,36 @@ import TestApp
 
 # from PathTests.TestPathPost import PathPostTestCases
 from PathTests.TestPathAdaptive import TestPathAdaptive
+from PathTests.TestPathAdaptiveCache import TestPathAdaptiveCache
 from PathTests.TestPathCore import TestPathCore
 from PathTests.TestPathDeburr import TestPathDeburr
 from PathTests.TestPathDepthParams import depthTestCases
 from PathTests.TestPathDressupDogbone import TestDressupDogbone
 from PathTests.TestPathDressupHoldingTags import TestHoldingTags
+from PathTests.TestPathDressupZCorrect import TestPathDressupZCorrect, TestPathDressupZCorrectExecute
+from PathTests.TestPathDropCutter import TestPathDropCutter
+from PathTests.TestPathFingerprint import TestPathFingerprint
+from PathTests.TestPathGcodeImport import TestPathGcodeImport
 from PathTests.TestPathGeom import TestPathGeom
+from PathTests.TestPathHeightMap import TestPathHeightMap
 from PathTests.TestPathHelix import TestPathHelix
 from PathTests.TestPathLog import TestPathLog
+from PathTests.TestPathOpScheduler import TestPathOpScheduler
 from PathTests.TestPathOpTools import TestPathOpTools
+from PathTests.TestPathOrdering import TestPathOrdering
+from PathTests.TestPathPostEngine import TestPathPostEngine
 from PathTests.TestPathPreferences import TestPathPreferences
+from PathTests.TestPathProbeMap import TestPathProbeMap
 from PathTests.TestPathPropertyBag import TestPathPropertyBag
 from PathTests.TestPathSetupSheet import TestPathSetupSheet
+from PathTests.TestPathStatistics import TestPathStatistics
 from PathTests.TestPathStock import TestPathStock
+from PathTests.TestPathStockSimulation import TestPathStockSimulation
+from PathTests.TestPathSurfaceSupport import TestPathSurfaceSupport
 from PathTests.TestPathThreadMilling import TestPathThreadMilling
 from PathTests.TestPathTool import TestPathTool
 from PathTests.TestPathToolBit import TestPathToolBit
+from PathTests.TestPathToolBitIndex import TestPathToolBitIndex
 from PathTests.TestPathToolController import TestPathToolController
 from PathTests.TestPathTooltable import TestPathTooltable
 from PathTests.TestPathUtil import TestPathUtil
@@ -51,20 +65,35 @@ False if depthTestCases.__name__ else True
 False if TestApp.__name__ else True
 False if TestDressupDogbone.__name__ else True
 False if TestHoldingTags.__name__ else True
+False if TestPathDressupZCorrect.__name__ else True
+False if TestPathDressupZCorrectExecute.__name__ else True
 False if TestPathAdaptive.__name__ else True
+False if TestPathAdaptiveCache.__name__ else True
 False if TestPathCore.__name__ else True
 False if TestPathDeburr.__name__ else True
+False if TestPathDropCutter.__name__ else True
+False if TestPathFingerprint.__name__ else True
+False if TestPathGcodeImport.__name__ else True
 False if TestPathGeom.__name__ else True
+False if TestPathHeightMap.__name__ else True
 False if TestPathHelix.__name__ else True
 False if TestPathLog.__name__ else True
+False if TestPathOpScheduler.__name__ else True
 False if TestPathOpTools.__name__ else True
+False if TestPathOrdering.__name__ else True
+False if TestPathPostEngine.__name__ else True
 False if TestPathPreferences.__name__ else True
+False if TestPathProbeMap.__name__ else True
 False if TestPathPropertyBag.__name__ else True
 False if TestPathSetupSheet.__name__ else True
+False if TestPathStatistics.__name__ else True
 False if TestPathStock.__name__ else True
+False if TestPathStockSimulation.__name__ else True
+False if TestPathSurfaceSupport.__name__ else True
 False if TestPathThreadMilling.__name__ else True
 False if TestPathTool.__name__ else True
 False if TestPathToolBit.__name__ else True
+False if TestPathToolBitIndex.__name__ else True
 False if TestPathToolController.__name__ else True
 False if TestPathTooltable.__name__ else True
 False if TestPathUtil.__name__ else True
@@ -326,17 +326,38 @@ bp::list AdaptiveExecute(AdaptivePath::Adaptive2d& ada,const boost::python::list
 		dpaths.push_back(dpath);
 	}
 	// Execute with callback
-	std::list<AdaptivePath::AdaptiveOutput> result=ada.Execute(stock_dpaths,dpaths,[progressCallbackFn](AdaptivePath::TPaths tp)->bool {
-		bp::list out_paths;
-		for(const auto & in_pair : tp) {
-			bp::list path;
-			for(const auto & in_pt : in_pair.second) {
-				path.append(bp::make_tuple(in_pt.first,in_pt.second));
+	// the computation doesn't touch any python object, so other threads may run meanwhile,
+	// only the callback needs the GIL again
+	std::list<AdaptivePath::AdaptiveOutput> result;
+	PyThreadState *threadState = PyEval_SaveThread();
+	try {
+		result=ada.Execute(stock_dpaths,dpaths,[&progressCallbackFn](AdaptivePath::TPaths tp)->bool {
+			PyGILState_STATE gilState = PyGILState_Ensure();
+			bool stop;
+			try {
+				bp::list out_paths;
+				for(const auto & in_pair : tp) {
+					bp::list path;
+					for(const auto & in_pt : in_pair.second) {
+						path.append(bp::make_tuple(in_pt.first,in_pt.second));
+					}
+					out_paths.append(bp::make_tuple(in_pair.first,path));
+				}
+				stop = bp::extract<bool>(progressCallbackFn(out_paths));
 			}
-			out_paths.append(bp::make_tuple(in_pair.first,path));
-		}
-		return bp::extract<bool>(progressCallbackFn(out_paths));
-	});
+			catch(...) {
+				PyGILState_Release(gilState);
+				throw;
+			}
+			PyGILState_Release(gilState);
+			return stop;
+		});
+	}
+	catch(...) {
+		PyEval_RestoreThread(threadState);
+		throw;
+	}
+	PyEval_RestoreThread(threadState);
 	// convert outputs back
 	BOOST_FOREACH(const auto & res, result) {
 		out_list.append(res);